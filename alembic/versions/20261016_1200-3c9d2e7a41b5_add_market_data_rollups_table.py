@@ -0,0 +1,63 @@
+"""Add market_data_rollups table for tiered price history
+
+Revision ID: 3c9d2e7a41b5
+Revises: fb67d208311d
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9d2e7a41b5"
+down_revision: str | None = "fb67d208311d"
+branch_labels: str | tuple[str, ...] | None = None
+depends_on: str | tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema.
+
+    OHLCV bars (5m/1h/1d) built from market_data by PriceHistoryStore.
+    """
+    op.create_table(
+        "market_data_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("resolution", sa.String(length=8), nullable=False),
+        sa.Column("game", sa.String(length=100), nullable=False),
+        sa.Column("item_name", sa.Text(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("open", sa.Float(), nullable=False),
+        sa.Column("high", sa.Float(), nullable=False),
+        sa.Column("low", sa.Float(), nullable=False),
+        sa.Column("close", sa.Float(), nullable=False),
+        sa.Column("volume", sa.Integer(), nullable=True),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "resolution",
+            "game",
+            "item_name",
+            "bucket_start",
+            name="uq_market_data_rollups_bucket",
+        ),
+    )
+    op.create_index(
+        op.f("ix_market_data_rollups_bucket_start"),
+        "market_data_rollups",
+        ["bucket_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema.
+
+    This function reverts schema changes from the upgrade.
+    Ensure this is always the inverse of upgrade().
+    """
+    op.drop_index(op.f("ix_market_data_rollups_bucket_start"), table_name="market_data_rollups")
+    op.drop_table("market_data_rollups")
@@ -0,0 +1,515 @@
+"""Incremental and vectorized technical indicators.
+
+Streaming indicators keep O(1) state per series and are updated one price
+at a time, so tracking thousands of items costs a few float operations per
+tick instead of recomputing indicators over the whole history:
+
+- ``SMA`` / ``EMA`` - moving averages
+- ``RSI`` - Wilder's Relative Strength Index
+- ``MACD`` - fast/slow EMA difference with an EMA signal line
+- ``Bollinger`` - rolling mean and population standard deviation
+
+``IndicatorState`` bundles them for one item and ``IndicatorEngine`` keeps
+a state per item. ``compute_indicators_batch`` computes the same indicators
+for a whole price matrix (items x history) with NumPy.
+
+All formulas match ``PriceAnalytics`` (EMA and RSI averages are seeded with
+the simple average of their first ``period`` values).
+
+Usage:
+    ```python
+    from src.analytics.indicators import IndicatorEngine, compute_indicators_batch
+
+    engine = IndicatorEngine()
+    engine.add_price("AK-47 | Redline (FT)", 12.5)
+    snapshot = engine.get("AK-47 | Redline (FT)").snapshot()
+
+    batch = compute_indicators_batch([history_1, history_2, ...])
+    latest_rsi = batch.latest()["rsi"]
+    ```
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+
+DEFAULT_MAX_ITEMS = 10_000
+
+
+class SMA:
+    """Simple moving average over the last ``period`` prices."""
+
+    def __init__(self, period: int) -> None:
+        """Initialize indicator.
+
+        Args:
+            period: Window length
+
+        Raises:
+            ValueError: If period is not positive
+        """
+        if period < 1:
+            raise ValueError("period must be positive")
+        self.period = period
+        self._window: deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+        self.value: float | None = None
+
+    def update(self, price: float) -> float | None:
+        """Add a price and return the new average (None until the window is full)."""
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(price)
+        self._sum += price
+        if len(self._window) == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class EMA:
+    """Exponential moving average seeded with the SMA of the first ``period`` prices."""
+
+    def __init__(self, period: int, alpha: float | None = None) -> None:
+        """Initialize indicator.
+
+        Args:
+            period: EMA period
+            alpha: Smoothing factor (default: 2 / (period + 1))
+
+        Raises:
+            ValueError: If period is not positive
+        """
+        if period < 1:
+            raise ValueError("period must be positive")
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2 / (period + 1)
+        self._count = 0
+        self._seed_sum = 0.0
+        self.value: float | None = None
+
+    def update(self, price: float) -> float | None:
+        """Add a price and return the new EMA (None until ``period`` prices are seen)."""
+        if self.value is not None:
+            self.value = price * self.alpha + self.value * (1 - self.alpha)
+            return self.value
+
+        self._count += 1
+        self._seed_sum += price
+        if self._count == self.period:
+            self.value = self._seed_sum / self.period
+        return self.value
+
+
+class RSI:
+    """Relative Strength Index with Wilder's smoothing."""
+
+    def __init__(self, period: int = 14) -> None:
+        """Initialize indicator.
+
+        Args:
+            period: RSI period
+        """
+        self.period = period
+        self._avg_gain = EMA(period, alpha=1 / period)
+        self._avg_loss = EMA(period, alpha=1 / period)
+        self._prev_price: float | None = None
+        self.value: float | None = None
+
+    def update(self, price: float) -> float | None:
+        """Add a price and return the new RSI (None until ``period + 1`` prices)."""
+        if self._prev_price is not None:
+            change = price - self._prev_price
+            avg_gain = self._avg_gain.update(max(0.0, change))
+            avg_loss = self._avg_loss.update(max(0.0, -change))
+            if avg_gain is not None and avg_loss is not None:
+                self.value = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+        self._prev_price = price
+        return self.value
+
+
+class MACD:
+    """MACD line, signal line and the previous values for crossover detection."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        """Initialize indicator.
+
+        Args:
+            fast: Fast EMA period
+            slow: Slow EMA period
+            signal: Signal line EMA period
+        """
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.macd_line: float | None = None
+        self.signal_line: float | None = None
+        self.prev_macd_line: float | None = None
+        self.prev_signal_line: float | None = None
+
+    def update(self, price: float) -> float | None:
+        """Add a price and return the new MACD line (None until the slow EMA is ready)."""
+        fast = self.fast.update(price)
+        slow = self.slow.update(price)
+        if fast is None or slow is None:
+            return None
+
+        self.prev_macd_line = self.macd_line
+        self.prev_signal_line = self.signal_line
+        self.macd_line = fast - slow
+        self.signal_line = self.signal.update(self.macd_line)
+        return self.macd_line
+
+
+class Bollinger:
+    """Rolling mean and population standard deviation over ``period`` prices."""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0) -> None:
+        """Initialize indicator.
+
+        Args:
+            period: Window length
+            num_std: Band width in standard deviations
+        """
+        self.period = period
+        self.num_std = num_std
+        self._window: deque[float] = deque(maxlen=period)
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean (Welford)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the window is full."""
+        return len(self._window) == self.period
+
+    @property
+    def middle(self) -> float | None:
+        """Rolling mean."""
+        return self._mean if self.ready else None
+
+    @property
+    def std(self) -> float | None:
+        """Rolling population standard deviation."""
+        return max(self._m2, 0.0) ** 0.5 / self.period**0.5 if self.ready else None
+
+    def update(self, price: float) -> float | None:
+        """Add a price and return the new rolling mean (None until the window is full)."""
+        if self.ready:
+            # Sliding Welford update: replace the oldest price with the new one
+            old = self._window[0]
+            old_mean = self._mean
+            self._mean += (price - old) / self.period
+            self._m2 += (price - old) * (price - self._mean + old - old_mean)
+        else:
+            count = len(self._window) + 1
+            delta = price - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (price - self._mean)
+        self._window.append(price)
+        return self.middle
+
+    def bands(self) -> tuple[float, float, float] | None:
+        """Return ``(upper, middle, lower)`` or None until the window is full."""
+        middle = self.middle
+        std = self.std
+        if middle is None or std is None:
+            return None
+        return middle + std * self.num_std, middle, middle - std * self.num_std
+
+
+@dataclass(frozen=True)
+class IndicatorSettings:
+    """Indicator periods shared by streaming and batch computation."""
+
+    rsi_period: int = 14
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    bollinger_period: int = 20
+    bollinger_std: float = 2.0
+    sma_periods: tuple[int, ...] = (20, 50)
+    ema_periods: tuple[int, ...] = (12, 26)
+
+
+class IndicatorState:
+    """Streaming indicators of one price series."""
+
+    def __init__(self, settings: IndicatorSettings | None = None) -> None:
+        """Initialize state.
+
+        Args:
+            settings: Indicator periods
+        """
+        self.settings = settings or IndicatorSettings()
+        self.count = 0
+        self.last_price: float | None = None
+        self.sma = {period: SMA(period) for period in self.settings.sma_periods}
+        self.ema = {period: EMA(period) for period in self.settings.ema_periods}
+        self.rsi = RSI(self.settings.rsi_period)
+        self.macd = MACD(
+            self.settings.macd_fast, self.settings.macd_slow, self.settings.macd_signal
+        )
+        self.bollinger = Bollinger(self.settings.bollinger_period, self.settings.bollinger_std)
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: Iterable[float],
+        settings: IndicatorSettings | None = None,
+    ) -> IndicatorState:
+        """Build state from a history (oldest first) in a single pass."""
+        state = cls(settings)
+        for price in prices:
+            state.update(price)
+        return state
+
+    def update(self, price: float) -> None:
+        """Add the next price of the series."""
+        price = float(price)
+        self.count += 1
+        self.last_price = price
+        for sma in self.sma.values():
+            sma.update(price)
+        for ema in self.ema.values():
+            ema.update(price)
+        self.rsi.update(price)
+        self.macd.update(price)
+        self.bollinger.update(price)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current indicator values (None where there is not enough data yet)."""
+        bands = self.bollinger.bands()
+        return {
+            "count": self.count,
+            "price": self.last_price,
+            **{f"sma_{period}": sma.value for period, sma in self.sma.items()},
+            **{f"ema_{period}": ema.value for period, ema in self.ema.items()},
+            "rsi": self.rsi.value,
+            "macd": self.macd.macd_line,
+            "macd_signal": self.macd.signal_line,
+            "bb_upper": bands[0] if bands else None,
+            "bb_middle": bands[1] if bands else None,
+            "bb_lower": bands[2] if bands else None,
+        }
+
+
+class IndicatorEngine:
+    """Per-item streaming indicator states.
+
+    The least recently updated items are dropped once ``max_items`` is
+    exceeded.
+    """
+
+    def __init__(
+        self,
+        settings: IndicatorSettings | None = None,
+        max_items: int = DEFAULT_MAX_ITEMS,
+    ) -> None:
+        """Initialize engine.
+
+        Args:
+            settings: Indicator periods
+            max_items: Maximum number of tracked items
+        """
+        self.settings = settings or IndicatorSettings()
+        self.max_items = max_items
+        self._states: OrderedDict[str, IndicatorState] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of tracked items."""
+        return len(self._states)
+
+    def __contains__(self, item_id: object) -> bool:
+        """Whether an item is tracked."""
+        return item_id in self._states
+
+    def add_price(self, item_id: str, price: float) -> IndicatorState:
+        """Update an item's indicators with a new price.
+
+        Args:
+            item_id: Item identifier
+            price: New price
+
+        Returns:
+            Updated state of the item
+        """
+        state = self._states.get(item_id)
+        if state is None:
+            state = self._states[item_id] = IndicatorState(self.settings)
+            if len(self._states) > self.max_items:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(item_id)
+        state.update(price)
+        return state
+
+    def get(self, item_id: str) -> IndicatorState | None:
+        """Return an item's state, or None if it is not tracked."""
+        return self._states.get(item_id)
+
+    def remove(self, item_id: str) -> None:
+        """Stop tracking an item."""
+        self._states.pop(item_id, None)
+
+    def clear(self) -> None:
+        """Drop all states."""
+        self._states.clear()
+
+
+@dataclass
+class BatchIndicators:
+    """Indicator series for a price matrix.
+
+    Attributes:
+        series: Indicator name -> float matrix of shape (items, history),
+            NaN where there is not enough data
+    """
+
+    series: dict[str, np.ndarray]
+
+    def latest(self) -> dict[str, np.ndarray]:
+        """Last value of every indicator per item."""
+        return {
+            name: values[:, -1] if values.shape[1] else np.full(values.shape[0], np.nan)
+            for name, values in self.series.items()
+        }
+
+    def for_item(self, index: int) -> dict[str, float | None]:
+        """Last indicator values of one item (None instead of NaN)."""
+        return {
+            name: None if np.isnan(values[index]) else float(values[index])
+            for name, values in self.latest().items()
+        }
+
+
+def to_price_matrix(histories: Sequence[Sequence[float]]) -> np.ndarray:
+    """Stack histories of different lengths into a right-aligned NaN-padded matrix."""
+    width = max((len(history) for history in histories), default=0)
+    matrix = np.full((len(histories), width), np.nan)
+    for row, history in enumerate(histories):
+        if len(history):
+            matrix[row, width - len(history) :] = history
+    return matrix
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last ``period`` values; NaN unless all of them are present."""
+    valid = ~np.isnan(values)
+    zeros = np.zeros((values.shape[0], 1))
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] >= period:
+        window_sum = sums[:, period:] - sums[:, :-period]
+        window_count = counts[:, period:] - counts[:, :-period]
+        result[:, period - 1 :] = np.where(window_count == period, window_sum / period, np.nan)
+    return result
+
+
+def _ema(values: np.ndarray, period: int, alpha: float | None = None) -> np.ndarray:
+    """EMA of each row, seeded with the mean of the row's first ``period`` values."""
+    alpha = alpha if alpha is not None else 2 / (period + 1)
+    result = np.full(values.shape, np.nan)
+    if values.size == 0:
+        return result
+
+    seeds = _rolling_mean(values, period)
+    seeded = ~np.isnan(seeds)
+    has_seed = seeded.any(axis=1)
+    if not has_seed.any():
+        return result
+
+    # Rows grouped by the column where their EMA starts
+    first_seed = np.argmax(seeded, axis=1)
+    starts: dict[int, np.ndarray] = {
+        int(column): np.flatnonzero(has_seed & (first_seed == column))
+        for column in np.unique(first_seed[has_seed])
+    }
+
+    # Iterate over contiguous columns; each step updates all items at once
+    columns = np.ascontiguousarray(values.T)
+    output = np.full(columns.shape, np.nan)
+    current = np.full(values.shape[0], np.nan)
+    for column in range(min(starts), columns.shape[0]):
+        current = columns[column] * alpha + current * (1 - alpha)
+        rows = starts.get(column)
+        if rows is not None:
+            current[rows] = seeds[rows, column]
+        output[column] = current
+    return output.T
+
+
+def compute_indicators_batch(
+    prices: np.ndarray | Sequence[Sequence[float]],
+    settings: IndicatorSettings | None = None,
+) -> BatchIndicators:
+    """Compute indicators for many items over their full history at once.
+
+    Args:
+        prices: Matrix of shape (items, history), oldest first, right-aligned
+            with leading NaN for shorter histories; or a list of histories
+        settings: Indicator periods
+
+    Returns:
+        Indicator series with the same shape as the price matrix
+
+    Raises:
+        ValueError: If a history has gaps (NaN after its first price)
+    """
+    settings = settings or IndicatorSettings()
+    if isinstance(prices, np.ndarray):
+        matrix = np.asarray(prices, dtype=float)
+    else:
+        matrix = to_price_matrix(prices)
+    if matrix.ndim != 2:
+        raise ValueError("prices must be a 2D matrix")
+
+    missing = np.isnan(matrix)
+    if (np.diff(missing.astype(np.int8), axis=1) > 0).any():
+        raise ValueError("price histories must not contain gaps")
+
+    series: dict[str, np.ndarray] = {}
+    for period in settings.sma_periods:
+        series[f"sma_{period}"] = _rolling_mean(matrix, period)
+    for period in settings.ema_periods:
+        series[f"ema_{period}"] = _ema(matrix, period)
+
+    # RSI: Wilder's smoothing of gains and losses
+    changes = np.diff(matrix, axis=1)
+    wilder_alpha = 1 / settings.rsi_period
+    avg_gain = _ema(np.maximum(changes, 0.0), settings.rsi_period, wilder_alpha)
+    avg_loss = _ema(np.maximum(-changes, 0.0), settings.rsi_period, wilder_alpha)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    rsi[np.isnan(avg_gain) | np.isnan(avg_loss)] = np.nan
+    series["rsi"] = np.concatenate([np.full((matrix.shape[0], 1), np.nan), rsi], axis=1)
+
+    # MACD
+    macd = _ema(matrix, settings.macd_fast) - _ema(matrix, settings.macd_slow)
+    signal = _ema(macd, settings.macd_signal)
+    series["macd"] = macd
+    series["macd_signal"] = signal
+    series["macd_histogram"] = macd - signal
+
+    # Bollinger bands (population standard deviation)
+    period = settings.bollinger_period
+    middle = _rolling_mean(matrix, period)
+    # Centering each row keeps E[x^2] - E[x]^2 numerically stable
+    counts = (~missing).sum(axis=1, keepdims=True)
+    centered = matrix - np.nansum(matrix, axis=1, keepdims=True) / np.maximum(counts, 1)
+    variance = _rolling_mean(centered**2, period) - _rolling_mean(centered, period) ** 2
+    std = np.sqrt(np.maximum(variance, 0.0))
+    series["bb_upper"] = middle + std * settings.bollinger_std
+    series["bb_middle"] = middle
+    series["bb_lower"] = middle - std * settings.bollinger_std
+
+    return BatchIndicators(series)
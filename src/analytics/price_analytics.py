@@ -8,6 +8,11 @@ Provides advanced price analysis using technical indicators:
 - Liquidity scoring - market depth analysis
 - Trend detection - price direction analysis
 
+Indicators are computed in a single pass with the streaming indicators
+from ``src.analytics.indicators``; ``add_price`` keeps incremental
+per-item state and ``calculate_indicators_batch`` handles many items at
+once with NumPy.
+
 Usage:
     ```python
     from src.analytics.price_analytics import PriceAnalytics
@@ -21,6 +26,9 @@ Usage:
     analysis = analytics.analyze_item(price_history)
     print(f"Trend: {analysis.trend}")
     print(f"RSI: {analysis.rsi}")
+
+    # Analyze stored history (PriceAnalytics(price_history_store=...))
+    analysis = await analytics.analyze_stored_item("csgo", item_name, current_price)
     ```
 
 Created: January 10, 2026
@@ -29,13 +37,33 @@ Created: January 10, 2026
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from enum import StrEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.analytics.indicators import (
+    EMA,
+    MACD,
+    RSI,
+    Bollinger,
+    IndicatorEngine,
+    IndicatorSettings,
+    IndicatorState,
+    compute_indicators_batch,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+    import numpy as np
+
+    from src.analytics.indicators import BatchIndicators
+    from src.utils.price_history_store import PriceHistoryStore
+
 
 logger = structlog.get_logger(__name__)
 
@@ -296,6 +324,9 @@ class PriceAnalytics:
         macd_signal: int = 9,
         bollinger_period: int = 20,
         bollinger_std: float = 2.0,
+        max_tracked_items: int = 10_000,
+        readiness_checks: Mapping[str, Callable[[], bool]] | None = None,
+        price_history_store: PriceHistoryStore | None = None,
     ) -> None:
         """Initialize analytics engine.
 
@@ -306,6 +337,12 @@ class PriceAnalytics:
             macd_signal: Signal line period for MACD
             bollinger_period: Period for Bollinger Bands
             bollinger_std: Standard deviation multiplier for bands
+            max_tracked_items: Maximum items with incremental state (add_price)
+            readiness_checks: Dependency checks by name (e.g. database pool,
+                Redis, bot polling) that must pass before price updates are
+                accepted
+            price_history_store: Stored price history read by
+                analyze_stored_item
         """
         self.rsi_period = rsi_period
         self.macd_fast = macd_fast
@@ -314,11 +351,76 @@ class PriceAnalytics:
         self.bollinger_period = bollinger_period
         self.bollinger_std = bollinger_std
 
+        self.settings = IndicatorSettings(
+            rsi_period=rsi_period,
+            macd_fast=macd_fast,
+            macd_slow=macd_slow,
+            macd_signal=macd_signal,
+            bollinger_period=bollinger_period,
+            bollinger_std=bollinger_std,
+        )
+        self._engine = IndicatorEngine(self.settings, max_items=max_tracked_items)
+        self._readiness_checks = dict(readiness_checks or {})
+        self.price_history_store = price_history_store
+
+    def is_ready(self) -> bool:
+        """Check if the engine accepts price updates.
+
+        Returns:
+            True if every readiness check passes
+        """
+        for name, check in self._readiness_checks.items():
+            try:
+                ready = check()
+            except Exception as e:
+                logger.warning("readiness_check_failed", dependency=name, error=str(e))
+                ready = False
+            if not ready:
+                logger.debug("price_analytics_not_ready", dependency=name)
+                return False
+        return True
+
+    def add_price(self, item_id: str, price: float | Decimal) -> None:
+        """Update an item's incremental indicators with a new price (O(1)).
+
+        Args:
+            item_id: Item identifier
+            price: New price
+        """
+        self._engine.add_price(item_id, float(price))
+
+    def get_indicators(self, item_id: str) -> dict[str, Any] | None:
+        """Get current indicator values of an item tracked via add_price.
+
+        Args:
+            item_id: Item identifier
+
+        Returns:
+            Indicator values or None if the item is not tracked
+        """
+        state = self._engine.get(item_id)
+        return state.snapshot() if state else None
+
+    def calculate_indicators_batch(
+        self,
+        histories: np.ndarray | Sequence[Sequence[float]],
+    ) -> BatchIndicators:
+        """Calculate indicators for many items over their full history at once.
+
+        Args:
+            histories: Price histories (oldest first), as a list or a
+                right-aligned NaN-padded matrix of shape (items, history)
+
+        Returns:
+            Indicator series per item
+        """
+        return compute_indicators_batch(histories, self.settings)
+
     def calculate_sma(self, prices: list[float], period: int) -> float | None:
         """Calculate Simple Moving Average.
 
         Args:
-            prices: List of prices (newest first or oldest first)
+            prices: List of prices (oldest first)
             period: SMA period
 
         Returns:
@@ -326,7 +428,7 @@ class PriceAnalytics:
         """
         if len(prices) < period:
             return None
-        return sum(prices[:period]) / period
+        return sum(prices[-period:]) / period
 
     def calculate_ema(self, prices: list[float], period: int) -> float | None:
         """Calculate Exponential Moving Average.
@@ -341,13 +443,11 @@ class PriceAnalytics:
         if len(prices) < period:
             return None
 
-        multiplier = 2 / (period + 1)
-        ema = sum(prices[:period]) / period  # Start with SMA
+        ema = EMA(period)  # Starts with SMA
+        for price in prices:
+            ema.update(price)
 
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        return ema.value
 
     def calculate_rsi(self, prices: list[float], period: int | None = None) -> RSIResult | None:
         """Calculate Relative Strength Index.
@@ -367,30 +467,12 @@ class PriceAnalytics:
         if len(prices) < period + 1:
             return None
 
-        # Calculate price changes
-        changes = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
-
-        # Separate gains and losses
-        gains = [max(0, c) for c in changes]
-        losses = [abs(min(0, c)) for c in changes]
-
-        # Calculate average gain and loss
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
-
-        # Smooth averages
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-
-        # Calculate RSI
-        if avg_loss == 0:
-            rsi = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        # Wilder's smoothing of average gain and loss
+        rsi = RSI(period)
+        for price in prices:
+            rsi.update(price)
 
-        return RSIResult.from_value(rsi)
+        return RSIResult.from_value(rsi.value) if rsi.value is not None else None
 
     def calculate_macd(
         self,
@@ -421,40 +503,24 @@ class PriceAnalytics:
         if len(prices) < slow + signal:
             return None
 
-        # Calculate EMAs
-        ema_fast = self.calculate_ema(prices, fast)
-        ema_slow = self.calculate_ema(prices, slow)
+        # Fast/slow EMAs and the signal line are updated in one pass
+        macd = MACD(fast, slow, signal)
+        for price in prices:
+            macd.update(price)
 
-        if ema_fast is None or ema_slow is None:
-            return None
-
-        macd_line = ema_fast - ema_slow
-
-        # Calculate MACD history for signal line
-        macd_history = []
-        for i in range(slow - 1, len(prices)):
-            subset = prices[: i + 1]
-            fast_ema = self.calculate_ema(subset, fast)
-            slow_ema = self.calculate_ema(subset, slow)
-            if fast_ema is not None and slow_ema is not None:
-                macd_history.append(fast_ema - slow_ema)
-
-        if len(macd_history) < signal:
-            return None
+        return self._macd_result(macd)
 
-        signal_line = self.calculate_ema(macd_history, signal)
-        if signal_line is None:
+    @staticmethod
+    def _macd_result(macd: MACD) -> MACDResult | None:
+        """Build MACD result from streaming state."""
+        if macd.macd_line is None or macd.signal_line is None:
             return None
 
-        # Get previous values for crossover detection
-        prev_macd = macd_history[-2] if len(macd_history) >= 2 else None
-        prev_signal = self.calculate_ema(macd_history[:-1], signal) if len(macd_history) >= 2 else None
-
         return MACDResult.from_values(
-            macd_line=macd_line,
-            signal_line=signal_line,
-            prev_macd=prev_macd,
-            prev_signal=prev_signal,
+            macd_line=macd.macd_line,
+            signal_line=macd.signal_line,
+            prev_macd=macd.prev_macd_line,
+            prev_signal=macd.prev_signal_line,
         )
 
     def calculate_bollinger_bands(
@@ -483,20 +549,22 @@ class PriceAnalytics:
         if len(prices) < period:
             return None
 
-        # Calculate SMA
-        recent_prices = prices[-period:]
-        sma = sum(recent_prices) / period
+        bollinger = Bollinger(period, num_std)
+        for price in prices[-period:]:
+            bollinger.update(price)
 
-        # Calculate standard deviation
-        variance = sum((p - sma) ** 2 for p in recent_prices) / period
-        std = variance ** 0.5
+        return self._bollinger_result(bollinger, prices[-1])
 
-        upper = sma + (std * num_std)
-        lower = sma - (std * num_std)
+    @staticmethod
+    def _bollinger_result(bollinger: Bollinger, current_price: float) -> BollingerBands | None:
+        """Build Bollinger Bands from streaming state."""
+        bands = bollinger.bands()
+        if bands is None:
+            return None
+        upper, sma, lower = bands
 
         # Calculate bandwidth and position
         bandwidth = (upper - lower) / sma if sma > 0 else 0
-        current_price = prices[-1]
         position = (current_price - lower) / (upper - lower) if (upper - lower) > 0 else 0.5
 
         return BollingerBands(
@@ -676,21 +744,23 @@ class PriceAnalytics:
             current_price=current_price,
         )
 
-        # Calculate technical indicators if enough data
-        if len(price_history) >= self.rsi_period + 1:
-            analysis.rsi = self.calculate_rsi(price_history)
+        # All technical indicators in a single pass over the history
+        state = IndicatorState.from_prices(price_history, self.settings)
+
+        if state.rsi.value is not None:
+            analysis.rsi = RSIResult.from_value(state.rsi.value)
 
-        if len(price_history) >= self.macd_slow + self.macd_signal:
-            analysis.macd = self.calculate_macd(price_history)
+        if state.count >= self.macd_slow + self.macd_signal:
+            analysis.macd = self._macd_result(state.macd)
 
-        if len(price_history) >= self.bollinger_period:
-            analysis.bollinger = self.calculate_bollinger_bands(price_history)
+        if state.last_price is not None:
+            analysis.bollinger = self._bollinger_result(state.bollinger, state.last_price)
 
-        # Moving averages
-        analysis.sma_20 = self.calculate_sma(price_history, 20)
-        analysis.sma_50 = self.calculate_sma(price_history, 50)
-        analysis.ema_12 = self.calculate_ema(price_history, 12)
-        analysis.ema_26 = self.calculate_ema(price_history, 26)
+        # Moving averages (over the most recent prices)
+        analysis.sma_20 = state.sma[20].value
+        analysis.sma_50 = state.sma[50].value
+        analysis.ema_12 = state.ema[12].value
+        analysis.ema_26 = state.ema[26].value
 
         # Trend analysis
         analysis.trend = self.analyze_trend(price_history)
@@ -709,6 +779,48 @@ class PriceAnalytics:
 
         return analysis
 
+    async def analyze_stored_item(
+        self,
+        game: str,
+        item_name: str,
+        current_price: Decimal,
+        days: int = 30,
+        listings_count: int = 0,
+        min_listing_price: Decimal | None = None,
+        max_listing_price: Decimal | None = None,
+    ) -> PriceAnalysis:
+        """Perform complete price analysis over the stored price history.
+
+        Args:
+            game: Game identifier
+            item_name: Item name
+            current_price: Current price
+            days: History length in days
+            listings_count: Number of active listings
+            min_listing_price: Minimum listing price
+            max_listing_price: Maximum listing price
+
+        Returns:
+            Complete price analysis
+
+        Raises:
+            RuntimeError: If no price history store is configured
+        """
+        if self.price_history_store is None:
+            raise RuntimeError("PriceAnalytics has no price history store")
+
+        price_history = await self.price_history_store.get_close_prices(
+            game, item_name, start=datetime.now(UTC) - timedelta(days=days)
+        )
+        return self.analyze_item(
+            item_name=item_name,
+            price_history=price_history,
+            current_price=current_price,
+            listings_count=listings_count,
+            min_listing_price=min_listing_price,
+            max_listing_price=max_listing_price,
+        )
+
     def _calculate_overall_signal(
         self,
         analysis: PriceAnalysis,
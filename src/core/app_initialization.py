@@ -485,6 +485,7 @@ class ComponentInitializer:
                 telegram_bot=self.app.bot.bot if self.app.bot else None,
                 database=self.app.database,
                 config=integrator_config,
+                bot_updater=self.app.bot.updater if self.app.bot else None,
             )
 
             init_results = await self.app.bot_integrator.initialize()
@@ -73,6 +73,16 @@ class ApplicationLifecycle:
         arbitrage_level = getattr(self.app.config, "arbitrage_level", "medium")
         cleanup_interval = getattr(self.app.config, "cleanup_interval_hours", 6.0)
 
+        # One shared market table per game instead of every scanner paging the API
+        if self.app.dmarket_api:
+            from src.dmarket.market_snapshot import start_market_snapshots
+
+            try:
+                await start_market_snapshots(self.app.dmarket_api, games_to_scan)
+                logger.info(f"✅ Market snapshots started: games={games_to_scan}")
+            except Exception as e:
+                logger.warning(f"⚠️ Market snapshots not started: {e}")
+
         self.app._scanner_task = asyncio.create_task(
             self.app.scanner_manager.run_continuous(
                 games=games_to_scan,
@@ -144,6 +154,7 @@ class ApplicationLifecycle:
 
             # Step 8: Close API connections
             await self._close_api_connections()
+            await self._close_http_pool()
 
             # Step 9: Close database
             await self._close_database()
@@ -207,6 +218,10 @@ class ApplicationLifecycle:
         except Exception as e:
             logger.warning(f"⚠️ Error stopping Scanner Manager: {e}")
 
+        from src.dmarket.market_snapshot import stop_market_snapshots
+
+        await stop_market_snapshots()
+
     async def _stop_integrator(self) -> None:
         """Stop Bot Integrator."""
         if not hasattr(self.app, "bot_integrator") or not self.app.bot_integrator:
@@ -323,6 +338,17 @@ class ApplicationLifecycle:
         except Exception as e:
             logger.warning(f"⚠️ Error closing API: {e}")
 
+    async def _close_http_pool(self) -> None:
+        """Close the shared HTTP connection pool."""
+        from src.utils.http_pool import http_pool
+
+        logger.info("Closing HTTP connection pool...")
+        try:
+            await asyncio.wait_for(http_pool.aclose(), timeout=3.0)
+            logger.info("✅ HTTP connection pool closed")
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing HTTP connection pool: {e}")
+
     async def _close_database(self) -> None:
         """Close database connections."""
         if not self.app.database:
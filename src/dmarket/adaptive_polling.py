@@ -47,7 +47,7 @@ Created: January 6, 2026
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import StrEnum
@@ -567,6 +567,16 @@ class DeltaTracker:
 
         return None
 
+    def forget(self, item_ids: Iterable[str]) -> None:
+        """Stop tracking items that are gone (sold or delisted).
+
+        Args:
+            item_ids: Item identifiers to drop
+
+        """
+        for item_id in item_ids:
+            self._snapshots.pop(item_id, None)
+
     def get_snapshot(self, item_id: str) -> dict[str, Any] | None:
         """Get last known snapshot for item."""
         return self._snapshots.get(item_id)
@@ -1,10 +1,26 @@
 """Request caching module for DMarket API.
 
-This module provides caching functionality for API responses.
+This module provides caching functionality for API responses:
+- Module-level helpers used by the modular DMarketAPIClient
+- APIResponseCache: bounded per-client LRU/TTL cache with a byte budget
+  and an optional Redis-backed second tier
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import math
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from src.utils import json_utils as json
+
+
+if TYPE_CHECKING:
+    from src.utils.redis_cache import RedisCache
+
+
+logger = logging.getLogger(__name__)
 
 
 # TTL for cache in seconds
@@ -155,3 +171,384 @@ def clear_cache_for_endpoint(endpoint_path: str) -> None:
     keys_to_delete = [key for key in _api_cache if endpoint_path in key]
     for key in keys_to_delete:
         del _api_cache[key]
+
+
+# ============================================================================
+# Bounded LRU/TTL response cache
+# ============================================================================
+
+# Defaults for APIResponseCache budgets
+DEFAULT_CACHE_MAX_ENTRIES = 2000
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 32 MB
+
+
+@dataclass(slots=True)
+class _ResponseCacheEntry:
+    """Single cached API response."""
+
+    data: dict[str, Any]
+    expires_at: float
+    ttl: float
+    size: int
+    path: str
+
+
+class APIResponseCache:
+    """Bounded in-memory cache for DMarket API responses.
+
+    Entries are kept in LRU order and evicted when either the entry count
+    or the byte budget is exceeded. Expired entries are removed eagerly:
+    since TTLs come from a small fixed set (see CACHE_TTL), entries that
+    share a TTL expire in insertion order, so each TTL bucket is a FIFO
+    queue and purging is amortized O(1) per entry. Entries promoted from
+    Redis join the bucket of their original TTL; they may expire before
+    the entries ahead of them, in which case ``get`` drops them on access
+    and the purge catches up once the head of the bucket expires.
+
+    An optional RedisCache can be attached as a second tier so that bot
+    replicas share warm responses. The second tier is only consulted from
+    the async methods (aget/aset), the sync ones touch memory only.
+
+    Example:
+        cache = APIResponseCache(max_bytes=8 * 1024 * 1024)
+        cache.set(key, data, ttl=30, path="/exchange/v1/market/items")
+        data = cache.get(key)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        name: str = "dmarket_api",
+        redis_cache: "RedisCache | None" = None,
+        redis_prefix: str = "dmarket_api:",
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Approximate memory budget for cached payloads
+            name: Cache name used as Prometheus label
+            redis_cache: Optional Redis-backed second tier
+            redis_prefix: Key prefix for entries stored in Redis
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.name = name
+        self.redis_cache = redis_cache
+        self.redis_prefix = redis_prefix
+
+        # LRU order: oldest first
+        self._entries: OrderedDict[str, _ResponseCacheEntry] = OrderedDict()
+        # TTL -> keys in expiry order
+        self._expiry_queues: dict[float, OrderedDict[str, None]] = {}
+        self._total_bytes = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+
+    def __len__(self) -> int:
+        """Number of entries currently stored (may include not yet purged expired ones)."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Check for a fresh entry without touching LRU order or statistics."""
+        entry = self._entries.get(key)  # type: ignore[call-overload]
+        return entry is not None and time.time() < entry.expires_at
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate size of cached payloads in bytes."""
+        return self._total_bytes
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get fresh entry from memory.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached data or None if missing/expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._record_request(hit=False)
+            return None
+
+        if time.time() >= entry.expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self._track_eviction("ttl")
+            self._record_request(hit=False)
+            return None
+
+        self._entries.move_to_end(key)
+        self._record_request(hit=True)
+        return entry.data
+
+    def set(
+        self,
+        key: str,
+        data: dict[str, Any],
+        ttl: float,
+        size_bytes: int | None = None,
+        path: str = "",
+        expires_at: float | None = None,
+    ) -> None:
+        """Store entry in memory, evicting expired and LRU entries as needed.
+
+        Args:
+            key: Cache key
+            data: Response data
+            ttl: Time to live in seconds (also selects the expiry bucket)
+            size_bytes: Payload size (estimated from JSON if not given)
+            path: API path the response belongs to (used for invalidation)
+            expires_at: Absolute expiry time, if shorter than ``ttl`` from now
+        """
+        if size_bytes is None:
+            size_bytes = self._estimate_size(data)
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._purge_expired()
+
+        if expires_at is None:
+            expires_at = time.time() + ttl
+        self._entries[key] = _ResponseCacheEntry(
+            data=data,
+            expires_at=expires_at,
+            ttl=ttl,
+            size=size_bytes,
+            path=path,
+        )
+        self._expiry_queues.setdefault(ttl, OrderedDict())[key] = None
+        self._total_bytes += size_bytes
+
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+            self._track_eviction("lru")
+
+        self._track_size()
+
+    async def aget(self, key: str) -> dict[str, Any] | None:
+        """Get entry from memory, falling back to the Redis tier.
+
+        Entries found in Redis are promoted to memory with their remaining
+        lifetime, in the expiry bucket of the TTL they were stored with.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached data or None
+        """
+        data = self.get(key)
+        if data is not None or self.redis_cache is None:
+            return data
+
+        try:
+            stored = await self.redis_cache.get(self.redis_prefix + key)
+        except Exception as e:
+            logger.debug(f"Redis tier get failed for {key[:8]}...: {e}")
+            stored = None
+
+        if not isinstance(stored, dict) or "data" not in stored:
+            self.l2_misses += 1
+            self._track_l2_request(hit=False)
+            return None
+
+        expires_at = float(stored.get("expires_at", 0))
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            self.l2_misses += 1
+            self._track_l2_request(hit=False)
+            return None
+
+        # Payloads written before the TTL was stored: use the nearest TTL class
+        ttl = stored.get("ttl") or min(
+            (value for value in CACHE_TTL.values() if value >= remaining),
+            default=math.ceil(remaining),
+        )
+
+        self.l2_hits += 1
+        self._track_l2_request(hit=True)
+        self.set(
+            key,
+            stored["data"],
+            float(ttl),
+            path=stored.get("path", ""),
+            expires_at=expires_at,
+        )
+        return stored["data"]  # type: ignore[no-any-return]
+
+    async def aset(
+        self,
+        key: str,
+        data: dict[str, Any],
+        ttl: float,
+        size_bytes: int | None = None,
+        path: str = "",
+    ) -> None:
+        """Store entry in memory and in the Redis tier (if configured).
+
+        Args:
+            key: Cache key
+            data: Response data
+            ttl: Time to live in seconds
+            size_bytes: Payload size (estimated from JSON if not given)
+            path: API path the response belongs to
+        """
+        self.set(key, data, ttl, size_bytes=size_bytes, path=path)
+        if self.redis_cache is None:
+            return
+
+        try:
+            await self.redis_cache.set(
+                self.redis_prefix + key,
+                {"data": data, "expires_at": time.time() + ttl, "ttl": ttl, "path": path},
+                ttl=max(1, math.ceil(ttl)),
+            )
+        except Exception as e:
+            logger.debug(f"Redis tier set failed for {key[:8]}...: {e}")
+
+    def invalidate(self, endpoint_path: str) -> int:
+        """Remove entries whose path (or key) contains endpoint_path.
+
+        Args:
+            endpoint_path: Endpoint path fragment
+
+        Returns:
+            Number of removed entries
+        """
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if endpoint_path in entry.path or endpoint_path in key
+        ]
+        for key in keys:
+            self._remove(key)
+        self._track_size()
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all in-memory entries."""
+        self._entries.clear()
+        self._expiry_queues.clear()
+        self._total_bytes = 0
+        self._track_size()
+
+    async def aclear(self) -> None:
+        """Remove all entries from memory and from the Redis tier."""
+        self.clear()
+        if self.redis_cache is not None:
+            try:
+                await self.redis_cache.clear(pattern=f"{self.redis_prefix}*")
+            except Exception as e:
+                logger.debug(f"Redis tier clear failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "l2_enabled": self.redis_cache is not None,
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+        }
+
+    def _remove(self, key: str) -> None:
+        """Remove entry and its expiry queue record."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        queue = self._expiry_queues.get(entry.ttl)
+        if queue is not None:
+            queue.pop(key, None)
+            if not queue:
+                del self._expiry_queues[entry.ttl]
+
+    def _purge_expired(self) -> None:
+        """Drop expired entries from the head of every TTL queue."""
+        now = time.time()
+        for ttl in list(self._expiry_queues):
+            queue = self._expiry_queues[ttl]
+            while queue:
+                key = next(iter(queue))
+                if self._entries[key].expires_at > now:
+                    break
+                self._remove(key)
+                self.expirations += 1
+                self._track_eviction("ttl")
+
+    @staticmethod
+    def _estimate_size(data: Any) -> int:
+        """Estimate payload size from its JSON representation."""
+        try:
+            return len(json.dumps(data))
+        except (TypeError, ValueError):
+            return len(str(data))
+
+    def _record_request(self, hit: bool) -> None:
+        """Update hit/miss counters."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        try:
+            from src.utils.prometheus_metrics import track_cache_request
+
+            track_cache_request(self.name, hit)
+        except ImportError:
+            pass  # Prometheus not available
+
+    def _track_l2_request(self, hit: bool) -> None:
+        """Update Prometheus counters for the Redis tier."""
+        try:
+            from src.utils.prometheus_metrics import track_cache_request
+
+            track_cache_request(f"{self.name}_redis", hit)
+        except ImportError:
+            pass  # Prometheus not available
+
+    def _track_eviction(self, reason: str) -> None:
+        """Update Prometheus eviction counter."""
+        try:
+            from src.utils.prometheus_metrics import track_cache_eviction
+
+            track_cache_eviction(self.name, reason)
+        except ImportError:
+            pass  # Prometheus not available
+
+    def _track_size(self) -> None:
+        """Update Prometheus size gauges."""
+        try:
+            from src.utils.prometheus_metrics import set_cache_entries, set_cache_size
+
+            set_cache_size(self.name, self._total_bytes)
+            set_cache_entries(self.name, len(self._entries))
+        except ImportError:
+            pass  # Prometheus not available
@@ -29,6 +29,7 @@ from src.dmarket.api.cache import (
 from src.dmarket.api.endpoints import Endpoints
 from src.utils import json_utils as json
 from src.utils.api_circuit_breaker import call_with_circuit_breaker
+from src.utils.http_pool import http_pool
 from src.utils.rate_limiter import RateLimiter
 from src.utils.sentry_breadcrumbs import add_api_breadcrumb
 
@@ -146,12 +147,10 @@ class DMarketAPIClient:
         await self._close_client()
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
+        """Get or create HTTP client on the shared connection pool."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=self.connection_timeout,
-                limits=self.pool_limits,
-            )
+            http_pool.configure(self.api_url, limits=self.pool_limits)
+            self._client = http_pool.create_client(timeout=self.connection_timeout)
         return self._client
 
     async def _close_client(self) -> None:
@@ -10,6 +10,7 @@ Supports Dependency Injection via IDMarketAPI Protocol interface.
 
 import asyncio
 import logging
+import math
 import os
 import time
 from typing import TYPE_CHECKING, Any
@@ -25,10 +26,11 @@ from src.dmarket.arbitrage import (
 )
 from src.dmarket.dmarket_api import DMarketAPI  # Нужен для создания нового клиента
 from src.dmarket.liquidity_analyzer import LiquidityAnalyzer
+from src.dmarket.market_snapshot import fetch_market_items
 
 # Import from scanner submodules (R-2 refactoring)
 from src.dmarket.scanner import ARBITRAGE_LEVELS, GAME_IDS, ScannerCache, ScannerFilters
-from src.utils.rate_limiter import RateLimiter
+from src.utils.rate_limiter import DMARKET_ENDPOINT_LIMITS, AdaptiveRateLimiter, RateLimiter
 from src.utils.sentry_breadcrumbs import add_trading_breadcrumb
 
 
@@ -71,6 +73,11 @@ __all__ = [
 # Создаем ограничитель скорости запросов
 rate_limiter = RateLimiter(is_authorized=True)
 
+# Максимум названий в одном запросе aggregated-prices (ограничение API)
+AGGREGATED_PRICES_CHUNK_SIZE = 100
+# Сколько предметов scan_level анализирует одновременно
+ANALYZE_CONCURRENCY = 10
+
 # GAME_IDS and ARBITRAGE_LEVELS are now imported from src.dmarket.scanner
 # (R-2 refactoring: removed duplicate definitions)
 
@@ -1399,67 +1406,195 @@ class ArbitrageScanner:
         items = self._scanner_filters.apply_filters(items, game)
 
         # Используем aggregated-prices для эффективного получения данных о ликвидности
+        # только для предметов, проходящих по цене и прибыли: остальные
+        # отсеются в _analyze_item без данных о ликвидности
         if use_aggregated_api and items:
-            try:
-                # Получаем названия всех предметов
-                titles = [item.get("title") for item in items if item.get("title")]
+            titles = [
+                item["title"]
+                for item in items
+                if item.get("title") and self._is_profit_candidate(item, config)
+            ]
+            liquidity_map = await self._fetch_liquidity_map(game, titles)
+
+            # Обогащаем items данными о ликвидности
+            for item in items:
+                title = item.get("title")
+                if title in liquidity_map:
+                    item["_liquidity"] = liquidity_map[title]
+
+        # Анализируем не больше ANALYZE_CONCURRENCY предметов одновременно:
+        # следующий стартует, как только освобождается слот, поэтому медленный
+        # предмет не задерживает остальные. Результаты собираются по порядку,
+        # после max_results находок оставшиеся задачи отменяются
+        semaphore = asyncio.Semaphore(ANALYZE_CONCURRENCY)
+
+        async def analyze(item: dict[str, Any]) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self._analyze_item(item, config, game, level)
+
+        tasks = [asyncio.create_task(analyze(item)) for item in items]
+        results = []
+        try:
+            for task in tasks:
+                analysis = await task
+                if analysis:
+                    results.append(analysis)
+                    if len(results) >= max_results:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Сохраняем в кеш через ScannerCache (R-2 refactoring)
+        self._save_to_cache(cache_key, results)
+        return results[:max_results]
 
-                # Получаем агрегированные данные одним запросом
-                aggregated = await self.api_client.get_aggregated_prices_bulk(
+    async def _fetch_liquidity_map(
+        self,
+        game: str,
+        titles: list[str],
+    ) -> dict[str, dict[str, Any]]:
+        """Получить данные о ликвидности через aggregated-prices.
+
+        Названия разбиваются на пачки по AGGREGATED_PRICES_CHUNK_SIZE, пачки
+        запрашиваются одновременно, но не больше, чем текущий лимит "market"
+        адаптивного лимитера клиента допускает в секунду. Ошибка одной пачки
+        или строки ответа не влияет на остальные.
+
+        Args:
+            game: Код игры
+            titles: Названия предметов
+
+        Returns:
+            Словарь title -> данные о ликвидности
+        """
+        unique_titles = list(dict.fromkeys(titles))
+        chunks = [
+            unique_titles[i : i + AGGREGATED_PRICES_CHUNK_SIZE]
+            for i in range(0, len(unique_titles), AGGREGATED_PRICES_CHUNK_SIZE)
+        ]
+        if not chunks:
+            return {}
+
+        limiter = getattr(self.api_client, "advanced_rate_limiter", None)
+        market_rate = (
+            limiter.get_rate("market")
+            if isinstance(limiter, AdaptiveRateLimiter)
+            else DMARKET_ENDPOINT_LIMITS["market"]
+        )
+        semaphore = asyncio.Semaphore(max(1, math.ceil(market_rate / 60)))
+
+        async def fetch_chunk(chunk: list[str]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.api_client.get_aggregated_prices_bulk(
                     game=game,
-                    titles=titles[:100],  # Ограничение API
-                    limit=len(titles[:100]),
+                    titles=chunk,
+                    limit=len(chunk),
                 )
 
-                if aggregated and "aggregatedPrices" in aggregated:
-                    # Создаем карту ликвидности: title -> liquidity_data
-                    liquidity_map = {}
-                    for price_data in aggregated["aggregatedPrices"]:
-                        title = price_data["title"]
-                        # API может возвращать строки вместо чисел - приводим к int
-                        try:
-                            offer_count = int(price_data.get("offerCount", 0))
-                            order_count = int(price_data.get("orderCount", 0))
-                        except (ValueError, TypeError):
-                            # Если не удалось преобразовать - используем 0
-                            offer_count = 0
-                            order_count = 0
-
-                        # Рассчитываем простой показатель ликвидности
-                        # Больше офферов и ордеров = выше ликвидность
-                        liquidity_score = min(100, (offer_count + order_count) * 2)
-
-                        liquidity_map[title] = {
-                            "offer_count": offer_count,
-                            "order_count": order_count,
-                            "liquidity_score": liquidity_score,
-                            "is_liquid": offer_count >= 5 and order_count >= 3,
-                        }
-
-                    # Обогащаем items данными о ликвидности
-                    for item in items:
-                        title = item.get("title")
-                        if title in liquidity_map:
-                            item["_liquidity"] = liquidity_map[title]
+        responses = await asyncio.gather(
+            *(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
 
-            except Exception as e:
+        liquidity_map: dict[str, dict[str, Any]] = {}
+        for response in responses:
+            if isinstance(response, BaseException):
                 logger.warning(
-                    f"Ошибка при получении aggregated prices: {e}, "
-                    "продолжаем без данных о ликвидности"
+                    f"Ошибка при получении aggregated prices: {response}, "
+                    "продолжаем без данных о ликвидности для части предметов"
                 )
+                continue
+            if not response or "aggregatedPrices" not in response:
+                continue
 
-        # Анализируем каждый предмет
-        results = []
-        for item in items:
-            analysis = await self._analyze_item(item, config, game, level)
-            if analysis:
-                results.append(analysis)
-                if len(results) >= max_results:
-                    break
+            for price_data in response["aggregatedPrices"]:
+                try:
+                    title = price_data["title"]
+                except (KeyError, TypeError):
+                    logger.debug(f"Пропущена строка aggregated prices без названия: {price_data}")
+                    continue
 
-        # Сохраняем в кеш через ScannerCache (R-2 refactoring)
-        self._save_to_cache(cache_key, results)
-        return results[:max_results]
+                # API может возвращать строки вместо чисел - приводим к int
+                try:
+                    offer_count = int(price_data.get("offerCount", 0))
+                    order_count = int(price_data.get("orderCount", 0))
+                except (ValueError, TypeError):
+                    # Если не удалось преобразовать - используем 0
+                    offer_count = 0
+                    order_count = 0
+
+                # Рассчитываем простой показатель ликвидности
+                # Больше офферов и ордеров = выше ликвидность
+                liquidity_score = min(100, (offer_count + order_count) * 2)
+
+                liquidity_map[title] = {
+                    "offer_count": offer_count,
+                    "order_count": order_count,
+                    "liquidity_score": liquidity_score,
+                    "is_liquid": offer_count >= 5 and order_count >= 3,
+                }
+
+        return liquidity_map
+
+    def _estimate_profit(
+        self,
+        item: dict[str, Any],
+        config: dict[str, Any],
+    ) -> tuple[float, float, float, float] | None:
+        """Оценить прибыль предмета по цене и suggestedPrice.
+
+        Args:
+            item: Данные о предмете
+            config: Конфигурация уровня
+
+        Returns:
+            (цена покупки, цена продажи, прибыль, прибыль в %) или None, если
+            цена вне диапазона уровня или прибыль ниже минимальной
+        """
+        # Convert price to float (API sometimes returns string)
+        price_value = item.get("price", {}).get("USD", 0)
+        price_usd = float(price_value) / 100 if price_value else 0.0
+        price_from, price_to = config["price_range"]
+
+        # Проверяем диапазон цен
+        if not (price_from <= price_usd <= price_to):
+            return None
+
+        # Получаем suggestedPrice или рассчитываем наценку 20%
+        # Convert suggested price to float (API sometimes returns string)
+        suggested_value = item.get("suggestedPrice", {}).get("USD", 0)
+        suggested_price_cents = float(suggested_value) if suggested_value else 0.0
+        if suggested_price_cents > 0:
+            suggested_price = suggested_price_cents / CENTS_TO_USD
+        else:
+            suggested_price = price_usd * 1.2
+
+        # Рассчитываем фактическую прибыль С УЧЁТОМ КОМИССИИ DMarket (7%)
+        # При продаже DMarket забирает 7% от цены продажи
+        commission_rate = 0.07  # 7% комиссия DMarket
+        net_sell_price = suggested_price * (1 - commission_rate)
+        profit_usd = net_sell_price - price_usd
+        profit_percent = (profit_usd / price_usd * 100) if price_usd > 0 else 0
+
+        # Проверяем минимальный процент прибыли
+        # Используем глобальный оверрайд если задан, иначе из конфига уровня
+        min_profit_percent = (
+            self.min_profit_percent
+            if self.min_profit_percent is not None
+            else config["min_profit_percent"]
+        )
+
+        if profit_percent < min_profit_percent:
+            return None
+        return price_usd, suggested_price, profit_usd, profit_percent
+
+    def _is_profit_candidate(self, item: dict[str, Any], config: dict[str, Any]) -> bool:
+        """Проходит ли предмет по цене и прибыли (некорректные данные - нет)."""
+        try:
+            return self._estimate_profit(item, config) is not None
+        except (AttributeError, TypeError, ValueError):
+            return False
 
     async def _analyze_item(
         self,
@@ -1481,41 +1616,10 @@ class ArbitrageScanner:
 
         """
         try:
-            # Convert price to float (API sometimes returns string)
-            price_value = item.get("price", {}).get("USD", 0)
-            price_usd = float(price_value) / 100 if price_value else 0.0
-            price_from, price_to = config["price_range"]
-
-            # Проверяем диапазон цен
-            if not (price_from <= price_usd <= price_to):
-                return None
-
-            # Получаем suggestedPrice или рассчитываем наценку 20%
-            # Convert suggested price to float (API sometimes returns string)
-            suggested_value = item.get("suggestedPrice", {}).get("USD", 0)
-            suggested_price_cents = float(suggested_value) if suggested_value else 0.0
-            if suggested_price_cents > 0:
-                suggested_price = suggested_price_cents / CENTS_TO_USD
-            else:
-                suggested_price = price_usd * 1.2
-
-            # Рассчитываем фактическую прибыль С УЧЁТОМ КОМИССИИ DMarket (7%)
-            # При продаже DMarket забирает 7% от цены продажи
-            commission_rate = 0.07  # 7% комиссия DMarket
-            net_sell_price = suggested_price * (1 - commission_rate)
-            profit_usd = net_sell_price - price_usd
-            profit_percent = (profit_usd / price_usd * 100) if price_usd > 0 else 0
-
-            # Проверяем минимальный процент прибыли
-            # Используем глобальный оверрайд если задан, иначе из конфига уровня
-            min_profit_percent = (
-                self.min_profit_percent
-                if self.min_profit_percent is not None
-                else config["min_profit_percent"]
-            )
-
-            if profit_percent < min_profit_percent:
+            estimate = self._estimate_profit(item, config)
+            if estimate is None:
                 return None
+            price_usd, suggested_price, profit_usd, profit_percent = estimate
 
             # Проверяем данные ликвидности из aggregated API (если есть)
             liquidity_data = {}
@@ -1904,7 +2008,7 @@ class ArbitrageScanner:
         """
         try:
             api = await self.get_api_client()
-            items = await api.get_market_items(game=game, limit=100)
+            items = await fetch_market_items(api, game=game, limit=100)
 
             objects = items.get("objects", [])
             total_items = len(objects)
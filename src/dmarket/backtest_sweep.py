@@ -0,0 +1,396 @@
+"""Parallel parameter-sweep runner for DMarket backtests.
+
+Spreads ``(strategy, params, item_subset)`` jobs across a process pool:
+
+- Price history is converted once into a ``PriceMatrix`` and written to a
+  temporary ``.npy`` file that every worker memory-maps read-only, so the
+  data is not pickled into each worker
+- Jobs with the same item subset are sent as one chunk and run as a
+  single ``VectorizedBacktester`` batch inside the worker
+- Results are merged into a ranked list / summary table
+
+Usage:
+    ```python
+    from src.dmarket.backtest_sweep import ParameterSweepRunner, build_sweep_jobs
+
+    jobs = build_sweep_jobs(
+        SimpleArbitrageStrategy,
+        {"buy_threshold_percent": [3.0, 5.0], "max_loss_percent": [3.0, 5.0]},
+    )
+    runner = ParameterSweepRunner.from_backtester(backtester, max_workers=4)
+    ranked = await runner.run(jobs)
+    print(format_ranking_table(ranked))
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.dmarket.backtester import BacktestResults, TradingStrategy
+from src.dmarket.vectorized_backtester import PriceMatrix, VectorizedBacktester
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from datetime import datetime
+    from multiprocessing.context import BaseContext
+
+    from src.dmarket.backtester import Backtester, HistoricalDataSet
+
+
+logger = logging.getLogger(__name__)
+
+# BacktestResults fields that are not numeric metrics
+_NON_METRIC_FIELDS = frozenset({
+    "strategy_name",
+    "start_date",
+    "end_date",
+    "trades",
+    "equity_curve",
+})
+
+# Metrics where a lower value ranks higher
+_LOWER_IS_BETTER = frozenset({"max_drawdown", "losing_trades"})
+
+
+@dataclass
+class SweepJob:
+    """A single backtest of a parameter sweep.
+
+    Attributes:
+        job_id: Job identifier (position in the sweep)
+        strategy: Built-in strategy with the parameters to test
+        item_ids: Items to trade (None = all items)
+        params: Swept parameter values (for reporting)
+    """
+
+    job_id: int
+    strategy: TradingStrategy
+    item_ids: tuple[str, ...] | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SweepResult:
+    """Backtest result of a sweep job.
+
+    Attributes:
+        job: The job that produced the result
+        results: Backtest results
+        rank: Position in the ranking (1 = best)
+    """
+
+    job: SweepJob
+    results: BacktestResults
+    rank: int = 0
+
+
+@dataclass
+class _WorkerState:
+    """Data attached by each pool worker in its initializer."""
+
+    matrix: PriceMatrix
+    initial_balance: float
+    fee_percent: float
+    engines: dict[tuple[str, ...] | None, VectorizedBacktester] = field(default_factory=dict)
+
+
+_worker_state: _WorkerState | None = None
+
+
+def _init_worker(
+    prices_path: str,
+    item_ids: list[str],
+    item_names: list[str],
+    timestamps: list[datetime],
+    initial_balance: float,
+    fee_percent: float,
+) -> None:
+    """Pool initializer: memory-map the shared price matrix."""
+    global _worker_state
+    matrix = PriceMatrix(
+        item_ids=item_ids,
+        item_names=item_names,
+        timestamps=timestamps,
+        prices=np.load(prices_path, mmap_mode="r"),
+    )
+    _worker_state = _WorkerState(
+        matrix=matrix,
+        initial_balance=initial_balance,
+        fee_percent=fee_percent,
+    )
+
+
+def _run_chunk(
+    jobs: list[SweepJob],
+    max_positions: int,
+    include_details: bool,
+) -> list[tuple[int, BacktestResults]]:
+    """Run jobs with the same item subset as one vectorized batch.
+
+    Engines are kept per item subset so signal scores are reused by later
+    chunks on the same worker.
+    """
+    state = _worker_state
+    if state is None:
+        raise RuntimeError("Sweep worker is not initialized")
+
+    item_ids = jobs[0].item_ids
+    engine = state.engines.get(item_ids)
+    if engine is None:
+        engine = VectorizedBacktester(
+            initial_balance=state.initial_balance,
+            fee_percent=state.fee_percent,
+        )
+        engine.load_matrix(state.matrix if item_ids is None else state.matrix.select(item_ids))
+        state.engines[item_ids] = engine
+
+    results = engine.run_batch([job.strategy for job in jobs], max_positions=max_positions)
+    if not include_details:
+        # Trades and equity curves dominate the size sent back to the parent
+        for result in results:
+            result.trades = []
+            result.equity_curve = []
+
+    return [(job.job_id, result) for job, result in zip(jobs, results, strict=True)]
+
+
+def build_sweep_jobs(
+    strategy_cls: type[TradingStrategy],
+    param_grid: Mapping[str, Sequence[Any]],
+    item_subsets: Sequence[Sequence[str] | None] | None = None,
+) -> list[SweepJob]:
+    """Create jobs for every parameter combination and item subset.
+
+    Args:
+        strategy_cls: Built-in strategy class
+        param_grid: Constructor argument name -> values to try
+        item_subsets: Item ID lists to test separately (None = all items)
+
+    Returns:
+        Jobs numbered in (subset, ``itertools.product``) order
+    """
+    names = list(param_grid)
+    combinations = list(itertools.product(*(param_grid[name] for name in names)))
+    subsets = list(item_subsets) if item_subsets is not None else [None]
+
+    jobs = []
+    for subset in subsets:
+        item_ids = tuple(subset) if subset is not None else None
+        for values in combinations:
+            params = dict(zip(names, values, strict=True))
+            jobs.append(
+                SweepJob(
+                    job_id=len(jobs),
+                    strategy=strategy_cls(**params),
+                    item_ids=item_ids,
+                    params=params,
+                )
+            )
+    return jobs
+
+
+def rank_results(
+    results: Sequence[SweepResult],
+    rank_by: str = "total_roi",
+) -> list[SweepResult]:
+    """Sort sweep results best first and assign ranks.
+
+    Args:
+        results: Sweep results to rank
+        rank_by: ``BacktestResults`` metric to rank by
+
+    Returns:
+        New list sorted best first
+
+    Raises:
+        ValueError: If the metric is unknown
+    """
+    if rank_by not in BacktestResults.__dataclass_fields__ or rank_by in _NON_METRIC_FIELDS:
+        raise ValueError(f"Unknown ranking metric: {rank_by}")
+
+    sign = 1 if rank_by in _LOWER_IS_BETTER else -1
+    ranked = sorted(
+        results,
+        key=lambda result: (sign * getattr(result.results, rank_by), result.job.job_id),
+    )
+    for rank, result in enumerate(ranked, 1):
+        result.rank = rank
+    return ranked
+
+
+def format_ranking_table(results: Sequence[SweepResult], limit: int = 10) -> str:
+    """Generate a summary table of ranked sweep results.
+
+    Args:
+        results: Ranked sweep results
+        limit: Maximum number of rows
+
+    Returns:
+        Formatted table string
+    """
+    header = (
+        "| # | Strategy | Params | Items | ROI | Win Rate | Sharpe | Max DD | Trades |\n"
+        "|---|----------|--------|-------|-----|----------|--------|--------|--------|\n"
+    )
+    rows = []
+    for result in results[:limit]:
+        r = result.results
+        params = ", ".join(f"{key}={value}" for key, value in result.job.params.items())
+        item_ids = result.job.item_ids
+        items = "all" if item_ids is None else str(len(item_ids))
+        rows.append(
+            f"| {result.rank} | {r.strategy_name[:20]} | {params} | {items} | {r.total_roi:.1f}% | "
+            f"{r.win_rate:.1f}% | {r.sharpe_ratio:.2f} | "
+            f"{r.max_drawdown:.1f}% | {r.total_trades} |"
+        )
+    return header + "\n".join(rows)
+
+
+class ParameterSweepRunner:
+    """Runs sweep jobs across a process pool over shared price data.
+
+    Attributes:
+        matrix: Price matrix shared with the workers
+        initial_balance: Starting balance of every backtest
+        fee_percent: Trading fee percentage
+        max_workers: Number of worker processes
+    """
+
+    def __init__(
+        self,
+        data: Mapping[str, HistoricalDataSet],
+        initial_balance: float = 1000.0,
+        fee_percent: float = 7.0,
+        max_workers: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """Initialize runner.
+
+        Args:
+            data: Historical data by item ID (as in ``Backtester.data``)
+            initial_balance: Starting balance in USD
+            fee_percent: Trading fee percentage
+            max_workers: Worker processes (default: CPU count)
+            mp_context: Multiprocessing context (default: spawn, which is
+                safe to use from a process running the bot's threads)
+        """
+        self.matrix = PriceMatrix.from_datasets(data)
+        self.initial_balance = initial_balance
+        self.fee_percent = fee_percent
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._mp_context = mp_context or multiprocessing.get_context("spawn")
+
+    @classmethod
+    def from_backtester(cls, backtester: Backtester, **kwargs: Any) -> ParameterSweepRunner:
+        """Create runner with the settings and data of a ``Backtester``."""
+        return cls(
+            backtester.data,
+            initial_balance=backtester.initial_balance,
+            fee_percent=backtester.fee_percent,
+            **kwargs,
+        )
+
+    async def run(
+        self,
+        jobs: Sequence[SweepJob],
+        max_positions: int = 5,
+        rank_by: str = "total_roi",
+        include_details: bool = False,
+    ) -> list[SweepResult]:
+        """Run all jobs and return ranked results.
+
+        Args:
+            jobs: Sweep jobs (see ``build_sweep_jobs``)
+            max_positions: Maximum concurrent positions per backtest
+            rank_by: ``BacktestResults`` metric to rank by
+            include_details: Keep trades and equity curves in the results
+
+        Returns:
+            Results sorted best first
+
+        Raises:
+            ValueError: If no data is loaded
+        """
+        if not self.matrix.item_ids:
+            raise ValueError("No historical data loaded")
+        if not jobs:
+            return []
+
+        chunks = self._chunk_jobs(jobs)
+        workers = min(self.max_workers, len(chunks))
+        jobs_by_id = {job.job_id: job for job in jobs}
+        start = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryDirectory(prefix="backtest_sweep_") as tmp_dir:
+            prices_path = str(Path(tmp_dir) / "prices.npy")
+            np.save(prices_path, self.matrix.prices)
+
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(
+                    prices_path,
+                    self.matrix.item_ids,
+                    self.matrix.item_names,
+                    self.matrix.timestamps,
+                    self.initial_balance,
+                    self.fee_percent,
+                ),
+            )
+            try:
+                chunk_results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool, _run_chunk, chunk, max_positions, include_details
+                        )
+                        for chunk in chunks
+                    )
+                )
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        results = [
+            SweepResult(job=jobs_by_id[job_id], results=result)
+            for chunk_result in chunk_results
+            for job_id, result in chunk_result
+        ]
+
+        logger.info(
+            "parameter_sweep_completed",
+            extra={
+                "jobs": len(jobs),
+                "chunks": len(chunks),
+                "workers": workers,
+                "duration_seconds": round(time.perf_counter() - start, 3),
+            },
+        )
+        return rank_results(results, rank_by)
+
+    def _chunk_jobs(self, jobs: Sequence[SweepJob]) -> list[list[SweepJob]]:
+        """Group jobs by item subset and split each group across workers."""
+        groups: dict[tuple[str, ...] | None, list[SweepJob]] = {}
+        for job in jobs:
+            groups.setdefault(job.item_ids, []).append(job)
+
+        chunks = []
+        for group in groups.values():
+            size = math.ceil(len(group) / self.max_workers)
+            chunks.extend(group[i : i + size] for i in range(0, len(group), size))
+        return chunks
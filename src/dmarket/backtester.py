@@ -636,6 +636,8 @@ class Backtester:
         self.trades: list[SimulatedTrade] = []
         self.open_positions: list[SimulatedTrade] = []
         self._trade_counter = 0
+        # Cost basis of open positions, kept incrementally for the equity curve
+        self._open_positions_value = 0.0
 
     def load_data_from_list(
         self,
@@ -764,6 +766,7 @@ class Backtester:
         self.trades = []
         self.open_positions = []
         self._trade_counter = 0
+        self._open_positions_value = 0.0
 
         equity_curve: list[tuple[datetime, float]] = []
         items_to_test = [item_id] if item_id else list(self.data.keys())
@@ -771,45 +774,62 @@ class Backtester:
         if not items_to_test:
             raise ValueError("No historical data loaded")
 
-        # Get time range from data
-        all_timestamps: set[datetime] = set()
-        for item in items_to_test:
-            if item in self.data:
-                all_timestamps.update(price.timestamp for price in self.data[item].prices)
-
-        sorted_timestamps = sorted(all_timestamps)
-        if not sorted_timestamps:
+        # Pre-index price points by timestamp (single pass over the data)
+        timeline = self._build_timeline(items_to_test)
+        if not timeline:
             raise ValueError("No price data available")
 
         # Simulate trading over time
         historical_prices: dict[str, list[PricePoint]] = {item: [] for item in items_to_test}
 
-        for timestamp in sorted_timestamps:
+        for timestamp, prices_at_timestamp in timeline:
             self._process_timestamp(
-                timestamp, items_to_test, historical_prices, strategy, max_positions
+                prices_at_timestamp, historical_prices, strategy, max_positions
             )
 
-            # Record equity
-            total_equity = self.current_balance + sum(
-                pos.price * pos.quantity for pos in self.open_positions
-            )
-            equity_curve.append((timestamp, total_equity))
+            # Record equity (open positions valued at cost, updated incrementally)
+            equity_curve.append((timestamp, self.current_balance + self._open_positions_value))
 
         # Close any remaining open positions at last price
-        self._close_all_positions(sorted_timestamps[-1])
+        self._close_all_positions(timeline[-1][0])
 
         # Calculate results
         return self._calculate_results(
             strategy_name=strategy.name,
-            start_date=sorted_timestamps[0],
-            end_date=sorted_timestamps[-1],
+            start_date=timeline[0][0],
+            end_date=timeline[-1][0],
             equity_curve=equity_curve,
         )
 
-    def _process_timestamp(
+    def _build_timeline(
         self,
-        timestamp: datetime,
         items_to_test: list[str],
+    ) -> list[tuple[datetime, list[tuple[str, PricePoint]]]]:
+        """Group price points of all tested items by timestamp.
+
+        Each price point is visited once, so a run costs O(P log T) for
+        indexing instead of rescanning every item's prices at every step.
+        Within a timestamp, points keep item order and per-item data order.
+
+        Args:
+            items_to_test: List of item IDs to test
+
+        Returns:
+            Sorted list of (timestamp, [(item_id, price point), ...])
+        """
+        prices_by_timestamp: dict[datetime, list[tuple[str, PricePoint]]] = {}
+        for item in items_to_test:
+            dataset = self.data.get(item)
+            if dataset is None:
+                continue
+            for price in dataset.prices:
+                prices_by_timestamp.setdefault(price.timestamp, []).append((item, price))
+
+        return sorted(prices_by_timestamp.items(), key=lambda entry: entry[0])
+
+    def _process_timestamp(
+        self,
+        prices_at_timestamp: list[tuple[str, PricePoint]],
         historical_prices: dict[str, list[PricePoint]],
         strategy: TradingStrategy,
         max_positions: int,
@@ -817,20 +837,16 @@ class Backtester:
         """Process a single timestamp in the backtest simulation.
 
         Args:
-            timestamp: Current timestamp to process
-            items_to_test: List of item IDs to test
+            prices_at_timestamp: (item_id, price point) pairs at current timestamp
             historical_prices: Historical price data accumulator
             strategy: Trading strategy to evaluate
             max_positions: Maximum number of open positions allowed
         """
-        for item in items_to_test:
-            if item not in self.data:
-                continue
-            current_prices = [p for p in self.data[item].prices if p.timestamp == timestamp]
-            for price in current_prices:
-                historical_prices[item].append(price)
-                self._check_and_close_positions(strategy, price)
-                self._evaluate_and_execute_buy(strategy, price, historical_prices[item], max_positions)
+        for item, price in prices_at_timestamp:
+            item_history = historical_prices[item]
+            item_history.append(price)
+            self._check_and_close_positions(strategy, price)
+            self._evaluate_and_execute_buy(strategy, price, item_history, max_positions)
 
     def _evaluate_and_execute_buy(
         self,
@@ -884,6 +900,7 @@ class Backtester:
         self.current_balance -= trade.total_cost
         self.trades.append(trade)
         self.open_positions.append(trade)
+        self._open_positions_value += trade.price * trade.quantity
 
         logger.debug(
             "executed_buy",
@@ -938,6 +955,7 @@ class Backtester:
         self.current_balance += proceeds
 
         self.open_positions.remove(position)
+        self._open_positions_value -= position.price * position.quantity
 
         logger.debug(
             "closed_position",
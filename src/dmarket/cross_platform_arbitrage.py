@@ -17,6 +17,8 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.dmarket.market_snapshot import fetch_market_items
+
 
 if TYPE_CHECKING:
     from src.dmarket.dmarket_api import DMarketAPI
@@ -230,6 +232,7 @@ class CrossPlatformArbitrageScanner:
         game_id: str = CS2_GAME_ID,
         limit: int = 100,
         offset: int = 0,
+        max_items: int | None = None,
     ) -> list[ArbitrageOpportunity]:
         """Scan the full DMarket for arbitrage opportunities.
 
@@ -239,10 +242,16 @@ class CrossPlatformArbitrageScanner:
         3. Compares each item with Waxpeer prices
         4. Returns list of profitable opportunities
 
+        When ``max_items`` is set, the market is streamed page by page via
+        ``DMarketAPI.iter_market_items`` and each page is analyzed as soon as
+        it arrives, so analysis starts after the first page and memory stays
+        flat regardless of the number of items.
+
         Args:
             game_id: Game ID to scan (default: CS2)
             limit: Maximum items per request (max 100)
             offset: Pagination offset
+            max_items: Stream up to this many items with cursor pagination
 
         Returns:
             List of ArbitrageOpportunity objects
@@ -264,6 +273,9 @@ class CrossPlatformArbitrageScanner:
             include_locked=self.config.include_locked,
         )
 
+        if max_items is not None:
+            return await self._scan_market_stream(game_id, balance, limit, max_items)
+
         # Step 2: Fetch items from DMarket (sorted by price, cheapest first)
         items = await self._fetch_market_items(game_id, balance, limit, offset)
 
@@ -288,6 +300,55 @@ class CrossPlatformArbitrageScanner:
 
         return opportunities
 
+    async def _scan_market_stream(
+        self,
+        game_id: str,
+        max_price: Decimal,
+        page_size: int,
+        max_items: int,
+    ) -> list[ArbitrageOpportunity]:
+        """Analyze market pages as they are streamed from DMarket.
+
+        Args:
+            game_id: Game ID
+            max_price: Maximum price in USD (usually user balance)
+            page_size: Items per page
+            max_items: Maximum items to scan
+
+        Returns:
+            Profitable opportunities sorted by ROI
+        """
+        opportunities: list[ArbitrageOpportunity] = []
+        total_items = 0
+
+        try:
+            async for page in self.dmarket.iter_market_items(
+                game=game_id,
+                max_items=max_items,
+                price_from=0.01,  # At least 1 cent
+                price_to=float(max_price) if self.config.use_balance_limit else None,
+                sort="price",
+                page_size=page_size,
+            ):
+                total_items += len(page)
+                for item in page:
+                    opportunity = await self._analyze_item(item)
+                    if opportunity and opportunity.is_profitable:
+                        opportunities.append(opportunity)
+        except Exception as e:
+            logger.exception("failed_to_stream_market_items", error=str(e))
+
+        opportunities.sort(key=lambda x: x.roi_percent, reverse=True)
+
+        logger.info(
+            "scan_completed",
+            total_items=total_items,
+            profitable=len(opportunities),
+            streamed=True,
+        )
+
+        return opportunities
+
     async def _fetch_market_items(
         self,
         game_id: str,
@@ -312,17 +373,16 @@ class CrossPlatformArbitrageScanner:
             List of item dictionaries
         """
         try:
-            # Convert USD to cents for DMarket API
-            price_to_cents = int(max_price * 100)
-
-            result = await self.dmarket.get_market_items(
+            # get_market_items takes USD and converts to cents itself;
+            # "price" sorts cheapest first
+            result = await fetch_market_items(
+                self.dmarket,
                 game=game_id,
                 limit=limit,
                 offset=offset,
-                price_from=1,  # At least 1 cent
-                price_to=price_to_cents,
-                sort="price",  # Sort by price
-                sort_dir="asc",  # Cheapest first
+                price_from=0.01,  # At least 1 cent
+                price_to=max_price,
+                sort="price",
             )
 
             return result.get("objects", []) or result.get("items", [])
@@ -312,6 +312,15 @@ class CursorPaginator:
         key = self._make_cache_key(game, filters)
         return self._saved_cursors.get(key)
 
+    def clear_saved_cursor(
+        self,
+        game: str,
+        filters: dict[str, Any] | None = None,
+    ) -> None:
+        """Удалить сохраненный cursor после завершённого прохода."""
+        key = self._make_cache_key(game, filters)
+        self._saved_cursors.pop(key, None)
+
     def _make_cache_key(
         self,
         game: str,
@@ -44,9 +44,12 @@ API Version: v1.1.0
 """
 
 import asyncio
+from collections.abc import AsyncIterator
+import contextlib
 import hashlib
 import hmac
 import logging
+import os
 import time
 import traceback
 from typing import TYPE_CHECKING, Any
@@ -57,11 +60,27 @@ import nacl.signing
 
 from src.dmarket.api_validator import validate_response
 from src.utils import json_utils as json
+from src.utils.http_pool import http_pool
 
 
 if TYPE_CHECKING:
+    from src.dmarket.cursor_paginator import CursorPaginator
     from src.telegram_bot.notifier import Notifier
+    from src.utils.redis_cache import RedisCache
 
+from src.dmarket.api.cache import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_MAX_ENTRIES,
+    APIResponseCache,
+)
+from src.dmarket.request_scheduler import (
+    TRADE_REQUEST_DEADLINE,
+    RequestExpiredError,
+    RequestScheduler,
+    RequestTicket,
+    get_request_scheduler,
+    resolve_priority,
+)
 from src.dmarket.schemas import (
     AggregatedPricesResponse,
     BuyOffersResponse,
@@ -71,7 +90,13 @@ from src.dmarket.schemas import (
     UserTargetsResponse,
 )
 from src.utils.api_circuit_breaker import call_with_circuit_breaker
-from src.utils.rate_limiter import DMarketRateLimiter, RateLimiter
+from src.utils.rate_limiter import (
+    AdaptiveRateLimiter,
+    RateLimiter,
+    RequestPriority,
+    get_dmarket_rate_limiter,
+)
+from src.utils.redis_rate_limiter import REDIS_AVAILABLE, get_sliding_window_limiter
 from src.utils.sentry_breadcrumbs import add_api_breadcrumb, add_trading_breadcrumb
 
 
@@ -84,9 +109,6 @@ CACHE_TTL = {
     "long": 1800,  # 30 минут для стабильных данных
 }
 
-# Кэш для хранения результатов запросов
-api_cache: dict[str, Any] = {}
-
 # Маппинг коротких имен игр в полные UUID для API v1.1.0
 # FIX: Исправление ошибки 400 Bad Request (Game ID mapping)
 # Note: DMarket API accepts both short names and UUIDs
@@ -190,6 +212,11 @@ class DMarketAPI:  # noqa: PLR0904
         enable_cache: bool = True,
         dry_run: bool = True,
         notifier: "Notifier | None" = None,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        redis_cache: "RedisCache | None" = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        request_scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialize DMarket API client.
 
@@ -204,6 +231,11 @@ class DMarketAPI:  # noqa: PLR0904
             enable_cache: Enable caching of frequent requests
             dry_run: If True, simulates trading operations without real API calls (default: True for safety)
             notifier: Notifier instance for sending alerts on API changes (optional)
+            cache_max_entries: Maximum number of cached responses
+            cache_max_bytes: Memory budget for cached responses in bytes
+            redis_cache: Optional Redis-backed second cache tier shared between replicas
+            rate_limiter: Adaptive rate limiter (default: shared limiter of the API key)
+            request_scheduler: Priority request queue (default: shared queue of the API key)
 
         """
         self.public_key = public_key
@@ -223,6 +255,13 @@ class DMarketAPI:  # noqa: PLR0904
         self.dry_run = dry_run
         self.notifier = notifier  # Store notifier for API validation alerts
 
+        # Per-instance response cache (LRU + TTL, bounded by entries and bytes)
+        self._cache = APIResponseCache(
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            redis_cache=redis_cache,
+        )
+
         # Default retry codes: server errors and too many requests
         self.retry_codes = retry_codes or [429, 500, 502, 503, 504]
 
@@ -245,13 +284,33 @@ class DMarketAPI:  # noqa: PLR0904
 
         self._signing_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hmac_signer")
 
+        # Single-flight: identical in-flight GET requests share one HTTP call
+        self._inflight_requests: dict[
+            str, tuple[asyncio.Task[dict[str, Any]], RequestTicket]
+        ] = {}
+        self._coalesced_requests = 0
+
         # Initialize legacy RateLimiter (kept for backward compatibility)
         self.rate_limiter = RateLimiter(
             is_authorized=bool(public_key and secret_key),
         )
 
-        # Initialize new per-endpoint RateLimiter (Roadmap Task #3)
-        self.advanced_rate_limiter = DMarketRateLimiter()
+        # Adaptive per-endpoint rate limiter (Roadmap Task #3), shared by all
+        # clients of the same API key and learning limits from response headers.
+        # With REDIS_URL set, replicas also share the key budget through Redis
+        redis_url = os.getenv("REDIS_URL")
+        self.advanced_rate_limiter: AdaptiveRateLimiter = rate_limiter or get_dmarket_rate_limiter(
+            public_key,
+            redis_limiter=(
+                get_sliding_window_limiter(redis_url) if redis_url and REDIS_AVAILABLE else None
+            ),
+        )
+
+        # Priority queue in front of the limiter: trades and targets are sent
+        # before scans and background ML requests of the same API key
+        self.request_scheduler: RequestScheduler = (
+            request_scheduler or get_request_scheduler(public_key)
+        )
 
         # Log initialization with trading mode
         mode = "[DRY-RUN]" if dry_run else "[LIVE]"
@@ -301,41 +360,27 @@ class DMarketAPI:  # noqa: PLR0904
         - HTTP/2 support for better performance (if h2 package installed)
         - Connection pooling with keepalive
         - Optimized timeout settings
+
+        The client sends requests through the process-wide pool
+        (src.utils.http_pool), so warm connections and TLS sessions survive
+        closing this client and are shared by every DMarketAPI instance.
         """
         if self._client is None or self._client.is_closed:
-            # Try to enable HTTP/2, fallback to HTTP/1.1 if h2 not installed
-            try:
-                self._client = httpx.AsyncClient(
-                    timeout=self.connection_timeout,
-                    limits=self.pool_limits,
-                    http2=self._http2_enabled,  # Try HTTP/2
-                    follow_redirects=True,
-                    verify=True,  # Always verify SSL
-                )
+            http_pool.configure(self.api_url, limits=self.pool_limits, http2=self._http2_enabled)
+            # Falls back to HTTP/1.1 if h2 package is not installed
+            self._http2_enabled = http_pool.uses_http2(self.api_url)
 
-                logger.debug(
-                    "Created HTTP client: max_connections=%d, max_keepalive=%d, http2=enabled",
-                    self.pool_limits.max_connections,
-                    self.pool_limits.max_keepalive_connections,
-                )
-            except ImportError:
-                # h2 package not installed, fallback to HTTP/1.1
-                logger.info("HTTP/2 not available (h2 package not installed), using HTTP/1.1")
-                self._http2_enabled = False  # Update flag
-
-                self._client = httpx.AsyncClient(
-                    timeout=self.connection_timeout,
-                    limits=self.pool_limits,
-                    http2=False,
-                    follow_redirects=True,
-                    verify=True,
-                )
+            self._client = http_pool.create_client(
+                timeout=self.connection_timeout,
+                follow_redirects=True,
+            )
 
-                logger.debug(
-                    "Created HTTP client: max_connections=%s, max_keepalive=%s, http2=disabled",
-                    getattr(self.pool_limits, "max_connections", "N/A"),
-                    getattr(self.pool_limits, "max_keepalive_connections", "N/A"),
-                )
+            logger.debug(
+                "Created HTTP client on shared pool: max_connections=%s, max_keepalive=%s, http2=%s",
+                getattr(self.pool_limits, "max_connections", "N/A"),
+                getattr(self.pool_limits, "max_keepalive_connections", "N/A"),
+                "enabled" if self._http2_enabled else "disabled",
+            )
 
         return self._client
 
@@ -350,6 +395,10 @@ class DMarketAPI:  # noqa: PLR0904
 
         Roadmap Task #7: Connection Pooling Metrics
 
+        Besides the DMarket pool usage, includes TLS handshakes per minute,
+        connection reuse ratio and the dashboard of all hosts of the shared
+        pool ("shared_pool").
+
         Returns:
             Dictionary with connection pool stats
         """
@@ -369,14 +418,16 @@ class DMarketAPI:  # noqa: PLR0904
             "http2_enabled": self._http2_enabled,
         }
 
-        # Try to get actual connection counts if available
+        # Actual connection counts come from the shared per-host pool
         try:
-            if hasattr(self._client, "_transport"):
-                transport = self._client._transport
-                if hasattr(transport, "_pool"):
-                    pool = transport._pool
-                    stats["active_connections"] = len(getattr(pool, "_requests", []))
-                    stats["idle_connections"] = len(getattr(pool, "_connections", []))
+            host_stats = http_pool.get_host_stats(self.api_url)
+            stats["active_connections"] = host_stats["active_connections"]
+            stats["idle_connections"] = host_stats["idle_connections"]
+            stats["pending_requests"] = host_stats["pending_requests"]
+            stats["utilization_percent"] = host_stats["utilization_percent"]
+            stats["tls_handshakes_per_minute"] = host_stats["tls_handshakes_per_minute"]
+            stats["connection_reuse_ratio"] = host_stats["connection_reuse_ratio"]
+            stats["shared_pool"] = http_pool.get_stats()
         except Exception as e:
             logger.debug(f"Could not get detailed pool stats: {e}")
 
@@ -722,54 +773,45 @@ class DMarketAPI:  # noqa: PLR0904
         if not self.enable_cache:
             return None
 
-        cache_entry = api_cache.get(cache_key)
-        if not cache_entry:
-            return None
-
-        data, expire_time = cache_entry
-        if time.time() < expire_time:
+        data = self._cache.get(cache_key)
+        if data is not None:
             logger.debug(f"Cache hit for key {cache_key[:8]}...")
-            return data  # type: ignore[no-any-return]
-
-        # Удаляем устаревшие данные
-        logger.debug(f"Cache expired for key {cache_key[:8]}...")
-        api_cache.pop(cache_key, None)
-        return None
+        return data
 
     def _save_to_cache(
         self,
         cache_key: str,
         data: dict[str, Any],
         ttl_type: str,
+        path: str = "",
+        size_bytes: int | None = None,
     ) -> None:
         """Сохраняет данные в кэш.
 
+        Вытеснение устаревших и давно не используемых записей выполняется
+        кэшем за O(1) на запись (см. APIResponseCache).
+
         Args:
             cache_key: Ключ кэша
             data: Данные для сохранения
             ttl_type: Тип TTL ('short', 'medium', 'long')
+            path: Путь эндпоинта (для инвалидации по эндпоинту)
+            size_bytes: Размер ответа в байтах (оценивается, если не указан)
 
         """
         if not self.enable_cache:
             return
 
         ttl = CACHE_TTL.get(ttl_type, CACHE_TTL["short"])
-        expire_time = time.time() + ttl
-        api_cache[cache_key] = (data, expire_time)
-
-        # Очистка кэша, если он слишком большой (более 500 записей)
-        if len(api_cache) > 500:
-            # Удаляем 20% старых записей
-            time.time()
-            keys_to_remove = sorted(
-                api_cache.keys(),
-                key=lambda k: api_cache[k][1],  # Сортировка по времени истечения
-            )[:100]
+        self._cache.set(cache_key, data, ttl, size_bytes=size_bytes, path=path)
 
-            for key in keys_to_remove:
-                api_cache.pop(key, None)
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Получить статистику кэша ответов API.
 
-            logger.debug(f"Cache cleanup: removed {len(keys_to_remove)} old entries")
+        Returns:
+            Словарь со статистикой (hits, misses, evictions, размер в байтах)
+        """
+        return self._cache.get_stats()
 
     # ============================================================================
     # Request helper methods (Phase 2 refactoring - extracted from _request)
@@ -969,6 +1011,109 @@ class DMarketAPI:  # noqa: PLR0904
         params: dict[str, Any] | None = None,
         data: dict[str, Any] | None = None,
         force_refresh: bool = False,
+        priority: RequestPriority | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """Выполняет запрос к DMarket API с объединением одинаковых GET-запросов.
+
+        Одновременные идентичные GET-запросы (одинаковый ключ _get_cache_key)
+        разделяют один HTTP-вызов: первый запрос выполняется, остальные
+        ожидают его результат, не расходуя лимит запросов. Общий запрос
+        ждет отправки с наивысшим классом приоритета среди ожидающих.
+
+        Args:
+            method: HTTP метод (GET, POST и т.д.)
+            path: Путь API без базового URL
+            params: Параметры запроса (для GET)
+            data: Данные для запроса (для POST/PUT)
+            force_refresh: Принудительно обновить кэш (если включен)
+            priority: Класс приоритета в очереди запросов (по умолчанию
+                из request_priority или по категории эндпоинта)
+            deadline: Сколько секунд запрос может ждать отправки; устаревший
+                запрос не отправляется (None - без срока)
+
+        Returns:
+            Ответ API в виде словаря
+
+        """
+        priority = resolve_priority(path, priority)
+        if method.upper() != "GET":
+            return await self._execute_request(
+                method, path, params, data, force_refresh, priority, deadline
+            )
+
+        flight_key = self._get_cache_key(method, path, params, data)
+        flight = self._inflight_requests.get(flight_key)
+
+        if flight is not None and not flight[0].done():
+            task, ticket = flight
+            self.request_scheduler.promote(ticket, priority)
+            self._coalesced_requests += 1
+            logger.debug(f"Coalesced in-flight request for {path}")
+            try:
+                from src.utils.prometheus_metrics import track_api_request_coalesced
+
+                track_api_request_coalesced(path)
+            except ImportError:
+                pass  # Prometheus not available
+        else:
+            ticket = self.request_scheduler.new_ticket(priority, deadline)
+            task = asyncio.ensure_future(
+                self._execute_request(
+                    method, path, params, data, force_refresh, priority, deadline, ticket
+                )
+            )
+            self._inflight_requests[flight_key] = (task, ticket)
+            task.add_done_callback(
+                lambda t, key=flight_key: self._finish_inflight_request(key, t)
+            )
+
+        # shield: отмена одного ожидающего не отменяет запрос для остальных
+        return await asyncio.shield(task)
+
+    def _finish_inflight_request(
+        self,
+        flight_key: str,
+        task: "asyncio.Task[dict[str, Any]]",
+    ) -> None:
+        """Удаляет завершенный запрос из реестра выполняющихся запросов."""
+        flight = self._inflight_requests.get(flight_key)
+        if flight is not None and flight[0] is task:
+            del self._inflight_requests[flight_key]
+        # Помечаем исключение как полученное, если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    def get_coalescing_stats(self) -> dict[str, int]:
+        """Получить статистику объединения одинаковых запросов.
+
+        Returns:
+            Словарь с числом объединенных и выполняющихся сейчас запросов
+        """
+        return {
+            "coalesced_requests": self._coalesced_requests,
+            "inflight_requests": len(self._inflight_requests),
+        }
+
+    def get_scheduler_stats(self) -> dict[str, Any]:
+        """Получить статистику очереди запросов по классам приоритета.
+
+        Returns:
+            Словарь с числом выполняемых и ожидающих запросов и временем
+            ожидания (avg, p50, p95, p99, max) каждого класса
+        """
+        return self.request_scheduler.get_stats()
+
+    async def _execute_request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+        force_refresh: bool = False,
+        priority: RequestPriority = RequestPriority.SCAN,
+        deadline: float | None = None,
+        ticket: RequestTicket | None = None,
     ) -> dict[str, Any]:
         """Выполняет запрос к DMarket API с обработкой ошибок, повторными попытками и кешированием.
 
@@ -978,6 +1123,10 @@ class DMarketAPI:  # noqa: PLR0904
             params: Параметры запроса (для GET)
             data: Данные для запроса (для POST/PUT)
             force_refresh: Принудительно обновить кэш (если включен)
+            priority: Класс приоритета в очереди запросов
+            deadline: Сколько секунд запрос может ждать отправки
+            ticket: Билет планировщика, созданный заранее (для объединенных
+                запросов, чей класс может повыситься до отправки)
 
         Returns:
             Ответ API в виде словаря
@@ -1008,9 +1157,11 @@ class DMarketAPI:  # noqa: PLR0904
         if method.upper() == "GET" and self.enable_cache and not force_refresh:
             cache_key = self._get_cache_key(method, path, params, data)
 
-            # Пробуем получить из кэша
+            # Пробуем получить из кэша (память, затем Redis если подключен)
             if is_cacheable:
                 cached_data = self._get_from_cache(cache_key)
+                if cached_data is None and self._cache.redis_cache is not None:
+                    cached_data = await self._cache.aget(cache_key)
                 if cached_data is not None:
                     logger.debug(f"Использую кэшированные данные для {path}")
                     return cached_data
@@ -1029,16 +1180,76 @@ class DMarketAPI:  # noqa: PLR0904
         path_for_signature = self._build_path_for_signature(method, path, params_items)
 
         logger.debug(f"Path for signature: {path_for_signature}")
-        headers = self._generate_signature(method.upper(), path_for_signature, body_json)
 
-        # Use advanced per-endpoint rate limiter (Roadmap Task #3)
-        await self.advanced_rate_limiter.acquire(path)
+        # Очередь по приоритету и адаптивный лимитер (Roadmap Task #3): каждая
+        # попытка ждет слот и токен лимитера по одному билету, так что срок
+        # запроса покрывает и повторы
+        if ticket is None:
+            ticket = self.request_scheduler.new_ticket(priority, deadline)
+        try:
+            return await self._send_with_retries(
+                client=client,
+                method=method,
+                path=path,
+                url=url,
+                params=params,
+                data=data,
+                path_for_signature=path_for_signature,
+                body_json=body_json,
+                ticket=ticket,
+                cache_key=cache_key,
+                is_cacheable=is_cacheable,
+                ttl_type=ttl_type,
+            )
+        except RequestExpiredError as e:
+            logger.warning(f"Устаревший запрос {method} {path} не отправлен: {e}")
+            return {
+                "error": True,
+                "message": str(e),
+                "code": "REQUEST_EXPIRED",
+            }
 
-        # Keep legacy rate limiter for backward compatibility
-        await self.rate_limiter.wait_if_needed(
-            "market" if "market" in path else "account",
-        )
+    async def _send_with_retries(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        path: str,
+        url: str,
+        params: Any,
+        data: dict[str, Any],
+        path_for_signature: str,
+        body_json: str,
+        ticket: RequestTicket,
+        cache_key: str,
+        is_cacheable: bool,
+        ttl_type: str,
+    ) -> dict[str, Any]:
+        """Отправляет запрос с повторами и сохраняет ответ в кэш.
+
+        Каждая попытка заново ждет слот планировщика и токен лимитера и
+        подписывается после ожидания; пауза перед повтором слот не занимает.
 
+        Args:
+            client: HTTP клиент
+            method: HTTP метод
+            path: Путь API без базового URL
+            url: Полный URL запроса
+            params: Отсортированные параметры запроса
+            data: Данные для запроса
+            path_for_signature: Путь с query string для подписи
+            body_json: Тело запроса для подписи
+            ticket: Билет планировщика (класс и срок запроса)
+            cache_key: Ключ кэша ("" - не кэшировать)
+            is_cacheable: Можно ли кэшировать ответ
+            ttl_type: Тип TTL кэша
+
+        Returns:
+            Ответ API или словарь с описанием ошибки
+
+        Raises:
+            RequestExpiredError: Если попытка не дождалась отправки до срока
+
+        """
         # Переменные для повторных попыток
         retries = 0
         last_error = None
@@ -1053,22 +1264,38 @@ class DMarketAPI:  # noqa: PLR0904
                     endpoint=path,
                     method=method.upper(),
                     retry_attempt=retries,
-                    has_cache=cache_key and self._get_from_cache(cache_key) is not None,
+                    has_cache=bool(cache_key) and cache_key in self._cache,
                 )
 
-                # Выполняем запрос (Phase 2 - extracted to helper method)
-                response = await self._execute_single_http_request(
-                    client=client,
-                    method=method,
-                    url=url,
-                    params=params,  # type: ignore[arg-type]
-                    data=data,
-                    headers=headers,
-                )
+                async with self.request_scheduler.slot(
+                    ticket=ticket,
+                    wait_for=lambda granted: self.advanced_rate_limiter.acquire(
+                        path, priority=granted.priority
+                    ),
+                ):
+                    # Подписываем после ожидания, чтобы метка времени подписи была свежей
+                    headers = self._generate_signature(
+                        method.upper(), path_for_signature, body_json
+                    )
+                    # Выполняем запрос (Phase 2 - extracted to helper method)
+                    response = await self._execute_single_http_request(
+                        client=client,
+                        method=method,
+                        url=url,
+                        params=params,
+                        data=data,
+                        headers=headers,
+                    )
 
                 # Проверяем статус ответа
                 response.raise_for_status()
 
+                # Лимиты из заголовков ответа и аддитивное увеличение скорости (AIMD)
+                self.advanced_rate_limiter.update_from_headers(
+                    getattr(response, "headers", None), path
+                )
+                self.advanced_rate_limiter.record_success(path)
+
                 # Рассчитываем время ответа
                 response_time_ms = (time.time() - start_time) * 1000
 
@@ -1084,8 +1311,21 @@ class DMarketAPI:  # noqa: PLR0904
                 result = self._parse_json_response(response, path)
 
                 # Сохраняем в кэш если нужно
-                if method.upper() == "GET" and self.enable_cache and is_cacheable:
-                    self._save_to_cache(cache_key, result, ttl_type)
+                if method.upper() == "GET" and self.enable_cache and is_cacheable and cache_key:
+                    content = getattr(response, "content", None)
+                    size_bytes = len(content) if isinstance(content, bytes) else None
+                    if self._cache.redis_cache is not None:
+                        await self._cache.aset(
+                            cache_key,
+                            result,
+                            CACHE_TTL.get(ttl_type, CACHE_TTL["short"]),
+                            size_bytes=size_bytes,
+                            path=path,
+                        )
+                    else:
+                        self._save_to_cache(
+                            cache_key, result, ttl_type, path=path, size_bytes=size_bytes
+                        )
 
                 return result  # type: ignore[no-any-return]
 
@@ -1129,10 +1369,6 @@ class DMarketAPI:  # noqa: PLR0904
                 if status_code in self.retry_codes:
                     retries += 1
 
-                    # Record 429 error in advanced rate limiter (Roadmap Task #3)
-                    if status_code == 429:
-                        self.advanced_rate_limiter.record_429_error(path)
-
                     # Calculate retry delay (Phase 2 - extracted to helper method)
                     retry_delay = self._calculate_retry_delay(
                         status_code=status_code,
@@ -1141,6 +1377,14 @@ class DMarketAPI:  # noqa: PLR0904
                         response=e.response,
                     )
 
+                    # Record 429 in adaptive rate limiter: halves the endpoint rate
+                    # and pauses all requests of the category (Roadmap Task #3)
+                    if status_code == 429:
+                        self.advanced_rate_limiter.update_from_headers(
+                            getattr(e.response, "headers", None), path
+                        )
+                        self.advanced_rate_limiter.record_429_error(path, retry_after=retry_delay)
+
                     if status_code == 429:
                         logger.warning(
                             f"⚠️  Rate limit превышен для {path}. "
@@ -1189,6 +1433,9 @@ class DMarketAPI:  # noqa: PLR0904
                 last_error = e
                 break
 
+            except RequestExpiredError:
+                raise
+
             except Exception as e:
                 # Другие ошибки
                 logger.exception(
@@ -1226,7 +1473,7 @@ class DMarketAPI:  # noqa: PLR0904
 
     async def clear_cache(self) -> None:
         """Очищает весь кэш API."""
-        api_cache.clear()
+        await self._cache.aclear()
         logger.info("API cache cleared")
 
     async def clear_cache_for_endpoint(self, endpoint_path: str) -> None:
@@ -1236,17 +1483,10 @@ class DMarketAPI:  # noqa: PLR0904
             endpoint_path: Путь эндпоинта
 
         """
-        keys_to_remove = []
-
-        for key in api_cache:
-            if endpoint_path in key:
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            api_cache.pop(key, None)
+        removed = self._cache.invalidate(endpoint_path)
 
         logger.info(
-            f"Cleared {len(keys_to_remove)} cache entries for endpoint {endpoint_path}",
+            f"Cleared {removed} cache entries for endpoint {endpoint_path}",
         )
 
     # Оставляем для обратной совместимости
@@ -1742,45 +1982,16 @@ class DMarketAPI:  # noqa: PLR0904
 
         if use_cursor:
             # Cursor-based pagination (recommended for large datasets)
-            cursor = None
-
-            while total_fetched < max_items:
-                params = {
-                    "gameId": game,
-                    "limit": limit,
-                    "currency": currency,
-                }
-
-                if price_from is not None:
-                    params["priceFrom"] = str(int(price_from * 100))
-                if price_to is not None:
-                    params["priceTo"] = str(int(price_to * 100))
-                if title:
-                    params["title"] = title
-                if sort:
-                    params["orderBy"] = sort
-                if cursor:
-                    params["cursor"] = cursor
-
-                response = await self._request(
-                    "GET",
-                    self.ENDPOINT_MARKET_ITEMS,
-                    params=params,
-                )
-
-                items = response.get("objects", [])
-                if not items:
-                    break
-
-                all_items.extend(items)
-                total_fetched += len(items)
-
-                # Get next cursor
-                cursor = response.get("cursor") or response.get("nextCursor")
-
-                # No more pages
-                if not cursor:
-                    break
+            async for page in self.iter_market_items(
+                game=game,
+                max_items=max_items,
+                currency=currency,
+                price_from=price_from,
+                price_to=price_to,
+                title=title,
+                sort=sort,
+            ):
+                all_items.extend(page)
 
             return all_items[:max_items]
 
@@ -1812,6 +2023,142 @@ class DMarketAPI:  # noqa: PLR0904
 
         return all_items[:max_items]
 
+    async def iter_market_items(
+        self,
+        game: str = "csgo",
+        max_items: int | None = 1000,
+        currency: str = "USD",
+        price_from: float | None = None,
+        price_to: float | None = None,
+        title: str | None = None,
+        sort: str = "price",
+        page_size: int = 100,
+        prefetch: int = 1,
+        start_cursor: str | None = None,
+        checkpoint: "CursorPaginator | None" = None,
+        resume: bool = False,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream marketplace items page by page using cursor pagination.
+
+        Pages are yielded as soon as they arrive, while the next page is
+        prefetched in the background. At most ``prefetch`` pages are buffered
+        ahead of the consumer (backpressure), so memory use does not depend
+        on ``max_items``.
+
+        When ``checkpoint`` is given, the cursor of the next page is saved via
+        ``CursorPaginator._save_cursor`` after each page has been processed by
+        the consumer, so an interrupted scan can be resumed with ``resume=True``.
+        The saved cursor is cleared once the stream has been consumed to the end.
+
+        Args:
+            game: Game name (csgo, dota2, tf2, rust etc)
+            max_items: Maximum number of items to yield (None = whole market)
+            currency: Price currency (USD, EUR etc)
+            price_from: Minimum price filter
+            price_to: Maximum price filter
+            title: Filter by item title
+            sort: Sort options (price, price_desc, date, popularity)
+            page_size: Items per request (max 100)
+            prefetch: Number of pages fetched ahead of the consumer
+            start_cursor: Cursor to start from
+            checkpoint: Paginator used to store resumable cursor checkpoints
+            resume: Start from the cursor saved in ``checkpoint``
+
+        Yields:
+            Lists of items (one list per API page)
+
+        Example:
+            async for page in api.iter_market_items(game="csgo", max_items=None):
+                analyze(page)
+
+        """
+        params: dict[str, Any] = {
+            "gameId": game,
+            "limit": min(page_size, 100),
+            "currency": currency,
+        }
+        if price_from is not None:
+            params["priceFrom"] = str(int(price_from * 100))
+        if price_to is not None:
+            params["priceTo"] = str(int(price_to * 100))
+        if title:
+            params["title"] = title
+        if sort:
+            params["orderBy"] = sort
+
+        # Фильтры для ключа checkpoint (без служебных параметров)
+        checkpoint_filters = {
+            k: v for k, v in params.items() if k not in {"gameId", "limit", "currency"}
+        }
+        if resume and checkpoint is not None and start_cursor is None:
+            start_cursor = checkpoint.get_saved_cursor(game, checkpoint_filters)
+
+        # Элемент очереди: (items, next_cursor) или None в конце
+        pages: asyncio.Queue[tuple[list[dict[str, Any]], str | None] | None] = asyncio.Queue(
+            maxsize=max(1, prefetch)
+        )
+
+        async def produce() -> None:
+            cursor = start_cursor
+            fetched = 0
+            try:
+                while max_items is None or fetched < max_items:
+                    page_params = dict(params)
+                    if cursor:
+                        page_params["cursor"] = cursor
+
+                    response = await self._request(
+                        "GET",
+                        self.ENDPOINT_MARKET_ITEMS,
+                        params=page_params,
+                    )
+
+                    items = response.get("objects", [])
+                    if not items:
+                        break
+
+                    if max_items is not None:
+                        items = items[: max_items - fetched]
+                    fetched += len(items)
+
+                    cursor = response.get("cursor") or response.get("nextCursor")
+                    await pages.put((items, cursor))
+
+                    if not cursor:
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await pages.put(None)
+                raise
+            await pages.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    break
+
+                items, next_cursor = page
+                yield items
+
+                # Страница обработана потребителем - сохраняем точку возобновления
+                if checkpoint is not None and next_cursor:
+                    checkpoint._save_cursor(game, checkpoint_filters, next_cursor)
+
+            # Пробрасываем ошибку загрузки, если она была
+            await producer
+
+            # Проход завершён - следующий запуск с resume начнёт сначала
+            if checkpoint is not None:
+                checkpoint.clear_saved_cursor(game, checkpoint_filters)
+        finally:
+            if not producer.done():
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
+
     async def buy_item(
         self,
         item_id: str,
@@ -1821,6 +2168,7 @@ class DMarketAPI:  # noqa: PLR0904
         sell_price: float | None = None,
         profit: float | None = None,
         source: str = "manual",
+        deadline: float | None = TRADE_REQUEST_DEADLINE,
     ) -> dict[str, Any]:
         """Покупает предмет с указанным ID и ценой.
 
@@ -1832,6 +2180,8 @@ class DMarketAPI:  # noqa: PLR0904
             sell_price: Ожидаемая цена продажи (для логирования)
             profit: Ожидаемая прибыль (для логирования)
             source: Источник намерения (arbitrage_scanner, manual и т.д.)
+            deadline: Сколько секунд покупка может ждать отправки; по истечении
+                срока цена считается устаревшей и запрос не отправляется
 
         Returns:
             Результат операции покупки
@@ -1921,8 +2271,21 @@ class DMarketAPI:  # noqa: PLR0904
                 "POST",
                 self.ENDPOINT_PURCHASE,
                 data=data,
+                deadline=deadline,
             )
 
+            if result.get("code") == "REQUEST_EXPIRED":
+                # Покупка не отправлена: цена устарела, пока запрос ждал очереди
+                bot_logger.log_trade_result(
+                    operation="buy",
+                    success=False,
+                    item_name=item_name or item_id,
+                    price_usd=price,
+                    error_message=result.get("message"),
+                    dry_run=False,
+                )
+                return result
+
             # Логируем успешный результат
             bot_logger.log_trade_result(
                 operation="buy",
@@ -2507,6 +2870,7 @@ class DMarketAPI:  # noqa: PLR0904
     async def buy_offers(
         self,
         offers: list[dict[str, Any]],
+        deadline: float | None = TRADE_REQUEST_DEADLINE,
     ) -> dict[str, Any]:
         """Купить предложения с маркета согласно DMarket API.
 
@@ -2515,6 +2879,9 @@ class DMarketAPI:  # noqa: PLR0904
         Args:
             offers: Список предложений для покупки
                 Формат: [{"offerId": "...", "price": {"amount": "100", "currency": "USD"}, "type": "dmarket"}]
+            deadline: Сколько секунд покупка может ждать отправки; по истечении
+                срока цены предложений считаются устаревшими и запрос не
+                отправляется (ответ с кодом REQUEST_EXPIRED)
 
         Returns:
             Dict[str, Any]: Результат покупки
@@ -2533,6 +2900,7 @@ class DMarketAPI:  # noqa: PLR0904
             "PATCH",
             "/exchange/v1/offers-buy",
             data=data,
+            deadline=deadline,
         )
 
     async def get_aggregated_prices(
@@ -3017,6 +3385,7 @@ class DMarketAPI:  # noqa: PLR0904
         self,
         game_id: str,
         targets: list[dict[str, Any]],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         """Создать таргеты (buy orders) для предметов.
 
@@ -3025,6 +3394,7 @@ class DMarketAPI:  # noqa: PLR0904
         Args:
             game_id: Идентификатор игры (csgo, dota2, tf2, rust или полный UUID)
             targets: Список таргетов для создания
+            deadline: Сколько секунд запрос может ждать отправки (None - без срока)
 
         Returns:
             Результат создания таргетов
@@ -3049,6 +3419,7 @@ class DMarketAPI:  # noqa: PLR0904
             "POST",
             "/marketplace-api/v1/user-targets/create",
             data=data,
+            deadline=deadline,
         )
 
     @validate_response(
@@ -3093,11 +3464,13 @@ class DMarketAPI:  # noqa: PLR0904
     async def delete_targets(
         self,
         target_ids: list[str],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         """Удалить таргеты.
 
         Args:
             target_ids: Список ID таргетов для удаления
+            deadline: Сколько секунд запрос может ждать отправки (None - без срока)
 
         Returns:
             Результат удаления
@@ -3109,6 +3482,7 @@ class DMarketAPI:  # noqa: PLR0904
             "POST",
             "/marketplace-api/v1/user-targets/delete",
             data=data,
+            deadline=deadline,
         )
 
     async def get_targets_by_title(
@@ -33,6 +33,8 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.dmarket.market_snapshot import fetch_market_items
+
 
 if TYPE_CHECKING:
     from src.dmarket.dmarket_api import DMarketAPI
@@ -459,7 +461,8 @@ class EnhancedPollingEngine:
             # Record request time for rate limiting
             self._request_times.append(datetime.now(UTC))
 
-            response = await self.api.get_market_items(
+            response = await fetch_market_items(
+                self.api,
                 game=game,
                 limit=self.config.batch_size,
             )
@@ -14,6 +14,7 @@ from typing import Any
 
 # DMarket API
 from src.dmarket.dmarket_api import DMarketAPI
+from src.dmarket.market_snapshot import fetch_market_items
 
 
 # Logger
@@ -259,7 +260,8 @@ async def find_price_anomalies(
 
     try:
         # Get market items
-        items_response = await dmarket_api.get_market_items(
+        items_response = await fetch_market_items(
+            dmarket_api,
             game=game,
             limit=200,
             offset=0,
@@ -371,7 +373,8 @@ async def find_trending_items(
         )
 
         # Get current market listings
-        market_items = await dmarket_api.get_market_items(
+        market_items = await fetch_market_items(
+            dmarket_api,
             game=game,
             limit=300,
             price_from=min_price,
@@ -592,7 +595,8 @@ async def find_mispriced_rare_items(
         }
 
         # Get market items with higher limit for rare items search
-        items_response = await dmarket_api.get_market_items(
+        items_response = await fetch_market_items(
+            dmarket_api,
             game=game,
             limit=500,
             offset=0,
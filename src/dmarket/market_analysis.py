@@ -128,52 +128,15 @@ async def analyze_price_changes(
         price_changes = []
 
         for item in current_items.get("items", []):
-            market_hash_name = item.get("title", "")
-            if not market_hash_name:
-                continue
-
-            # Текущая цена
-            current_price = _extract_price_from_item(item)
-            if current_price <= 0:
-                continue
-
-            # Исторические цены для этого предмета
-            if market_hash_name in historical_prices:
-                old_price = historical_prices[market_hash_name]
-
-                # Если есть историческая цена, рассчитываем изменение
-                if old_price > 0:
-                    change_amount = current_price - old_price
-                    change_percent = (change_amount / old_price) * 100
-
-                    # Фильтруем по направлению изменения
-                    if direction == "up" and change_percent <= 0:
-                        continue
-                    if direction == "down" and change_percent >= 0:
-                        continue
-
-                    # Фильтруем по минимальному проценту изменения
-                    if abs(change_percent) < min_change_percent:
-                        continue
-
-                    # Добавляем в результаты
-                    price_changes.append(
-                        {
-                            "market_hash_name": market_hash_name,
-                            "current_price": current_price,
-                            "old_price": old_price,
-                            "change_amount": change_amount,
-                            "change_percent": change_percent,
-                            "direction": "up" if change_percent > 0 else "down",
-                            "game": game,
-                            "sales_volume": item.get("salesVolume", 0),
-                            "image_url": item.get("imageUrl", ""),
-                            "item_url": (
-                                f"https://dmarket.com/ingame-items/{game}/{market_hash_name.lower().replace(' ', '-')}"
-                            ),
-                            "timestamp": int(time.time()),
-                        },
-                    )
+            change = evaluate_price_change(
+                item,
+                historical_prices.get(item.get("title", ""), 0),
+                game=game,
+                min_change_percent=min_change_percent,
+                direction=direction,
+            )
+            if change is not None:
+                price_changes.append(change)
 
         # Сортируем по абсолютному значению процента изменения (по убыванию)
         price_changes.sort(key=lambda x: abs(x["change_percent"]), reverse=True)
@@ -246,37 +209,9 @@ async def find_trending_items(
         trending_items = []
 
         for item in trending_response.get("items", []):
-            sales_volume = item.get("salesVolume", 0)
-
-            # Пропускаем предметы с низким объемом продаж
-            if sales_volume < min_sales:
-                continue
-
-            market_hash_name = item.get("title", "")
-            if not market_hash_name:
-                continue
-
-            # Получаем цену
-            price = _extract_price_from_item(item)
-            if price <= 0:
-                continue
-
-            # Добавляем в результаты
-            trending_items.append(
-                {
-                    "market_hash_name": market_hash_name,
-                    "price": price,
-                    "sales_volume": sales_volume,
-                    "popularity_score": _calculate_popularity_score(item),
-                    "image_url": item.get("imageUrl", ""),
-                    "item_url": (
-                        f"https://dmarket.com/ingame-items/{game}/{market_hash_name.lower().replace(' ', '-')}"
-                    ),
-                    "timestamp": int(time.time()),
-                    "game": game,
-                    "offers_count": item.get("offersCount", 0),
-                },
-            )
+            trending_item = evaluate_trending_item(item, game=game, min_sales=min_sales)
+            if trending_item is not None:
+                trending_items.append(trending_item)
 
         # Сортируем по показателю популярности
         trending_items.sort(key=operator.itemgetter("popularity_score"), reverse=True)
@@ -357,44 +292,14 @@ async def analyze_market_volatility(
 
         for item in current_items.get("items", []):
             market_hash_name = item.get("title", "")
-            if not market_hash_name:
-                continue
-
-            # Текущая цена
-            current_price = _extract_price_from_item(item)
-            if current_price <= 0:
-                continue
-
-            # Получаем исторические цены
-            price_24h = historical_24h.get(market_hash_name, 0)
-            price_7d = historical_7d.get(market_hash_name, 0)
-
-            # Пропускаем, если нет исторических данных
-            if price_24h <= 0 or price_7d <= 0:
-                continue
-
-            # Рассчитываем изменения цен
-            change_24h_percent = ((current_price - price_24h) / price_24h) * 100
-            change_7d_percent = ((current_price - price_7d) / price_7d) * 100
-
-            # Рассчитываем волатильность как разницу между изменениями за разные периоды
-            volatility_score = abs(change_24h_percent - change_7d_percent)
-
-            # Добавляем в результаты
-            volatility_items.append(
-                {
-                    "market_hash_name": market_hash_name,
-                    "current_price": current_price,
-                    "price_24h": price_24h,
-                    "price_7d": price_7d,
-                    "change_24h_percent": change_24h_percent,
-                    "change_7d_percent": change_7d_percent,
-                    "volatility_score": volatility_score,
-                    "game": game,
-                    "image_url": item.get("imageUrl", ""),
-                    "timestamp": int(time.time()),
-                },
+            volatility_item = evaluate_item_volatility(
+                item,
+                historical_24h.get(market_hash_name, 0),
+                historical_7d.get(market_hash_name, 0),
+                game=game,
             )
+            if volatility_item is not None:
+                volatility_items.append(volatility_item)
 
         # Сортируем по волатильности
         volatility_items.sort(key=operator.itemgetter("volatility_score"), reverse=True)
@@ -729,12 +634,25 @@ async def _get_historical_prices(
     if not items_response or "items" not in items_response:
         return {}
 
+    return simulate_historical_prices(items_response.get("items", []))
+
+
+def simulate_historical_prices(items: list[dict[str, Any]]) -> dict[str, float]:
+    """Симулирует исторические цены для переданных предметов.
+
+    Args:
+        items: Предметы рынка в формате DMarket API
+
+    Returns:
+        Словарь {market_hash_name: historical_price}
+
+    """
     # Симулируем исторические цены на основе текущих с небольшими отклонениями
     historical_prices = {}
 
     import random
 
-    for item in items_response.get("items", []):
+    for item in items:
         market_hash_name = item.get("title", "")
         if not market_hash_name:
             continue
@@ -753,6 +671,159 @@ async def _get_historical_prices(
     return historical_prices
 
 
+def _item_url(game: str, market_hash_name: str) -> str:
+    """Возвращает ссылку на предмет на DMarket."""
+    return f"https://dmarket.com/ingame-items/{game}/{market_hash_name.lower().replace(' ', '-')}"
+
+
+def evaluate_price_change(
+    item: dict[str, Any],
+    old_price: float,
+    game: str = "csgo",
+    min_change_percent: float = 0.0,
+    direction: str = "any",
+) -> dict[str, Any] | None:
+    """Рассчитывает изменение цены одного предмета.
+
+    Args:
+        item: Предмет рынка в формате DMarket API
+        old_price: Историческая цена предмета (USD)
+        game: Код игры
+        min_change_percent: Минимальный процент изменения цены для учета
+        direction: Направление изменения цены (up, down, any)
+
+    Returns:
+        Информация об изменении цены или None, если предмет не проходит фильтры
+
+    """
+    market_hash_name = item.get("title", "")
+    if not market_hash_name or old_price <= 0:
+        return None
+
+    current_price = _extract_price_from_item(item)
+    if current_price <= 0:
+        return None
+
+    change_amount = current_price - old_price
+    change_percent = (change_amount / old_price) * 100
+
+    # Фильтруем по направлению изменения
+    if direction == "up" and change_percent <= 0:
+        return None
+    if direction == "down" and change_percent >= 0:
+        return None
+
+    # Фильтруем по минимальному проценту изменения
+    if abs(change_percent) < min_change_percent:
+        return None
+
+    return {
+        "market_hash_name": market_hash_name,
+        "current_price": current_price,
+        "old_price": old_price,
+        "change_amount": change_amount,
+        "change_percent": change_percent,
+        "direction": "up" if change_percent > 0 else "down",
+        "game": game,
+        "sales_volume": item.get("salesVolume", 0),
+        "image_url": item.get("imageUrl", ""),
+        "item_url": _item_url(game, market_hash_name),
+        "timestamp": int(time.time()),
+    }
+
+
+def evaluate_trending_item(
+    item: dict[str, Any],
+    game: str = "csgo",
+    min_sales: int = 5,
+) -> dict[str, Any] | None:
+    """Рассчитывает показатели популярности одного предмета.
+
+    Args:
+        item: Предмет рынка в формате DMarket API
+        game: Код игры
+        min_sales: Минимальное количество продаж для учета
+
+    Returns:
+        Информация о трендовом предмете или None, если предмет не проходит фильтры
+
+    """
+    sales_volume = item.get("salesVolume", 0)
+
+    # Пропускаем предметы с низким объемом продаж
+    if sales_volume < min_sales:
+        return None
+
+    market_hash_name = item.get("title", "")
+    if not market_hash_name:
+        return None
+
+    price = _extract_price_from_item(item)
+    if price <= 0:
+        return None
+
+    return {
+        "market_hash_name": market_hash_name,
+        "price": price,
+        "sales_volume": sales_volume,
+        "popularity_score": _calculate_popularity_score(item),
+        "image_url": item.get("imageUrl", ""),
+        "item_url": _item_url(game, market_hash_name),
+        "timestamp": int(time.time()),
+        "game": game,
+        "offers_count": item.get("offersCount", 0),
+    }
+
+
+def evaluate_item_volatility(
+    item: dict[str, Any],
+    price_24h: float,
+    price_7d: float,
+    game: str = "csgo",
+) -> dict[str, Any] | None:
+    """Рассчитывает волатильность цены одного предмета.
+
+    Args:
+        item: Предмет рынка в формате DMarket API
+        price_24h: Цена предмета 24 часа назад (USD)
+        price_7d: Цена предмета 7 дней назад (USD)
+        game: Код игры
+
+    Returns:
+        Информация о волатильности или None, если нет исторических данных
+
+    """
+    market_hash_name = item.get("title", "")
+    if not market_hash_name:
+        return None
+
+    current_price = _extract_price_from_item(item)
+    if current_price <= 0:
+        return None
+
+    # Пропускаем, если нет исторических данных
+    if price_24h <= 0 or price_7d <= 0:
+        return None
+
+    # Рассчитываем изменения цен
+    change_24h_percent = ((current_price - price_24h) / price_24h) * 100
+    change_7d_percent = ((current_price - price_7d) / price_7d) * 100
+
+    return {
+        "market_hash_name": market_hash_name,
+        "current_price": current_price,
+        "price_24h": price_24h,
+        "price_7d": price_7d,
+        "change_24h_percent": change_24h_percent,
+        "change_7d_percent": change_7d_percent,
+        # Волатильность как разница между изменениями за разные периоды
+        "volatility_score": abs(change_24h_percent - change_7d_percent),
+        "game": game,
+        "image_url": item.get("imageUrl", ""),
+        "timestamp": int(time.time()),
+    }
+
+
 def _extract_price_from_item(item: dict[str, Any]) -> float:
     """Извлекает цену из объекта предмета.
 
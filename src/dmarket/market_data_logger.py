@@ -29,9 +29,12 @@ from pathlib import Path
 import time
 from typing import TYPE_CHECKING, Any
 
+from src.utils.market_data_ingestor import market_items_to_rows
+
 
 if TYPE_CHECKING:
     from src.dmarket.dmarket_api import DMarketAPI
+    from src.utils.market_data_ingestor import MarketDataIngestor
 
 logger = logging.getLogger(__name__)
 
@@ -95,15 +98,19 @@ class MarketDataLogger:
         self,
         api: "DMarketAPI",
         config: MarketDataLoggerConfig | None = None,
+        ingestor: "MarketDataIngestor | None" = None,
     ) -> None:
         """Initialize the Market Data Logger.
 
         Args:
             api: DMarket API client
             config: Logger configuration (uses defaults if not provided)
+            ingestor: Optional buffered writer that also stores the logged
+                items in the market_data table
         """
         self.api = api
         self.config = config or MarketDataLoggerConfig()
+        self.ingestor = ingestor
 
         # Statistics
         self.stats = {
@@ -163,6 +170,8 @@ class MarketDataLogger:
                 if items:
                     self._write_items_to_csv(items, game_id)
                     items_logged += len(items)
+                    if self.ingestor is not None:
+                        await self.ingestor.put_many(market_items_to_rows(items, game_id))
 
             self.stats["total_items_logged"] += items_logged
             self.stats["scans_completed"] += 1
@@ -0,0 +1,696 @@
+"""Общий снимок рынка DMarket для нескольких потребителей.
+
+Вместо того чтобы каждая проверка самостоятельно запрашивала предметы рынка,
+потребители берут снимок из ``MarketSnapshotStore``:
+
+- снимок запрашивается не чаще одного раза за ``ttl`` секунд
+- одновременные запросы снимка ждут одну и ту же загрузку
+- для каждого предмета хранится отпечаток (цена, продажи, предложения),
+  по которому потребитель определяет предметы, изменившиеся с его
+  последней обработки
+
+Сканеры (ArbitrageScanner, IntramarketArbitrage, SmartMarketFinder,
+TrendingItemsFinder, CrossPlatformArbitrageScanner, EnhancedPollingEngine)
+раньше листали ``/exchange/v1/market/items`` каждый сам по себе для одной и
+той же игры и ценового диапазона. ``MarketSnapshotService`` обновляет рынок
+игры в фоне и хранит его в колоночной таблице ``MarketTable``, отсортированной
+по цене и проиндексированной по названию. Сканеры получают предметы через
+``fetch_market_items``: запрос, на который таблица может ответить, не
+расходует лимит API; остальные (другая сортировка, treeFilters, курсор,
+устаревший снимок, таблица еще не загружена) уходят в API как раньше.
+
+Фоновое обновление расходует не больше ``SNAPSHOT_BUDGET_SHARE`` бюджета
+категории "market" ключа API: период обновления выводится из числа страниц
+и лимита, а запросы страниц идут с классом BACKGROUND.
+"""
+
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+import contextlib
+from dataclasses import dataclass, field
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from src.dmarket.adaptive_polling import DeltaTracker
+from src.dmarket.request_scheduler import request_priority
+from src.utils.rate_limiter import DMARKET_ENDPOINT_LIMITS, AdaptiveRateLimiter, RequestPriority
+
+
+if TYPE_CHECKING:
+    from src.dmarket.dmarket_api import DMarketAPI
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_TTL = 300.0  # 5 минут
+DEFAULT_SNAPSHOT_LIMIT = 200
+
+DEFAULT_TABLE_MAX_ITEMS = 2000  # 20 страниц по 100 предметов на обновление
+MARKET_PAGE_SIZE = 100  # Максимум DMarket API на страницу
+# Доля лимита "market" ключа API, которую расходуют все таблицы вместе
+SNAPSHOT_BUDGET_SHARE = 0.25
+MIN_REFRESH_INTERVAL = 30.0  # Не обновлять таблицу чаще (секунды)
+
+# Аргументы get_market_items, которые таблица умеет обслужить
+SNAPSHOT_QUERY_ARGS = frozenset({
+    "limit",
+    "offset",
+    "price_from",
+    "price_to",
+    "title",
+    "sort",
+    "currency",
+})
+
+ItemFingerprint = tuple[Any, Any, Any]
+
+
+def item_fingerprint(item: dict[str, Any]) -> ItemFingerprint:
+    """Возвращает отпечаток предмета для обнаружения изменений.
+
+    Args:
+        item: Предмет рынка в формате DMarket API
+
+    Returns:
+        Кортеж (цена, объем продаж, количество предложений)
+
+    """
+    price = item.get("price")
+    if isinstance(price, dict):
+        # {"amount": 1000} или {"USD": "1000"} - словарь нехешируемый
+        price = tuple(sorted(price.items()))
+    return (price, item.get("salesVolume"), item.get("offersCount"))
+
+
+@dataclass(slots=True)
+class MarketSnapshot:
+    """Снимок предметов рынка одной игры."""
+
+    game: str
+    fetched_at: float
+    items: dict[str, dict[str, Any]] = field(default_factory=dict)
+    fingerprints: dict[str, ItemFingerprint] = field(default_factory=dict)
+
+    @classmethod
+    def from_items(
+        cls,
+        game: str,
+        items: list[dict[str, Any]],
+        fetched_at: float | None = None,
+    ) -> "MarketSnapshot":
+        """Создает снимок из списка предметов, индексируя их по названию."""
+        snapshot = cls(game=game, fetched_at=time.time() if fetched_at is None else fetched_at)
+        for item in items:
+            title = item.get("title")
+            if not title:
+                continue
+            snapshot.items[title] = item
+            snapshot.fingerprints[title] = item_fingerprint(item)
+        return snapshot
+
+    def changed_since(
+        self,
+        fingerprints: dict[str, ItemFingerprint],
+    ) -> tuple[list[str], list[str]]:
+        """Сравнивает снимок с ранее обработанными отпечатками.
+
+        Args:
+            fingerprints: Отпечатки предметов, обработанных потребителем ранее
+
+        Returns:
+            Кортеж (новые или изменившиеся предметы, исчезнувшие предметы)
+
+        """
+        changed = [
+            title
+            for title, fingerprint in self.fingerprints.items()
+            if fingerprints.get(title) != fingerprint
+        ]
+        removed = [title for title in fingerprints if title not in self.items]
+        return changed, removed
+
+
+class MarketSnapshotStore:
+    """Загружает и раздает общий снимок рынка."""
+
+    def __init__(
+        self,
+        dmarket_api: "DMarketAPI",
+        game: str = "csgo",
+        min_price: float = 1.0,
+        max_price: float = 500.0,
+        limit: int = DEFAULT_SNAPSHOT_LIMIT,
+        ttl: float = DEFAULT_SNAPSHOT_TTL,
+    ) -> None:
+        """Инициализация хранилища.
+
+        Args:
+            dmarket_api: Клиент DMarket API
+            game: Код игры
+            min_price: Минимальная цена предметов снимка (USD)
+            max_price: Максимальная цена предметов снимка (USD)
+            limit: Количество предметов в снимке
+            ttl: Время, в течение которого снимок считается свежим (секунды)
+
+        """
+        self.dmarket_api = dmarket_api
+        self.game = game
+        self.min_price = min_price
+        self.max_price = max_price
+        self.limit = limit
+        self.ttl = ttl
+        self.fetch_count = 0
+        self._snapshot: MarketSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def snapshot(self) -> MarketSnapshot | None:
+        """Последний загруженный снимок."""
+        return self._snapshot
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """Проверяет, что последний снимок моложе ttl."""
+        if self._snapshot is None:
+            return False
+        now = time.time() if now is None else now
+        return now - self._snapshot.fetched_at < self.ttl
+
+    async def _fetch_items(self) -> list[dict[str, Any]] | None:
+        """Загружает до limit предметов снимка.
+
+        Если общая таблица рынка покрывает диапазон, предметы берутся из нее,
+        иначе рынок листается по курсору страницами по MARKET_PAGE_SIZE.
+
+        Returns:
+            Предметы или None, если API вернул пустой ответ на одну из страниц
+
+        """
+        query: dict[str, Any] = {"price_from": self.min_price, "price_to": self.max_price}
+        response = query_market_snapshot(self.dmarket_api, self.game, limit=self.limit, **query)
+        if response is not None:
+            return response["objects"]
+
+        items: list[dict[str, Any]] = []
+        cursor = ""
+        while len(items) < self.limit:
+            response = await self.dmarket_api.get_market_items(
+                game=self.game,
+                limit=min(MARKET_PAGE_SIZE, self.limit - len(items)),
+                cursor=cursor,
+                **query,
+            )
+            if not response or ("objects" not in response and "items" not in response):
+                return None
+            page = response.get("objects") or response.get("items") or []
+            items.extend(page)
+            cursor = response.get("cursor") or ""
+            if not page or not cursor:
+                break
+        return items[: self.limit]
+
+    async def get(self, force: bool = False) -> MarketSnapshot | None:
+        """Возвращает свежий снимок, загружая его при необходимости.
+
+        Args:
+            force: Загрузить снимок, даже если текущий еще свежий
+
+        Returns:
+            Снимок рынка или None, если загрузить его не удалось
+
+        """
+        if not force and self.is_fresh():
+            return self._snapshot
+
+        async with self._lock:
+            # Пока ждали блокировку, снимок мог загрузить другой потребитель
+            if not force and self.is_fresh():
+                return self._snapshot
+
+            try:
+                items = await self._fetch_items()
+            except Exception as e:
+                logger.exception(f"Ошибка загрузки снимка рынка {self.game}: {e}")
+                return None
+
+            if items is None:
+                logger.warning(f"Пустой ответ при загрузке снимка рынка {self.game}")
+                return None
+
+            self._snapshot = MarketSnapshot.from_items(self.game, items)
+            self.fetch_count += 1
+            logger.debug(
+                f"Загружен снимок рынка {self.game}: {len(self._snapshot.items)} предметов",
+            )
+            return self._snapshot
+
+
+def item_price_cents(item: dict[str, Any]) -> int | None:
+    """Цена предмета в центах USD или None, если цены нет."""
+    price = item.get("price")
+    if isinstance(price, dict):
+        price = price.get("USD", price.get("amount"))
+    try:
+        return int(float(price))
+    except (TypeError, ValueError):
+        return None
+
+
+class MarketTable:
+    """Колоночная таблица предметов рынка, отсортированная по цене.
+
+    Колонки (цена в центах, название, предмет) хранятся отдельными
+    списками; выборка по ценовому диапазону - бинарный поиск по колонке цен,
+    предложения одного названия - по индексу названий.
+    """
+
+    __slots__ = ("_by_title", "covered_to", "fetched_at", "game", "items", "prices", "titles")
+
+    def __init__(
+        self,
+        game: str,
+        items: Iterable[dict[str, Any]],
+        fetched_at: float | None = None,
+        complete: bool = True,
+    ) -> None:
+        """Создает таблицу из предметов рынка.
+
+        Args:
+            game: Код игры
+            items: Предметы в формате DMarket API
+            fetched_at: Время загрузки (time.time())
+            complete: Загружен ли весь ценовой диапазон; если нет, таблица
+                достоверна только до цены последнего предмета
+
+        """
+        rows = []
+        for item in items:
+            price = item_price_cents(item)
+            if price is not None:
+                rows.append((price, item.get("title") or "", item))
+        rows.sort(key=lambda row: row[0])
+
+        self.game = game
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.prices = [row[0] for row in rows]
+        self.titles = [row[1] for row in rows]
+        self.items = [row[2] for row in rows]
+        self.covered_to: float = math.inf if complete or not rows else self.prices[-1]
+        self._by_title: dict[str, list[int]] = {}
+        for index, title in enumerate(self.titles):
+            self._by_title.setdefault(title, []).append(index)
+
+    def __len__(self) -> int:
+        """Количество предметов в таблице."""
+        return len(self.items)
+
+    def offers(self, title: str) -> list[dict[str, Any]]:
+        """Предложения предмета с точным названием, от дешевых к дорогим."""
+        return [self.items[index] for index in self._by_title.get(title, ())]
+
+    def select(
+        self,
+        price_from: float | None = None,
+        price_to: float | None = None,
+        title: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        sort: str = "price",
+    ) -> list[dict[str, Any]] | None:
+        """Выборка предметов, как ее вернул бы /exchange/v1/market/items.
+
+        Args:
+            price_from: Минимальная цена (USD)
+            price_to: Максимальная цена (USD)
+            title: Подстрока названия (без учета регистра)
+            limit: Количество предметов
+            offset: Смещение
+            sort: "price" (по возрастанию) или "price_desc"
+
+        Returns:
+            Предметы или None, если таблица не может ответить на запрос
+            (другая сортировка или диапазон за пределами загруженного)
+
+        """
+        if sort not in {"price", "price_desc", ""}:
+            return None
+
+        low = 0 if price_from is None else int(price_from * 100)
+        high = math.inf if price_to is None else int(price_to * 100)
+        start = bisect_left(self.prices, low)
+        end = len(self.prices) if high == math.inf else bisect_right(self.prices, high)
+        range_covered = self.covered_to == math.inf or high < self.covered_to
+        needed = offset + limit
+        needle = title.lower() if title else None
+
+        if sort == "price_desc":
+            # Самые дорогие предметы диапазона должны быть загружены
+            if not range_covered:
+                return None
+            indices: Iterable[int] = range(end - 1, start - 1, -1)
+        else:
+            indices = range(start, end)
+
+        selected: list[dict[str, Any]] = []
+        for index in indices:
+            if needle is None or needle in self.titles[index].lower():
+                selected.append(self.items[index])
+                if len(selected) >= needed:
+                    break
+
+        # По возрастанию цены первые needed предметов достоверны и в неполной таблице
+        if len(selected) < needed and not range_covered:
+            return None
+        return [dict(item) for item in selected[offset:needed]]
+
+
+class MarketSnapshotService:
+    """Фоновое обновление рынка одной игры в колоночную таблицу."""
+
+    def __init__(
+        self,
+        dmarket_api: "DMarketAPI",
+        game: str = "csgo",
+        min_price: float = 0.0,
+        max_price: float | None = None,
+        max_items: int = DEFAULT_TABLE_MAX_ITEMS,
+        refresh_interval: float | None = None,
+        max_age: float | None = None,
+        budget_share: float = SNAPSHOT_BUDGET_SHARE,
+    ) -> None:
+        """Инициализация сервиса.
+
+        Args:
+            dmarket_api: Клиент DMarket API
+            game: Код игры
+            min_price: Нижняя граница цены загружаемых предметов (USD)
+            max_price: Верхняя граница цены (USD, None - без границы)
+            max_items: Сколько самых дешевых предметов диапазона загружать
+            refresh_interval: Период фонового обновления (секунды); если
+                задан, max_items урезается до страниц, которые бюджет
+                позволяет загрузить за период, иначе период выводится из
+                max_items и бюджета
+            max_age: Возраст, после которого таблица не используется
+                (по умолчанию два периода обновления)
+            budget_share: Доля лимита "market" ключа API на этот сервис
+
+        """
+        self.dmarket_api = dmarket_api
+        self.game = game
+        self.min_price = min_price
+        self.max_price = max_price
+        self.budget_share = budget_share
+
+        # Страниц в минуту, которые сервис может себе позволить
+        pages_per_minute = self.pages_per_minute()
+        if refresh_interval is None:
+            pages = math.ceil(max_items / MARKET_PAGE_SIZE)
+            refresh_interval = max(MIN_REFRESH_INTERVAL, pages * 60.0 / pages_per_minute)
+        else:
+            pages = max(1, int(pages_per_minute * refresh_interval / 60.0))
+            max_items = min(max_items, pages * MARKET_PAGE_SIZE)
+        self.max_items = max_items
+        self.refresh_interval = refresh_interval
+        self.max_age = 2 * refresh_interval if max_age is None else max_age
+        self.delta_tracker = DeltaTracker(max_history=max_items)
+        self.last_changed: set[str] = set()
+        self.refresh_count = 0
+        self.api_calls = 0
+        self.served_queries = 0
+        self._table: MarketTable | None = None
+        self._item_ids: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def table(self) -> MarketTable | None:
+        """Последняя загруженная таблица."""
+        return self._table
+
+    def pages_per_minute(self) -> float:
+        """Запросов страниц в минуту, приходящихся на сервис из лимита "market"."""
+        limiter = getattr(self.dmarket_api, "advanced_rate_limiter", None)
+        if isinstance(limiter, AdaptiveRateLimiter):
+            rate = limiter.get_rate("market")
+        else:
+            rate = DMARKET_ENDPOINT_LIMITS["market"]
+        return max(rate * self.budget_share, 1e-3)
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        """Проверяет, что таблица загружена не раньше max_age секунд назад."""
+        if self._table is None:
+            return False
+        now = time.time() if now is None else now
+        return now - self._table.fetched_at < self.max_age
+
+    async def _fetch_items(self) -> tuple[list[dict[str, Any]], bool]:
+        """Загружает предметы диапазона постранично, от дешевых к дорогим.
+
+        Returns:
+            Кортеж (предметы, загружен ли весь диапазон)
+
+        """
+        items: list[dict[str, Any]] = []
+        cursor = ""
+        while len(items) < self.max_items:
+            # Сделки, таргеты и запросы пользователей идут раньше обновления таблицы
+            with request_priority(RequestPriority.BACKGROUND):
+                response = await self.dmarket_api.get_market_items(
+                    game=self.game,
+                    limit=min(MARKET_PAGE_SIZE, self.max_items - len(items)),
+                    price_from=self.min_price or None,
+                    price_to=self.max_price,
+                    sort="price",
+                    cursor=cursor,
+                )
+            self.api_calls += 1
+            if not response or response.get("error"):
+                raise RuntimeError(f"Market page request failed: {response}")
+            page = response.get("objects") or response.get("items") or []
+            items.extend(page)
+            cursor = response.get("cursor") or ""
+            if not page or not cursor:
+                return items, True
+        return items, False
+
+    async def refresh(self) -> MarketTable | None:
+        """Загружает рынок и перестраивает таблицу, если он изменился.
+
+        Returns:
+            Актуальная таблица или None, если загрузить рынок не удалось
+
+        """
+        async with self._lock:
+            try:
+                items, complete = await self._fetch_items()
+            except Exception as e:
+                logger.warning(f"Ошибка обновления таблицы рынка {self.game}: {e}")
+                return None
+
+            changed: set[str] = set()
+            item_ids: set[str] = set()
+            for item in items:
+                item_id = item.get("itemId") or f"{item.get('title')}:{item_price_cents(item)}"
+                item_ids.add(item_id)
+                delta = self.delta_tracker.update(
+                    item_id,
+                    {"price": item_price_cents(item), "suggestedPrice": item.get("suggestedPrice")},
+                )
+                if delta is not None:
+                    changed.add(item.get("title") or "")
+            removed = self._item_ids - item_ids
+            # Проданные и снятые предметы больше не отслеживаются
+            self.delta_tracker.forget(removed)
+
+            now = time.time()
+            if self._table is not None and not changed and not removed:
+                # Рынок не изменился: продлеваем таблицу без перестройки
+                self._table.fetched_at = now
+            else:
+                self._table = MarketTable(self.game, items, fetched_at=now, complete=complete)
+            self._item_ids = item_ids
+            self.last_changed = changed
+            self.refresh_count += 1
+            logger.debug(
+                f"Таблица рынка {self.game}: {len(self._table)} предметов, "
+                f"изменилось {len(changed)}, исчезло {len(removed)}",
+            )
+            return self._table
+
+    def query(self, **kwargs: Any) -> list[dict[str, Any]] | None:
+        """Выборка из свежей таблицы (аргументы MarketTable.select).
+
+        Returns:
+            Предметы или None, если таблица устарела или не покрывает запрос
+
+        """
+        if not self.is_fresh():
+            return None
+        price_from = kwargs.get("price_from")
+        if self.min_price and (price_from is None or price_from < self.min_price):
+            return None
+        price_to = kwargs.get("price_to")
+        if self.max_price is not None and (price_to is None or price_to > self.max_price):
+            return None
+        items = self._table.select(**kwargs)  # type: ignore[union-attr]
+        if items is not None:
+            self.served_queries += 1
+        return items
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self) -> None:
+        """Запускает фоновое обновление таблицы, не дожидаясь первой загрузки.
+
+        Пока таблица не загружена, fetch_market_items листает API как раньше.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновое обновление."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Статистика сервиса."""
+        table = self._table
+        return {
+            "game": self.game,
+            "items": len(table) if table else 0,
+            "complete": table is not None and table.covered_to == math.inf,
+            "age_seconds": round(time.time() - table.fetched_at, 1) if table else None,
+            "fresh": self.is_fresh(),
+            "refresh_count": self.refresh_count,
+            "api_calls": self.api_calls,
+            "served_queries": self.served_queries,
+            "last_changed": len(self.last_changed),
+        }
+
+
+# Сервисы по ключу API и игре
+_services: dict[tuple[Any, str], MarketSnapshotService] = {}
+
+
+def _service_key(dmarket_api: "DMarketAPI", game: str) -> tuple[Any, str]:
+    from src.dmarket.dmarket_api import GAME_MAP
+
+    return getattr(dmarket_api, "public_key", ""), GAME_MAP.get(game.lower(), game)
+
+
+def get_market_snapshot_service(
+    dmarket_api: "DMarketAPI",
+    game: str = "csgo",
+    **kwargs: Any,
+) -> MarketSnapshotService:
+    """Получить (или создать) сервис таблицы рынка игры.
+
+    Args:
+        dmarket_api: Клиент DMarket API
+        game: Код игры
+        **kwargs: Параметры MarketSnapshotService для нового сервиса
+
+    Returns:
+        Сервис, общий для всех клиентов с тем же ключом API
+
+    """
+    key = _service_key(dmarket_api, game)
+    service = _services.get(key)
+    if service is None:
+        service = _services[key] = MarketSnapshotService(dmarket_api, game, **kwargs)
+    return service
+
+
+async def start_market_snapshots(
+    dmarket_api: "DMarketAPI",
+    games: Iterable[str],
+    **kwargs: Any,
+) -> list[MarketSnapshotService]:
+    """Запустить фоновое обновление таблиц рынка для игр.
+
+    Первые загрузки идут в фоне, запуск приложения их не ждет. Доля лимита
+    SNAPSHOT_BUDGET_SHARE делится между играми поровну.
+
+    Args:
+        dmarket_api: Клиент DMarket API
+        games: Коды игр
+        **kwargs: Параметры MarketSnapshotService
+
+    Returns:
+        Запущенные сервисы
+
+    """
+    games = list(games)
+    kwargs.setdefault("budget_share", SNAPSHOT_BUDGET_SHARE / max(1, len(games)))
+    services = [get_market_snapshot_service(dmarket_api, game, **kwargs) for game in games]
+    await asyncio.gather(*(service.start() for service in services))
+    return services
+
+
+async def stop_market_snapshots() -> None:
+    """Остановить и удалить все сервисы таблиц рынка."""
+    services = list(_services.values())
+    _services.clear()
+    for service in services:
+        await service.stop()
+
+
+def query_market_snapshot(
+    dmarket_api: "DMarketAPI",
+    game: str = "csgo",
+    **kwargs: Any,
+) -> dict[str, Any] | None:
+    """Ответ /exchange/v1/market/items из таблицы рынка, если она может его дать.
+
+    Args:
+        dmarket_api: Клиент DMarket API
+        game: Код игры
+        **kwargs: Аргументы get_market_items
+
+    Returns:
+        Ответ в формате API ({"objects": [...]}) или None
+
+    """
+    if not kwargs.keys() <= SNAPSHOT_QUERY_ARGS:
+        return None
+    if kwargs.pop("currency", "USD") != "USD":
+        return None
+    service = _services.get(_service_key(dmarket_api, game))
+    if service is None:
+        return None
+    items = service.query(**kwargs)
+    if items is None:
+        return None
+    return {"objects": items, "cursor": ""}
+
+
+async def fetch_market_items(
+    dmarket_api: "DMarketAPI",
+    game: str = "csgo",
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Предметы рынка из общей таблицы или, если она не покрывает запрос, из API.
+
+    Args:
+        dmarket_api: Клиент DMarket API
+        game: Код игры
+        **kwargs: Аргументы DMarketAPI.get_market_items
+
+    Returns:
+        Ответ в формате /exchange/v1/market/items
+
+    """
+    response = query_market_snapshot(dmarket_api, game, **kwargs)
+    if response is not None:
+        return response
+    return await dmarket_api.get_market_items(game=game, **kwargs)
@@ -0,0 +1,276 @@
+"""Компактное хранилище истории цен для RealtimePriceWatcher.
+
+История каждого предмета хранится в строке преаллоцированных NumPy-массивов
+(timestamp и цена, float64) вместо списка кортежей:
+
+- добавление точки - O(1) (амортизированно: при заполнении строки последние
+  ``capacity`` точек сдвигаются в начало, запас строки - четверть capacity)
+- чтение окна по времени возвращает срезы-представления без копирования
+- общий объем памяти ограничен ``memory_budget``; при его исчерпании
+  освобождается история предмета, который дольше всех не обновлялся
+
+Строки выделяются блоками по ``_BLOCK_ROWS``, поэтому рост числа предметов
+не требует копирования уже выделенных массивов. Лимит памяти по умолчанию
+задается переменной окружения ``PRICE_HISTORY_MEMORY_MB``.
+"""
+
+from collections import OrderedDict
+import logging
+import os
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_POINTS = 100
+DEFAULT_MEMORY_BUDGET = 16 * 1024 * 1024  # 16 МБ - около 8 тыс. предметов по 100 точек
+MEMORY_BUDGET_ENV = "PRICE_HISTORY_MEMORY_MB"
+
+_BLOCK_ROWS = 256
+_BYTES_PER_POINT = 16  # timestamp + цена, float64
+
+
+def memory_budget_from_env() -> int:
+    """Получить лимит памяти под историю цен из окружения.
+
+    Returns:
+        ``PRICE_HISTORY_MEMORY_MB`` в байтах или DEFAULT_MEMORY_BUDGET, если
+        переменная не задана или некорректна
+
+    """
+    value = os.getenv(MEMORY_BUDGET_ENV)
+    if not value:
+        return DEFAULT_MEMORY_BUDGET
+    try:
+        megabytes = float(value)
+    except ValueError:
+        megabytes = 0.0
+    if megabytes <= 0:
+        logger.warning(f"Некорректное значение {MEMORY_BUDGET_ENV}={value!r}, лимит по умолчанию")
+        return DEFAULT_MEMORY_BUDGET
+    return int(megabytes * 1024 * 1024)
+
+
+class PriceHistoryBuffer:
+    """Кольцевые буферы истории цен (timestamp, price) для многих предметов."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HISTORY_POINTS,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        """Инициализация хранилища.
+
+        Args:
+            capacity: Максимальное количество точек истории на предмет
+            memory_budget: Максимальный объем памяти под историю всех предметов (байт)
+
+        Raises:
+            ValueError: Если capacity или memory_budget не положительные
+
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if memory_budget < 1:
+            raise ValueError("memory_budget must be positive")
+
+        self._capacity = capacity
+        self.memory_budget = memory_budget
+        self.evicted = 0
+        self._init_storage()
+
+    def _init_storage(self) -> None:
+        """Сбросить хранилище под текущие capacity и memory_budget."""
+        self._width = self._capacity + max(1, self._capacity // 4)
+        self._row_bytes = self._width * _BYTES_PER_POINT
+        self.max_items = max(1, self.memory_budget // self._row_bytes)
+
+        self._timestamps: list[np.ndarray] = []
+        self._prices: list[np.ndarray] = []
+        # Границы данных в строке каждого слота: [start, end)
+        self._start: list[int] = []
+        self._end: list[int] = []
+        # item_id -> слот, от давно не обновлявшихся к недавним
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._free: list[int] = []
+
+    @property
+    def capacity(self) -> int:
+        """Максимальное количество точек истории на предмет."""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int) -> None:
+        """Изменить емкость, сохранив последние точки истории."""
+        if value < 1:
+            raise ValueError("capacity must be positive")
+        if value == self._capacity:
+            return
+
+        saved = [
+            (item_id, *(array.copy() for array in self.window(item_id))) for item_id in self._slots
+        ]
+        self._capacity = value
+        self._init_storage()
+        for item_id, timestamps, prices in saved:
+            for timestamp, price in zip(timestamps[-value:], prices[-value:], strict=True):
+                self.append(item_id, timestamp, price)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Объем выделенной памяти под историю (байт)."""
+        return sum(block.nbytes for block in self._timestamps) + sum(
+            block.nbytes for block in self._prices
+        )
+
+    def __len__(self) -> int:
+        """Количество предметов с историей."""
+        return len(self._slots)
+
+    def __contains__(self, item_id: object) -> bool:
+        """Есть ли история у предмета."""
+        return item_id in self._slots
+
+    def __getitem__(self, item_id: str) -> list[tuple[float, float]]:
+        """История предмета в виде списка [(timestamp, price), ...]."""
+        return self.points(item_id)
+
+    def _row(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        """Строки массивов timestamp и цен слота."""
+        block, row = divmod(slot, _BLOCK_ROWS)
+        return self._timestamps[block][row], self._prices[block][row]
+
+    def _allocate_slot(self) -> int:
+        """Выделить слот под новый предмет (с вытеснением при нехватке памяти)."""
+        if self._free:
+            return self._free.pop()
+
+        slot = len(self._start)
+        if slot < self.max_items:
+            if slot % _BLOCK_ROWS == 0:
+                rows = min(_BLOCK_ROWS, self.max_items - slot)
+                self._timestamps.append(np.empty((rows, self._width)))
+                self._prices.append(np.empty((rows, self._width)))
+            self._start.append(0)
+            self._end.append(0)
+            return slot
+
+        evicted_id, slot = self._slots.popitem(last=False)
+        self.evicted += 1
+        logger.debug(f"История цен {evicted_id} вытеснена: превышен лимит памяти")
+        return slot
+
+    def append(self, item_id: str, timestamp: float, price: float) -> None:
+        """Добавить точку в историю предмета.
+
+        Args:
+            item_id: ID предмета
+            timestamp: Время (Unix timestamp)
+            price: Цена предмета
+
+        """
+        slot = self._slots.get(item_id)
+        if slot is None:
+            slot = self._allocate_slot()
+            self._slots[item_id] = slot
+            start = end = 0
+        else:
+            self._slots.move_to_end(item_id)
+            start, end = self._start[slot], self._end[slot]
+
+        timestamps, prices = self._row(slot)
+        if end == self._width:
+            # Строка заполнена: переносим последние точки в начало
+            keep = self._capacity - 1
+            timestamps[:keep] = timestamps[end - keep : end]
+            prices[:keep] = prices[end - keep : end]
+            start, end = 0, keep
+
+        timestamps[end] = timestamp
+        prices[end] = price
+        end += 1
+        self._start[slot] = max(start, end - self._capacity)
+        self._end[slot] = end
+
+    def window(
+        self,
+        item_id: str,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Получить историю предмета за период без копирования.
+
+        Args:
+            item_id: ID предмета
+            start_time: Начало периода включительно (None - с первой точки)
+            end_time: Конец периода включительно (None - до последней точки)
+
+        Returns:
+            Массивы (timestamps, prices) только для чтения; пустые, если
+            истории нет. Представления становятся неактуальными после
+            следующих добавлений точек.
+
+        """
+        slot = self._slots.get(item_id)
+        if slot is None:
+            return np.empty(0), np.empty(0)
+
+        row_timestamps, row_prices = self._row(slot)
+        start, end = self._start[slot], self._end[slot]
+        timestamps = row_timestamps[start:end]
+        if start_time is not None:
+            start += int(np.searchsorted(timestamps, start_time, side="left"))
+        if end_time is not None:
+            end = self._start[slot] + int(np.searchsorted(timestamps, end_time, side="right"))
+
+        timestamps = row_timestamps[start:end]
+        prices = row_prices[start:end]
+        timestamps.flags.writeable = False
+        prices.flags.writeable = False
+        return timestamps, prices
+
+    def points(
+        self,
+        item_id: str,
+        limit: int | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> list[tuple[float, float]]:
+        """Получить историю предмета списком [(timestamp, price), ...].
+
+        Args:
+            item_id: ID предмета
+            limit: Только последние limit точек
+            start_time: Начало периода включительно
+            end_time: Конец периода включительно
+
+        Returns:
+            Точки истории от старых к новым
+
+        """
+        timestamps, prices = self.window(item_id, start_time, end_time)
+        if limit:
+            timestamps, prices = timestamps[-limit:], prices[-limit:]
+        return list(zip(timestamps.tolist(), prices.tolist(), strict=True))
+
+    def remove(self, item_id: str) -> None:
+        """Удалить историю предмета и освободить его слот."""
+        slot = self._slots.pop(item_id, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def clear(self) -> None:
+        """Удалить всю историю и освободить память."""
+        self._init_storage()
+
+    def get_stats(self) -> dict[str, int]:
+        """Статистика использования памяти."""
+        return {
+            "items": len(self._slots),
+            "max_items": self.max_items,
+            "capacity": self._capacity,
+            "memory_bytes": self.memory_bytes,
+            "memory_budget": self.memory_budget,
+            "evicted": self.evicted,
+        }
@@ -8,16 +8,28 @@
 
 import asyncio
 from collections import defaultdict
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 import contextlib
 import logging
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 
 from src.dmarket.dmarket_api import DMarketAPI
+from src.dmarket.price_history_buffer import (
+    DEFAULT_HISTORY_POINTS,
+    PriceHistoryBuffer,
+    memory_budget_from_env,
+)
+from src.utils.threshold_index import ABOVE, BELOW, ThresholdIndex
 from src.utils.websocket_client import DMarketWebSocketClient
 
 
+if TYPE_CHECKING:
+    from src.utils.database import DatabaseManager
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,11 +90,17 @@ class PriceAlert:
 class RealtimePriceWatcher:
     """Класс для отслеживания цен в реальном времени."""
 
-    def __init__(self, api_client: DMarketAPI) -> None:
+    def __init__(
+        self,
+        api_client: DMarketAPI,
+        history_memory_budget: int | None = None,
+    ) -> None:
         """Инициализация наблюдателя за ценами.
 
         Args:
             api_client: Экземпляр DMarketAPI для работы с API
+            history_memory_budget: Лимит памяти под историю цен всех предметов
+                (байт); по умолчанию из PRICE_HISTORY_MEMORY_MB (16 МБ)
 
         """
         self.api_client = api_client
@@ -91,13 +109,23 @@ class RealtimePriceWatcher:
         # Словарь для отслеживания цен {item_id: latest_price}
         self.price_cache = {}
 
-        # Исторические данные о ценах {item_id: [(timestamp, price), ...]}
-        self.price_history = defaultdict(list)
-        self.max_history_points = 100  # Максимальное количество сохраняемых точек истории цен
+        # Исторические данные о ценах: кольцевые буферы (timestamp, price) по item_id
+        self.price_history = PriceHistoryBuffer(
+            capacity=DEFAULT_HISTORY_POINTS,
+            memory_budget=(
+                history_memory_budget
+                if history_memory_budget is not None
+                else memory_budget_from_env()
+            ),
+        )
 
         # Словарь для хранения оповещений {item_id: [alert1, alert2, ...]}
         self.price_alerts = defaultdict(list)
 
+        # Несработавшие оповещения в отсортированных по порогу массивах:
+        # тик цены находит сработавшие за O(log n + k)
+        self._alert_index: ThresholdIndex[PriceAlert] = ThresholdIndex(inclusive=True)
+
         # Список обработчиков событий изменения цен {item_id: [handler1, handler2, ...]}
         self.price_change_handlers = defaultdict(list)
 
@@ -120,6 +148,15 @@ class RealtimePriceWatcher:
             300  # Обновление цен каждые 5 минут для отслеживаемых предметов
         )
 
+    @property
+    def max_history_points(self) -> int:
+        """Максимальное количество сохраняемых точек истории цен на предмет."""
+        return self.price_history.capacity
+
+    @max_history_points.setter
+    def max_history_points(self, value: int) -> None:
+        self.price_history.capacity = value
+
     async def start(self) -> bool:
         """Запуск наблюдателя за ценами.
 
@@ -300,12 +337,8 @@ class RealtimePriceWatcher:
             price: Цена предмета
 
         """
-        # Добавляем новую точку с текущим временем
-        self.price_history[item_id].append((time.time(), price))
-
-        # Ограничиваем размер истории
-        if len(self.price_history[item_id]) > self.max_history_points:
-            self.price_history[item_id] = self.price_history[item_id][-self.max_history_points :]
+        # Добавляем новую точку с текущим временем (старые вытесняются буфером)
+        self.price_history.append(item_id, time.time(), price)
 
     async def _periodic_price_updates(self) -> None:
         """Периодическое обновление цен через REST API."""
@@ -437,10 +470,9 @@ class RealtimePriceWatcher:
             current_price: Текущая цена предмета
 
         """
-        alerts = self.price_alerts.get(item_id, [])
-
-        for alert in alerts:
-            # Проверяем условие и не сработало ли оповещение ранее
+        # Сработавшие оповещения покидают индекс до reset_triggered_alerts()
+        for alert in self._alert_index.pop_crossed(item_id, current_price):
+            # Флаг мог быть выставлен снаружи - такое оповещение уже сработало
             if not alert.is_triggered and alert.check_condition(current_price):
                 alert.is_triggered = True
 
@@ -576,6 +608,7 @@ class RealtimePriceWatcher:
 
         """
         self.price_alerts[alert.item_id].append(alert)
+        self._index_alert(alert)
 
         # Добавляем предмет для отслеживания
         self.watch_item(alert.item_id)
@@ -585,6 +618,67 @@ class RealtimePriceWatcher:
             f"({alert.condition} {alert.target_price})",
         )
 
+    def add_price_alerts(self, alerts: Iterable[PriceAlert]) -> int:
+        """Массово добавить оповещения о цене.
+
+        Пороги каждого предмета сортируются один раз, а не при каждой вставке.
+
+        Args:
+            alerts: Оповещения о цене для добавления
+
+        Returns:
+            int: Количество добавленных оповещений
+
+        """
+        entries = []
+        count = 0
+        for alert in alerts:
+            self.price_alerts[alert.item_id].append(alert)
+            self.watched_items.add(alert.item_id)
+            if not alert.is_triggered and alert.condition in {ABOVE, BELOW}:
+                entries.append((alert.item_id, alert.target_price, alert.condition, alert))
+            count += 1
+
+        self._alert_index.add_many(entries)
+        logger.info(f"Добавлено {count} оповещений о цене")
+        return count
+
+    async def load_price_alerts(
+        self,
+        database: "DatabaseManager",
+        batch_size: int = 10000,
+    ) -> int:
+        """Загрузить активные оповещения о цене из базы данных.
+
+        Args:
+            database: Менеджер базы данных
+            batch_size: Количество строк, читаемых за один раз
+
+        Returns:
+            int: Количество загруженных оповещений
+
+        """
+        loaded = 0
+        async for rows in database.iter_active_price_alerts(batch_size=batch_size):
+            loaded += self.add_price_alerts(
+                PriceAlert(
+                    item_id=row["item_id"] or row["market_hash_name"],
+                    market_hash_name=row["market_hash_name"] or row["item_id"],
+                    target_price=float(row["target_price"]),
+                    condition=row["condition"] or BELOW,
+                    game=row["game"] or "csgo",
+                )
+                for row in rows
+                if row["item_id"] or row["market_hash_name"]
+            )
+        return loaded
+
+    def _index_alert(self, alert: PriceAlert) -> None:
+        """Добавить несработавшее оповещение в индекс порогов."""
+        # Оповещения с другими условиями никогда не срабатывают
+        if not alert.is_triggered and alert.condition in {ABOVE, BELOW}:
+            self._alert_index.add(alert.item_id, alert.target_price, alert.condition, alert)
+
     def remove_price_alert(self, alert: PriceAlert) -> None:
         """Удалить оповещение о цене.
 
@@ -595,6 +689,10 @@ class RealtimePriceWatcher:
         if alert.item_id in self.price_alerts:
             if alert in self.price_alerts[alert.item_id]:
                 self.price_alerts[alert.item_id].remove(alert)
+                if alert.condition in {ABOVE, BELOW}:
+                    self._alert_index.remove(
+                        alert.item_id, alert.target_price, alert.condition, alert
+                    )
 
             # Если больше нет оповещений для этого предмета, удаляем ключ
             if not self.price_alerts[alert.item_id]:
@@ -644,21 +742,41 @@ class RealtimePriceWatcher:
         self,
         item_id: str,
         limit: int | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
     ) -> list[tuple[float, float]]:
         """Получить историю цен предмета.
 
         Args:
             item_id: ID предмета
             limit: Ограничение на количество точек истории
+            start_time: Начало периода (Unix timestamp, включительно)
+            end_time: Конец периода (Unix timestamp, включительно)
 
         Returns:
             List[Tuple[float, float]]: Список точек истории цен [(timestamp, price), ...]
 
         """
-        history = self.price_history.get(item_id, [])
-        if limit:
-            return history[-limit:]
-        return history
+        return self.price_history.points(item_id, limit, start_time, end_time)
+
+    def get_price_window(
+        self,
+        item_id: str,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Получить историю цен предмета за период без копирования.
+
+        Args:
+            item_id: ID предмета
+            start_time: Начало периода (Unix timestamp, включительно)
+            end_time: Конец периода (Unix timestamp, включительно)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Массивы (timestamps, prices) только для чтения
+
+        """
+        return self.price_history.window(item_id, start_time, end_time)
 
     def get_all_alerts(self) -> dict[str, list[PriceAlert]]:
         """Получить все активные оповещения.
@@ -694,7 +812,14 @@ class RealtimePriceWatcher:
         for alerts in self.price_alerts.values():
             for alert in alerts:
                 if alert.is_triggered:
+                    # Удаляем на случай, если флаг выставили снаружи и оповещение
+                    # еще в индексе, чтобы не добавить его дважды
+                    if alert.condition in {ABOVE, BELOW}:
+                        self._alert_index.remove(
+                            alert.item_id, alert.target_price, alert.condition, alert
+                        )
                     alert.reset()
+                    self._index_alert(alert)
                     reset_count += 1
         return reset_count
 
@@ -0,0 +1,458 @@
+"""Приоритетный планировщик запросов к DMarket API.
+
+Автопокупка, перебивание таргетов, сканеры, дашборды и сборщики данных
+для ML отправляют запросы через один и тот же ключ API с ограниченной
+частотой. Раньше они конкурировали в порядке FIFO, и покупка могла ждать
+за сотней страниц сканирования.
+
+``RequestScheduler`` стоит перед отправкой запроса в ``DMarketAPI._request``:
+
+- классы приоритета (RequestPriority): сделки > таргеты > запросы
+  пользователя > сканирование > фоновые задачи ML
+- ограниченное число одновременно выполняемых запросов; освободившийся
+  слот получает запрос наивысшего класса, внутри класса - в порядке FIFO
+- крайний срок: запрос, не дождавшийся отправки к сроку, снимается из
+  очереди с RequestExpiredError вместо отправки устаревшего запроса
+- токен лимитера частоты берется только после получения слота, так что
+  ожидающие в очереди запросы низших классов не расходуют бюджет ключа
+- повтор запроса снова встает в очередь с тем же билетом и сроком: пауза
+  перед повтором не занимает слот
+- класс запроса, ожидающего отправки, можно повысить (promote) - например,
+  когда к выполняющемуся GET-запросу присоединяется запрос высшего класса
+- время ожидания в очереди по каждому классу (p50/p95/p99 и максимум)
+  доступно в get_stats() и экспортируется в Prometheus
+
+Класс запроса по умолчанию определяется категорией эндпоинта
+(CATEGORY_PRIORITIES); фоновые задачи задают его для всех своих запросов
+через ``request_priority``.
+
+Example usage:
+    ```python
+    from src.dmarket.request_scheduler import request_priority
+    from src.utils.rate_limiter import RequestPriority
+
+    with request_priority(RequestPriority.BACKGROUND):
+        items = await api.get_market_items(game="csgo", limit=100)
+
+    print(api.get_scheduler_stats()["classes"]["trade"]["p95_wait"])
+    ```
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass
+import heapq
+import itertools
+import logging
+import time
+from typing import Any
+
+from src.utils.rate_limiter import (
+    CATEGORY_PRIORITIES,
+    RequestPriority,
+    get_dmarket_endpoint_category,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 16  # Одновременно выполняемых запросов на ключ API
+DEFAULT_STATS_WINDOW = 1000  # Последних ожиданий для перцентилей
+
+# Крайние сроки запросов, которые устаревают вместе с ценой, по которой
+# принято решение (секунды ожидания отправки)
+TRADE_REQUEST_DEADLINE = 5.0  # Покупка предложений по увиденной цене
+OVERBID_REQUEST_DEADLINE = 10.0  # Перебитие ордера конкурента
+
+# Класс запросов текущей задачи (задается через request_priority)
+_current_priority: ContextVar[RequestPriority | None] = ContextVar(
+    "dmarket_request_priority", default=None
+)
+
+
+class RequestExpiredError(Exception):
+    """Запрос не был отправлен до своего крайнего срока."""
+
+    def __init__(self, priority: RequestPriority, waited: float) -> None:
+        super().__init__(f"{priority.name} request expired after {waited:.2f}s in queue")
+        self.priority = priority
+        self.waited = waited
+
+
+@contextlib.contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Задать класс приоритета для всех запросов внутри блока.
+
+    Действует и на задачи, созданные внутри блока.
+
+    Args:
+        priority: Класс приоритета запросов
+    """
+    token = _current_priority.set(RequestPriority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def resolve_priority(path: str, priority: RequestPriority | None = None) -> RequestPriority:
+    """Определить класс приоритета запроса.
+
+    Args:
+        path: Путь эндпоинта
+        priority: Явно заданный класс
+
+    Returns:
+        Явный класс, иначе класс из request_priority, иначе класс
+        категории эндпоинта
+    """
+    if priority is not None:
+        return RequestPriority(priority)
+    current = _current_priority.get()
+    if current is not None:
+        return current
+    return CATEGORY_PRIORITIES.get(get_dmarket_endpoint_category(path), RequestPriority.SCAN)
+
+
+@dataclass(eq=False)
+class RequestTicket:
+    """Место запроса в очереди планировщика."""
+
+    priority: RequestPriority
+    enqueued_at: float
+    deadline: float | None = None
+    future: "asyncio.Future[None] | None" = None
+    granted_at: float | None = None
+
+    def remaining(self, now: float | None = None) -> float | None:
+        """Секунды до крайнего срока (None - срок не задан)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() if now is None else now))
+
+    def waited(self, now: float | None = None) -> float:
+        """Время от постановки в очередь до получения слота (или до now)."""
+        end = self.granted_at if self.granted_at is not None else now
+        return (time.monotonic() if end is None else end) - self.enqueued_at
+
+
+class _ClassStats:
+    """Счетчики и время ожидания одного класса приоритета."""
+
+    __slots__ = ("cancelled", "expired", "granted", "max_wait", "queued", "total_wait", "waits")
+
+    def __init__(self, window: int) -> None:
+        self.queued = 0
+        self.granted = 0
+        self.expired = 0
+        self.cancelled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits: deque[float] = deque(maxlen=window)
+
+    def record_wait(self, wait: float) -> None:
+        self.granted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.waits.append(wait)
+
+    def as_dict(self) -> dict[str, Any]:
+        waits = sorted(self.waits)
+        last = len(waits) - 1
+        percentiles = {
+            f"{name}_wait": round(waits[round(last * quantile)], 4) if waits else 0.0
+            for name, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+        return {
+            "queued": self.queued,
+            "granted": self.granted,
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+            "avg_wait": round(self.total_wait / self.granted, 4) if self.granted else 0.0,
+            "max_wait": round(self.max_wait, 4),
+            **percentiles,
+        }
+
+
+class RequestScheduler:
+    """Очередь запросов с классами приоритета, крайними сроками и лимитом параллельности."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        stats_window: int = DEFAULT_STATS_WINDOW,
+    ) -> None:
+        """Инициализация планировщика.
+
+        Args:
+            max_concurrency: Максимум одновременно выполняемых запросов
+            stats_window: Сколько последних ожиданий хранить для перцентилей
+
+        Raises:
+            ValueError: Если max_concurrency меньше 1
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._stats_window = stats_window
+        self._active = 0
+        self._queue: list[tuple[int, int, RequestTicket]] = []
+        self._seq = itertools.count()
+        self._stats = {priority: _ClassStats(stats_window) for priority in RequestPriority}
+
+    @property
+    def active(self) -> int:
+        """Количество выполняемых сейчас запросов."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Количество запросов, ожидающих слот."""
+        return sum(stats.queued for stats in self._stats.values())
+
+    def new_ticket(
+        self,
+        priority: RequestPriority = RequestPriority.SCAN,
+        timeout: float | None = None,
+    ) -> RequestTicket:
+        """Создать билет запроса заранее, до ожидания слота.
+
+        Args:
+            priority: Класс приоритета запроса
+            timeout: Сколько секунд запрос может ждать отправки (None - без срока)
+
+        Returns:
+            Билет для slot(ticket=...) и promote()
+        """
+        now = time.monotonic()
+        return RequestTicket(
+            priority=RequestPriority(priority),
+            enqueued_at=now,
+            deadline=None if timeout is None else now + timeout,
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        priority: RequestPriority = RequestPriority.SCAN,
+        timeout: float | None = None,
+        wait_for: Callable[[RequestTicket], Awaitable[Any]] | None = None,
+        ticket: RequestTicket | None = None,
+    ) -> AsyncIterator[RequestTicket]:
+        """Дождаться слота для отправки запроса.
+
+        Args:
+            priority: Класс приоритета запроса
+            timeout: Сколько секунд запрос может ждать отправки (None - без срока)
+            wait_for: Что еще дождаться после получения слота в пределах того же
+                срока (например, токен лимитера частоты); вызывается с билетом,
+                время входит в ожидание класса
+            ticket: Билет из new_ticket (priority и timeout тогда не используются);
+                билет уже отправленного запроса (повтор) снова встает в очередь
+                с прежними классом и сроком
+
+        Yields:
+            Билет запроса
+
+        Raises:
+            RequestExpiredError: Если срок истек до отправки
+        """
+        if ticket is None:
+            ticket = self.new_ticket(priority, timeout)
+        elif ticket.granted_at is not None:
+            if ticket.remaining() == 0.0:
+                raise self._expire(ticket)
+            ticket.enqueued_at = time.monotonic()
+            ticket.granted_at = None
+            ticket.future = None
+
+        await self._acquire(ticket)
+        try:
+            if wait_for is not None:
+                try:
+                    await asyncio.wait_for(wait_for(ticket), ticket.remaining())
+                except TimeoutError:
+                    raise self._expire(ticket) from None
+            self._record_wait(ticket)
+            yield ticket
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    def promote(self, ticket: RequestTicket, priority: RequestPriority) -> None:
+        """Повысить класс запроса, который еще не отправлен.
+
+        Запрос из очереди переходит в очередь нового класса; запрос, уже
+        получивший слот, берет токен лимитера с новым классом. Понижение
+        класса игнорируется.
+
+        Args:
+            ticket: Билет запроса
+            priority: Новый класс приоритета
+        """
+        priority = RequestPriority(priority)
+        if priority >= ticket.priority:
+            return
+        if ticket.future is not None and not ticket.future.done():
+            # Старая запись в куче будет пропущена: билет к тому времени уже обслужен
+            self._stats[ticket.priority].queued -= 1
+            self._stats[priority].queued += 1
+            heapq.heappush(self._queue, (priority, next(self._seq), ticket))
+        ticket.priority = priority
+
+    async def _acquire(self, ticket: RequestTicket) -> None:
+        now = time.monotonic()
+        if self._active < self.max_concurrency and self.queued == 0:
+            self._grant(ticket, now)
+            return
+        if ticket.remaining(now) == 0.0:
+            raise self._expire(ticket)
+
+        loop = asyncio.get_running_loop()
+        ticket.future = loop.create_future()
+        heapq.heappush(self._queue, (ticket.priority, next(self._seq), ticket))
+        self._stats[ticket.priority].queued += 1
+
+        timer = None
+        remaining = ticket.remaining(now)
+        if remaining is not None:
+            timer = loop.call_later(remaining, self._on_deadline, ticket)
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.granted_at is not None:
+                # Слот уже выдан, но задача отменена до продолжения
+                self._active -= 1
+                self._dispatch()
+            elif ticket.future.cancelled():
+                stats = self._stats[ticket.priority]
+                stats.queued -= 1
+                stats.cancelled += 1
+            else:
+                ticket.future.exception()  # Срок истек одновременно с отменой
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    def _grant(self, ticket: RequestTicket, now: float) -> None:
+        ticket.granted_at = now
+        self._active += 1
+
+    def _record_wait(self, ticket: RequestTicket) -> None:
+        """Учесть ожидание слота и лимитера в статистике класса."""
+        wait = time.monotonic() - ticket.enqueued_at
+        self._stats[ticket.priority].record_wait(wait)
+        _track_wait(ticket.priority, wait)
+
+    def _expire(self, ticket: RequestTicket) -> RequestExpiredError:
+        waited = time.monotonic() - ticket.enqueued_at
+        self._stats[ticket.priority].expired += 1
+        _track_expired(ticket.priority)
+        logger.debug(f"Dropped stale {ticket.priority.name} request after {waited:.2f}s")
+        return RequestExpiredError(ticket.priority, waited)
+
+    def _on_deadline(self, ticket: RequestTicket) -> None:
+        if ticket.future is None or ticket.future.done():
+            return
+        self._stats[ticket.priority].queued -= 1
+        ticket.future.set_exception(self._expire(ticket))
+
+    def _dispatch(self) -> None:
+        """Отдать свободные слоты запросам наивысшего класса."""
+        now = time.monotonic()
+        while self._queue and self._active < self.max_concurrency:
+            _, _, ticket = heapq.heappop(self._queue)
+            future = ticket.future
+            if future is None or future.done():
+                continue  # Истек или отменен, уже учтен
+            self._stats[ticket.priority].queued -= 1
+            if ticket.remaining(now) == 0.0:
+                future.set_exception(self._expire(ticket))
+                continue
+            self._grant(ticket, now)
+            future.set_result(None)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Статистика очереди по классам приоритета.
+
+        Returns:
+            Словарь с лимитом параллельности, числом выполняемых и ожидающих
+            запросов и счетчиками ожидания каждого класса под "classes"
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "queued": self.queued,
+            "classes": {
+                priority.name.lower(): stats.as_dict() for priority, stats in self._stats.items()
+            },
+        }
+
+    def reset_stats(self) -> None:
+        """Сбросить счетчики ожидания (запросы в очереди остаются)."""
+        for priority, stats in self._stats.items():
+            fresh = _ClassStats(self._stats_window)
+            fresh.queued = stats.queued
+            self._stats[priority] = fresh
+
+
+def _track_wait(priority: RequestPriority, wait: float) -> None:
+    """Record queue wait time in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_request_queue_wait
+
+        track_request_queue_wait(priority.name.lower(), wait)
+    except ImportError:
+        pass
+
+
+def _track_expired(priority: RequestPriority) -> None:
+    """Record a dropped stale request in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_request_expired
+
+        track_request_expired(priority.name.lower())
+    except ImportError:
+        pass
+
+
+# Планировщики по ключам API: все клиенты одного ключа делят одну очередь
+_shared_schedulers: dict[str, RequestScheduler] = {}
+
+
+def get_request_scheduler(api_key: str = "") -> RequestScheduler:
+    """Получить общий планировщик запросов для ключа API.
+
+    Args:
+        api_key: Публичный ключ DMarket API
+
+    Returns:
+        Планировщик, общий для всех клиентов с этим ключом
+    """
+    scheduler = _shared_schedulers.get(api_key)
+    if scheduler is None:
+        scheduler = _shared_schedulers[api_key] = RequestScheduler()
+    return scheduler
+
+
+def reset_request_schedulers() -> None:
+    """Удалить общие планировщики (для тестов)."""
+    _shared_schedulers.clear()
+
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENCY",
+    "OVERBID_REQUEST_DEADLINE",
+    "TRADE_REQUEST_DEADLINE",
+    "RequestExpiredError",
+    "RequestScheduler",
+    "RequestTicket",
+    "get_request_scheduler",
+    "request_priority",
+    "reset_request_schedulers",
+    "resolve_priority",
+]
@@ -7,7 +7,6 @@
 """
 
 from datetime import datetime
-import json
 import logging
 import operator
 import os
@@ -18,6 +17,7 @@ from typing import Any
 from dotenv import load_dotenv
 
 from src.dmarket.dmarket_api import DMarketAPI
+from src.dmarket.sales_history_store import SalesHistoryStore
 from src.utils.rate_limiter import RateLimiter
 
 
@@ -126,10 +126,10 @@ SALES_HISTORY_TYPES = {
     "last_12_hours": "12h",
 }
 
-# Каталог для кеширования истории продаж
+# Каталог старого JSON-кеша истории продаж (импортируется в SALES_DB_PATH)
 SALES_CACHE_DIR = Path(__file__).parents[2] / "data" / "sales_history"
-# Создаем директорию, если её нет
-SALES_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# База кеша истории продаж
+SALES_DB_PATH = Path(__file__).parents[2] / "data" / "sales_history.db"
 
 # Время жизни кеша (в секундах)
 CACHE_TTL = {
@@ -248,6 +248,54 @@ async def get_item_sales_history(
                 logger.warning(f"Ошибка при закрытии клиента API: {e}")
 
 
+async def get_items_sales_history(
+    item_names: list[str],
+    game: str = "csgo",
+    period: str = "24h",
+    use_cache: bool = True,
+    dmarket_api: DMarketAPI | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Получает историю продаж нескольких предметов.
+
+    Свежие данные из кеша читаются одним запросом, история остальных
+    предметов запрашивается через API.
+
+    Args:
+        item_names: Названия предметов (market hash name)
+        game: Код игры (csgo, dota2, rust, tf2)
+        period: Период истории (1h, 12h, 24h, 7d, 30d)
+        use_cache: Использовать ли кешированные данные
+        dmarket_api: Экземпляр DMarketAPI или None для создания нового
+
+    Returns:
+        Словарь {название предмета: список продаж от новых к старым}
+
+    """
+    if period not in CACHE_TTL:
+        period = "24h"
+
+    result: dict[str, list[dict[str, Any]]] = {}
+    if use_cache:
+        try:
+            result = get_sales_history_store().load_many(
+                item_names, game, period, max_age=CACHE_TTL[period]
+            )
+        except Exception as e:
+            logger.warning(f"Ошибка при загрузке кеша истории продаж: {e}")
+
+    for item_name in item_names:
+        if item_name not in result:
+            result[item_name] = await get_item_sales_history(
+                item_name,
+                game=game,
+                period=period,
+                use_cache=use_cache,
+                dmarket_api=dmarket_api,
+            )
+
+    return result
+
+
 async def detect_price_anomalies(
     item_name: str,
     game: str = "csgo",
@@ -582,32 +630,23 @@ def _calculate_std_dev(numbers: list[float]) -> float:
     return (sum_of_squares / (len(numbers) - 1)) ** 0.5
 
 
-def _get_cache_file_path(item_name: str, game: str, period: str) -> Path:
-    """Возвращает путь к файлу кеша для истории продаж."""
-    # Безопасное имя файла без спецсимволов
-    safe_name = "".join(c if c.isalnum() else "_" for c in item_name)
-    return SALES_CACHE_DIR / f"{game}_{safe_name}_{period}.json"
+_sales_store: SalesHistoryStore | None = None
+
+
+def get_sales_history_store() -> SalesHistoryStore:
+    """Возвращает общее хранилище истории продаж (создается при первом вызове)."""
+    global _sales_store
+    if _sales_store is None:
+        _sales_store = SalesHistoryStore(SALES_DB_PATH, legacy_cache_dir=SALES_CACHE_DIR)
+    return _sales_store
 
 
 def _load_from_cache(item_name: str, game: str, period: str) -> list[dict[str, Any]]:
     """Загружает историю продаж из кеша, если она не устарела."""
-    cache_file = _get_cache_file_path(item_name, game, period)
-
     try:
-        # Проверяем существование файла
-        if not cache_file.exists():
-            return []
-
-        # Проверяем время изменения файла
-        file_age = time.time() - cache_file.stat().st_mtime
-        if file_age > CACHE_TTL.get(period, 3600):
-            # Кеш устарел
-            return []
-
-        # Загружаем данные из файла
-        with open(cache_file, encoding="utf-8") as f:
-            return json.load(f)
-
+        return get_sales_history_store().load(
+            item_name, game, period, max_age=CACHE_TTL.get(period, 3600)
+        )
     except Exception as e:
         logger.warning(f"Ошибка при загрузке кеша истории продаж: {e}")
         return []
@@ -619,17 +658,9 @@ def _save_to_cache(
     period: str,
     data: list[dict[str, Any]],
 ) -> None:
-    """Сохраняет историю продаж в кеш."""
-    cache_file = _get_cache_file_path(item_name, game, period)
-
+    """Сохраняет историю продаж в кеш (дописывает новые продажи)."""
     try:
-        # Создаем директорию, если её нет
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Сохраняем данные в файл
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
+        get_sales_history_store().append(item_name, game, period, data)
     except Exception as e:
         logger.warning(f"Ошибка при сохранении кеша истории продаж: {e}")
 
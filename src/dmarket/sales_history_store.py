@@ -0,0 +1,250 @@
+"""
+Хранилище истории продаж DMarket в одной SQLite базе.
+
+Заменяет кеш из отдельных JSON-файлов на каждую пару (предмет, период):
+- одна таблица продаж с индексом по (game, item_name, period)
+- пакетное чтение истории многих предметов одним запросом
+- обновления только дописывают новые продажи (append-only)
+- старые JSON-файлы кеша импортируются автоматически при первом открытии
+"""
+
+from collections.abc import Iterable, Sequence
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import time
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# SQLite < 3.32 ограничивает запрос 999 параметрами
+_MAX_IN_PARAMS = 900
+
+
+class SalesHistoryStore:
+    """SQLite-хранилище истории продаж предметов."""
+
+    def __init__(self, db_path: str | Path, legacy_cache_dir: str | Path | None = None):
+        """
+        Инициализация хранилища.
+
+        Args:
+            db_path: Путь к файлу базы данных
+            legacy_cache_dir: Каталог старого JSON-кеша для импорта (None - без импорта)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+        if legacy_cache_dir is not None:
+            self.migrate_json_cache(Path(legacy_cache_dir))
+
+    def create_tables(self) -> None:
+        """Создает таблицы и индексы."""
+        with self.conn:
+            # Серии продаж: время последнего обновления (для TTL)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sales_series (
+                    game TEXT NOT NULL,
+                    item_name TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (game, item_name, period)
+                )
+            """)
+
+            # Продажи; timestamp без типа, чтобы сохранить значение API как есть
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS sales (
+                    game TEXT NOT NULL,
+                    item_name TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    timestamp NOT NULL,
+                    price REAL NOT NULL
+                )
+            """)
+
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sales_series
+                ON sales(game, item_name, period, timestamp)
+            """)
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self.conn.close()
+
+    def load(
+        self,
+        item_name: str,
+        game: str,
+        period: str,
+        max_age: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Загружает историю продаж предмета.
+
+        Args:
+            item_name: Название предмета
+            game: Код игры
+            period: Период истории
+            max_age: Максимальный возраст данных в секундах (None - любой)
+
+        Returns:
+            Продажи от новых к старым или пустой список, если данных нет
+            или они устарели
+        """
+        return self.load_many([item_name], game, period, max_age).get(item_name, [])
+
+    def load_many(
+        self,
+        item_names: Iterable[str],
+        game: str,
+        period: str,
+        max_age: float | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Загружает историю продаж нескольких предметов.
+
+        Args:
+            item_names: Названия предметов
+            game: Код игры
+            period: Период истории
+            max_age: Максимальный возраст данных в секундах (None - любой)
+
+        Returns:
+            Словарь {название: продажи от новых к старым} только для
+            предметов со свежими данными
+        """
+        names = list(dict.fromkeys(item_names))
+        min_updated = time.time() - max_age if max_age is not None else float("-inf")
+        result: dict[str, list[dict[str, Any]]] = {}
+
+        for start in range(0, len(names), _MAX_IN_PARAMS):
+            chunk = names[start : start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT s.item_name, s.timestamp, s.price
+                FROM sales_series AS ss
+                JOIN sales AS s
+                  ON s.game = ss.game AND s.item_name = ss.item_name AND s.period = ss.period
+                WHERE ss.game = ? AND ss.period = ? AND ss.updated_at >= ?
+                  AND ss.item_name IN ({placeholders})
+                ORDER BY s.item_name, s.timestamp DESC
+                """,  # noqa: S608
+                (game, period, min_updated, *chunk),
+            )
+            for item_name, timestamp, price in rows:
+                result.setdefault(item_name, []).append({
+                    "price": price,
+                    "timestamp": timestamp,
+                    "market_hash_name": item_name,
+                })
+
+        return result
+
+    def append(
+        self,
+        item_name: str,
+        game: str,
+        period: str,
+        sales: Sequence[dict[str, Any]],
+        updated_at: float | None = None,
+    ) -> int:
+        """
+        Дописывает новые продажи предмета.
+
+        Сохраняются только продажи новее последней сохраненной; продажи
+        старше самой ранней из переданных удаляются (окно периода сдвигается).
+
+        Args:
+            item_name: Название предмета
+            game: Код игры
+            period: Период истории
+            sales: Продажи с ключами price и timestamp
+            updated_at: Время получения данных (по умолчанию - сейчас)
+
+        Returns:
+            Количество добавленных продаж
+        """
+        key = (game, item_name, period)
+        with self.conn:
+            (latest,) = self.conn.execute(
+                "SELECT MAX(timestamp) FROM sales WHERE game = ? AND item_name = ? AND period = ?",
+                key,
+            ).fetchone()
+
+            new_rows = [
+                (*key, sale["timestamp"], sale["price"])
+                for sale in sales
+                if latest is None or sale["timestamp"] > latest
+            ]
+            self.conn.executemany(
+                "INSERT INTO sales (game, item_name, period, timestamp, price)"
+                " VALUES (?, ?, ?, ?, ?)",
+                new_rows,
+            )
+
+            if sales:
+                oldest = min(sale["timestamp"] for sale in sales)
+                self.conn.execute(
+                    "DELETE FROM sales"
+                    " WHERE game = ? AND item_name = ? AND period = ? AND timestamp < ?",
+                    (*key, oldest),
+                )
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sales_series (game, item_name, period, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                (*key, updated_at if updated_at is not None else time.time()),
+            )
+
+        return len(new_rows)
+
+    def migrate_json_cache(self, cache_dir: Path) -> int:
+        """
+        Импортирует файлы старого JSON-кеша и удаляет их.
+
+        Файлы имеют вид ``{game}_{safe_name}_{period}.json``; название
+        предмета берется из поля market_hash_name продаж, время обновления -
+        из времени изменения файла.
+
+        Args:
+            cache_dir: Каталог JSON-кеша
+
+        Returns:
+            Количество импортированных файлов
+        """
+        if not cache_dir.is_dir():
+            return 0
+
+        migrated = 0
+        for cache_file in cache_dir.glob("*.json"):
+            try:
+                game, _, rest = cache_file.stem.partition("_")
+                period = rest.rpartition("_")[2]
+                with open(cache_file, encoding="utf-8") as f:
+                    sales = json.load(f)
+
+                if game and period and sales:
+                    self.append(
+                        sales[0]["market_hash_name"],
+                        game,
+                        period,
+                        sales,
+                        updated_at=cache_file.stat().st_mtime,
+                    )
+                    migrated += 1
+                cache_file.unlink()
+            except Exception as e:
+                logger.warning(f"Не удалось импортировать кеш истории продаж {cache_file}: {e}")
+
+        if migrated:
+            logger.info(f"Импортировано {migrated} файлов кеша истории продаж в {self.db_path}")
+        return migrated
@@ -19,6 +19,7 @@ import operator
 from typing import Any
 
 from src.dmarket.dmarket_api import DMarketAPI
+from src.dmarket.market_snapshot import query_market_snapshot
 
 
 logger = logging.getLogger(__name__)
@@ -309,8 +310,10 @@ class SmartMarketFinder:
         game_id = game_ids.get(game, game)
 
         try:
-            # Получаем предметы с рынка
-            market_response = await self.api._request(
+            # Получаем предметы с рынка (из общей таблицы рынка, если она свежая)
+            market_response = query_market_snapshot(
+                self.api, game, limit=100, price_from=min_price, price_to=max_price
+            ) or await self.api._request(
                 method="GET",
                 path="/exchange/v1/market/items",
                 params={
@@ -502,8 +505,10 @@ class SmartMarketFinder:
     ) -> list[dict[str, Any]]:
         """Получить предметы с маркета вместе с агрегированными ценами."""
         try:
-            # Получаем предметы с маркета
-            market_response = await self.api._request(
+            # Получаем предметы с маркета (из общей таблицы рынка, если она свежая)
+            market_response = query_market_snapshot(
+                self.api, game, limit=limit, price_from=min_price, price_to=max_price
+            ) or await self.api._request(
                 method="GET",
                 path="/exchange/v1/market/items",
                 params={
@@ -18,6 +18,8 @@ from typing import Any, Awaitable, Callable
 from dotenv import load_dotenv
 import httpx
 
+from src.utils.http_pool import http_pool
+
 
 # Загружаем переменные окружения
 load_dotenv()
@@ -117,7 +119,8 @@ async def get_steam_price(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        # Клиент поверх общего пула: соединение со Steam переиспользуется между запросами
+        async with http_pool.create_client(timeout=10.0) as client:
             logger.debug(f"Requesting Steam price for: {market_hash_name}")
             response = await client.get(url, params=params)
 
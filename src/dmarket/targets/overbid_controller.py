@@ -24,6 +24,7 @@ from src.dmarket.models.target_enhancements import (
     TargetOperationStatus,
     TargetOverbidConfig,
 )
+from src.dmarket.request_scheduler import OVERBID_REQUEST_DEADLINE
 
 
 if TYPE_CHECKING:
@@ -256,8 +257,21 @@ class OverbidController:
         logger.info(f"Overbidding order {target_id}: ${old_price:.2f} -> ${new_price:.2f}")
 
         try:
-            # 1. Удалить старый ордер
-            await self.api_client.delete_targets(targets=[{"TargetID": target_id}])
+            # 1. Удалить старый ордер. Цена конкурента устаревает: если запрос
+            # не отправлен в срок, перебитие отменяется, старый ордер остается
+            deleted = await self.api_client.delete_targets(
+                targets=[{"TargetID": target_id}],
+                deadline=OVERBID_REQUEST_DEADLINE,
+            )
+            if deleted and deleted.get("code") == "REQUEST_EXPIRED":
+                logger.warning(f"Overbid of order {target_id} skipped: {deleted.get('message')}")
+                return TargetOperationResult(
+                    success=False,
+                    status=TargetOperationStatus.FAILED,
+                    message="Overbid request expired",
+                    reason=deleted.get("message", "Request expired in queue"),
+                    error_code=TargetErrorCode.RATE_LIMIT_EXCEEDED,
+                )
 
             # 2. Создать новый с новой ценой
             target_data = {
@@ -14,6 +14,8 @@ import logging
 import operator
 from typing import TYPE_CHECKING, Any
 
+from src.dmarket.market_snapshot import fetch_market_items
+
 
 if TYPE_CHECKING:
     from src.dmarket.dmarket_api import DMarketAPI
@@ -127,7 +129,8 @@ class TrendingItemsFinder:
     async def _fetch_market_items(self, dmarket_api: DMarketAPI) -> list[dict[str, Any]]:
         """Fetch current market items."""
         try:
-            result = await dmarket_api.get_market_items(
+            result = await fetch_market_items(
+                dmarket_api,
                 game=self.game,
                 limit=300,
                 price_from=self.min_price,
@@ -0,0 +1,631 @@
+"""Vectorized NumPy backtesting engine for strategy parameter sweeps.
+
+Loads historical prices once into a columnar matrix (one row per item,
+one column per timestamp) and evaluates the built-in strategies over the
+whole grid at once:
+
+- ``SimpleArbitrageStrategy`` - rolling average discount
+- ``MomentumStrategy`` - price change over N points
+- ``MeanReversionStrategy`` - rolling z-score
+
+A batch of strategies (e.g. a parameter grid over thresholds, stop-loss
+and take-profit) is simulated in one pass: entry signals are computed per
+distinct lookback window, and position state is kept as arrays with one
+row per strategy, so every timestamp is visited once for the whole batch.
+
+Results are ``BacktestResults`` built with the same formulas as
+``Backtester``, and match ``Backtester.run`` within floating point
+tolerance.
+
+Usage:
+    ```python
+    from src.dmarket.vectorized_backtester import VectorizedBacktester
+
+    engine = VectorizedBacktester.from_backtester(backtester)
+    results = engine.run_grid(
+        SimpleArbitrageStrategy,
+        {
+            "buy_threshold_percent": [3.0, 5.0, 7.0],
+            "min_profit_percent": [5.0, 10.0],
+            "max_loss_percent": [3.0, 5.0],
+        },
+    )
+    best = max(results, key=lambda r: r.total_roi)
+    ```
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.dmarket.backtester import (
+    Backtester,
+    BacktestResults,
+    MeanReversionStrategy,
+    MomentumStrategy,
+    SimpleArbitrageStrategy,
+    SimulatedTrade,
+    TradeAction,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from src.dmarket.backtester import HistoricalDataSet, TradingStrategy
+
+
+logger = logging.getLogger(__name__)
+
+# Strategy.evaluate() checks the balance against price * 1.07 regardless of fee_percent
+_BALANCE_CHECK_MULTIPLIER = 1.07
+
+
+@dataclass
+class PriceMatrix:
+    """Columnar price history: one row per item, one column per timestamp.
+
+    Attributes:
+        item_ids: Item identifiers (row order)
+        item_names: Item names (row order)
+        timestamps: Sorted union of all timestamps (column order)
+        prices: Float matrix of shape (items, timestamps), NaN where an
+            item has no price at a timestamp
+    """
+
+    item_ids: list[str]
+    item_names: list[str]
+    timestamps: list[datetime]
+    prices: np.ndarray
+
+    @classmethod
+    def from_datasets(cls, data: Mapping[str, HistoricalDataSet]) -> PriceMatrix:
+        """Build the matrix from ``Backtester.data``.
+
+        If an item has several points at one timestamp, the last one wins.
+
+        Args:
+            data: Historical data by item ID
+
+        Returns:
+            PriceMatrix with items in the mapping's order
+        """
+        item_ids = [item_id for item_id, dataset in data.items() if dataset.prices]
+        timestamps = sorted({p.timestamp for item_id in item_ids for p in data[item_id].prices})
+        column = {timestamp: index for index, timestamp in enumerate(timestamps)}
+
+        prices = np.full((len(item_ids), len(timestamps)), np.nan)
+        duplicates = 0
+        for row, item_id in enumerate(item_ids):
+            item_prices = data[item_id].prices
+            columns = [column[p.timestamp] for p in item_prices]
+            duplicates += len(columns) - len(set(columns))
+            prices[row, columns] = [p.price for p in item_prices]
+
+        if duplicates:
+            logger.warning(
+                "price_matrix_duplicate_timestamps",
+                extra={"duplicates": duplicates},
+            )
+
+        return cls(
+            item_ids=item_ids,
+            item_names=[data[item_id].item_name for item_id in item_ids],
+            timestamps=timestamps,
+            prices=prices,
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(items, timestamps)."""
+        return self.prices.shape
+
+    def select(self, item_ids: Sequence[str]) -> PriceMatrix:
+        """Sub-matrix for some items, as ``Backtester.run`` would see them.
+
+        Columns where none of the selected items has a price are dropped,
+        so the equity curve covers the same timestamps.
+
+        Args:
+            item_ids: Items to keep (unknown IDs are ignored)
+
+        Returns:
+            New PriceMatrix with copied prices
+        """
+        index = {item_id: row for row, item_id in enumerate(self.item_ids)}
+        rows = [index[item_id] for item_id in item_ids if item_id in index]
+        prices = self.prices[rows]
+        columns = np.flatnonzero((~np.isnan(prices)).any(axis=0))
+        return PriceMatrix(
+            item_ids=[self.item_ids[row] for row in rows],
+            item_names=[self.item_names[row] for row in rows],
+            timestamps=[self.timestamps[column] for column in columns],
+            prices=prices[:, columns],
+        )
+
+
+@dataclass(frozen=True)
+class _StrategySpec:
+    """Array-friendly parameters of a built-in strategy."""
+
+    signal: tuple[str, int]
+    buy_threshold: float
+    take_profit: float
+    stop_loss: float
+
+
+def _strategy_spec(strategy: TradingStrategy) -> _StrategySpec:
+    """Extract signal kind, window and exit levels from a strategy.
+
+    Only the built-in strategies are supported: subclasses may override
+    ``evaluate`` and cannot be vectorized safely.
+
+    Raises:
+        TypeError: If the strategy type is not supported
+        ValueError: If the window is not positive
+    """
+    strategy_type = type(strategy)
+    if strategy_type is SimpleArbitrageStrategy:
+        spec = _StrategySpec(
+            signal=("discount", strategy.lookback_periods),
+            buy_threshold=strategy.buy_threshold_percent,
+            take_profit=strategy.min_profit_percent,
+            stop_loss=strategy.max_loss_percent,
+        )
+    elif strategy_type is MomentumStrategy:
+        spec = _StrategySpec(
+            signal=("momentum", strategy.momentum_periods),
+            buy_threshold=strategy.momentum_threshold,
+            take_profit=strategy.profit_target,
+            stop_loss=strategy.stop_loss,
+        )
+    elif strategy_type is MeanReversionStrategy:
+        spec = _StrategySpec(
+            signal=("zscore", strategy.lookback_periods),
+            buy_threshold=strategy.std_threshold,
+            take_profit=strategy.profit_target,
+            stop_loss=strategy.stop_loss,
+        )
+    else:
+        raise TypeError(
+            f"{strategy_type.__name__} is not supported by VectorizedBacktester, "
+            "use Backtester.run for custom strategies"
+        )
+
+    if spec.signal[1] < 1:
+        raise ValueError(f"Strategy window must be positive, got {spec.signal[1]}")
+    return spec
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each full window, accumulated left to right like ``sum()``.
+
+    Returns an array of ``len(values) - window + 1`` sums; element ``j`` is
+    the window ending at ``values[j + window - 1]``.
+    """
+    count = len(values) - window + 1
+    total = values[:count].copy()
+    for offset in range(1, window):
+        total += values[offset : offset + count]
+    return total
+
+
+def _signal_scores(values: np.ndarray, kind: str, window: int) -> np.ndarray:
+    """Compute the entry score for every point of one item's price series.
+
+    A strategy buys when ``score >= threshold``. Points without enough
+    history (or with zero variation for the z-score) get NaN.
+
+    The arithmetic mirrors the strategies' ``evaluate`` step by step, so
+    scores are bit-identical to the event-driven engine.
+
+    Args:
+        values: Price series of one item (no gaps)
+        kind: "discount", "momentum" or "zscore"
+        window: Lookback / momentum periods
+
+    Returns:
+        Score array of the same length as ``values``
+    """
+    scores = np.full(len(values), np.nan)
+    if len(values) < window:
+        return scores
+
+    current = values[window - 1 :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if kind == "momentum":
+            old = values[: len(values) - window + 1]
+            scores[window - 1 :] = ((current - old) / old) * 100
+        else:
+            mean = _window_sum(values, window) / window
+            if kind == "discount":
+                scores[window - 1 :] = ((mean - current) / mean) * 100
+            else:
+                count = len(mean)
+                squares = np.zeros(count)
+                for offset in range(window):
+                    deviation = values[offset : offset + count] - mean
+                    squares += deviation * deviation
+                std = np.sqrt(squares / window)
+                z_score = (current - mean) / std
+                # z <= -threshold  <=>  -z >= threshold
+                scores[window - 1 :] = np.where(std == 0, np.nan, -z_score)
+    return scores
+
+
+class VectorizedBacktester:
+    """Columnar backtesting engine for batches of built-in strategies.
+
+    Simulates the same rules as ``Backtester``: one unit per trade, a
+    global ``max_positions`` limit, exits checked before entries at each
+    point, and remaining positions closed at each item's last price.
+
+    Attributes:
+        initial_balance: Starting balance for each simulated strategy
+        fee_percent: Trading fee percentage (default: 7% for DMarket)
+        matrix: Loaded price matrix
+    """
+
+    def __init__(
+        self,
+        initial_balance: float = 1000.0,
+        fee_percent: float = 7.0,
+    ) -> None:
+        """Initialize engine.
+
+        Args:
+            initial_balance: Starting balance in USD
+            fee_percent: Trading fee percentage
+        """
+        self.initial_balance = initial_balance
+        self.fee_percent = fee_percent
+        self.matrix: PriceMatrix | None = None
+        # Signal scores by (kind, window), reused across runs on the same data
+        self._scores: dict[tuple[str, int], np.ndarray] = {}
+
+    @classmethod
+    def from_backtester(cls, backtester: Backtester) -> VectorizedBacktester:
+        """Create engine with the settings and data of a ``Backtester``."""
+        engine = cls(
+            initial_balance=backtester.initial_balance,
+            fee_percent=backtester.fee_percent,
+        )
+        engine.load_data(backtester.data)
+        return engine
+
+    def load_data(self, data: Mapping[str, HistoricalDataSet]) -> None:
+        """Load historical data into the price matrix.
+
+        Args:
+            data: Historical data by item ID (as in ``Backtester.data``)
+        """
+        self.load_matrix(PriceMatrix.from_datasets(data))
+
+    def load_matrix(self, matrix: PriceMatrix) -> None:
+        """Use an already built price matrix.
+
+        Args:
+            matrix: Price matrix to backtest on
+        """
+        self.matrix = matrix
+        self._scores = {}
+        logger.info(
+            "loaded_price_matrix",
+            extra={"items": matrix.shape[0], "timestamps": matrix.shape[1]},
+        )
+
+    def run(
+        self,
+        strategy: TradingStrategy,
+        max_positions: int = 5,
+    ) -> BacktestResults:
+        """Run backtest for a single strategy.
+
+        Args:
+            strategy: Built-in strategy to test
+            max_positions: Maximum concurrent positions
+
+        Returns:
+            BacktestResults with performance metrics
+        """
+        return self.run_batch([strategy], max_positions=max_positions)[0]
+
+    def run_grid(
+        self,
+        strategy_cls: type[TradingStrategy],
+        param_grid: Mapping[str, Sequence[Any]],
+        max_positions: int = 5,
+    ) -> list[BacktestResults]:
+        """Run every combination of strategy parameters in one pass.
+
+        Args:
+            strategy_cls: Built-in strategy class
+            param_grid: Constructor argument name -> values to try
+            max_positions: Maximum concurrent positions
+
+        Returns:
+            Results in ``itertools.product`` order of the grid values
+        """
+        names = list(param_grid)
+        strategies = [
+            strategy_cls(**dict(zip(names, values, strict=True)))
+            for values in itertools.product(*(param_grid[name] for name in names))
+        ]
+        return self.run_batch(strategies, max_positions=max_positions)
+
+    def run_batch(
+        self,
+        strategies: Sequence[TradingStrategy],
+        max_positions: int = 5,
+    ) -> list[BacktestResults]:
+        """Run several strategies over the same data in one pass.
+
+        Each strategy has its own balance and positions; they only share
+        the price matrix and the signal computation.
+
+        Args:
+            strategies: Built-in strategies to test
+            max_positions: Maximum concurrent positions per strategy
+
+        Returns:
+            One BacktestResults per strategy, in input order
+
+        Raises:
+            ValueError: If no data is loaded
+            TypeError: If a strategy type is not supported
+        """
+        if self.matrix is None or not self.matrix.item_ids:
+            raise ValueError("No historical data loaded")
+        if not strategies:
+            return []
+
+        specs = [_strategy_spec(strategy) for strategy in strategies]
+        simulation = _BatchSimulation(self, specs, max_positions)
+        simulation.run()
+
+        results = simulation.results([strategy.name for strategy in strategies])
+        logger.info(
+            "vectorized_backtest_completed",
+            extra={
+                "strategies": len(strategies),
+                "items": self.matrix.shape[0],
+                "timestamps": self.matrix.shape[1],
+            },
+        )
+        return results
+
+    def _signal_matrix(self, signal: tuple[str, int]) -> np.ndarray:
+        """Get (items, timestamps) entry scores for a signal, cached per data."""
+        scores = self._scores.get(signal)
+        if scores is None:
+            assert self.matrix is not None
+            prices = self.matrix.prices
+            scores = np.full(prices.shape, np.nan)
+            kind, window = signal
+            for row in range(prices.shape[0]):
+                columns = np.flatnonzero(~np.isnan(prices[row]))
+                scores[row, columns] = _signal_scores(prices[row, columns], kind, window)
+            self._scores[signal] = scores
+        return scores
+
+
+class _BatchSimulation:
+    """Position state of a strategy batch, one array row per strategy."""
+
+    def __init__(
+        self,
+        engine: VectorizedBacktester,
+        specs: list[_StrategySpec],
+        max_positions: int,
+    ) -> None:
+        assert engine.matrix is not None
+        self.engine = engine
+        self.matrix = engine.matrix
+        self.max_positions = max_positions
+        self.fee_rate = engine.fee_percent / 100
+
+        combos = len(specs)
+        slots = max(max_positions, 1)
+        items, steps = self.matrix.shape
+
+        signals = sorted({spec.signal for spec in specs})
+        self.scores = np.stack([engine._signal_matrix(signal) for signal in signals])
+        self.signal_index = np.array([signals.index(spec.signal) for spec in specs])
+        self.buy_threshold = np.array([spec.buy_threshold for spec in specs], dtype=float)
+        self.take_profit = np.array([spec.take_profit for spec in specs], dtype=float)[:, None]
+        self.stop_loss = np.array([spec.stop_loss for spec in specs], dtype=float)[:, None]
+
+        # Points where at least one strategy of the batch has an entry signal
+        self.candidates = np.zeros((steps, items), dtype=bool)
+        if max_positions > 0:
+            for index in range(len(signals)):
+                threshold = self.buy_threshold[self.signal_index == index].min()
+                with np.errstate(invalid="ignore"):
+                    self.candidates |= (self.scores[index] >= threshold).T
+        self.valid = ~np.isnan(self.matrix.prices.T)
+
+        self.balance = np.full(combos, float(engine.initial_balance))
+        self.open_value = np.zeros(combos)
+        self.open_count = np.zeros(combos, dtype=int)
+        self.open_by_item = np.zeros(items, dtype=int)
+        self.slot_active = np.zeros((combos, slots), dtype=bool)
+        self.slot_item = np.full((combos, slots), -1)
+        # Inactive slots hold 1.0 so profit percentages stay finite
+        self.slot_price = np.ones((combos, slots))
+        self.slot_trade: list[list[SimulatedTrade | None]] = [[None] * slots for _ in range(combos)]
+        self.trades: list[list[SimulatedTrade]] = [[] for _ in range(combos)]
+        self.equity = np.zeros((combos, steps))
+
+    def run(self) -> None:
+        """Step through all timestamps, then close remaining positions."""
+        prices = self.matrix.prices
+        for step, timestamp in enumerate(self.matrix.timestamps):
+            active = self.valid[step] & (self.candidates[step] | (self.open_by_item > 0))
+            for item in np.flatnonzero(active):
+                price = float(prices[item, step])
+                if self.open_by_item[item]:
+                    self._check_exits(item, price, timestamp)
+                if self.candidates[step, item]:
+                    self._check_entries(item, step, price, timestamp)
+            # Equity with open positions valued at cost, as in Backtester.run
+            self.equity[:, step] = self.balance + self.open_value
+
+        self._close_all_positions()
+
+    def _check_exits(self, item: int, price: float, timestamp: datetime) -> None:
+        """Close positions on ``item`` that hit take-profit or stop-loss."""
+        held = self.slot_active & (self.slot_item == item)
+        profit_percent = ((price - self.slot_price) / self.slot_price) * 100
+        to_close = held & (
+            (profit_percent >= self.take_profit) | (profit_percent <= -self.stop_loss)
+        )
+        if not to_close.any():
+            return
+
+        sell_fee = price * 1 * self.fee_rate
+        proceeds = (price * 1) - sell_fee
+        for slot in np.flatnonzero(to_close.any(axis=0)):
+            closed = to_close[:, slot]
+            self.balance[closed] += proceeds
+            self.open_value[closed] -= self.slot_price[closed, slot]
+
+        for combo, slot in zip(*np.nonzero(to_close), strict=True):
+            trade = self.slot_trade[combo][slot]
+            assert trade is not None
+            trade.close(price, timestamp)
+            self.slot_trade[combo][slot] = None
+
+        closed_per_combo = to_close.sum(axis=1)
+        self.open_count -= closed_per_combo
+        self.open_by_item[item] -= int(closed_per_combo.sum())
+        self.slot_active[to_close] = False
+        self.slot_price[to_close] = 1.0
+        self.slot_item[to_close] = -1
+
+    def _check_entries(self, item: int, step: int, price: float, timestamp: datetime) -> None:
+        """Open a position for every strategy with an entry signal."""
+        scores = self.scores[self.signal_index, item, step]
+        with np.errstate(invalid="ignore"):
+            buy = (
+                (self.open_count < self.max_positions)
+                & (scores >= self.buy_threshold)
+                & (self.balance >= price * _BALANCE_CHECK_MULTIPLIER)
+            )
+        if not buy.any():
+            return
+
+        fees = price * self.fee_rate
+        total_cost = (price * 1) + fees
+        self.balance[buy] -= total_cost
+        self.open_value[buy] += price * 1
+        self.open_count[buy] += 1
+
+        combos = np.flatnonzero(buy)
+        self.open_by_item[item] += len(combos)
+        # First free slot of each buying strategy
+        slots = np.argmin(self.slot_active[combos], axis=1)
+        self.slot_active[combos, slots] = True
+        self.slot_item[combos, slots] = item
+        self.slot_price[combos, slots] = price
+
+        item_id = self.matrix.item_ids[item]
+        item_name = self.matrix.item_names[item]
+        for combo, slot in zip(combos.tolist(), slots.tolist(), strict=True):
+            trades = self.trades[combo]
+            trade = SimulatedTrade(
+                trade_id=f"BT-{len(trades) + 1:06d}",
+                item_id=item_id,
+                item_name=item_name,
+                action=TradeAction.BUY,
+                price=price,
+                quantity=1,
+                timestamp=timestamp,
+                fees=fees,
+            )
+            trades.append(trade)
+            self.slot_trade[combo][slot] = trade
+
+    def _close_all_positions(self) -> None:
+        """Close remaining positions at each item's last price, in open order."""
+        prices = self.matrix.prices
+        for combo in np.flatnonzero(self.open_count).tolist():
+            open_trades = [trade for trade in self.slot_trade[combo] if trade is not None]
+            open_trades.sort(key=lambda trade: trade.trade_id)
+            balance = float(self.balance[combo])
+            for trade in open_trades:
+                row = self.matrix.item_ids.index(trade.item_id)
+                last_step = int(np.flatnonzero(~np.isnan(prices[row]))[-1])
+                price = float(prices[row, last_step])
+                trade.close(price, self.matrix.timestamps[last_step])
+                sell_fee = price * trade.quantity * self.fee_rate
+                balance += (price * trade.quantity) - sell_fee
+            self.balance[combo] = balance
+
+    def results(self, strategy_names: list[str]) -> list[BacktestResults]:
+        """Build results with Backtester's metric formulas.
+
+        Drawdown and Sharpe ratio are computed for the whole batch at once
+        instead of looping over every equity curve in Python.
+        """
+        max_drawdowns = self._max_drawdowns().tolist()
+        sharpe_ratios = self._sharpe_ratios().tolist()
+        timestamps = self.matrix.timestamps
+
+        results = []
+        for combo, strategy_name in enumerate(strategy_names):
+            report = Backtester(
+                initial_balance=self.engine.initial_balance,
+                fee_percent=self.engine.fee_percent,
+            )
+            report.trades = self.trades[combo]
+            report.current_balance = float(self.balance[combo])
+
+            # Trade metrics come from Backtester; the curve metrics are set below
+            result = report._calculate_results(
+                strategy_name=strategy_name,
+                start_date=timestamps[0],
+                end_date=timestamps[-1],
+                equity_curve=[],
+            )
+            result.max_drawdown = max_drawdowns[combo]
+            result.sharpe_ratio = sharpe_ratios[combo]
+            result.equity_curve = list(zip(timestamps, self.equity[combo].tolist(), strict=True))
+            results.append(result)
+        return results
+
+    def _max_drawdowns(self) -> np.ndarray:
+        """Maximum drawdown (%) of every equity curve."""
+        peaks = np.maximum.accumulate(self.equity, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdowns = ((peaks - self.equity) / peaks) * 100
+        return np.maximum(np.nanmax(drawdowns, axis=1, initial=0.0), 0.0)
+
+    def _sharpe_ratios(self, risk_free_rate: float = 0.02) -> np.ndarray:
+        """Annualized Sharpe ratio of every equity curve (hourly returns)."""
+        sharpe = np.zeros(self.equity.shape[0])
+        if self.equity.shape[1] < 2:
+            return sharpe
+
+        previous = self.equity[:, :-1]
+        valid = previous > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.where(valid, (self.equity[:, 1:] - previous) / previous, 0.0)
+        counts = valid.sum(axis=1)
+        has_returns = counts > 0
+        safe_counts = np.maximum(counts, 1)
+
+        avg_return = returns.sum(axis=1) / safe_counts
+        deviations = np.where(valid, returns - avg_return[:, None], 0.0)
+        std_return = np.sqrt((deviations * deviations).sum(axis=1) / safe_counts)
+
+        defined = has_returns & (std_return != 0)
+        annualized_return = avg_return[defined] * 8760
+        annualized_std = std_return[defined] * (8760**0.5)
+        sharpe[defined] = (annualized_return - risk_free_rate) / annualized_std
+        return sharpe
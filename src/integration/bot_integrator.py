@@ -44,6 +44,8 @@ from src.integration.service_registry import ServiceRegistry
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from src.dmarket.dmarket_api import DMarketAPI
     from src.utils.config import Config
     from src.waxpeer.waxpeer_api import WaxpeerAPI
@@ -115,6 +117,8 @@ class BotIntegrator:
         telegram_bot: Any | None = None,
         database: Any | None = None,
         config: IntegratorConfig | None = None,
+        redis_cache: Any | None = None,
+        bot_updater: Any | None = None,
     ) -> None:
         """Initialize bot integrator.
 
@@ -124,11 +128,15 @@ class BotIntegrator:
             telegram_bot: Telegram bot instance
             database: Database manager
             config: Integrator configuration
+            redis_cache: Redis cache (optional)
+            bot_updater: Telegram updater that polls for updates (optional)
         """
         self.dmarket_api = dmarket_api
         self.waxpeer_api = waxpeer_api
         self.telegram_bot = telegram_bot
         self.database = database
+        self.redis_cache = redis_cache
+        self.bot_updater = bot_updater
         self.config = config or IntegratorConfig()
 
         # Core components
@@ -330,7 +338,12 @@ class BotIntegrator:
         try:
             from src.analytics.price_analytics import PriceAnalytics
 
-            self._price_analytics = PriceAnalytics()
+            self._price_analytics = PriceAnalytics(
+                readiness_checks=self._readiness_checks(),
+                price_history_store=(
+                    self.database.price_history_store if self.database is not None else None
+                ),
+            )
 
             self.services.register("price_analytics", self._price_analytics)
 
@@ -539,6 +552,17 @@ class BotIntegrator:
             logger.warning(f"Security module not available: {e}")
             return False
 
+    def _readiness_checks(self) -> dict[str, Callable[[], bool]]:
+        """Build readiness checks of the configured dependencies."""
+        checks: dict[str, Callable[[], bool]] = {}
+        if self.database is not None:
+            checks["database"] = lambda: self.database.is_pool_ready
+        if self.redis_cache is not None:
+            checks["redis"] = lambda: self.redis_cache.is_connected
+        if self.bot_updater is not None:
+            checks["bot_polling"] = lambda: self.bot_updater.running
+        return checks
+
     def _setup_event_handlers(self) -> None:
         """Setup event handlers for inter-module communication."""
 
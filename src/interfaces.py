@@ -295,11 +295,13 @@ class ITargetManager(Protocol):
     async def delete_targets(
         self,
         target_ids: list[str],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         """Удалить таргеты.
 
         Args:
             target_ids: Список ID таргетов для удаления
+            deadline: Сколько секунд запрос может ждать отправки (None - без срока)
 
         Returns:
             Результат удаления
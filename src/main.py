@@ -20,6 +20,7 @@ from src.telegram_bot.register_all_handlers import register_all_handlers
 from src.utils.config import Config
 from src.utils.daily_report_scheduler import DailyReportScheduler
 from src.utils.database import DatabaseManager
+from src.utils.http_pool import http_pool
 from src.utils.logging_utils import BotLogger, setup_logging
 from src.utils.sentry_integration import init_sentry
 from src.utils.state_manager import StateManager
@@ -421,6 +422,15 @@ class Application:
                 except Exception as e:
                     logger.exception(f"❌ Error closing API: {e}")
 
+            # Shared connection pools outlive the API clients built on them
+            try:
+                await asyncio.wait_for(http_pool.aclose(), timeout=3.0)
+                logger.info("✅ HTTP connection pool closed")
+            except TimeoutError:
+                logger.warning("⚠️  Timeout closing HTTP connection pool")
+            except Exception as e:
+                logger.exception(f"❌ Error closing HTTP connection pool: {e}")
+
             # Step 6: Close database connections
             logger.info("Step 7/9: Closing database connections...")
             if self.database:
@@ -790,9 +800,16 @@ class Application:
                 training_time=dt_time(3, 0),
                 data_collection_interval=300,
                 enabled=True,
+                database=self.database,
             )
             self.bot.ai_scheduler = self.ai_scheduler
 
+            if self.database is not None:
+                from src.ml.ai_coordinator import get_ai_coordinator
+
+                # ML scoring reads price history from the rollup tiers
+                get_ai_coordinator(price_history_store=self.database.price_history_store)
+
             logger.info("AI Training Scheduler initialized (training at 03:00 UTC)")
         except Exception as e:
             logger.warning(f"Failed to initialize AI Training Scheduler: {e}")
@@ -1059,6 +1076,7 @@ class Application:
                 telegram_bot=self.bot.bot if self.bot else None,
                 database=self.database,
                 config=integrator_config,
+                bot_updater=self.bot.updater if self.bot else None,
             )
 
             init_results = await self.bot_integrator.initialize()
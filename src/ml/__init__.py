@@ -74,7 +74,7 @@ from src.ml.enhanced_predictor import (
     ItemRarity,
     MLPipeline,
 )
-from src.ml.feature_extractor import MarketFeatureExtractor, PriceFeatures
+from src.ml.feature_extractor import MarketFeatureExtractor, MarketHistoryBatch, PriceFeatures
 from src.ml.model_tuner import (
     AutoMLSelector,
     CVStrategy,
@@ -86,14 +86,22 @@ from src.ml.model_tuner import (
 
 # Real Data Training Modules (новые модули для обучения на реальных данных API)
 from src.ml.price_normalizer import NormalizedPrice, PriceNormalizer, PriceSource
-from src.ml.price_predictor import AdaptivePricePredictor, PredictionConfidence, PricePrediction
+from src.ml.price_predictor import (
+    AdaptivePricePredictor,
+    PredictionBatch,
+    PredictionConfidence,
+    PricePrediction,
+)
 from src.ml.real_price_collector import (
     CollectedPrice,
+    CollectionCheckpoint,
     CollectionResult,
     CollectionStatus,
     GameType as CollectorGameType,
+    JsonlPriceSink,
     RealPriceCollector,
 )
+from src.ml.scoring_executor import ScoringExecutor
 from src.ml.smart_recommendations import (
     ItemRecommendation,
     RecommendationBatch,
@@ -103,7 +111,12 @@ from src.ml.smart_recommendations import (
     create_smart_recommendations,
 )
 from src.ml.trade_classifier import AdaptiveTradeClassifier, RiskLevel, TradeSignal
-from src.ml.training_data_manager import DatasetMetadata, TrainingDataManager, TrainingDataset
+from src.ml.training_data_manager import (
+    DatasetChunk,
+    DatasetMetadata,
+    TrainingDataManager,
+    TrainingDataset,
+)
 
 
 __all__ = [
@@ -134,10 +147,12 @@ __all__ = [
     "BotState",
     "CVStrategy",
     "CollectedPrice",
+    "CollectionCheckpoint",
     "CollectionResult",
     "CollectionStatus",
     "CollectorGameType",
     "CycleResult",
+    "DatasetChunk",
     "DatasetMetadata",
     # ═══════════════════════════════════════════════════════════════════
     # Discount Threshold Predictor (ML-based выбор порога скидки)
@@ -153,15 +168,18 @@ __all__ = [
     "ItemCondition",
     "ItemRarity",
     "ItemRecommendation",
+    "JsonlPriceSink",
     # Data Scheduler - автоматический сбор и переобучение
     "MLDataScheduler",
     "MLPipeline",
     "MarketCondition",
     # Feature Extractor
     "MarketFeatureExtractor",
+    "MarketHistoryBatch",
     # Model Tuner (автонастройка)
     "ModelTuner",
     "NormalizedPrice",
+    "PredictionBatch",
     "PredictionConfidence",
     "PriceFeatures",
     # ═══════════════════════════════════════════════════════════════════
@@ -180,6 +198,7 @@ __all__ = [
     "SafetyLimits",
     "SchedulerConfig",
     "SchedulerState",
+    "ScoringExecutor",
     "ScoringMetric",
     # Smart Recommendations
     "SmartRecommendations",
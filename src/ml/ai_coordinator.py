@@ -22,9 +22,16 @@ Usage:
     decision = await ai.make_decision(item_data, balance=100.0)
 
     # Run autonomous scan
-    opportunities = await ai.scan_and_decide(game="csgo")
+    opportunities = await ai.scan_and_decide(items)
     ```
 
+Scoring (feature extraction, price prediction, trade classification and
+anomaly checks) is synchronous CPU work and runs on a ScoringExecutor
+thread pool, so big scans do not block the event loop.
+
+With a ``price_history_store``, items without an API ``priceHistory`` are
+scored on daily closing prices of the stored price history.
+
 Created: January 2026
 """
 
@@ -32,9 +39,10 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from enum import StrEnum
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from src.ml.anomaly_detection import AnomalyDetector, AnomalyResult
@@ -44,6 +52,7 @@ from src.ml.discount_threshold_predictor import (
     ThresholdPrediction,
     get_discount_threshold_predictor,
 )
+from src.ml.scoring_executor import ScoringExecutor
 from src.ml.smart_recommendations import RecommendationType, RiskLevel
 
 
@@ -52,6 +61,7 @@ if TYPE_CHECKING:
     from src.ml.enhanced_predictor import EnhancedPricePredictor
     from src.ml.llama_integration import LlamaIntegration
     from src.ml.trade_classifier import AdaptiveTradeClassifier
+    from src.utils.price_history_store import PriceHistoryStore
 
 
 logger = logging.getLogger(__name__)
@@ -241,6 +251,9 @@ class AICoordinator:
     # Model version for tracking and drift detection
     MODEL_VERSION = "1.1.0"
 
+    # Days of stored price history loaded for items without one
+    PRICE_HISTORY_DAYS = 30
+
     # Drift detection thresholds
     DRIFT_DETECTION_WINDOW = 100  # Number of decisions to track
     DRIFT_ACCURACY_THRESHOLD = 0.60  # Below this triggers drift alert
@@ -253,6 +266,8 @@ class AICoordinator:
         safety_limits: SafetyLimits | None = None,
         user_balance: float = 100.0,
         model_weights: dict[str, float] | None = None,
+        scoring_executor: ScoringExecutor | None = None,
+        price_history_store: PriceHistoryStore | None = None,
     ) -> None:
         """Initialize AI Coordinator.
 
@@ -261,6 +276,9 @@ class AICoordinator:
             safety_limits: Safety limits for trading
             user_balance: Current user balance in USD
             model_weights: Custom weights for ensemble models (must sum to 1.0)
+            scoring_executor: Worker pool for CPU-bound scoring (created lazily)
+            price_history_store: Stored price history for items without
+                an API price history
         """
         self.autonomy_level = autonomy_level
         self.safety_limits = safety_limits or SafetyLimits()
@@ -277,6 +295,8 @@ class AICoordinator:
         self._discount_predictor: DiscountThresholdPredictor | None = None
         self._anomaly_detector: AnomalyDetector | None = None
         self._llama: LlamaIntegration | None = None
+        self._scoring_executor = scoring_executor
+        self.price_history_store = price_history_store
 
         # Market condition
         self._market_condition = MarketCondition.STABLE
@@ -380,6 +400,23 @@ class AICoordinator:
             self._anomaly_detector = AnomalyDetector()
         return self._anomaly_detector
 
+    def _ensure_models(self) -> None:
+        """Initialize the ML modules before scoring is handed to the workers.
+
+        The lazy getters are not thread-safe: two workers could each build a
+        model and score against different instances.
+        """
+        self._get_price_predictor()
+        self._get_trade_classifier()
+        self._get_discount_predictor()
+        self._get_anomaly_detector()
+
+    def _get_scoring_executor(self) -> ScoringExecutor:
+        """Get or initialize the scoring worker pool."""
+        if self._scoring_executor is None:
+            self._scoring_executor = ScoringExecutor()
+        return self._scoring_executor
+
     async def _get_llama(self) -> LlamaIntegration | None:
         """Get or initialize Llama integration."""
         if self._llama is None:
@@ -434,6 +471,169 @@ class AICoordinator:
         Returns:
             ItemAnalysis with all model outputs
         """
+        self._ensure_models()
+        (item_data,) = await self._with_stored_history([item_data])
+        analysis = await self._get_scoring_executor().run(self._score_item, item_data)
+
+        # LLM analysis (optional)
+        if include_llm:
+            llama = await self._get_llama()
+            if llama:
+                try:
+                    llm_result = await llama.evaluate_item(
+                        item_name=analysis.item_name,
+                        current_price=analysis.current_price,
+                        item_data=item_data,
+                    )
+                    if llm_result.success:
+                        analysis.llm_analysis = llm_result.response
+                except Exception as e:
+                    logger.warning(
+                        "llama_evaluation_failed",
+                        extra={"item_name": analysis.item_name, "error": str(e)},
+                    )
+
+        return analysis
+
+    async def _with_stored_history(
+        self,
+        items: list[dict[str, Any]],
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Add stored daily closing prices to items without a price history.
+
+        The history of all such items is read with one bulk store call.
+
+        Args:
+            items: Item data from API
+            timeout: Time budget for the read in seconds; on timeout or
+                error the items are scored without stored history
+
+        Returns:
+            Items with ``priceHistory`` and ``priceHistoryTimes`` (oldest
+            first) where the store has history, otherwise unchanged
+        """
+        if self.price_history_store is None:
+            return items
+
+        keys = [
+            None
+            if item.get("priceHistory")
+            else (
+                item.get("gameId", item.get("game", "csgo")),
+                item.get("title", item.get("name", "unknown")),
+            )
+            for item in items
+        ]
+        wanted = {key for key in keys if key is not None}
+        if not wanted:
+            return items
+
+        start = datetime.now(UTC) - timedelta(days=self.PRICE_HISTORY_DAYS)
+        try:
+            bars_by_item = await asyncio.wait_for(
+                self.price_history_store.get_price_bars_bulk(
+                    wanted, start=start, resolution=timedelta(days=1)
+                ),
+                timeout,
+            )
+        except Exception as e:
+            logger.warning(
+                "stored_price_history_failed",
+                extra={"items": len(wanted), "error": str(e) or type(e).__name__},
+            )
+            return items
+
+        loaded = []
+        for item, key in zip(items, keys, strict=True):
+            bars = bars_by_item.get(key) if key is not None else None
+            if bars:
+                item = {
+                    **item,
+                    "priceHistory": [bar.close for bar in bars],
+                    "priceHistoryTimes": [bar.timestamp for bar in bars],
+                }
+            loaded.append(item)
+        return loaded
+
+    def _score_item(self, item_data: dict[str, Any]) -> ItemAnalysis:
+        """Score one item with all ML models (synchronous, runs in a worker)."""
+        result = self._score_items([item_data])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _score_items(
+        self,
+        items: list[dict[str, Any]],
+    ) -> list[ItemAnalysis | Exception]:
+        """Score a batch of items with all ML models (synchronous, runs in a worker).
+
+        Price prediction runs once over the whole batch and the discount
+        threshold is predicted once per game.
+
+        Args:
+            items: Item data from API
+
+        Returns:
+            ItemAnalysis or the exception raised for each item, in order
+        """
+        results: list[ItemAnalysis | Exception | None] = [None] * len(items)
+        parsed: list[tuple[int, dict[str, Any]]] = []
+        for idx, item_data in enumerate(items):
+            try:
+                parsed.append((idx, self._parse_item(item_data)))
+            except Exception as e:
+                results[idx] = e
+
+        if not parsed:
+            return results
+
+        # 1. Price prediction (one model call per batch)
+        predictor = self._get_price_predictor()
+        now = datetime.now(UTC)
+        price_preds = predictor.predict_batch([
+            {
+                "item_name": item["item_name"],
+                "current_price": item["current_price"],
+                "price_history": list(
+                    zip(
+                        item["history_times"] or [now] * len(item["historical_prices"]),
+                        item["historical_prices"],
+                        strict=True,
+                    )
+                )[-30:],
+            }
+            for _, item in parsed
+        ]).predictions
+
+        classifier = self._get_trade_classifier()
+        discount_pred = self._get_discount_predictor()
+        anomaly_detector = self._get_anomaly_detector()
+        thresholds: dict[str, float] = {}
+
+        for (idx, item), price_pred in zip(parsed, price_preds, strict=True):
+            try:
+                # 3. ML discount threshold
+                game = item["game"]
+                if game not in thresholds:
+                    threshold_result: ThresholdPrediction = discount_pred.predict(game=game)
+                    thresholds[game] = threshold_result.optimal_threshold
+
+                results[idx] = self._build_analysis(
+                    item,
+                    price_pred,
+                    classifier=classifier,
+                    anomaly_detector=anomaly_detector,
+                    ml_threshold=thresholds[game],
+                )
+            except Exception as e:
+                results[idx] = e
+
+        return results
+
+    def _parse_item(self, item_data: dict[str, Any]) -> dict[str, Any]:
+        """Extract name, prices and discount from API item data."""
         item_name = item_data.get("title", item_data.get("name", "unknown"))
         item_id = item_data.get("itemId", item_data.get("id", ""))
         game = item_data.get("gameId", item_data.get("game", "csgo"))
@@ -460,54 +660,43 @@ class AICoordinator:
         # Get historical prices if available
         historical_prices = item_data.get("priceHistory", [])
 
-        # 1. Price prediction
-        predictor = self._get_price_predictor()
-        price_pred = predictor.predict(
-            item_name=item_name,
-            current_price=current_price,
-            price_history=[(datetime.now(UTC), p) for p in historical_prices[-30:]],
-        )
+        return {
+            "item_name": item_name,
+            "item_id": item_id,
+            "game": game,
+            "current_price": current_price,
+            "actual_discount": actual_discount,
+            "historical_prices": historical_prices,
+            "history_times": item_data.get("priceHistoryTimes"),
+        }
+
+    def _build_analysis(
+        self,
+        item: dict[str, Any],
+        price_pred: dict[str, Any],
+        classifier: AdaptiveTradeClassifier,
+        anomaly_detector: AnomalyDetector,
+        ml_threshold: float,
+    ) -> ItemAnalysis:
+        """Combine the model outputs for one parsed item into an ItemAnalysis."""
+        item_name = item["item_name"]
+        current_price = item["current_price"]
+        actual_discount = item["actual_discount"]
 
         # 2. Trade signal classification
-        classifier = self._get_trade_classifier()
         signal = classifier.classify(
             item_name=item_name,
             current_price=current_price,
             expected_price=price_pred.get("predicted_price_24h", current_price),
         )
 
-        # 3. ML discount threshold
-        discount_pred = self._get_discount_predictor()
-        threshold_result: ThresholdPrediction = discount_pred.predict(game=game)
-        ml_threshold = threshold_result.optimal_threshold
-
         # 4. Anomaly detection
-        anomaly_detector = self._get_anomaly_detector()
         anomaly_result: AnomalyResult = anomaly_detector.check_price_anomaly(
             current_price=current_price,
-            historical_prices=historical_prices,
+            historical_prices=item["historical_prices"],
             item_name=item_name,
         )
 
-        # 5. LLM analysis (optional)
-        llm_analysis = None
-        if include_llm:
-            llama = await self._get_llama()
-            if llama:
-                try:
-                    llm_result = await llama.evaluate_item(
-                        item_name=item_name,
-                        current_price=current_price,
-                        item_data=item_data,
-                    )
-                    if llm_result.success:
-                        llm_analysis = llm_result.response
-                except Exception as e:
-                    logger.warning(
-                        "llama_evaluation_failed",
-                        extra={"item_name": item_name, "error": str(e)},
-                    )
-
         # Determine recommendation
         is_undervalued = actual_discount >= ml_threshold
         recommendation = self._determine_recommendation(
@@ -519,8 +708,8 @@ class AICoordinator:
 
         return ItemAnalysis(
             item_name=item_name,
-            item_id=item_id,
-            game=game,
+            item_id=item["item_id"],
+            game=item["game"],
             current_price=current_price,
             predicted_price_1h=price_pred.get("predicted_price_1h", current_price),
             predicted_price_24h=price_pred.get("predicted_price_24h", current_price),
@@ -538,7 +727,6 @@ class AICoordinator:
             risk_factors=signal.reasoning if hasattr(signal, "reasoning") else [],
             recommendation=recommendation,
             recommendation_reason=self._get_recommendation_reason(recommendation, is_undervalued, signal),
-            llm_analysis=llm_analysis,
         )
 
     def _determine_recommendation(
@@ -597,7 +785,10 @@ class AICoordinator:
         """
         # Get comprehensive analysis
         analysis = await self.analyze_item(item_data)
+        return self._decide(analysis)
 
+    def _decide(self, analysis: ItemAnalysis) -> TradeDecision:
+        """Turn an item analysis into a trading decision."""
         # Calculate ensemble confidence
         confidence = self._calculate_ensemble_confidence(analysis)
 
@@ -913,6 +1104,9 @@ class AICoordinator:
             "user_balance": self.user_balance,
             "model_weights": self._model_weights,
             "drift_status": self.get_drift_status(),
+            "scoring_executor": (
+                self._scoring_executor.get_stats() if self._scoring_executor else None
+            ),
             "models_status": {
                 "price_predictor": self._price_predictor is not None,
                 "trade_classifier": self._trade_classifier is not None,
@@ -926,36 +1120,48 @@ class AICoordinator:
         self,
         items: list[dict[str, Any]],
         max_decisions: int = 10,
+        deadline: float | None = None,
     ) -> list[TradeDecision]:
         """Scan items and make decisions.
 
+        Items are scored in chunks on the scoring worker pool, the event
+        loop only turns finished analyses into decisions.
+
         Args:
             items: List of items to analyze
             max_decisions: Maximum decisions to return
+            deadline: Time budget for loading stored price history and
+                scoring in seconds; items not scored in time are skipped
 
         Returns:
             List of TradeDecision sorted by confidence
         """
         decisions = []
 
-        # Process items concurrently (in batches to avoid overload)
-        batch_size = 20
-        for i in range(0, len(items), batch_size):
-            batch = items[i : i + batch_size]
-            tasks = [self.make_decision(item) for item in batch]
-            batch_decisions = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for idx, decision in enumerate(batch_decisions):
-                if isinstance(decision, Exception):
-                    # Log the exception for debugging
-                    item_name = batch[idx].get("title", batch[idx].get("name", "unknown"))
-                    logger.warning(
-                        "batch_decision_failed",
-                        extra={"item_name": item_name, "error": str(decision)},
-                    )
-                elif isinstance(decision, TradeDecision):
-                    if decision.action not in {TradeAction.HOLD, TradeAction.SKIP}:
-                        decisions.append(decision)
+        self._ensure_models()
+        started = time.monotonic()
+        items = await self._with_stored_history(items, timeout=deadline)
+        if deadline is not None:
+            deadline = max(0.0, deadline - (time.monotonic() - started))
+        analyses = await self._get_scoring_executor().map_batches(
+            self._score_items, items, deadline=deadline
+        )
+
+        for item, analysis in zip(items, analyses, strict=True):
+            if analysis is None:
+                continue  # Not scored before the deadline
+            if isinstance(analysis, BaseException):
+                # Log the exception for debugging
+                item_name = item.get("title", item.get("name", "unknown"))
+                logger.warning(
+                    "batch_decision_failed",
+                    extra={"item_name": item_name, "error": str(analysis)},
+                )
+                continue
+
+            decision = self._decide(analysis)
+            if decision.action not in {TradeAction.HOLD, TradeAction.SKIP}:
+                decisions.append(decision)
 
         # Sort by confidence and return top N
         decisions.sort(key=lambda d: d.confidence, reverse=True)
@@ -969,12 +1175,15 @@ _coordinator: AICoordinator | None = None
 def get_ai_coordinator(
     autonomy_level: AutonomyLevel = AutonomyLevel.MANUAL,
     user_balance: float = 100.0,
+    price_history_store: PriceHistoryStore | None = None,
 ) -> AICoordinator:
     """Get or create global AI coordinator instance.
 
     Args:
         autonomy_level: Initial autonomy level
         user_balance: Initial user balance
+        price_history_store: Stored price history (also set on an existing
+            instance)
 
     Returns:
         AICoordinator instance
@@ -985,6 +1194,8 @@ def get_ai_coordinator(
             autonomy_level=autonomy_level,
             user_balance=user_balance,
         )
+    if price_history_store is not None:
+        _coordinator.price_history_store = price_history_store
     return _coordinator
 
 
@@ -8,9 +8,11 @@ ML Data Scheduler - Автоматизация сбора данных и обу
 Example:
     >>> from src.ml.data_scheduler import MLDataScheduler
     >>> from src.ml.enhanced_predictor import EnhancedPricePredictor
+    >>> from src.ml.real_price_collector import RealPriceCollector
     >>>
     >>> predictor = EnhancedPricePredictor()
-    >>> scheduler = MLDataScheduler(predictor)
+    >>> collector = RealPriceCollector(dmarket_api=dmarket_api)
+    >>> scheduler = MLDataScheduler(predictor, collector=collector)
     >>>
     >>> # Запуск планировщика
     >>> await scheduler.start()
@@ -29,6 +31,7 @@ import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import structlog
@@ -36,6 +39,7 @@ import structlog
 
 if TYPE_CHECKING:
     from src.ml.enhanced_predictor import EnhancedPricePredictor
+    from src.ml.real_price_collector import RealPriceCollector
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -84,6 +88,8 @@ class SchedulerConfig:
         max_retries: Максимум повторов.
         retry_delay_minutes: Задержка между повторами (минуты).
         retraining_interval_hours: Алиас для training_interval_hours (часы).
+        collection_dir: Каталог собранных цен (JSON Lines) и checkpoint'а
+            прерванного сбора.
     """
 
     collection_interval_hours: float = 6.0
@@ -101,6 +107,7 @@ class SchedulerConfig:
     max_retries: int = 3
     retry_delay_minutes: float = 5.0
     retraining_interval_hours: float = 24.0  # Алиас для совместимости
+    collection_dir: str = "data/ml_collection"
 
 
 @dataclass
@@ -202,6 +209,7 @@ class MLDataScheduler:
         self,
         predictor: EnhancedPricePredictor,
         config: SchedulerConfig | None = None,
+        collector: RealPriceCollector | None = None,
     ) -> None:
         """Инициализация планировщика.
 
@@ -209,9 +217,12 @@ class MLDataScheduler:
             predictor: Экземпляр EnhancedPricePredictor.
             config: Опциональная конфигурация. Если None, используются
                 значения по умолчанию.
+            collector: Коллектор цен с API клиентами. Если None, создаётся
+                при сборе.
         """
         self.predictor = predictor
         self.config = config or SchedulerConfig()
+        self.collector = collector
         self.state = SchedulerState.STOPPED
         self.stats = SchedulerStats()
 
@@ -752,7 +763,8 @@ class MLDataScheduler:
                     )
                     await asyncio.sleep(self.config.retry_delay_minutes * 60)
                     try:
-                        result = await self._collect_data_only(game_types or ["csgo"])
+                        # Продолжает сбор с сохранённого checkpoint'а
+                        result = await self._collect_data_only(games_to_collect)
                         items_collected = result.get("total_samples", 0)
                         error_message = None
                         self.stats.successful_collections += 1
@@ -780,14 +792,28 @@ class MLDataScheduler:
     ) -> dict[str, Any]:
         """Собрать данные без обучения модели.
 
+        Цены всех источников собираются постранично и параллельно и сразу
+        дописываются в JSON Lines файл в ``config.collection_dir``. После
+        каждой страницы сохраняется checkpoint: прерванный сбор (в том числе
+        повтор в ``_run_collection``) продолжается с места остановки и
+        дописывает тот же файл.
+
         Args:
             game_types: Список игр.
 
         Returns:
             Информация о собранных данных.
+
+        Raises:
+            RuntimeError: Если сбор какого-либо источника прерван (checkpoint
+                сохранён для продолжения).
         """
-        from src.ml.real_price_collector import GameType, RealPriceCollector
-        from src.ml.training_data_manager import TrainingDataManager
+        from src.ml.real_price_collector import (
+            CollectionCheckpoint,
+            GameType,
+            JsonlPriceSink,
+            RealPriceCollector,
+        )
 
         # Маппинг строк в GameType enum
         game_type_map = {
@@ -802,77 +828,101 @@ class MLDataScheduler:
         # Конвертировать game_types
         games = []
         for gt in game_types:
-            if gt.lower() in game_type_map:
-                games.append(game_type_map[gt.lower()])
+            game_type = game_type_map.get(gt.lower())
+            if game_type is not None and game_type not in games:
+                games.append(game_type)
 
         if not games:
             games = [GameType.CSGO]
 
-        # Инициализировать коллектор и менеджер данных
-        collector = RealPriceCollector()
-        data_manager = TrainingDataManager()
+        # Отключённые в конфигурации источники не собираются
+        collector = self.collector or RealPriceCollector()
+        if not self.config.enable_dmarket or not self.config.enable_waxpeer:
+            collector = RealPriceCollector(
+                dmarket_api=collector.dmarket_api if self.config.enable_dmarket else None,
+                waxpeer_api=collector.waxpeer_api if self.config.enable_waxpeer else None,
+                normalizer=collector.normalizer,
+                timeout=collector.timeout,
+            )
+
+        if collector.dmarket_api is None and collector.waxpeer_api is None:
+            logger.error(
+                "collection_no_sources",
+                enable_dmarket=self.config.enable_dmarket,
+                enable_waxpeer=self.config.enable_waxpeer,
+            )
+            raise RuntimeError(
+                "Нет API клиентов для сбора: передайте collector с клиентами DMarket или Waxpeer"
+            )
+
+        # Checkpoint прерванного сбора и файл, в который он писал
+        collection_dir = Path(self.config.collection_dir)
+        checkpoint = CollectionCheckpoint.load(collection_dir / "checkpoint.json")
+        sink = JsonlPriceSink(collection_dir / f"prices_{checkpoint.run_id}.jsonl")
 
         collected_info: dict[str, Any] = {
             "total_samples": 0,
             "games_collected": [],
             "sources": {"dmarket": 0, "waxpeer": 0, "steam": 0},
             "duration": 0,
+            "output_file": str(sink.path),
         }
 
         start_time = datetime.now()
+        interrupted: list[str] = []
 
         for game_type in games:
             try:
-                # Собрать цены
-                prices = await collector.collect_prices(
-                    game_type=game_type,
-                    max_items=self.config.items_per_collection,
-                    include_dmarket=self.config.enable_dmarket,
-                    include_waxpeer=self.config.enable_waxpeer,
-                    include_steam=self.config.enable_steam,
+                result = await collector.collect_bulk_prices(
+                    game=game_type,
+                    limit=self.config.items_per_collection,
+                    sink=sink,
+                    checkpoint=checkpoint,
                 )
-
-                if prices:
-                    # Сохранить в TrainingDataManager
-                    for price in prices:
-                        data_manager.add_price_sample(
-                            item_id=price.item_id,
-                            title=price.title,
-                            normalized_price=price.price_usd,
-                            source=price.source.value,
-                            game=game_type.value,
-                            timestamp=price.timestamp,
-                            metadata={
-                                "original_price": price.original_price,
-                                "currency": price.currency,
-                            },
-                        )
-
-                        # Обновить статистику по источникам
-                        if price.source.value in collected_info["sources"]:
-                            collected_info["sources"][price.source.value] += 1
-
-                    collected_info["total_samples"] += len(prices)
-                    collected_info["games_collected"].append(game_type.value)
-
-                    logger.info(
-                        "game_data_collected",
-                        game=game_type.value,
-                        samples=len(prices),
-                    )
-
             except Exception as e:
                 logger.warning(
                     "game_collection_failed",
                     game=game_type.value,
                     error=str(e),
                 )
+                interrupted.append(game_type.value)
+                continue
+
+            # Обновить статистику по источникам
+            for source_result in result.results:
+                if source_result.source.value in collected_info["sources"]:
+                    collected_info["sources"][source_result.source.value] += (
+                        source_result.items_collected
+                    )
+
+            # Источник, не дошедший до конца, сохранил cursor в checkpoint
+            if not all(
+                checkpoint.is_complete(CollectionCheckpoint.key(r.source, game_type))
+                for r in result.results
+            ):
+                interrupted.append(game_type.value)
 
-        # Сохранить данные
-        data_manager.save_data()
+            if result.total_items:
+                collected_info["total_samples"] += result.total_items
+                collected_info["games_collected"].append(game_type.value)
+
+                logger.info(
+                    "game_data_collected",
+                    game=game_type.value,
+                    samples=result.total_items,
+                )
 
         collected_info["duration"] = (datetime.now() - start_time).total_seconds()
 
+        if interrupted:
+            raise RuntimeError(
+                f"Сбор прерван для {', '.join(interrupted)}: "
+                f"{sink.rows_written} строк записано, продолжение с checkpoint'а"
+            )
+
+        # Сбор завершён - следующий запуск начнётся с первой страницы
+        checkpoint.clear()
+
         return collected_info
 
     async def _run_training(self) -> TaskResult:
@@ -909,21 +959,11 @@ class MLDataScheduler:
                 }
 
             else:
-                # Fallback: использовать старый метод обучения
-                from src.ml.training_data_manager import TrainingDataManager
-
-                data_manager = TrainingDataManager()
-                X, y = data_manager.prepare_training_data()
-
-                if len(X) >= self.config.min_samples_for_training:
-                    self.predictor.train(X, y)
-                    samples_used = len(X)
-                    details = {"method": "legacy_training"}
-                else:
-                    raise ValueError(
-                        f"Недостаточно данных для обучения: "
-                        f"{len(X)} < {self.config.min_samples_for_training}"
-                    )
+                # Fallback: дообучение на сохранённых версиях датасета
+                samples_used = await asyncio.to_thread(
+                    self._train_on_stored_datasets, ["csgo", "dota2"]
+                )
+                details = {"method": "incremental_training"}
 
             self.stats.total_trainings += 1
             self.stats.successful_trainings += 1
@@ -954,6 +994,48 @@ class MLDataScheduler:
             details=details,
         )
 
+    def _train_on_stored_datasets(self, game_types: list[str]) -> int:
+        """Дообучить модель на последних версиях датасета по играм.
+
+        Версии загружаются через memory-map, строки подаются в
+        ``predictor.partial_fit`` пакетами ``iter_batches``, без чтения
+        датасета в память целиком.
+
+        Args:
+            game_types: Список игр.
+
+        Returns:
+            Количество строк, на которых обучена модель.
+
+        Raises:
+            ValueError: Если predictor не поддерживает partial_fit или
+                данных недостаточно.
+        """
+        from src.ml.training_data_manager import TrainingDataManager
+
+        if not hasattr(self.predictor, "partial_fit"):
+            raise ValueError("Модель не поддерживает дообучение (partial_fit)")
+
+        data_manager = TrainingDataManager()
+        datasets = [
+            data_manager.load_version(metadata.version_id, verify_checksum=False)
+            for game in game_types
+            if (metadata := data_manager.get_latest_version(game)) is not None
+        ]
+
+        total = sum(len(dataset) for dataset in datasets)
+        if total < self.config.min_samples_for_training:
+            raise ValueError(
+                f"Недостаточно данных для обучения: "
+                f"{total} < {self.config.min_samples_for_training}"
+            )
+
+        for dataset in datasets:
+            for X, y in dataset.iter_batches():
+                self.predictor.partial_fit(X, y)
+
+        return total
+
     async def _run_cleanup(self) -> TaskResult:
         """Выполнить очистку старых данных.
 
@@ -1147,6 +1229,7 @@ def create_scheduler(
     enable_dmarket: bool = True,
     enable_waxpeer: bool = True,
     enable_steam: bool = True,
+    collector: RealPriceCollector | None = None,
 ) -> MLDataScheduler:
     """Создать планировщик с заданной конфигурацией.
 
@@ -1157,6 +1240,7 @@ def create_scheduler(
         enable_dmarket: Включить DMarket.
         enable_waxpeer: Включить Waxpeer.
         enable_steam: Включить Steam.
+        collector: Коллектор цен с API клиентами.
 
     Returns:
         Настроенный экземпляр MLDataScheduler.
@@ -1164,6 +1248,7 @@ def create_scheduler(
     Example:
         >>> scheduler = create_scheduler(
         ...     predictor,
+        ...     collector=RealPriceCollector(dmarket_api=api),
         ...     collection_interval_hours=4.0,
         ...     training_interval_hours=12.0,
         ... )
@@ -1177,25 +1262,27 @@ def create_scheduler(
         enable_steam=enable_steam,
     )
 
-    return MLDataScheduler(predictor, config)
+    return MLDataScheduler(predictor, config, collector=collector)
 
 
 async def quick_start_scheduler(
     predictor: EnhancedPricePredictor,
+    collector: RealPriceCollector | None = None,
 ) -> MLDataScheduler:
     """Быстро создать и запустить планировщик с настройками по умолчанию.
 
     Args:
         predictor: Экземпляр EnhancedPricePredictor.
+        collector: Коллектор цен с API клиентами.
 
     Returns:
         Запущенный экземпляр MLDataScheduler.
 
     Example:
-        >>> scheduler = await quick_start_scheduler(predictor)
+        >>> scheduler = await quick_start_scheduler(predictor, collector)
         >>> # ... бот работает ...
         >>> await scheduler.stop()
     """
-    scheduler = MLDataScheduler(predictor)
+    scheduler = MLDataScheduler(predictor, collector=collector)
     await scheduler.start()
     return scheduler
@@ -5,6 +5,8 @@
 2. Расширенный Feature Engineering
 3. Pipeline для защиты от ошибок API
 4. Поддержка всех игр: CS2, Dota 2, TF2, Rust
+5. Пакетный прогноз (predict_batch): один вызов каждой модели на матрицу
+   признаков всех предметов
 
 Все библиотеки бесплатные (scikit-learn, xgboost опционально).
 """
@@ -19,6 +21,9 @@ from typing import Any
 import joblib
 import numpy as np
 
+from src.ml.feature_extractor import HISTORY_FEATURES, MarketHistoryBatch
+from src.ml.price_predictor import PredictionBatch
+
 
 logger = logging.getLogger(__name__)
 
@@ -355,178 +360,82 @@ class EnhancedFeatureExtractor:
         Returns:
             EnhancedFeatures с расширенными признаками
         """
-        features = EnhancedFeatures(
-            current_price=current_price,
-            game_type=game,
-        )
-
-        # Временные признаки
-        now = datetime.now(UTC)
-        features.hour_of_day = now.hour
-        features.day_of_week = now.weekday()
-        features.is_weekend = features.day_of_week >= 5
-        features.is_peak_hours = self.PEAK_HOURS_START <= features.hour_of_day < self.PEAK_HOURS_END
-
-        # Базовые ценовые признаки
-        if price_history and len(price_history) > 0:
-            features = self._extract_price_features(features, price_history, now)
-        else:
-            features.data_quality_score *= 0.5
-
-        # Признаки продаж
-        if sales_history and len(sales_history) > 0:
-            features = self._extract_sales_features(features, sales_history, now)
-        else:
-            features.data_quality_score *= 0.7
-
-        # Рыночные признаки
-        if market_offers and len(market_offers) > 0:
-            features = self._extract_market_features(features, market_offers)
-        else:
-            features.data_quality_score *= 0.8
-
-        # Relative Strength
-        features = self._extract_relative_strength(features, game)
-
-        # Game-specific признаки
-        if item_data:
-            features = self._extract_game_specific_features(features, game, item_data, item_name)
-
-        return features
-
-    def _extract_price_features(
+        return self.extract_batch(
+            item_names=[item_name],
+            current_prices=[current_price],
+            games=[game],
+            price_histories=[price_history],
+            sales_histories=[sales_history],
+            market_offers=[market_offers],
+            item_data=[item_data],
+        )[0]
+
+    def extract_batch(
         self,
-        features: EnhancedFeatures,
-        price_history: list[tuple[datetime, float]],
-        now: datetime,
-    ) -> EnhancedFeatures:
-        """Извлечь ценовые признаки из истории."""
-        cutoff_7d = now - timedelta(days=7)
-        cutoff_24h = now - timedelta(hours=24)
-        cutoff_1h = now - timedelta(hours=1)
-
-        prices_7d = [p for ts, p in price_history if ts >= cutoff_7d]
-        prices_24h = [p for ts, p in price_history if ts >= cutoff_24h]
-        prices_1h = [p for ts, p in price_history if ts >= cutoff_1h]
-
-        if prices_7d:
-            features.price_mean_7d = float(np.mean(prices_7d))
-            features.price_std_7d = float(np.std(prices_7d)) if len(prices_7d) > 1 else 0.0
-            features.price_min_7d = min(prices_7d)
-            features.price_max_7d = max(prices_7d)
-
-            if features.price_mean_7d > 0:
-                features.volatility = features.price_std_7d / features.price_mean_7d
-
-        # Изменение цены
-        if prices_7d and len(prices_7d) >= 2:
-            first_price = prices_7d[0]
-            if first_price > 0:
-                features.price_change_7d = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        if prices_24h and len(prices_24h) >= 2:
-            first_price = prices_24h[0]
-            if first_price > 0:
-                features.price_change_24h = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        if prices_1h and len(prices_1h) >= 2:
-            first_price = prices_1h[0]
-            if first_price > 0:
-                features.price_change_1h = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        # RSI
-        if len(prices_7d) >= self.RSI_PERIOD:
-            features.rsi = self._calculate_rsi(prices_7d)
-
-        # Momentum
-        if len(prices_24h) >= 2:
-            features.momentum = self._calculate_momentum(prices_24h)
+        item_names: list[str],
+        current_prices: list[float],
+        games: list[GameType] | None = None,
+        price_histories: list[list[tuple[datetime, float]] | None] | None = None,
+        sales_histories: list[list[dict[str, Any]] | None] | None = None,
+        market_offers: list[list[dict[str, Any]] | None] | None = None,
+        item_data: list[dict[str, Any] | None] | None = None,
+        now: datetime | None = None,
+    ) -> list[EnhancedFeatures]:
+        """Извлечь расширенные признаки для пакета предметов.
+
+        Признаки из историй цен, продаж и предложений считаются колоночно
+        по всему пакету (MarketHistoryBatch), game-specific - по предметам.
 
-        return features
+        Args:
+            item_names: Названия предметов
+            current_prices: Текущие цены
+            games: Игры предметов (по умолчанию CS2)
+            price_histories: Истории цен по предметам
+            sales_histories: Истории продаж по предметам
+            market_offers: Предложения на рынке по предметам
+            item_data: Дополнительные данные о предметах
+            now: Момент расчёта (по умолчанию - текущее время)
 
-    def _extract_sales_features(
-        self,
-        features: EnhancedFeatures,
-        sales_history: list[dict[str, Any]],
-        now: datetime,
-    ) -> EnhancedFeatures:
-        """Извлечь признаки из истории продаж с учётом времени."""
-        cutoff_24h = now - timedelta(hours=24)
-        cutoff_7d = now - timedelta(days=7)
-
-        sales_24h = 0
-        sales_7d = 0
-        sale_times: list[datetime] = []
-
-        for sale in sales_history:
-            sale_time = sale.get("timestamp") or sale.get("date")
-            if isinstance(sale_time, str):
-                try:
-                    sale_time = datetime.fromisoformat(sale_time)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(sale_time, (int, float)):
-                sale_time = datetime.fromtimestamp(sale_time, tz=UTC)
-
-            if sale_time:
-                sale_times.append(sale_time)
-                if sale_time >= cutoff_7d:
-                    sales_7d += 1
-                    if sale_time >= cutoff_24h:
-                        sales_24h += 1
-
-        features.sales_count_24h = sales_24h
-        features.sales_count_7d = sales_7d
-        features.avg_sales_per_day = sales_7d / 7.0 if sales_7d > 0 else 0.0
-
-        # Time Since Last Sale (НОВОЕ)
-        if sale_times:
-            last_sale = max(sale_times)
-            features.time_since_last_sale = (now - last_sale).total_seconds()
-
-            # Среднее время между продажами
-            if len(sale_times) >= 2:
-                sorted_times = sorted(sale_times)
-                intervals = [
-                    (sorted_times[i + 1] - sorted_times[i]).total_seconds()
-                    for i in range(len(sorted_times) - 1)
-                ]
-                features.avg_time_between_sales = float(np.mean(intervals))
+        Returns:
+            Список EnhancedFeatures в порядке предметов
+        """
+        now = now or datetime.now(UTC)
+        games = games or [GameType.CS2] * len(item_names)
+        item_data = item_data or [None] * len(item_names)
 
-        return features
+        batch = MarketHistoryBatch.from_histories(
+            current_prices, price_histories, sales_histories, market_offers
+        )
+        columns = batch.history_columns(now, self.RSI_PERIOD)
+        names = (*HISTORY_FEATURES, "time_since_last_sale", "avg_time_between_sales")
 
-    def _extract_market_features(
-        self,
-        features: EnhancedFeatures,
-        market_offers: list[dict[str, Any]],
-    ) -> EnhancedFeatures:
-        """Извлечь признаки из текущих предложений."""
-        features.market_depth = float(len(market_offers))
+        hour_of_day = now.hour
+        day_of_week = now.weekday()
+        is_peak_hours = self.PEAK_HOURS_START <= hour_of_day < self.PEAK_HOURS_END
 
-        price_range_low = features.current_price * 0.95
-        price_range_high = features.current_price * 1.05
+        features_list = []
+        rows = zip(*(columns[name].tolist() for name in names), strict=True)
+        for item_name, game, data, row in zip(item_names, games, item_data, rows, strict=True):
+            features = EnhancedFeatures(
+                **dict(zip(names, row, strict=True)),
+                game_type=game,
+                hour_of_day=hour_of_day,
+                day_of_week=day_of_week,
+                is_weekend=day_of_week >= 5,
+                is_peak_hours=is_peak_hours,
+                feature_timestamp=now,
+            )
 
-        competitive_offers = 0
-        for offer in market_offers:
-            offer_price = offer.get("price", {})
-            if isinstance(offer_price, dict):
-                price = float(offer_price.get("USD", 0)) / 100
-            else:
-                price = float(offer_price) / 100 if offer_price else 0
+            # Relative Strength
+            features = self._extract_relative_strength(features, game)
 
-            if price_range_low <= price <= price_range_high:
-                competitive_offers += 1
+            # Game-specific признаки
+            if data:
+                features = self._extract_game_specific_features(features, game, data, item_name)
 
-        if len(market_offers) > 0:
-            features.competition_level = competitive_offers / len(market_offers)
+            features_list.append(features)
 
-        return features
+        return features_list
 
     def _extract_relative_strength(
         self,
@@ -1002,10 +911,10 @@ class EnhancedPricePredictor:
         game = game or self.game
 
         # Проверяем кэш
-        cache_key = f"{game.value}:{item_name}:{current_price:.2f}"
-        if use_cache and cache_key in self._prediction_cache:
-            cached_time, cached_pred = self._prediction_cache[cache_key]
-            if datetime.now(UTC) - cached_time < self._cache_ttl:
+        cache_key = self._cache_key(game, item_name, current_price)
+        if use_cache:
+            cached_pred = self._get_cached(cache_key)
+            if cached_pred is not None:
                 return cached_pred
 
         # Извлекаем признаки
@@ -1027,24 +936,139 @@ class EnhancedPricePredictor:
 
         return prediction
 
+    def predict_batch(
+        self,
+        items: list[dict[str, Any]],
+        game: GameType | None = None,
+        use_cache: bool = True,
+    ) -> PredictionBatch:
+        """Прогнозировать цены для списка предметов одним вызовом моделей.
+
+        Признаки всех предметов без свежего прогноза в кэше собираются в одну
+        матрицу, каждая модель вызывается на ней один раз. Кэш ведётся по
+        предмету, с теми же ключами, что и у ``predict``.
+
+        Args:
+            items: Предметы - словари с аргументами ``predict`` (item_name,
+                current_price и опционально game, price_history, sales_history,
+                market_offers, item_data)
+            game: Игра по умолчанию для предметов без ключа "game"
+            use_cache: Использовать кэш
+
+        Returns:
+            PredictionBatch с колонками прогнозов в порядке items
+        """
+        default_game = game or self.game
+        predictions: list[dict[str, Any] | None] = [None] * len(items)
+        cache_keys: list[str] = []
+        misses: list[int] = []
+        miss_names: list[str] = []
+        miss_prices: list[float] = []
+        miss_games: list[GameType] = []
+
+        for index, item in enumerate(items):
+            item_name = item["item_name"]
+            current_price = float(item["current_price"])
+            item_game = item.get("game") or default_game
+
+            cache_key = self._cache_key(item_game, item_name, current_price)
+            cache_keys.append(cache_key)
+            if use_cache:
+                predictions[index] = self._get_cached(cache_key)
+                if predictions[index] is not None:
+                    continue
+
+            misses.append(index)
+            miss_names.append(item_name)
+            miss_prices.append(current_price)
+            miss_games.append(item_game)
+
+        if misses:
+            miss_features = self.feature_extractor.extract_batch(
+                item_names=miss_names,
+                current_prices=miss_prices,
+                games=miss_games,
+                price_histories=[items[index].get("price_history") for index in misses],
+                sales_histories=[items[index].get("sales_history") for index in misses],
+                market_offers=[items[index].get("market_offers") for index in misses],
+                item_data=[items[index].get("item_data") for index in misses],
+            )
+            now = datetime.now(UTC)
+            for index, prediction in zip(
+                misses, self._make_predictions(miss_names, miss_features), strict=True
+            ):
+                predictions[index] = prediction
+                self._prediction_cache[cache_keys[index]] = (now, prediction)
+
+        return PredictionBatch.from_predictions(predictions, cache_hits=len(items) - len(misses))
+
+    def _cache_key(self, game: GameType, item_name: str, current_price: float) -> str:
+        """Ключ кэша прогноза для одного предмета."""
+        return f"{game.value}:{item_name}:{current_price:.2f}"
+
+    def _get_cached(self, cache_key: str) -> dict[str, Any] | None:
+        """Получить прогноз из кэша, если он не устарел."""
+        cached = self._prediction_cache.get(cache_key)
+        if cached is None:
+            return None
+        cached_time, cached_pred = cached
+        if datetime.now(UTC) - cached_time < self._cache_ttl:
+            return cached_pred
+        return None
+
     def _make_prediction(
         self,
         item_name: str,
         features: EnhancedFeatures,
     ) -> dict[str, Any]:
         """Выполнить прогнозирование."""
-        current_price = features.current_price
+        return self._make_predictions([item_name], [features])[0]
 
-        # Пробуем использовать ML модели
+    def _make_predictions(
+        self,
+        item_names: list[str],
+        features_list: list[EnhancedFeatures],
+    ) -> list[dict[str, Any]]:
+        """Выполнить прогнозирование для набора предметов.
+
+        Прогноз ансамбля не зависит от горизонта (горизонт меняет только
+        std), поэтому модели вызываются один раз на всю матрицу признаков.
+        """
         if self._has_trained_models():
-            predicted_1h, std_1h = self._ensemble_predict(features, horizon_hours=1)
-            predicted_24h, std_24h = self._ensemble_predict(features, horizon_hours=24)
-            predicted_7d, std_7d = self._ensemble_predict(features, horizon_hours=168)
+            predicted, std = self._ensemble_predict_matrix(features_list)
+            horizons = [
+                ((p, s), (p, s), (p, s * 1.2))
+                for p, s in zip(predicted.tolist(), std.tolist(), strict=True)
+            ]
         else:
             # Fallback: статистические методы
-            predicted_1h, std_1h = self._statistical_predict(features, horizon_hours=1)
-            predicted_24h, std_24h = self._statistical_predict(features, horizon_hours=24)
-            predicted_7d, std_7d = self._statistical_predict(features, horizon_hours=168)
+            horizons = [
+                (
+                    self._statistical_predict(features, horizon_hours=1),
+                    self._statistical_predict(features, horizon_hours=24),
+                    self._statistical_predict(features, horizon_hours=168),
+                )
+                for features in features_list
+            ]
+
+        return [
+            self._build_prediction(item_name, features, *horizon)
+            for item_name, features, horizon in zip(item_names, features_list, horizons, strict=True)
+        ]
+
+    def _build_prediction(
+        self,
+        item_name: str,
+        features: EnhancedFeatures,
+        horizon_1h: tuple[float, float],
+        horizon_24h: tuple[float, float],
+        horizon_7d: tuple[float, float],
+    ) -> dict[str, Any]:
+        """Собрать прогноз из пар (цена, std) по горизонтам."""
+        current_price = features.current_price
+        predicted_1h, std_1h = horizon_1h
+        predicted_24h, std_24h = horizon_24h
+        predicted_7d, std_7d = horizon_7d
 
         # Рассчитываем уверенность
         relative_std = std_24h / current_price if current_price > 0 else 1.0
@@ -1119,66 +1143,60 @@ class EnhancedPricePredictor:
         horizon_hours: int,
     ) -> tuple[float, float]:
         """Ансамблевый прогноз с использованием всех моделей."""
-        X = features.to_array().reshape(1, -1)
+        predicted, std = self._ensemble_predict_matrix([features])
+
+        # Масштабирование по горизонту
+        if horizon_hours > 24:
+            std *= 1.2
+
+        return float(predicted[0]), float(std[0])
+
+    def _ensemble_predict_matrix(
+        self,
+        features_list: list[EnhancedFeatures],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Ансамблевый прогноз для матрицы признаков (по строке на предмет).
+
+        Returns:
+            Кортеж (прогнозы, std) без масштабирования по горизонту
+        """
+        X = np.vstack([features.to_array() for features in features_list])
         X = self.pipeline.transform(X)
+        current_prices = np.array([features.current_price for features in features_list], dtype=float)
 
         predictions = []
         weights = []
 
-        # RandomForest
-        try:
-            rf_pred = self._random_forest.predict(X)[0]
-            predictions.append(rf_pred)
-            weights.append(0.35)
-        except Exception:
-            pass
-
-        # XGBoost (если доступен)
-        if self._xgboost is not None:
+        models = [
+            (self._random_forest, 0.35),
+            (self._xgboost, 0.35),  # None, если XGBoost недоступен
+            (self._gradient_boost, 0.20),
+            (self._ridge, 0.10),
+        ]
+        for model, weight in models:
+            if model is None:
+                continue
             try:
-                xgb_pred = self._xgboost.predict(X)[0]
-                predictions.append(xgb_pred)
-                weights.append(0.35)
+                predictions.append(np.asarray(model.predict(X), dtype=float))
+                weights.append(weight)
             except Exception:
                 pass
 
-        # Gradient Boosting
-        try:
-            gb_pred = self._gradient_boost.predict(X)[0]
-            predictions.append(gb_pred)
-            weights.append(0.20)
-        except Exception:
-            pass
-
-        # Ridge
-        try:
-            ridge_pred = self._ridge.predict(X)[0]
-            predictions.append(ridge_pred)
-            weights.append(0.10)
-        except Exception:
-            pass
-
         if not predictions:
-            return features.current_price, features.current_price * 0.1
+            return current_prices, current_prices * 0.1
 
-        # Нормализуем веса
-        total_weight = sum(weights[: len(predictions)])
-        weights = [w / total_weight for w in weights[: len(predictions)]]
+        stacked = np.vstack(predictions)
 
-        # Взвешенное среднее
-        prediction = sum(p * w for p, w in zip(predictions, weights, strict=False))
+        # Взвешенное среднее (веса нормализуются)
+        prediction = np.average(stacked, axis=0, weights=weights)
 
         # Стандартное отклонение
         if len(predictions) >= 2:
-            std = float(np.std(predictions))
+            std = np.std(stacked, axis=0)
         else:
-            std = abs(predictions[0] - features.current_price) * 0.1
+            std = np.abs(stacked[0] - current_prices) * 0.1
 
-        # Масштабирование по горизонту
-        if horizon_hours > 24:
-            std *= 1.2
-
-        return float(prediction), float(std)
+        return prediction, std
 
     def _statistical_predict(
         self,
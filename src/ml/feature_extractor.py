@@ -2,10 +2,16 @@
 
 Этот модуль извлекает числовые признаки из данных рынка DMarket
 для использования в ML моделях прогнозирования.
+
+Истории цен, продаж и предложений пакета предметов хранятся в колоночном
+виде (MarketHistoryBatch): значения всех предметов лежат в общих массивах,
+границы предметов задаются смещениями. Все признаки считаются оконными
+редукциями сразу по всему пакету; один предмет - это пакет из одной строки,
+поэтому признаки для обучения и для пакетного прогноза совпадают побитово.
 """
 
 from dataclasses import dataclass, field
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from enum import StrEnum
 import logging
 from typing import Any
@@ -15,6 +21,31 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+SECONDS_1H = 3600.0
+SECONDS_24H = 24 * SECONDS_1H
+SECONDS_7D = 7 * SECONDS_24H
+
+# Признаки из историй цен, продаж и предложений (поля PriceFeatures)
+HISTORY_FEATURES = (
+    "current_price",
+    "price_mean_7d",
+    "price_std_7d",
+    "price_min_7d",
+    "price_max_7d",
+    "price_change_1h",
+    "price_change_24h",
+    "price_change_7d",
+    "rsi",
+    "volatility",
+    "momentum",
+    "sales_count_24h",
+    "sales_count_7d",
+    "avg_sales_per_day",
+    "market_depth",
+    "competition_level",
+    "data_quality_score",
+)
+
 
 class TrendDirection(StrEnum):
     """Направление тренда цены."""
@@ -124,6 +155,348 @@ class PriceFeatures:
         ]
 
 
+def _to_epoch(timestamp: datetime) -> float:
+    """Перевести время в секунды Unix (время без зоны считается UTC)."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return timestamp.timestamp()
+
+
+def _sale_epoch(sale: dict[str, Any]) -> float | None:
+    """Время продажи в секундах Unix или None, если его нет или не разобрать."""
+    sale_time = sale.get("timestamp") or sale.get("date")
+    if isinstance(sale_time, str):
+        try:
+            sale_time = datetime.fromisoformat(sale_time)
+        except (ValueError, TypeError):
+            return None
+    elif isinstance(sale_time, (int, float)):
+        return float(sale_time)
+
+    if isinstance(sale_time, datetime):
+        return _to_epoch(sale_time)
+    return None
+
+
+def _offer_price(offer: dict[str, Any]) -> float:
+    """Цена предложения в долларах."""
+    offer_price = offer.get("price", {})
+    if isinstance(offer_price, dict):
+        return float(offer_price.get("USD", 0)) / 100  # Центы в доллары
+    return float(offer_price) / 100 if offer_price else 0
+
+
+def _offsets(counts: list[int]) -> np.ndarray:
+    """Смещения сегментов по их длинам."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _segment_ids(offsets: np.ndarray) -> np.ndarray:
+    """Номер предмета для каждого значения сегментированного массива."""
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _segment_reduce(
+    ufunc: np.ufunc,
+    values: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+) -> np.ndarray:
+    """Редукция ufunc по каждому сегменту (0 для пустых сегментов)."""
+    result = np.zeros(len(counts))
+    nonempty = counts > 0
+    if nonempty.any():
+        result[nonempty] = ufunc.reduceat(values, starts[nonempty])
+    return result
+
+
+@dataclass
+class PriceWindow:
+    """Значения истории цен, попавшие в окно, по предметам пакета.
+
+    Значения предмета i лежат в ``prices[starts[i]:starts[i] + counts[i]]``.
+    """
+
+    prices: np.ndarray
+    segments: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def select(
+        cls,
+        prices: np.ndarray,
+        segments: np.ndarray,
+        mask: np.ndarray,
+        size: int,
+    ) -> "PriceWindow":
+        """Выбрать значения по маске, сохранив порядок внутри предметов."""
+        counts = np.bincount(segments[mask], minlength=size)
+        starts = np.zeros(size, dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        return cls(prices[mask], segments[mask], starts, counts)
+
+    @property
+    def ends(self) -> np.ndarray:
+        """Конец сегмента каждого предмета (не включительно)."""
+        return self.starts + self.counts
+
+    def change_percent(self, current_price: np.ndarray) -> np.ndarray:
+        """Изменение текущей цены относительно первой цены окна, в %."""
+        change = np.zeros(len(self.counts))
+        first = np.zeros(len(self.counts))
+        valid = self.counts >= 2
+        first[valid] = self.prices[self.starts[valid]]
+        valid &= first > 0
+        change[valid] = ((current_price[valid] - first[valid]) / first[valid]) * 100
+        return change
+
+    def rsi(self, period: int) -> np.ndarray:
+        """RSI по последним ``period`` изменениям цены в окне."""
+        size = len(self.counts)
+        rsi = np.full(size, 50.0)
+        eligible = self.counts >= period
+        if not eligible.any():
+            return rsi
+
+        periods = np.maximum(np.minimum(period, self.counts - 1), 1)
+        changes = np.diff(self.prices)
+        owner = self.segments[1:]
+        position = np.arange(1, len(self.prices))
+        take = (
+            (self.segments[:-1] == owner)
+            & eligible[owner]
+            & (self.ends[owner] - position <= periods[owner])
+        )
+        owner = owner[take]
+        changes = changes[take]
+
+        avg_gain = np.bincount(owner, weights=np.maximum(changes, 0), minlength=size) / periods
+        avg_loss = np.bincount(owner, weights=np.maximum(-changes, 0), minlength=size) / periods
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.clip(100 - (100 / (1 + avg_gain / avg_loss)), 0, 100)
+        value = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), value)
+        return np.where(eligible, value, rsi)
+
+    def momentum(self, max_period: int = 10) -> np.ndarray:
+        """Momentum: изменение последней цены окна за ``max_period`` шагов, в %."""
+        momentum = np.zeros(len(self.counts))
+        valid = self.counts >= 2
+        if not valid.any():
+            return momentum
+
+        ends = self.ends[valid]
+        period = np.minimum(max_period, self.counts[valid] - 1)
+        old_price = self.prices[ends - period - 1]
+        current_price = self.prices[ends - 1]
+
+        nonzero = old_price != 0
+        values = np.zeros(len(ends))
+        values[nonzero] = (
+            (current_price[nonzero] - old_price[nonzero]) / old_price[nonzero]
+        ) * 100
+        momentum[valid] = values
+        return momentum
+
+
+@dataclass
+class MarketHistoryBatch:
+    """Истории цен, продаж и предложений пакета предметов в колоночном виде.
+
+    Значения всех предметов лежат в общих массивах, данные предмета i -
+    в срезе ``[offsets[i]:offsets[i + 1]]`` соответствующего массива.
+    Время хранится в секундах Unix, цены предложений - в долларах.
+    """
+
+    current_price: np.ndarray
+    price_times: np.ndarray
+    prices: np.ndarray
+    price_offsets: np.ndarray
+    sale_times: np.ndarray
+    sale_offsets: np.ndarray
+    has_sales: np.ndarray
+    offer_prices: np.ndarray
+    offer_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        """Количество предметов в пакете."""
+        return len(self.current_price)
+
+    @classmethod
+    def from_histories(
+        cls,
+        current_prices: list[float],
+        price_histories: list[list[tuple[datetime, float]] | None] | None = None,
+        sales_histories: list[list[dict[str, Any]] | None] | None = None,
+        market_offers: list[list[dict[str, Any]] | None] | None = None,
+    ) -> "MarketHistoryBatch":
+        """Собрать пакет из историй отдельных предметов.
+
+        Каждая метка времени разбирается один раз.
+
+        Args:
+            current_prices: Текущие цены предметов
+            price_histories: Истории цен [(timestamp, price), ...] по предметам
+            sales_histories: Истории продаж по предметам
+            market_offers: Предложения на рынке по предметам
+
+        Returns:
+            MarketHistoryBatch
+        """
+        size = len(current_prices)
+        price_histories = price_histories or [None] * size
+        sales_histories = sales_histories or [None] * size
+        market_offers = market_offers or [None] * size
+
+        price_times: list[float] = []
+        prices: list[float] = []
+        price_counts: list[int] = []
+        for history in price_histories:
+            history = history or []
+            price_times.extend([
+                ts.timestamp() if ts.tzinfo is not None else _to_epoch(ts) for ts, _ in history
+            ])
+            prices.extend([price for _, price in history])
+            price_counts.append(len(history))
+
+        sale_times: list[float] = []
+        sale_counts: list[int] = []
+        for sales in sales_histories:
+            parsed = [t for t in map(_sale_epoch, sales or []) if t is not None]
+            sale_times.extend(parsed)
+            sale_counts.append(len(parsed))
+
+        offer_prices: list[float] = []
+        offer_counts: list[int] = []
+        for offers in market_offers:
+            offers = offers or []
+            offer_prices.extend(_offer_price(offer) for offer in offers)
+            offer_counts.append(len(offers))
+
+        return cls(
+            current_price=np.asarray(current_prices, dtype=np.float64).reshape(size),
+            price_times=np.asarray(price_times, dtype=np.float64),
+            prices=np.asarray(prices, dtype=np.float64),
+            price_offsets=_offsets(price_counts),
+            sale_times=np.asarray(sale_times, dtype=np.float64),
+            sale_offsets=_offsets(sale_counts),
+            has_sales=np.array([bool(sales) for sales in sales_histories], dtype=bool),
+            offer_prices=np.asarray(offer_prices, dtype=np.float64),
+            offer_offsets=_offsets(offer_counts),
+        )
+
+    def history_columns(self, now: datetime, rsi_period: int = 14) -> dict[str, np.ndarray]:
+        """Рассчитать признаки из историй для всех предметов пакета.
+
+        Args:
+            now: Момент расчёта, от которого отсчитываются окна
+            rsi_period: Период RSI
+
+        Returns:
+            Колонки признаков: поля HISTORY_FEATURES, а также
+            time_since_last_sale и avg_time_between_sales
+        """
+        size = len(self)
+        now_ts = _to_epoch(now)
+        current = self.current_price
+        columns: dict[str, np.ndarray] = {"current_price": current}
+
+        # Окна истории цен
+        segments = _segment_ids(self.price_offsets)
+        window_7d = PriceWindow.select(
+            self.prices, segments, self.price_times >= now_ts - SECONDS_7D, size
+        )
+        window_24h = PriceWindow.select(
+            self.prices, segments, self.price_times >= now_ts - SECONDS_24H, size
+        )
+        window_1h = PriceWindow.select(
+            self.prices, segments, self.price_times >= now_ts - SECONDS_1H, size
+        )
+
+        counts = window_7d.counts
+        mean = np.zeros(size)
+        np.divide(
+            np.bincount(window_7d.segments, weights=window_7d.prices, minlength=size),
+            counts,
+            out=mean,
+            where=counts > 0,
+        )
+        deviation = window_7d.prices - mean[window_7d.segments]
+        std = np.zeros(size)
+        np.divide(
+            np.bincount(window_7d.segments, weights=deviation * deviation, minlength=size),
+            counts,
+            out=std,
+            where=counts > 1,
+        )
+        std = np.sqrt(std)
+        volatility = np.zeros(size)
+        np.divide(std, mean, out=volatility, where=mean > 0)
+
+        columns["price_mean_7d"] = mean
+        columns["price_std_7d"] = std
+        columns["price_min_7d"] = _segment_reduce(
+            np.minimum, window_7d.prices, window_7d.starts, counts
+        )
+        columns["price_max_7d"] = _segment_reduce(
+            np.maximum, window_7d.prices, window_7d.starts, counts
+        )
+        columns["price_change_1h"] = window_1h.change_percent(current)
+        columns["price_change_24h"] = window_24h.change_percent(current)
+        columns["price_change_7d"] = window_7d.change_percent(current)
+        columns["rsi"] = window_7d.rsi(rsi_period)
+        columns["volatility"] = volatility
+        columns["momentum"] = window_24h.momentum()
+
+        # Продажи
+        sale_segments = _segment_ids(self.sale_offsets)
+        sales_24h = np.bincount(
+            sale_segments[self.sale_times >= now_ts - SECONDS_24H], minlength=size
+        )
+        sales_7d = np.bincount(sale_segments[self.sale_times >= now_ts - SECONDS_7D], minlength=size)
+        columns["sales_count_24h"] = sales_24h
+        columns["sales_count_7d"] = sales_7d
+        columns["avg_sales_per_day"] = sales_7d / 7.0
+
+        sale_counts = np.diff(self.sale_offsets)
+        sale_starts = self.sale_offsets[:-1]
+        first_sale = _segment_reduce(np.minimum, self.sale_times, sale_starts, sale_counts)
+        last_sale = _segment_reduce(np.maximum, self.sale_times, sale_starts, sale_counts)
+        columns["time_since_last_sale"] = np.where(sale_counts > 0, now_ts - last_sale, 0.0)
+        avg_interval = np.zeros(size)
+        np.divide(last_sale - first_sale, sale_counts - 1, out=avg_interval, where=sale_counts > 1)
+        columns["avg_time_between_sales"] = avg_interval
+
+        # Предложения: глубина и конкуренция (предложения в пределах ±5% от цены)
+        offer_segments = _segment_ids(self.offer_offsets)
+        depth = np.diff(self.offer_offsets).astype(np.float64)
+        offer_current = current[offer_segments]
+        competitive = (offer_current * 0.95 <= self.offer_prices) & (
+            self.offer_prices <= offer_current * 1.05
+        )
+        competition = np.zeros(size)
+        np.divide(
+            np.bincount(offer_segments[competitive], minlength=size),
+            depth,
+            out=competition,
+            where=depth > 0,
+        )
+        columns["market_depth"] = depth
+        columns["competition_level"] = competition
+
+        # Полнота данных
+        quality = np.ones(size)
+        quality *= np.where(np.diff(self.price_offsets) > 0, 1.0, 0.5)
+        quality *= np.where(self.has_sales, 1.0, 0.7)
+        quality *= np.where(depth > 0, 1.0, 0.8)
+        columns["data_quality_score"] = quality
+
+        return columns
+
+
 class MarketFeatureExtractor:
     """Извлекает признаки из рыночных данных для ML моделей.
 
@@ -165,163 +538,102 @@ class MarketFeatureExtractor:
         Returns:
             PriceFeatures с извлечёнными признаками
         """
-        features = PriceFeatures(current_price=current_price)
-
-        # Временные признаки
-        now = datetime.now(UTC)
-        features.hour_of_day = now.hour
-        features.day_of_week = now.weekday()
-        features.is_weekend = features.day_of_week >= 5
-        features.is_peak_hours = (
-            self.PEAK_HOURS_START <= features.hour_of_day < self.PEAK_HOURS_END
-        )
+        return self.extract_batch(
+            current_prices=[current_price],
+            price_histories=[price_history],
+            sales_histories=[sales_history],
+            market_offers=[market_offers],
+        )[0]
+
+    def extract_batch(
+        self,
+        current_prices: list[float],
+        price_histories: list[list[tuple[datetime, float]] | None] | None = None,
+        sales_histories: list[list[dict[str, Any]] | None] | None = None,
+        market_offers: list[list[dict[str, Any]] | None] | None = None,
+        now: datetime | None = None,
+    ) -> list[PriceFeatures]:
+        """Извлечь признаки для пакета предметов за один проход.
 
-        # Обработка истории цен
-        if price_history and len(price_history) > 0:
-            features = self._extract_price_features(features, price_history, now)
-        else:
-            features.data_quality_score *= 0.5
+        Args:
+            current_prices: Текущие цены предметов
+            price_histories: Истории цен по предметам
+            sales_histories: Истории продаж по предметам
+            market_offers: Предложения на рынке по предметам
+            now: Момент расчёта (по умолчанию - текущее время)
 
-        # Обработка истории продаж
-        if sales_history and len(sales_history) > 0:
-            features = self._extract_sales_features(features, sales_history, now)
-        else:
-            features.data_quality_score *= 0.7
+        Returns:
+            Список PriceFeatures в порядке предметов
+        """
+        now = now or datetime.now(UTC)
+        batch = MarketHistoryBatch.from_histories(
+            current_prices, price_histories, sales_histories, market_offers
+        )
+        columns = batch.history_columns(now, self.RSI_PERIOD)
 
-        # Обработка предложений рынка
-        if market_offers and len(market_offers) > 0:
-            features = self._extract_market_features(features, market_offers)
-        else:
-            features.data_quality_score *= 0.8
+        hour_of_day = now.hour
+        day_of_week = now.weekday()
+        is_peak_hours = self.PEAK_HOURS_START <= hour_of_day < self.PEAK_HOURS_END
 
-        return features
+        features_list = []
+        for row in zip(*(columns[name].tolist() for name in HISTORY_FEATURES), strict=True):
+            features = PriceFeatures(
+                **dict(zip(HISTORY_FEATURES, row, strict=True)),
+                hour_of_day=hour_of_day,
+                day_of_week=day_of_week,
+                is_weekend=day_of_week >= 5,
+                is_peak_hours=is_peak_hours,
+                feature_timestamp=now,
+            )
+            features.trend_direction = self._determine_trend(
+                features.price_change_7d,
+                features.volatility,
+            )
+            features_list.append(features)
+
+        return features_list
 
-    def _extract_price_features(
+    def extract_matrix(
         self,
-        features: PriceFeatures,
-        price_history: list[tuple[datetime, float]],
-        now: datetime,
-    ) -> PriceFeatures:
-        """Извлечь ценовые признаки из истории."""
-        # Фильтруем данные за последние 7 дней
-        cutoff_7d = now - timedelta(days=7)
-        cutoff_24h = now - timedelta(hours=24)
-        cutoff_1h = now - timedelta(hours=1)
-
-        prices_7d = [p for ts, p in price_history if ts >= cutoff_7d]
-        prices_24h = [p for ts, p in price_history if ts >= cutoff_24h]
-        prices_1h = [p for ts, p in price_history if ts >= cutoff_1h]
-
-        if prices_7d:
-            features.price_mean_7d = np.mean(prices_7d)
-            features.price_std_7d = np.std(prices_7d) if len(prices_7d) > 1 else 0.0
-            features.price_min_7d = min(prices_7d)
-            features.price_max_7d = max(prices_7d)
-
-            # Волатильность
-            if features.price_mean_7d > 0:
-                features.volatility = features.price_std_7d / features.price_mean_7d
-
-        # Изменение цены
-        if prices_7d and len(prices_7d) >= 2:
-            first_price = prices_7d[0]
-            if first_price > 0:
-                features.price_change_7d = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        if prices_24h and len(prices_24h) >= 2:
-            first_price = prices_24h[0]
-            if first_price > 0:
-                features.price_change_24h = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        if prices_1h and len(prices_1h) >= 2:
-            first_price = prices_1h[0]
-            if first_price > 0:
-                features.price_change_1h = (
-                    (features.current_price - first_price) / first_price
-                ) * 100
-
-        # RSI
-        if len(prices_7d) >= self.RSI_PERIOD:
-            features.rsi = self._calculate_rsi(prices_7d)
-
-        # Momentum
-        if len(prices_24h) >= 2:
-            features.momentum = self._calculate_momentum(prices_24h)
-
-        # Определение тренда
-        features.trend_direction = self._determine_trend(
-            features.price_change_7d,
-            features.volatility,
-        )
+        batch: MarketHistoryBatch,
+        now: datetime | None = None,
+    ) -> np.ndarray:
+        """Извлечь матрицу признаков пакета без создания PriceFeatures.
 
-        return features
+        Строки совпадают с ``PriceFeatures.to_array()`` тех же предметов.
 
-    def _extract_sales_features(
-        self,
-        features: PriceFeatures,
-        sales_history: list[dict[str, Any]],
-        now: datetime,
-    ) -> PriceFeatures:
-        """Извлечь признаки из истории продаж."""
-        cutoff_24h = now - timedelta(hours=24)
-        cutoff_7d = now - timedelta(days=7)
-
-        # Парсинг дат продаж
-        sales_24h = 0
-        sales_7d = 0
-
-        for sale in sales_history:
-            sale_time = sale.get("timestamp") or sale.get("date")
-            if isinstance(sale_time, str):
-                try:
-                    sale_time = datetime.fromisoformat(sale_time)
-                except (ValueError, TypeError):
-                    continue
-            elif isinstance(sale_time, (int, float)):
-                sale_time = datetime.fromtimestamp(sale_time, tz=UTC)
-
-            if sale_time and sale_time >= cutoff_7d:
-                sales_7d += 1
-                if sale_time >= cutoff_24h:
-                    sales_24h += 1
-
-        features.sales_count_24h = sales_24h
-        features.sales_count_7d = sales_7d
-        features.avg_sales_per_day = sales_7d / 7.0 if sales_7d > 0 else 0.0
-
-        return features
-
-    def _extract_market_features(
-        self,
-        features: PriceFeatures,
-        market_offers: list[dict[str, Any]],
-    ) -> PriceFeatures:
-        """Извлечь признаки из текущих предложений."""
-        features.market_depth = float(len(market_offers))
-
-        # Конкуренция - сколько предложений близко к текущей цене (±5%)
-        price_range_low = features.current_price * 0.95
-        price_range_high = features.current_price * 1.05
-
-        competitive_offers = 0
-        for offer in market_offers:
-            offer_price = offer.get("price", {})
-            if isinstance(offer_price, dict):
-                price = float(offer_price.get("USD", 0)) / 100  # Центы в доллары
-            else:
-                price = float(offer_price) / 100 if offer_price else 0
+        Args:
+            batch: Истории предметов в колоночном виде
+            now: Момент расчёта (по умолчанию - текущее время)
 
-            if price_range_low <= price <= price_range_high:
-                competitive_offers += 1
+        Returns:
+            Матрица (предметы x PriceFeatures.feature_names())
+        """
+        now = now or datetime.now(UTC)
+        columns = batch.history_columns(now, self.RSI_PERIOD)
+        size = len(batch)
+
+        hour_of_day = now.hour
+        day_of_week = now.weekday()
+        columns["hour_of_day"] = np.full(size, float(hour_of_day))
+        columns["day_of_week"] = np.full(size, float(day_of_week))
+        columns["is_weekend"] = np.full(size, 1.0 if day_of_week >= 5 else 0.0)
+        columns["is_peak_hours"] = np.full(
+            size,
+            1.0 if self.PEAK_HOURS_START <= hour_of_day < self.PEAK_HOURS_END else 0.0,
+        )
 
-        if len(market_offers) > 0:
-            features.competition_level = competitive_offers / len(market_offers)
+        # Тренд в числовом виде, как в PriceFeatures._trend_to_numeric
+        change_7d = columns["price_change_7d"]
+        columns["trend_direction"] = np.select(
+            [columns["volatility"] > 0.15, change_7d > 5, change_7d < -5],
+            [0.5, 1.0, -1.0],
+            0.0,
+        )
 
-        return features
+        return np.column_stack([
+            columns[name].astype(np.float64) for name in PriceFeatures.feature_names()
+        ])
 
     def _calculate_rsi(self, prices: list[float]) -> float:
         """Рассчитать RSI (Relative Strength Index)."""
@@ -392,24 +704,18 @@ class MarketFeatureExtractor:
         Returns:
             Список PriceFeatures
         """
-        features_list = []
-
+        current_prices = []
         for item in items:
-            item_name = item.get("title", item.get("name", "unknown"))
             price = item.get("price", {})
 
             if isinstance(price, dict):
-                current_price = float(price.get("USD", 0)) / 100
+                current_prices.append(float(price.get("USD", 0)) / 100)
             else:
-                current_price = float(price) / 100 if price else 0.0
-
-            features = self.extract_features(
-                item_name=item_name,
-                current_price=current_price,
-                price_history=item.get("price_history"),
-                sales_history=item.get("sales_history"),
-                market_offers=item.get("offers"),
-            )
-            features_list.append(features)
+                current_prices.append(float(price) / 100 if price else 0.0)
 
-        return features_list
+        return self.extract_batch(
+            current_prices=current_prices,
+            price_histories=[item.get("price_history") for item in items],
+            sales_histories=[item.get("sales_history") for item in items],
+            market_offers=[item.get("offers") for item in items],
+        )
@@ -11,6 +11,10 @@
 - Типу предмета (дешёвый/дорогой)
 
 Все библиотеки бесплатные (scikit-learn, numpy).
+
+Пакетное прогнозирование (``batch_predict``/``predict_batch``) собирает
+признаки всех предметов в одну матрицу и вызывает каждую модель один раз
+на весь пакет, результат возвращается в колоночном виде (PredictionBatch).
 """
 
 from dataclasses import dataclass
@@ -88,6 +92,74 @@ class PricePrediction:
         return ((predicted - self.current_price) / self.current_price) * 100
 
 
+def _prediction_field(prediction: Any, name: str) -> Any:
+    """Получить поле прогноза (PricePrediction или dict)."""
+    if isinstance(prediction, dict):
+        return prediction[name]
+    return getattr(prediction, name)
+
+
+@dataclass
+class PredictionBatch:
+    """Результат пакетного прогнозирования в колоночном виде.
+
+    Колонки выровнены по порядку входных предметов, ``predictions``
+    содержит те же прогнозы построчно.
+    """
+
+    item_names: list[str]
+    current_price: np.ndarray
+    predicted_price_1h: np.ndarray
+    predicted_price_24h: np.ndarray
+    predicted_price_7d: np.ndarray
+    confidence_score: np.ndarray
+    predictions: list[Any]
+    cache_hits: int = 0
+
+    def __len__(self) -> int:
+        """Количество предметов в пакете."""
+        return len(self.item_names)
+
+    def expected_profit_percent(self, horizon: str = "24h") -> np.ndarray:
+        """Рассчитать ожидаемый профит в процентах для всех предметов."""
+        if horizon == "1h":
+            predicted = self.predicted_price_1h
+        elif horizon == "7d":
+            predicted = self.predicted_price_7d
+        else:
+            predicted = self.predicted_price_24h
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            profit = (predicted - self.current_price) / self.current_price * 100
+        return np.where(self.current_price > 0, profit, 0.0)
+
+    @classmethod
+    def from_predictions(cls, predictions: list[Any], cache_hits: int = 0) -> "PredictionBatch":
+        """Собрать колонки из построчных прогнозов.
+
+        Args:
+            predictions: Прогнозы (PricePrediction или dict с теми же полями)
+            cache_hits: Сколько прогнозов взято из кэша
+
+        Returns:
+            PredictionBatch
+        """
+
+        def column(name: str) -> np.ndarray:
+            return np.array([_prediction_field(p, name) for p in predictions], dtype=float)
+
+        return cls(
+            item_names=[_prediction_field(p, "item_name") for p in predictions],
+            current_price=column("current_price"),
+            predicted_price_1h=column("predicted_price_1h"),
+            predicted_price_24h=column("predicted_price_24h"),
+            predicted_price_7d=column("predicted_price_7d"),
+            confidence_score=column("confidence_score"),
+            predictions=list(predictions),
+            cache_hits=cache_hits,
+        )
+
+
 class AdaptivePricePredictor:
     """Адаптивный прогнозатор цен с ансамблем моделей.
 
@@ -195,10 +267,10 @@ class AdaptivePricePredictor:
             PricePrediction с прогнозами и рекомендациями
         """
         # Проверяем кэш
-        cache_key = f"{item_name}:{current_price:.2f}"
-        if use_cache and cache_key in self._prediction_cache:
-            cached_time, cached_pred = self._prediction_cache[cache_key]
-            if datetime.now(UTC) - cached_time < self._cache_ttl:
+        cache_key = self._cache_key(item_name, current_price)
+        if use_cache:
+            cached_pred = self._get_cached(cache_key)
+            if cached_pred is not None:
                 return cached_pred
 
         # Извлекаем признаки
@@ -218,24 +290,73 @@ class AdaptivePricePredictor:
 
         return prediction
 
+    def _cache_key(self, item_name: str, current_price: float) -> str:
+        """Ключ кэша прогноза для одного предмета."""
+        return f"{item_name}:{current_price:.2f}"
+
+    def _get_cached(self, cache_key: str) -> PricePrediction | None:
+        """Получить прогноз из кэша, если он не устарел."""
+        cached = self._prediction_cache.get(cache_key)
+        if cached is None:
+            return None
+        cached_time, cached_pred = cached
+        if datetime.now(UTC) - cached_time < self._cache_ttl:
+            return cached_pred
+        return None
+
     def _make_prediction(
         self,
         item_name: str,
         features: PriceFeatures,
     ) -> PricePrediction:
         """Выполнить прогнозирование на основе признаков."""
-        current_price = features.current_price
+        return self._make_predictions([item_name], [features])[0]
+
+    def _make_predictions(
+        self,
+        item_names: list[str],
+        features_list: list[PriceFeatures],
+    ) -> list[PricePrediction]:
+        """Выполнить прогнозирование для набора предметов.
 
-        # Пробуем использовать ML модели
+        ML модели вызываются один раз на всю матрицу признаков: прогноз
+        моделей не зависит от горизонта, горизонт меняет только std.
+        """
         if self._has_trained_models():
-            predicted_1h, std_1h = self._ml_predict(features, horizon_hours=1)
-            predicted_24h, std_24h = self._ml_predict(features, horizon_hours=24)
-            predicted_7d, std_7d = self._ml_predict(features, horizon_hours=168)
+            predicted, std = self._ml_predict_matrix(features_list)
+            horizons = [
+                ((p, s), (p, s), (p, s * 1.2))
+                for p, s in zip(predicted.tolist(), std.tolist(), strict=True)
+            ]
         else:
             # Fallback: статистические методы
-            predicted_1h, std_1h = self._statistical_predict(features, horizon_hours=1)
-            predicted_24h, std_24h = self._statistical_predict(features, horizon_hours=24)
-            predicted_7d, std_7d = self._statistical_predict(features, horizon_hours=168)
+            horizons = [
+                (
+                    self._statistical_predict(features, horizon_hours=1),
+                    self._statistical_predict(features, horizon_hours=24),
+                    self._statistical_predict(features, horizon_hours=168),
+                )
+                for features in features_list
+            ]
+
+        return [
+            self._build_prediction(item_name, features, *horizon)
+            for item_name, features, horizon in zip(item_names, features_list, horizons, strict=True)
+        ]
+
+    def _build_prediction(
+        self,
+        item_name: str,
+        features: PriceFeatures,
+        horizon_1h: tuple[float, float],
+        horizon_24h: tuple[float, float],
+        horizon_7d: tuple[float, float],
+    ) -> PricePrediction:
+        """Собрать PricePrediction из прогнозов (цена, std) по горизонтам."""
+        current_price = features.current_price
+        predicted_1h, std_1h = horizon_1h
+        predicted_24h, std_24h = horizon_24h
+        predicted_7d, std_7d = horizon_7d
 
         # Рассчитываем уверенность
         confidence_score = self._calculate_confidence(features, std_24h / current_price if current_price > 0 else 1.0)
@@ -287,33 +408,47 @@ class AdaptivePricePredictor:
         horizon_hours: int,
     ) -> tuple[float, float]:
         """Прогноз с использованием ML моделей."""
-        X = features.to_array().reshape(1, -1)
+        predicted, std = self._ml_predict_matrix([features])
+
+        # Масштабирование по горизонту
+        if horizon_hours in {1, 24}:
+            scale = 1.0
+        else:  # 7 days
+            scale = 1.2  # Больше неопределённости
+
+        return float(predicted[0]), float(std[0] * scale)
+
+    def _ml_predict_matrix(
+        self,
+        features_list: list[PriceFeatures],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Прогноз ML моделей для матрицы признаков (по строке на предмет).
+
+        Returns:
+            Кортеж (прогнозы, std) без масштабирования по горизонту
+        """
+        X = np.vstack([features.to_array() for features in features_list])
+        current_prices = np.array([features.current_price for features in features_list], dtype=float)
 
         # Gradient Boosting prediction
         try:
-            gb_pred = self._gradient_boost.predict(X)[0]
+            gb_pred = np.asarray(self._gradient_boost.predict(X), dtype=float)
         except Exception:
-            gb_pred = features.current_price
+            gb_pred = current_prices
 
         # Ridge prediction
         try:
-            ridge_pred = self._ridge.predict(X)[0]
+            ridge_pred = np.asarray(self._ridge.predict(X), dtype=float)
         except Exception:
-            ridge_pred = features.current_price
+            ridge_pred = current_prices
 
         # Ансамбль: взвешенное среднее
         prediction = 0.7 * gb_pred + 0.3 * ridge_pred
 
-        # Масштабирование по горизонту
-        if horizon_hours in {1, 24}:
-            scale = 1.0
-        else:  # 7 days
-            scale = 1.2  # Больше неопределённости
-
         # Стандартное отклонение (оценка)
-        std = abs(gb_pred - ridge_pred) * scale
+        std = np.abs(gb_pred - ridge_pred)
 
-        return float(prediction), float(std)
+        return prediction, std
 
     def _statistical_predict(
         self,
@@ -588,9 +723,32 @@ class AdaptivePricePredictor:
         Returns:
             Список PricePrediction
         """
-        predictions = []
+        return self.predict_batch(items).predictions
+
+    def predict_batch(
+        self,
+        items: list[dict[str, Any]],
+        use_cache: bool = True,
+    ) -> PredictionBatch:
+        """Прогнозировать для списка предметов одним вызовом моделей.
+
+        Прогнозы кэшируются по предмету, как в ``predict``: через модели
+        проходят только предметы без свежего прогноза в кэше.
+
+        Args:
+            items: Список предметов с данными (формат DMarket, цена в центах)
+            use_cache: Использовать кэш
+
+        Returns:
+            PredictionBatch с колонками прогнозов в порядке items
+        """
+        predictions: list[PricePrediction | None] = [None] * len(items)
+        cache_keys: list[str] = []
+        misses: list[int] = []
+        miss_names: list[str] = []
+        miss_prices: list[float] = []
 
-        for item in items:
+        for index, item in enumerate(items):
             item_name = item.get("title", item.get("name", "unknown"))
             price = item.get("price", {})
 
@@ -599,13 +757,29 @@ class AdaptivePricePredictor:
             else:
                 current_price = float(price) / 100 if price else 0.0
 
-            prediction = self.predict(
-                item_name=item_name,
-                current_price=current_price,
-                price_history=item.get("price_history"),
-                sales_history=item.get("sales_history"),
-                market_offers=item.get("offers"),
+            cache_key = self._cache_key(item_name, current_price)
+            cache_keys.append(cache_key)
+            if use_cache:
+                predictions[index] = self._get_cached(cache_key)
+                if predictions[index] is not None:
+                    continue
+
+            misses.append(index)
+            miss_names.append(item_name)
+            miss_prices.append(current_price)
+
+        if misses:
+            miss_features = self.feature_extractor.extract_batch(
+                current_prices=miss_prices,
+                price_histories=[items[index].get("price_history") for index in misses],
+                sales_histories=[items[index].get("sales_history") for index in misses],
+                market_offers=[items[index].get("offers") for index in misses],
             )
-            predictions.append(prediction)
-
-        return predictions
+            now = datetime.now(UTC)
+            for index, prediction in zip(
+                misses, self._make_predictions(miss_names, miss_features), strict=True
+            ):
+                predictions[index] = prediction
+                self._prediction_cache[cache_keys[index]] = (now, prediction)
+
+        return PredictionBatch.from_predictions(predictions, cache_hits=len(items) - len(misses))
@@ -4,6 +4,13 @@ Real Price Collector Module.
 Async collector for real market prices from DMarket, Waxpeer, and Steam APIs.
 Integrates with PriceNormalizer for unified price representation.
 
+Bulk collection pages through the whole market with cursors and collects from
+all sources concurrently; DMarket pages are requested with background priority
+and so share the API rate budget with trades and scans. Pages can be streamed
+to a sink (e.g. JsonlPriceSink) instead of being held in memory, and a
+CollectionCheckpoint stores the cursor of every source after each page, so an
+interrupted collection resumes where it stopped.
+
 Version: 1.0.0
 Created: January 2026
 """
@@ -11,19 +18,26 @@ Created: January 2026
 from __future__ import annotations
 
 import asyncio
+import bisect
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from decimal import Decimal
 from enum import Enum
+import json
+from operator import itemgetter
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from src.dmarket.request_scheduler import request_priority
 from src.ml.price_normalizer import (
     NormalizedPrice,
     PriceNormalizer,
     PriceSource,
 )
+from src.utils.rate_limiter import RequestPriority
 
 
 if TYPE_CHECKING:
@@ -99,6 +113,27 @@ class CollectedPrice:
     game: GameType
     additional_data: dict[str, Any] = field(default_factory=dict)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a storable row."""
+        return {
+            "item_name": self.item_name,
+            "game": self.game.value,
+            "source": self.normalized_price.source.value,
+            "price_usd": self.normalized_price.price_usd,
+            "original_value": self.normalized_price.original_value,
+            "timestamp": self.normalized_price.timestamp.isoformat(),
+            "additional_data": self.additional_data,
+        }
+
+
+# Receives each collected page; used to stream rows to storage
+PriceSink = Callable[[list[CollectedPrice]], Awaitable[None]]
+
+# Fetches one page: (cursor, page size) -> (prices, cursor of the next page)
+PageFetcher = Callable[
+    [str | None, int], Awaitable[tuple[list[CollectedPrice], str | None]]
+]
+
 
 @dataclass
 class CollectionResult:
@@ -144,11 +179,13 @@ class MultiSourceResult:
     all_prices: list[CollectedPrice] = field(default_factory=list)
     started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     completed_at: datetime | None = None
+    # Prices handed to a sink instead of all_prices
+    streamed_items: int = 0
 
     @property
     def total_items(self) -> int:
         """Get total number of collected items."""
-        return len(self.all_prices)
+        return len(self.all_prices) + self.streamed_items
 
     @property
     def total_duration(self) -> float:
@@ -171,6 +208,173 @@ class MultiSourceResult:
         return [p for p in self.all_prices if p.item_name.lower() == item_name.lower()]
 
 
+@dataclass
+class CollectionCheckpoint:
+    """
+    Resumable progress of a bulk collection.
+
+    Keeps, per source and game, the cursor of the next page and the number
+    of prices collected so far, and is saved as JSON after every page. A
+    page is handed to the sink before its cursor is saved, so after a crash
+    at most the page in flight is collected twice. ``advance`` and
+    ``complete`` write the file on a worker thread, one write at a time.
+
+    Example:
+        ```python
+        checkpoint = CollectionCheckpoint.load("data/ml_collection/checkpoint.json")
+        sink = JsonlPriceSink(f"data/ml_collection/prices_{checkpoint.run_id}.jsonl")
+
+        await collector.collect_bulk_prices(
+            GameType.CSGO, limit=None, sink=sink, checkpoint=checkpoint
+        )
+        checkpoint.clear()  # the next run starts from the first page
+        ```
+    """
+
+    path: Path | None = None
+    run_id: str = field(
+        default_factory=lambda: datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+    )
+    cursors: dict[str, str] = field(default_factory=dict)
+    collected: dict[str, int] = field(default_factory=dict)
+    completed: list[str] = field(default_factory=list)
+    _write_lock: asyncio.Lock = field(
+        default_factory=asyncio.Lock, init=False, repr=False, compare=False
+    )
+
+    @staticmethod
+    def key(source: PriceSource, game: GameType) -> str:
+        """Get checkpoint key of a source and game."""
+        return f"{source.value}:{game.value}"
+
+    @classmethod
+    def load(cls, path: Path | str) -> CollectionCheckpoint:
+        """
+        Load a checkpoint, or start a new one if there is none.
+
+        Args:
+            path: Checkpoint file
+
+        Returns:
+            Stored checkpoint or an empty one bound to path
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(path=path)
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            checkpoint = cls(
+                path=path,
+                run_id=data["run_id"],
+                cursors=dict(data.get("cursors", {})),
+                collected={k: int(v) for k, v in data.get("collected", {}).items()},
+                completed=list(data.get("completed", [])),
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("collection_checkpoint_invalid", path=str(path), error=str(e))
+            return cls(path=path)
+
+        logger.info(
+            "collection_checkpoint_loaded",
+            run_id=checkpoint.run_id,
+            collected=sum(checkpoint.collected.values()),
+        )
+        return checkpoint
+
+    def _dump(self) -> str:
+        """Serialize the current progress."""
+        return json.dumps({
+            "run_id": self.run_id,
+            "cursors": self.cursors,
+            "collected": self.collected,
+            "completed": self.completed,
+        })
+
+    def _write(self, payload: str) -> None:
+        """Replace the checkpoint file with payload atomically."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def save(self) -> None:
+        """Write the checkpoint atomically (no-op without a path)."""
+        self._write(self._dump())
+
+    async def _save_in_thread(self) -> None:
+        """Write the checkpoint without blocking the event loop."""
+        if self.path is None:
+            return
+        async with self._write_lock:
+            # Serialized under the lock, so the last write has the latest progress
+            await asyncio.to_thread(self._write, self._dump())
+
+    async def advance(self, key: str, cursor: str, collected: int) -> None:
+        """Record the cursor of the next page and save."""
+        self.cursors[key] = cursor
+        self.collected[key] = collected
+        await self._save_in_thread()
+
+    async def complete(self, key: str, collected: int) -> None:
+        """Mark a source as fully collected and save."""
+        self.cursors.pop(key, None)
+        self.collected[key] = collected
+        if key not in self.completed:
+            self.completed.append(key)
+        await self._save_in_thread()
+
+    def is_complete(self, key: str) -> bool:
+        """Check whether a source has been fully collected."""
+        return key in self.completed
+
+    def clear(self) -> None:
+        """Forget all progress and delete the checkpoint file."""
+        self.cursors.clear()
+        self.collected.clear()
+        self.completed.clear()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class JsonlPriceSink:
+    """
+    Price sink that appends collected prices to a JSON Lines file.
+
+    Each page is written as it arrives, so memory use does not depend on the
+    size of the collection. Writes run in a worker thread and are serialized,
+    so concurrent sources can share one sink.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Initialize JsonlPriceSink.
+
+        Args:
+            path: File the rows are appended to
+        """
+        self.path = Path(path)
+        self.rows_written = 0
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, prices: list[CollectedPrice]) -> None:
+        """Append a page of prices."""
+        lines = "".join(
+            json.dumps(price.to_dict(), default=str) + "\n" for price in prices
+        )
+        async with self._lock:
+            await asyncio.to_thread(self._append, lines)
+            self.rows_written += len(prices)
+
+    def _append(self, lines: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+
+
 class RealPriceCollector:
     """
     Async collector for real market prices from multiple platforms.
@@ -184,6 +388,7 @@ class RealPriceCollector:
         - Rate limiting awareness
         - Error handling and retries
         - Batch collection support
+        - Resumable bulk collection of the whole market
 
     Example:
         ```python
@@ -284,13 +489,15 @@ class RealPriceCollector:
 
             # Use aggregated prices endpoint for efficiency
             if hasattr(self.dmarket_api, "get_aggregated_prices"):
-                response = await asyncio.wait_for(
-                    self.dmarket_api.get_aggregated_prices(
-                        game=game.dmarket_id,
-                        titles=item_names,
-                    ),
-                    timeout=self.timeout,
-                )
+                # Background ML collection yields the API key to trades and scans
+                with request_priority(RequestPriority.BACKGROUND):
+                    response = await asyncio.wait_for(
+                        self.dmarket_api.get_aggregated_prices(
+                            game=game.dmarket_id,
+                            titles=item_names,
+                        ),
+                        timeout=self.timeout,
+                    )
 
                 aggregated = response.get("aggregatedPrices", [])
                 for item_data in aggregated:
@@ -324,14 +531,15 @@ class RealPriceCollector:
             else:
                 for name in item_names:
                     try:
-                        item_response = await asyncio.wait_for(
-                            self.dmarket_api.get_market_items(
-                                game=game.dmarket_id,
-                                title=name,
-                                limit=1,
-                            ),
-                            timeout=self.timeout,
-                        )
+                        with request_priority(RequestPriority.BACKGROUND):
+                            item_response = await asyncio.wait_for(
+                                self.dmarket_api.get_market_items(
+                                    game=game.dmarket_id,
+                                    title=name,
+                                    limit=1,
+                                ),
+                                timeout=self.timeout,
+                            )
 
                         items = item_response.get("objects", [])
                         if items:
@@ -805,79 +1013,201 @@ class RealPriceCollector:
     async def collect_bulk_prices(
         self,
         game: GameType,
-        limit: int = 1000,
+        limit: int | None = 1000,
+        sink: PriceSink | None = None,
+        checkpoint: CollectionCheckpoint | None = None,
     ) -> MultiSourceResult:
         """
         Collect bulk prices for a game without specifying item names.
 
-        Uses platform-specific bulk endpoints for efficiency.
+        Uses platform-specific bulk endpoints, pages through them with
+        cursors and collects from all sources concurrently.
 
         Args:
             game: Game type
-            limit: Maximum number of items to collect
+            limit: Maximum number of items per source (None = whole market)
+            sink: Receives each page of prices; streamed prices are not kept
+                in ``all_prices``
+            checkpoint: Progress to resume from and to update after each page
 
         Returns:
             MultiSourceResult with collected prices
         """
         result = MultiSourceResult()
 
-        # Collect from DMarket bulk
+        tasks = []
         if self.dmarket_api:
-            try:
-                dm_result = await self._collect_dmarket_bulk(game, limit)
-                result.results.append(dm_result)
-                result.all_prices.extend(dm_result.prices)
-            except Exception as e:
-                logger.error("dmarket_bulk_error", error=str(e))
-
-        # Collect from Waxpeer bulk
+            tasks.append(self._collect_dmarket_bulk(game, limit, sink, checkpoint))
         if self.waxpeer_api and hasattr(self.waxpeer_api, "get_bulk_prices"):
-            try:
-                wp_result = await self._collect_waxpeer_bulk(game, limit)
-                result.results.append(wp_result)
-                result.all_prices.extend(wp_result.prices)
-            except Exception as e:
-                logger.error("waxpeer_bulk_error", error=str(e))
+            tasks.append(self._collect_waxpeer_bulk(game, limit, sink, checkpoint))
+
+        collection_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for res in collection_results:
+            if isinstance(res, Exception):
+                logger.error("bulk_collection_task_error", error=str(res))
+            elif isinstance(res, CollectionResult):
+                result.results.append(res)
+                if sink is None:
+                    result.all_prices.extend(res.prices)
+                else:
+                    result.streamed_items += res.items_collected
 
         result.completed_at = datetime.now(UTC)
+
+        logger.info(
+            "bulk_collection_complete",
+            game=game.value,
+            total_items=result.total_items,
+            sources_succeeded=result.success_count,
+            duration=result.total_duration,
+        )
+
         return result
 
-    async def _collect_dmarket_bulk(
+    async def _collect_pages(
         self,
+        source: PriceSource,
         game: GameType,
-        limit: int,
+        limit: int | None,
+        fetch_page: PageFetcher,
+        sink: PriceSink | None,
+        checkpoint: CollectionCheckpoint | None,
     ) -> CollectionResult:
-        """Collect bulk prices from DMarket."""
+        """
+        Page through one source until it is exhausted or limit is reached.
+
+        Pages go to the sink (or into the result) before the checkpoint is
+        advanced. A failed page ends the collection; the checkpoint keeps the
+        cursor of that page for the next run.
+        """
         start_time = datetime.now(UTC)
         result = CollectionResult(
             status=CollectionStatus.NO_DATA,
-            source=PriceSource.DMARKET,
+            source=source,
             game=game,
-            items_requested=limit,
+            items_requested=limit or 0,
         )
 
+        key = CollectionCheckpoint.key(source, game)
+        cursor = None
+        collected = 0
+        if checkpoint is not None:
+            if checkpoint.is_complete(key):
+                result.status = CollectionStatus.SUCCESS
+                logger.info(
+                    "bulk_collection_already_complete",
+                    source=source.value,
+                    game=game.value,
+                )
+                return result
+            cursor = checkpoint.cursors.get(key)
+            collected = checkpoint.collected.get(key, 0)
+            if cursor:
+                logger.info(
+                    "bulk_collection_resumed",
+                    source=source.value,
+                    game=game.value,
+                    collected=collected,
+                )
+
         try:
-            response = await asyncio.wait_for(
-                self.dmarket_api.get_market_items(
-                    game=game.dmarket_id,
-                    limit=min(limit, 100),  # DMarket max is 100
-                ),
-                timeout=self.timeout,
+            while limit is None or collected < limit:
+                size = self.MAX_BATCH_SIZE
+                if limit is not None:
+                    size = min(size, limit - collected)
+                prices, cursor = await fetch_page(cursor, size)
+                prices = prices[:size]
+
+                if prices:
+                    if sink is None:
+                        result.prices.extend(prices)
+                    else:
+                        await sink(prices)
+                    collected += len(prices)
+                    result.items_collected += len(prices)
+                    self._collection_stats["total_items_collected"] += len(prices)
+
+                if not cursor:
+                    break
+                if checkpoint is not None:
+                    await checkpoint.advance(key, cursor, collected)
+
+            if checkpoint is not None:
+                await checkpoint.complete(key, collected)
+
+            result.status = (
+                CollectionStatus.SUCCESS if result.items_collected else CollectionStatus.NO_DATA
             )
 
+        except TimeoutError:
+            result.status = (
+                CollectionStatus.PARTIAL if result.items_collected else CollectionStatus.TIMEOUT
+            )
+            result.error_message = f"Request timed out after {self.timeout}s"
+            self._collection_stats["total_errors"] += 1
+            logger.error("bulk_collection_timeout", source=source.value, game=game.value)
+
+        except Exception as e:
+            result.status = (
+                CollectionStatus.PARTIAL if result.items_collected else CollectionStatus.FAILED
+            )
+            result.error_message = str(e)
+            self._collection_stats["total_errors"] += 1
+            logger.error(
+                "bulk_collection_error",
+                source=source.value,
+                game=game.value,
+                error=str(e),
+            )
+
+        result.duration_seconds = (
+            datetime.now(UTC) - start_time
+        ).total_seconds()
+        return result
+
+    async def _collect_dmarket_bulk(
+        self,
+        game: GameType,
+        limit: int | None,
+        sink: PriceSink | None = None,
+        checkpoint: CollectionCheckpoint | None = None,
+    ) -> CollectionResult:
+        """Collect bulk prices from DMarket, following the market cursor."""
+
+        async def fetch_page(
+            cursor: str | None, size: int
+        ) -> tuple[list[CollectedPrice], str | None]:
+            with request_priority(RequestPriority.BACKGROUND):
+                response = await asyncio.wait_for(
+                    self.dmarket_api.get_market_items(
+                        game=game.dmarket_id,
+                        limit=size,  # DMarket max is 100
+                        cursor=cursor or "",
+                    ),
+                    timeout=self.timeout,
+                )
+            self._collection_stats["dmarket_calls"] += 1
+
+            items = response.get("objects", [])
+            if not items:
+                return [], None
+
             prices: list[CollectedPrice] = []
-            for item in response.get("objects", []):
+            for item in items:
                 title = item.get("title", "")
                 price_data = item.get("price", {})
                 price_cents = int(price_data.get("USD", 0))
 
                 if price_cents > 0:
                     normalized = self.normalizer.normalize(
-                        price=Decimal(price_cents),
+                        price=price_cents,
                         source=PriceSource.DMARKET,
                         item_name=title,
                         game=game.value,
                     )
+                    if not normalized.is_valid:
+                        continue
 
                     prices.append(
                         CollectedPrice(
@@ -890,53 +1220,60 @@ class RealPriceCollector:
                         )
                     )
 
-            result.prices = prices
-            result.items_collected = len(prices)
-            result.status = CollectionStatus.SUCCESS if prices else CollectionStatus.NO_DATA
-
-        except Exception as e:
-            result.status = CollectionStatus.FAILED
-            result.error_message = str(e)
+            return prices, response.get("cursor") or response.get("nextCursor")
 
-        result.duration_seconds = (
-            datetime.now(UTC) - start_time
-        ).total_seconds()
-        return result
+        return await self._collect_pages(
+            PriceSource.DMARKET, game, limit, fetch_page, sink, checkpoint
+        )
 
     async def _collect_waxpeer_bulk(
         self,
         game: GameType,
-        limit: int,
+        limit: int | None,
+        sink: PriceSink | None = None,
+        checkpoint: CollectionCheckpoint | None = None,
     ) -> CollectionResult:
-        """Collect bulk prices from Waxpeer."""
-        start_time = datetime.now(UTC)
-        result = CollectionResult(
-            status=CollectionStatus.NO_DATA,
-            source=PriceSource.WAXPEER,
-            game=game,
-            items_requested=limit,
-        )
+        """
+        Collect bulk prices from Waxpeer.
 
-        try:
-            response = await asyncio.wait_for(
-                self.waxpeer_api.get_bulk_prices(game=game.waxpeer_name),
-                timeout=self.timeout,
-            )
+        The bulk endpoint returns the whole market at once. It is paged by
+        item name, and the last name of a page serves as the cursor.
+        """
+        from src.waxpeer.waxpeer_api import WaxpeerGame
 
-            prices: list[CollectedPrice] = []
-            count = 0
+        entries: list[tuple[str, Any]] | None = None
 
-            for name, price_mils in response.items():
-                if count >= limit:
-                    break
+        async def fetch_page(
+            cursor: str | None, size: int
+        ) -> tuple[list[CollectedPrice], str | None]:
+            nonlocal entries
+            if entries is None:
+                response = await asyncio.wait_for(
+                    self.waxpeer_api.get_bulk_prices(game=WaxpeerGame(game.waxpeer_name)),
+                    timeout=self.timeout,
+                )
+                self._collection_stats["waxpeer_calls"] += 1
+                entries = sorted(response.items(), key=itemgetter(0))
+
+            start = 0
+            if cursor:
+                start = bisect.bisect_right(entries, cursor, key=itemgetter(0))
+            page = entries[start : start + size]
+
+            prices: list[CollectedPrice] = []
+            for name, data in page:
+                # {"price": mils, "count": n}, or just the price in mils
+                price_mils = data.get("price") if isinstance(data, dict) else data
 
                 if price_mils and price_mils > 0:
                     normalized = self.normalizer.normalize(
-                        price=Decimal(price_mils),
+                        price=price_mils,
                         source=PriceSource.WAXPEER,
                         item_name=name,
                         game=game.value,
                     )
+                    if not normalized.is_valid:
+                        continue
 
                     prices.append(
                         CollectedPrice(
@@ -945,20 +1282,13 @@ class RealPriceCollector:
                             game=game,
                         )
                     )
-                    count += 1
-
-            result.prices = prices
-            result.items_collected = len(prices)
-            result.status = CollectionStatus.SUCCESS if prices else CollectionStatus.NO_DATA
 
-        except Exception as e:
-            result.status = CollectionStatus.FAILED
-            result.error_message = str(e)
+            next_cursor = page[-1][0] if start + size < len(entries) else None
+            return prices, next_cursor
 
-        result.duration_seconds = (
-            datetime.now(UTC) - start_time
-        ).total_seconds()
-        return result
+        return await self._collect_pages(
+            PriceSource.WAXPEER, game, limit, fetch_page, sink, checkpoint
+        )
 
     def get_statistics(self) -> dict[str, Any]:
         """
@@ -0,0 +1,219 @@
+"""Scoring Executor - worker pool for CPU-bound ML scoring.
+
+Feature extraction, ensemble prediction, trade classification and anomaly
+checks are synchronous CPU work. Run directly in a coroutine they block the
+event loop for the whole scan, stalling Telegram handlers and WebSocket
+consumers.
+
+ScoringExecutor runs that work on a small thread pool instead. The models
+stay loaded once in the coordinator and are shared by the workers: the
+scoring path only reads them, and numpy/scikit-learn/XGBoost release the GIL
+inside their native code. A process pool would need a pickled copy of every
+model per worker and a re-sync after each training run.
+
+Items are scored in chunks. The chunk size adapts to the measured cost per
+item so that one chunk takes about ``chunk_budget`` seconds, which bounds how
+long a deadline or a cancelled scan can be overshot.
+
+Usage:
+    ```python
+    from src.ml.scoring_executor import ScoringExecutor
+
+    executor = ScoringExecutor(max_workers=2, chunk_budget=0.05)
+
+    # One call
+    analysis = await executor.run(score_item, item)
+
+    # Many items, scored in chunks; items past the deadline come back as None
+    results = await executor.map_batches(score_items, items, deadline=2.0)
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+import time
+from typing import Any, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_SCORING_WORKERS = 2
+DEFAULT_CHUNK_BUDGET = 0.05  # seconds of scoring per chunk
+DEFAULT_CHUNK_SIZE = 20  # first chunk, before the cost per item is known
+MAX_CHUNK_SIZE = 1000
+
+
+class ScoringExecutor:
+    """Thread pool that scores items in latency-bounded chunks.
+
+    Attributes:
+        max_workers: Number of scoring threads (and chunks in flight).
+        chunk_budget: Target scoring time of one chunk in seconds.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_SCORING_WORKERS,
+        chunk_budget: float = DEFAULT_CHUNK_BUDGET,
+        initial_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_workers: Number of scoring threads
+            chunk_budget: Target scoring time of one chunk in seconds
+            initial_chunk_size: Size of the first chunk
+            max_chunk_size: Upper bound of the chunk size
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers
+        self.chunk_budget = chunk_budget
+        self.initial_chunk_size = max(1, initial_chunk_size)
+        self.max_chunk_size = max(1, max_chunk_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="ml_scoring",
+        )
+
+        # Exponential moving average of the scoring time per item
+        self._seconds_per_item: float | None = None
+
+        self._stats = {
+            "chunks": 0,
+            "items_scored": 0,
+            "items_dropped": 0,
+            "busy_seconds": 0.0,
+        }
+
+    async def run(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Run one synchronous call on the pool.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of the call
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def chunk_size(self) -> int:
+        """Current chunk size that fits into the chunk budget."""
+        if not self._seconds_per_item:
+            return self.initial_chunk_size
+        size = int(self.chunk_budget / self._seconds_per_item)
+        return max(1, min(self.max_chunk_size, size))
+
+    def _score_chunk(self, func: Callable[[list[T]], list[R]], chunk: list[T]) -> list[R]:
+        """Score one chunk and update the cost per item (runs in a worker)."""
+        start = time.perf_counter()
+        results = func(chunk)
+        elapsed = time.perf_counter() - start
+
+        per_item = elapsed / len(chunk)
+        if self._seconds_per_item is None:
+            self._seconds_per_item = per_item
+        else:
+            self._seconds_per_item = 0.7 * self._seconds_per_item + 0.3 * per_item
+
+        self._stats["chunks"] += 1
+        self._stats["items_scored"] += len(chunk)
+        self._stats["busy_seconds"] += elapsed
+        return results
+
+    async def map_batches(
+        self,
+        func: Callable[[list[T]], list[R]],
+        items: Sequence[T],
+        deadline: float | None = None,
+    ) -> list[R | BaseException | None]:
+        """Score items in chunks on the pool.
+
+        ``func`` receives a chunk of items and returns one result per item.
+        Up to ``max_workers`` chunks are scored at the same time. Once the
+        deadline has passed no new chunks are started: chunks already
+        running finish (each takes about ``chunk_budget``), the remaining
+        items get None.
+
+        Args:
+            func: Batch scoring function
+            items: Items to score
+            deadline: Time budget for the whole call in seconds
+
+        Returns:
+            Results in the order of items: the value returned by func, the
+            exception raised for the item's chunk, or None if not scored
+        """
+        loop = asyncio.get_running_loop()
+        ends_at = None if deadline is None else loop.time() + deadline
+        results: list[R | BaseException | None] = [None] * len(items)
+        pending: dict[asyncio.Future[list[R]], tuple[int, int]] = {}
+        position = 0
+
+        try:
+            while position < len(items) or pending:
+                while (
+                    position < len(items)
+                    and len(pending) < self.max_workers
+                    and (ends_at is None or loop.time() < ends_at)
+                ):
+                    size = self.chunk_size()
+                    chunk = list(items[position : position + size])
+                    future = loop.run_in_executor(self._executor, self._score_chunk, func, chunk)
+                    pending[future] = (position, len(chunk))
+                    position += len(chunk)
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    start, length = pending.pop(future)
+                    try:
+                        chunk_results = future.result()
+                    except Exception as e:
+                        chunk_results = [e] * length
+                    results[start : start + length] = chunk_results
+        finally:
+            for future in pending:
+                future.cancel()
+
+        dropped = len(items) - position
+        if dropped:
+            self._stats["items_dropped"] += dropped
+            logger.warning(
+                "scoring_deadline_reached",
+                extra={"scored": position, "dropped": dropped, "deadline": deadline},
+            )
+
+        return results
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get executor statistics."""
+        return {
+            **self._stats,
+            "busy_seconds": round(self._stats["busy_seconds"], 3),
+            "max_workers": self.max_workers,
+            "chunk_budget_ms": self.chunk_budget * 1000,
+            "chunk_size": self.chunk_size(),
+            "ms_per_item": (
+                round(self._seconds_per_item * 1000, 3) if self._seconds_per_item else None
+            ),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut the worker threads down."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
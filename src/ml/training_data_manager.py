@@ -4,13 +4,21 @@ Training Data Manager Module.
 Manages storage, versioning, and preparation of training data
 for ML price prediction models.
 
+Each version directory stores its rows as ``features.npy``/``labels.npy``.
+Versions are loaded memory-mapped, so a dataset is not read into RAM until
+its rows are used. Incremental versions store only their new rows on top of
+a parent version; loading one returns the rows of the whole chain as a list
+of chunks, and merges combine the chunks of their versions without copying.
+Training code can stream the rows with ``TrainingDataset.iter_batches``.
+
 Version: 1.0.0
 Created: January 2026
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 import hashlib
 import json
@@ -37,6 +45,9 @@ DEFAULT_DATA_DIR = Path("data/ml_training")
 DEFAULT_VERSIONS_DIR = DEFAULT_DATA_DIR / "versions"
 DEFAULT_CACHE_DIR = DEFAULT_DATA_DIR / "cache"
 
+# Rows per block when streaming over stored arrays
+DEFAULT_BATCH_SIZE = 65536
+
 
 @dataclass
 class DatasetMetadata:
@@ -53,6 +64,8 @@ class DatasetMetadata:
     description: str = ""
     tags: list[str] = field(default_factory=list)
     metrics: dict[str, Any] = field(default_factory=dict)
+    # Version this one appends rows to (None for a full version)
+    parent_version: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -68,6 +81,7 @@ class DatasetMetadata:
             "description": self.description,
             "tags": self.tags,
             "metrics": self.metrics,
+            "parent_version": self.parent_version,
         }
 
     @classmethod
@@ -85,23 +99,137 @@ class DatasetMetadata:
             description=data.get("description", ""),
             tags=data.get("tags", []),
             metrics=data.get("metrics", {}),
+            parent_version=data.get("parent_version"),
         )
 
 
 @dataclass
-class TrainingDataset:
-    """Container for training data."""
+class DatasetChunk:
+    """Rows of one stored dataset segment (arrays may be memory-mapped)."""
 
     features: np.ndarray
     labels: np.ndarray
+
+    def __len__(self) -> int:
+        """Get number of rows."""
+        return len(self.labels)
+
+
+@dataclass(init=False)
+class TrainingDataset:
+    """
+    Container for training data.
+
+    Rows are held as a list of chunks. A dataset loaded from disk has one
+    chunk per stored version segment, a merged dataset has the chunks of all
+    merged versions. ``features`` and ``labels`` concatenate the chunks on
+    first access; ``iter_batches`` streams the rows without copying them.
+    """
+
     item_names: list[str]
     metadata: DatasetMetadata
-    feature_names: list[str] = field(default_factory=list)
+    feature_names: list[str]
+    chunks: list[DatasetChunk]
+
+    def __init__(
+        self,
+        features: np.ndarray | None,
+        labels: np.ndarray | None,
+        item_names: list[str],
+        metadata: DatasetMetadata,
+        feature_names: list[str] | None = None,
+        chunks: list[DatasetChunk] | None = None,
+    ) -> None:
+        """
+        Initialize the dataset.
+
+        Args:
+            features: Feature matrix (None if chunks are given)
+            labels: Labels (None if chunks are given)
+            item_names: Item name of every row
+            metadata: Dataset metadata
+            feature_names: Names of the feature columns
+            chunks: Rows as chunks instead of features/labels
+        """
+        if chunks is None:
+            if features is None or labels is None:
+                raise ValueError("Either features and labels or chunks are required")
+            chunks = [DatasetChunk(features=features, labels=labels)]
+        elif not chunks:
+            raise ValueError("At least one chunk is required")
+
+        self.item_names = item_names
+        self.metadata = metadata
+        self.feature_names = feature_names if feature_names is not None else []
+        self.chunks = chunks
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: list[DatasetChunk],
+        item_names: list[str],
+        metadata: DatasetMetadata,
+        feature_names: list[str] | None = None,
+    ) -> TrainingDataset:
+        """Create a dataset over existing chunks without copying them."""
+        return cls(None, None, item_names, metadata, feature_names, chunks=chunks)
+
+    def _single_chunk(self) -> DatasetChunk:
+        """Concatenate the chunks into one (once) and return it."""
+        if len(self.chunks) > 1:
+            self.chunks = [
+                DatasetChunk(
+                    features=np.concatenate([chunk.features for chunk in self.chunks]),
+                    labels=np.concatenate([chunk.labels for chunk in self.chunks]),
+                )
+            ]
+        return self.chunks[0]
+
+    @property
+    def features(self) -> np.ndarray:
+        """Get feature matrix of all rows."""
+        return self._single_chunk().features
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Get labels of all rows."""
+        return self._single_chunk().labels
+
+    def __len__(self) -> int:
+        """Get number of rows."""
+        return sum(len(chunk) for chunk in self.chunks)
 
     @property
     def shape(self) -> tuple[int, int]:
         """Get shape of features array."""
-        return self.features.shape
+        return (len(self), *self.chunks[0].features.shape[1:])
+
+    def iter_batches(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream rows in batches without concatenating the chunks.
+
+        Batches are views of the chunks, so rows of a memory-mapped dataset
+        are read from disk only when a batch is used. A batch never spans two
+        chunks: the last batch of a chunk may be shorter than batch_size.
+
+        Args:
+            batch_size: Maximum rows per batch
+
+        Yields:
+            Tuples of (features, labels)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        for chunk in self.chunks:
+            for start in range(0, len(chunk), batch_size):
+                yield (
+                    chunk.features[start : start + batch_size],
+                    chunk.labels[start : start + batch_size],
+                )
 
     def train_test_split(
         self,
@@ -185,6 +313,7 @@ class TrainingDataManager:
 
     Features:
     - Version control for datasets
+    - Memory-mapped loading, append-only incremental versions
     - Automatic feature extraction
     - Data normalization and validation
     - Train/test splitting
@@ -290,8 +419,46 @@ class TrainingDataManager:
 
     def _compute_checksum(self, features: np.ndarray, labels: np.ndarray) -> str:
         """Compute checksum for data integrity."""
-        data_bytes = features.tobytes() + labels.tobytes()
-        return hashlib.sha256(data_bytes).hexdigest()[:16]
+        return self._compute_chunks_checksum([DatasetChunk(features=features, labels=labels)])
+
+    def _compute_chunks_checksum(self, chunks: list[DatasetChunk]) -> str:
+        """
+        Compute checksum of chunked rows, reading them block by block.
+
+        Equal to the checksum of the concatenated features and labels.
+        """
+        digest = hashlib.sha256()
+        for name in ("features", "labels"):
+            for chunk in chunks:
+                array = getattr(chunk, name)
+                for start in range(0, len(array), DEFAULT_BATCH_SIZE):
+                    digest.update(array[start : start + DEFAULT_BATCH_SIZE].tobytes())
+        return digest.hexdigest()[:16]
+
+    def _write_array(self, path: Path, arrays: list[np.ndarray]) -> None:
+        """
+        Write arrays as one .npy file, chunk by chunk.
+
+        The file is written next to its final path and moved into place, so
+        arrays memory-mapped from the previous file stay valid.
+        """
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        try:
+            output = np.lib.format.open_memmap(
+                tmp_path,
+                mode="w+",
+                dtype=np.result_type(*arrays),
+                shape=(sum(len(array) for array in arrays), *arrays[0].shape[1:]),
+            )
+            position = 0
+            for array in arrays:
+                output[position : position + len(array)] = array
+                position += len(array)
+            output.flush()
+            del output
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
     def _extract_features(
         self,
@@ -547,8 +714,12 @@ class TrainingDataManager:
 
         try:
             # Save features and labels
-            np.save(version_dir / "features.npy", dataset.features)
-            np.save(version_dir / "labels.npy", dataset.labels)
+            self._write_array(
+                version_dir / "features.npy", [chunk.features for chunk in dataset.chunks]
+            )
+            self._write_array(
+                version_dir / "labels.npy", [chunk.labels for chunk in dataset.chunks]
+            )
 
             # Save item names
             with open(version_dir / "item_names.json", "w") as f:
@@ -579,12 +750,77 @@ class TrainingDataManager:
                 shutil.rmtree(version_dir)
             raise RuntimeError(f"Failed to save dataset: {e}") from e
 
-    def load_version(self, version_id: str) -> TrainingDataset:
+    def append_version(
+        self,
+        dataset: TrainingDataset,
+        parent_version: str,
+        overwrite: bool = False,
+    ) -> str:
+        """
+        Save new rows as an incremental version of parent_version.
+
+        Only the rows of ``dataset`` are written. Loading the new version
+        returns the rows of the parent chain followed by these rows.
+
+        Args:
+            dataset: Dataset with the new rows only
+            parent_version: Version the rows are appended to
+            overwrite: Whether to overwrite existing version
+
+        Returns:
+            Version ID
+
+        Raises:
+            FileNotFoundError: If parent version doesn't exist
+            ValueError: If feature sets don't match
+        """
+        parent_dir = self.versions_dir / parent_version
+        if not parent_dir.exists():
+            raise FileNotFoundError(f"Version {parent_version} not found")
+
+        with open(parent_dir / "metadata.json") as f:
+            parent = DatasetMetadata.from_dict(json.load(f))
+        with open(parent_dir / "feature_names.json") as f:
+            if json.load(f) != dataset.feature_names:
+                raise ValueError("Incompatible feature sets")
+
+        labels_min = min(float(chunk.labels.min()) for chunk in dataset.chunks)
+        labels_max = max(float(chunk.labels.max()) for chunk in dataset.chunks)
+        metadata = replace(
+            dataset.metadata,
+            parent_version=parent_version,
+            total_samples=parent.total_samples + len(dataset),
+            price_range=(
+                min(parent.price_range[0], labels_min),
+                max(parent.price_range[1], labels_max),
+            ),
+        )
+
+        return self.save_version(
+            TrainingDataset.from_chunks(
+                dataset.chunks, dataset.item_names, metadata, dataset.feature_names
+            ),
+            overwrite=overwrite,
+        )
+
+    def load_version(
+        self,
+        version_id: str,
+        mmap: bool = True,
+        verify_checksum: bool = True,
+    ) -> TrainingDataset:
         """
         Load a dataset version from disk.
 
+        An incremental version is loaded with its parent chain: one chunk
+        per stored segment, oldest first.
+
         Args:
             version_id: Version to load
+            mmap: Memory-map the arrays read-only instead of reading them
+                into RAM (the pickle cache is only used when False)
+            verify_checksum: Verify the checksum of every segment (reads all
+                rows once, block by block)
 
         Returns:
             TrainingDataset
@@ -593,55 +829,50 @@ class TrainingDataManager:
             FileNotFoundError: If version doesn't exist
         """
         # Check cache first
-        if self.enable_cache:
+        use_cache = self.enable_cache and not mmap
+        if use_cache:
             cached = self._load_from_cache(version_id)
             if cached is not None:
                 self._stats["cache_hits"] += 1
                 return cached
             self._stats["cache_misses"] += 1
 
-        version_dir = self.versions_dir / version_id
-
-        if not version_dir.exists():
+        if not (self.versions_dir / version_id).exists():
             raise FileNotFoundError(f"Version {version_id} not found")
 
         try:
-            # Load features and labels
-            features = np.load(version_dir / "features.npy")
-            labels = np.load(version_dir / "labels.npy")
-
-            # Load item names
-            with open(version_dir / "item_names.json") as f:
-                item_names = json.load(f)
+            chunks: list[DatasetChunk] = []
+            item_names: list[str] = []
+            segment_id: str | None = version_id
+            visited: set[str] = set()
+
+            while segment_id is not None:
+                if segment_id in visited:
+                    raise ValueError(f"Version chain of {version_id} has a cycle")
+                visited.add(segment_id)
+
+                chunk, names, segment_meta = self._load_segment(
+                    segment_id, mmap, verify_checksum
+                )
+                chunks.insert(0, chunk)
+                item_names[:0] = names
+                if segment_id == version_id:
+                    metadata = segment_meta
+                segment_id = segment_meta.parent_version
 
             # Load feature names
-            with open(version_dir / "feature_names.json") as f:
+            with open(self.versions_dir / version_id / "feature_names.json") as f:
                 feature_names = json.load(f)
 
-            # Load metadata
-            with open(version_dir / "metadata.json") as f:
-                metadata = DatasetMetadata.from_dict(json.load(f))
-
-            # Verify checksum
-            computed_checksum = self._compute_checksum(features, labels)
-            if computed_checksum != metadata.checksum:
-                logger.warning(
-                    "checksum_mismatch",
-                    version_id=version_id,
-                    expected=metadata.checksum,
-                    computed=computed_checksum,
-                )
-
-            dataset = TrainingDataset(
-                features=features,
-                labels=labels,
+            dataset = TrainingDataset.from_chunks(
+                chunks=chunks,
                 item_names=item_names,
                 metadata=metadata,
                 feature_names=feature_names,
             )
 
             # Cache for future use
-            if self.enable_cache:
+            if use_cache:
                 self._save_to_cache(version_id, dataset)
 
             self._stats["datasets_loaded"] += 1
@@ -649,7 +880,9 @@ class TrainingDataManager:
             logger.info(
                 "dataset_version_loaded",
                 version_id=version_id,
-                samples=len(labels),
+                samples=len(dataset),
+                segments=len(chunks),
+                mmap=mmap,
             )
 
             return dataset
@@ -657,6 +890,46 @@ class TrainingDataManager:
         except Exception as e:
             raise RuntimeError(f"Failed to load dataset: {e}") from e
 
+    def _load_segment(
+        self,
+        version_id: str,
+        mmap: bool,
+        verify_checksum: bool,
+    ) -> tuple[DatasetChunk, list[str], DatasetMetadata]:
+        """Load the rows stored in one version directory."""
+        version_dir = self.versions_dir / version_id
+
+        if not version_dir.exists():
+            raise FileNotFoundError(f"Version {version_id} not found")
+
+        # Load features and labels
+        mmap_mode = "r" if mmap else None
+        chunk = DatasetChunk(
+            features=np.load(version_dir / "features.npy", mmap_mode=mmap_mode),
+            labels=np.load(version_dir / "labels.npy", mmap_mode=mmap_mode),
+        )
+
+        # Load item names
+        with open(version_dir / "item_names.json") as f:
+            item_names = json.load(f)
+
+        # Load metadata
+        with open(version_dir / "metadata.json") as f:
+            metadata = DatasetMetadata.from_dict(json.load(f))
+
+        # Verify checksum
+        if verify_checksum:
+            computed_checksum = self._compute_chunks_checksum([chunk])
+            if computed_checksum != metadata.checksum:
+                logger.warning(
+                    "checksum_mismatch",
+                    version_id=version_id,
+                    expected=metadata.checksum,
+                    computed=computed_checksum,
+                )
+
+        return chunk, item_names, metadata
+
     def _save_to_cache(self, version_id: str, dataset: TrainingDataset) -> None:
         """Save dataset to cache."""
         cache_path = self.cache_dir / f"{version_id}.pkl"
@@ -691,10 +964,18 @@ class TrainingDataManager:
         # Sort by creation date
         game_versions.sort(key=lambda x: x[1].created_at, reverse=True)
 
-        # Remove oldest
+        # Remove oldest (parents of remaining versions are kept)
         for version_id, _ in game_versions[self.max_versions :]:
             self.delete_version(version_id)
 
+    def _get_dependents(self, version_id: str) -> list[str]:
+        """Get versions that append rows to the given version."""
+        return [
+            vid
+            for vid, meta in self._metadata_index.items()
+            if meta.parent_version == version_id
+        ]
+
     def delete_version(self, version_id: str) -> bool:
         """
         Delete a dataset version.
@@ -703,13 +984,22 @@ class TrainingDataManager:
             version_id: Version to delete
 
         Returns:
-            True if deleted, False if not found
+            True if deleted, False if not found or other versions append to it
         """
         version_dir = self.versions_dir / version_id
 
         if not version_dir.exists():
             return False
 
+        dependents = self._get_dependents(version_id)
+        if dependents:
+            logger.warning(
+                "delete_version_has_dependents",
+                version_id=version_id,
+                dependents=dependents,
+            )
+            return False
+
         try:
             shutil.rmtree(version_dir)
 
@@ -779,6 +1069,9 @@ class TrainingDataManager:
         """
         Merge multiple dataset versions into one.
 
+        The merged dataset holds the memory-mapped chunks of all versions;
+        no rows are copied until its features or labels are accessed.
+
         Args:
             version_ids: List of version IDs to merge
             description: Description for merged dataset
@@ -797,12 +1090,12 @@ class TrainingDataManager:
             if ds.feature_names != feature_names:
                 raise ValueError("Incompatible feature sets")
 
-        # Merge arrays
-        merged_features = np.concatenate([ds.features for ds in datasets])
-        merged_labels = np.concatenate([ds.labels for ds in datasets])
+        # Merge chunks
+        merged_chunks = [chunk for ds in datasets for chunk in ds.chunks]
         merged_names = []
         for ds in datasets:
             merged_names.extend(ds.item_names)
+        total_samples = sum(len(chunk) for chunk in merged_chunks)
 
         # Collect sources and games
         all_sources: set[str] = set()
@@ -813,15 +1106,18 @@ class TrainingDataManager:
 
         game_str = "_".join(sorted(all_games))
         version_id = self._generate_version_id(f"merged_{game_str}")
-        checksum = self._compute_checksum(merged_features, merged_labels)
+        checksum = self._compute_chunks_checksum(merged_chunks)
 
         metadata = DatasetMetadata(
             version_id=version_id,
             created_at=datetime.now(UTC),
             game=game_str,
             sources=sorted(all_sources),
-            total_samples=len(merged_labels),
-            price_range=(float(merged_labels.min()), float(merged_labels.max())),
+            total_samples=total_samples,
+            price_range=(
+                min(float(chunk.labels.min()) for chunk in merged_chunks),
+                max(float(chunk.labels.max()) for chunk in merged_chunks),
+            ),
             features_count=len(feature_names),
             checksum=checksum,
             description=description or f"Merged from: {', '.join(version_ids)}",
@@ -834,12 +1130,11 @@ class TrainingDataManager:
             "datasets_merged",
             version_ids=version_ids,
             new_version=version_id,
-            total_samples=len(merged_labels),
+            total_samples=total_samples,
         )
 
-        return TrainingDataset(
-            features=merged_features,
-            labels=merged_labels,
+        return TrainingDataset.from_chunks(
+            chunks=merged_chunks,
             item_names=merged_names,
             metadata=metadata,
             feature_names=feature_names,
@@ -859,13 +1154,19 @@ class TrainingDataManager:
         dataset = self.load_version(version_id)
         output_path = Path(output_path)
 
-        # Create DataFrame
-        df = pd.DataFrame(dataset.features, columns=dataset.feature_names)
-        df["label"] = dataset.labels
-        df["item_name"] = dataset.item_names
-
-        # Save to CSV
-        df.to_csv(output_path, index=False)
+        # Write batch by batch
+        position = 0
+        for features, labels in dataset.iter_batches():
+            df = pd.DataFrame(features, columns=dataset.feature_names)
+            df["label"] = labels
+            df["item_name"] = dataset.item_names[position : position + len(labels)]
+            df.to_csv(
+                output_path,
+                index=False,
+                mode="a" if position else "w",
+                header=not position,
+            )
+            position += len(labels)
 
         logger.info("dataset_exported", version_id=version_id, path=str(output_path))
 
@@ -2,7 +2,7 @@
 
 from src.models.alert import PriceAlert
 from src.models.log import AnalyticsEvent, CommandLog
-from src.models.market import MarketData, MarketDataCache
+from src.models.market import MarketData, MarketDataCache, MarketDataRollup
 from src.models.pending_trade import PendingTrade, PendingTradeStatus
 from src.models.target import Target, TradeHistory, TradingSettings
 from src.models.user import User, UserSettings
@@ -13,6 +13,7 @@ __all__ = [
     "CommandLog",
     "MarketData",
     "MarketDataCache",
+    "MarketDataRollup",
     "PendingTrade",
     "PendingTradeStatus",
     "PriceAlert",
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text, UniqueConstraint
 
 from src.models.base import Base, UUIDType
 
@@ -26,6 +26,38 @@ class MarketData(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
 
 
+class MarketDataRollup(Base):
+    """OHLCV aggregate of market_data for one item and time bucket.
+
+    Rollups are built by ``PriceHistoryStore`` for several resolutions
+    (5 minutes, 1 hour, 1 day) so long price histories can be read without
+    scanning raw market_data rows.
+    """
+
+    __tablename__ = "market_data_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "resolution",
+            "game",
+            "item_name",
+            "bucket_start",
+            name="uq_market_data_rollups_bucket",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resolution = Column(String(8), nullable=False)
+    game = Column(String(100), nullable=False)
+    item_name = Column(Text, nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False, index=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Integer)  # Highest volume_24h reported in the bucket
+    samples = Column(Integer, nullable=False, default=0)  # Raw ticks aggregated
+
+
 class MarketDataCache(Base):
     """Market data cache model.
 
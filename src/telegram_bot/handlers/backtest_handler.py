@@ -3,10 +3,12 @@
 Provides commands for running and viewing backtests:
 - /backtest <strategy> [days] - Run backtest
 - /backtest_results - View recent results
+- Parameter sweep - run a strategy parameter grid in the background
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 import logging
@@ -21,14 +23,40 @@ from src.analytics import (
     HistoricalDataCollector,
     SimpleArbitrageStrategy,
 )
+from src.dmarket.backtest_sweep import (
+    ParameterSweepRunner,
+    build_sweep_jobs,
+    format_ranking_table,
+)
+from src.dmarket.backtester import (
+    Backtester as SweepBacktester,
+    SimpleArbitrageStrategy as SweepArbitrageStrategy,
+)
 
 
 if TYPE_CHECKING:
+    from telegram import Bot
+
     from src.interfaces import IDMarketAPI
 
 
 logger = logging.getLogger(__name__)
 
+# Sample items for testing
+# In production, this would come from user's watchlist or popular items
+SAMPLE_ITEMS = [
+    "AK-47 | Redline (Field-Tested)",
+    "AWP | Asiimov (Field-Tested)",
+    "M4A1-S | Hyper Beast (Field-Tested)",
+]
+
+# Parameter grid for the background sweep (36 backtests)
+SWEEP_PARAM_GRID: dict[str, list[float]] = {
+    "buy_threshold_percent": [3.0, 5.0, 7.0],
+    "min_profit_percent": [5.0, 10.0, 15.0],
+    "max_loss_percent": [3.0, 5.0, 8.0, 12.0],
+}
+
 
 class BacktestHandler:
     """Handler for backtesting Telegram commands.
@@ -50,6 +78,7 @@ class BacktestHandler:
         self._api = api
         self._initial_balance = Decimal(str(initial_balance))
         self._recent_results: list[BacktestResult] = []
+        self._sweep_tasks: dict[int, asyncio.Task[None]] = {}
 
     def set_api(self, api: IDMarketAPI) -> None:
         """Set the API client.
@@ -95,6 +124,12 @@ class BacktestHandler:
                     callback_data=f"backtest:run:simple:{days}",
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    "🧪 Parameter Sweep",
+                    callback_data=f"backtest:sweep:{days}",
+                ),
+            ],
             [
                 InlineKeyboardButton(
                     "📊 View Results",
@@ -142,6 +177,9 @@ class BacktestHandler:
             strategy = parts[2]
             days = int(parts[3]) if len(parts) > 3 else 30
             await self._run_backtest(query, strategy, days)
+        elif data.startswith("backtest:sweep:"):
+            days = int(data.split(":")[-1])
+            await self._start_sweep(query, context, days)
         elif data == "backtest:results":
             await self._show_results(query)
         elif data == "backtest:settings":
@@ -190,18 +228,10 @@ class BacktestHandler:
             else:
                 strategy = SimpleArbitrageStrategy()
 
-            # Collect sample items for testing
-            # In production, this would come from user's watchlist or popular items
-            sample_items = [
-                "AK-47 | Redline (Field-Tested)",
-                "AWP | Asiimov (Field-Tested)",
-                "M4A1-S | Hyper Beast (Field-Tested)",
-            ]
-
             # Collect historical data
             price_histories = await collector.collect_batch(
                 game="csgo",
-                titles=sample_items,
+                titles=SAMPLE_ITEMS,
                 days=days,
             )
 
@@ -234,6 +264,105 @@ class BacktestHandler:
                 ]),
             )
 
+    async def _start_sweep(
+        self,
+        query,
+        context: ContextTypes.DEFAULT_TYPE,
+        days: int,
+    ) -> None:
+        """Start a parameter sweep in the background.
+
+        The ranked table is sent to the chat when the sweep completes.
+
+        Args:
+            query: Callback query
+            context: Callback context
+            days: Number of days to backtest
+        """
+        if not self._api:
+            await query.edit_message_text("❌ API not configured")
+            return
+
+        chat_id = query.message.chat_id
+        running = self._sweep_tasks.get(chat_id)
+        if running and not running.done():
+            await query.edit_message_text("⏳ A parameter sweep is already running in this chat.")
+            return
+
+        self._sweep_tasks[chat_id] = asyncio.create_task(
+            self._run_sweep(context.bot, chat_id, days)
+        )
+
+        jobs_count = len(build_sweep_jobs(SweepArbitrageStrategy, SWEEP_PARAM_GRID))
+        await query.edit_message_text(
+            f"🧪 Parameter sweep started\n\n"
+            f"Strategy: Simple Arbitrage\n"
+            f"Backtests: {jobs_count}\n"
+            f"Period: {days} days\n\n"
+            f"Results will be sent here when ready.",
+            reply_markup=InlineKeyboardMarkup([
+                [InlineKeyboardButton("« Back", callback_data="backtest:back")]
+            ]),
+        )
+
+    async def _run_sweep(self, bot: Bot, chat_id: int, days: int) -> None:
+        """Collect data, run the sweep across worker processes and report.
+
+        Args:
+            bot: Telegram bot to send the report with
+            chat_id: Chat to report to
+            days: Number of days to backtest
+        """
+        try:
+            collector = HistoricalDataCollector(self._api)
+            price_histories = await collector.collect_batch(
+                game="csgo",
+                titles=SAMPLE_ITEMS,
+                days=days,
+            )
+
+            backtester = SweepBacktester(initial_balance=float(self._initial_balance))
+            for title, history in price_histories.items():
+                backtester.load_data_from_list(
+                    item_id=title,
+                    item_name=title,
+                    game=history.game,
+                    prices=[
+                        {
+                            "timestamp": point.timestamp,
+                            "price": float(point.price),
+                            "volume": point.volume,
+                        }
+                        for point in history.points
+                    ],
+                )
+
+            if not any(dataset.prices for dataset in backtester.data.values()):
+                await bot.send_message(chat_id=chat_id, text="❌ Sweep failed: no price history")
+                return
+
+            jobs = build_sweep_jobs(SweepArbitrageStrategy, SWEEP_PARAM_GRID)
+            runner = ParameterSweepRunner.from_backtester(backtester)
+            ranked = await runner.run(jobs)
+
+            await bot.send_message(
+                chat_id=chat_id,
+                text=(
+                    f"🧪 *Parameter Sweep Results* ({days} days, {len(ranked)} backtests)\n\n"
+                    f"```\n{format_ranking_table(ranked, limit=5)}\n```"
+                ),
+                parse_mode="Markdown",
+            )
+
+        except Exception as e:
+            logger.exception("backtest_sweep_error", extra={"error": str(e)})
+            await bot.send_message(
+                chat_id=chat_id,
+                text=f"❌ Sweep failed: {e!s}\n\nPlease try again later.",
+            )
+        finally:
+            self._sweep_tasks.pop(chat_id, None)
+
     async def _display_result(
         self,
         query,
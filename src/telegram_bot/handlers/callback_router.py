@@ -4,9 +4,16 @@ This module implements a clean callback routing system using the Command pattern
 to replace the massive button_callback_handler with 83 elif statements.
 
 Phase 2 Refactoring: Early returns, small functions, clear responsibilities.
+
+Prefixes are compiled into a trie, so the longest registered prefix wins
+regardless of registration order. Registering a different handler for an
+already registered callback_data or prefix raises RouteConflictError at
+startup instead of silently shadowing one of them.
 """
 
+from dataclasses import dataclass, field
 import logging
+import time
 from typing import Awaitable, Callable
 
 from telegram import Update
@@ -20,6 +27,41 @@ logger = logging.getLogger(__name__)
 # Type alias for callback handlers
 CallbackHandler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]
 
+# Route label for callbacks without a handler
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteConflictError(ValueError):
+    """Raised when a callback route is registered with two different handlers."""
+
+
+@dataclass
+class _TrieNode:
+    """Node of the prefix trie (one character per edge)."""
+
+    children: dict[str, "_TrieNode"] = field(default_factory=dict)
+    handler: CallbackHandler | None = None
+
+
+@dataclass
+class RouteStats:
+    """Hit count and handler latency of a route."""
+
+    hits: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record one handled callback."""
+        self.hits += 1
+        self.total_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
+
+    @property
+    def avg_seconds(self) -> float:
+        """Average handler duration."""
+        return self.total_seconds / self.hits if self.hits else 0.0
+
 
 class CallbackRouter:
     """Routes callback queries to appropriate handlers using Command pattern."""
@@ -27,8 +69,10 @@ class CallbackRouter:
     def __init__(self) -> None:
         """Initialize the callback router with empty registry."""
         self._exact_handlers: dict[str, CallbackHandler] = {}
-        self._prefix_handlers: list[tuple[str, CallbackHandler]] = []
+        self._prefix_handlers: dict[str, CallbackHandler] = {}
+        self._prefix_trie = _TrieNode()
         self._pattern_handlers: list[tuple[Callable[[str], bool], CallbackHandler]] = []
+        self._route_stats: dict[str, RouteStats] = {}
 
     def register_exact(self, callback_data: str, handler: CallbackHandler) -> None:
         """Register handler for exact callback_data match.
@@ -37,7 +81,13 @@ class CallbackRouter:
             callback_data: Exact callback data string to match
             handler: Async handler function
 
+        Raises:
+            RouteConflictError: If callback_data already has another handler
+
         """
+        _check_conflict(
+            "callback_data", callback_data, self._exact_handlers.get(callback_data), handler
+        )
         self._exact_handlers[callback_data] = handler
 
     def register_prefix(self, prefix: str, handler: CallbackHandler) -> None:
@@ -47,8 +97,20 @@ class CallbackRouter:
             prefix: Prefix to match
             handler: Async handler function
 
+        Raises:
+            ValueError: If prefix is empty
+            RouteConflictError: If prefix already has another handler
+
         """
-        self._prefix_handlers.append((prefix, handler))
+        if not prefix:
+            raise ValueError("Callback prefix must not be empty")
+        _check_conflict("prefix", prefix, self._prefix_handlers.get(prefix), handler)
+        self._prefix_handlers[prefix] = handler
+
+        node = self._prefix_trie
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.handler = handler
 
     def register_pattern(self, matcher: Callable[[str], bool], handler: CallbackHandler) -> None:
         """Register handler with custom matcher function.
@@ -60,6 +122,64 @@ class CallbackRouter:
         """
         self._pattern_handlers.append((matcher, handler))
 
+    def _match_prefix(self, callback_data: str) -> tuple[str, CallbackHandler] | None:
+        """Find the longest registered prefix of callback_data."""
+        node = self._prefix_trie
+        match = None
+        for index, char in enumerate(callback_data):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.handler is not None:
+                match = (callback_data[: index + 1], node.handler)
+        return match
+
+    def resolve(self, callback_data: str) -> tuple[str, CallbackHandler] | None:
+        """Find the handler for callback_data without calling it.
+
+        Exact matches win over prefixes, prefixes over pattern matchers.
+        Among prefixes the longest one wins.
+
+        Args:
+            callback_data: Callback data of the pressed button
+
+        Returns:
+            (route, handler) or None if nothing matches. route is the matched
+            callback_data, prefix or "pattern:<matcher name>".
+
+        """
+        handler = self._exact_handlers.get(callback_data)
+        if handler is not None:
+            return callback_data, handler
+
+        match = self._match_prefix(callback_data)
+        if match is not None:
+            return match
+
+        for matcher, handler in self._pattern_handlers:
+            if matcher(callback_data):
+                return f"pattern:{getattr(matcher, '__name__', 'matcher')}", handler
+
+        return None
+
+    def get_route_stats(self) -> dict[str, RouteStats]:
+        """Hit counts and handler latency per route (slowest average first)."""
+        return dict(
+            sorted(
+                self._route_stats.items(),
+                key=lambda item: item[1].avg_seconds,
+                reverse=True,
+            )
+        )
+
+    def _record(self, route: str, duration: float) -> None:
+        """Record handler latency of a route."""
+        stats = self._route_stats.get(route)
+        if stats is None:
+            stats = self._route_stats[route] = RouteStats()
+        stats.record(duration)
+        _track_callback_route(route, duration)
+
     async def route(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
         """Route callback query to appropriate handler.
 
@@ -80,27 +200,45 @@ class CallbackRouter:
         # Answer callback query immediately
         await update.callback_query.answer()
 
-        # Try exact match first (fastest)
-        if callback_data in self._exact_handlers:
-            handler = self._exact_handlers[callback_data]
+        match = self.resolve(callback_data)
+        if match is None:
+            self._record(UNMATCHED_ROUTE, 0.0)
+            logger.warning("No handler found for callback_data: %s", callback_data)
+            return False
+
+        route, handler = match
+        started = time.perf_counter()
+        try:
             await handler(update, context)
-            return True
+        finally:
+            self._record(route, time.perf_counter() - started)
+        return True
 
-        # Try prefix matches
-        for prefix, handler in self._prefix_handlers:
-            if callback_data.startswith(prefix):
-                await handler(update, context)
-                return True
 
-        # Try pattern matches
-        for matcher, handler in self._pattern_handlers:
-            if matcher(callback_data):
-                await handler(update, context)
-                return True
+def _check_conflict(
+    kind: str,
+    key: str,
+    registered: CallbackHandler | None,
+    handler: CallbackHandler,
+) -> None:
+    """Raise if key is already registered with a different handler."""
+    if registered is None or registered is handler:
+        return
+    raise RouteConflictError(
+        f"Callback {kind} {key!r} is already handled by "
+        f"{getattr(registered, '__qualname__', registered)!r}, "
+        f"cannot register {getattr(handler, '__qualname__', handler)!r}"
+    )
+
+
+def _track_callback_route(route: str, duration: float) -> None:
+    """Record callback handler latency in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_callback_route
 
-        # No handler found
-        logger.warning("No handler found for callback_data: %s", callback_data)
-        return False
+        track_callback_route(route, duration)
+    except ImportError:
+        pass
 
 
 @telegram_error_boundary(user_friendly_message="❌ Ошибка обработки кнопки")
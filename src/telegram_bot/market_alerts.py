@@ -3,10 +3,17 @@
 Этот модуль предоставляет функции для отслеживания рынка и отправки
 уведомлений о важных событиях, таких как резкие изменения цен,
 появление выгодных предложений или новые арбитражные возможности.
+
+Каждый тип уведомлений имеет свой таймер в куче (heapq) вместо опроса
+раз в 30 секунд. Проверки изменений цен, трендов и волатильности, наступившие
+одновременно, используют один общий снимок рынка (``MarketSnapshotStore``)
+и выполняются параллельно; в снимке заново оцениваются только предметы,
+изменившиеся с прошлой проверки этого типа.
 """
 
 import asyncio
 import contextlib
+import heapq
 import logging
 import time
 from typing import Any
@@ -17,8 +24,13 @@ from src.dmarket.dmarket_api import DMarketAPI
 from src.dmarket.market_analysis import (
     analyze_market_volatility,
     analyze_price_changes,
+    evaluate_item_volatility,
+    evaluate_price_change,
+    evaluate_trending_item,
     find_trending_items,
+    simulate_historical_prices,
 )
+from src.dmarket.market_snapshot import ItemFingerprint, MarketSnapshot, MarketSnapshotStore
 
 
 # Настройка логирования
@@ -26,6 +38,15 @@ logger = logging.getLogger(__name__)
 
 SECONDS_PER_DAY = 86400
 
+# Типы уведомлений, которые оцениваются по общему снимку рынка
+SNAPSHOT_ALERT_TYPES = ("price_changes", "trending", "volatility")
+
+# Пауза перед повтором проверок, если снимок рынка загрузить не удалось
+SNAPSHOT_RETRY_DELAY = 60.0
+
+# Сколько лучших предметов каждого типа рассматривать для уведомлений
+ALERT_CANDIDATES_LIMIT = 10
+
 
 class MarketAlertsManager:
     """Менеджер уведомлений о событиях на рынке."""
@@ -88,6 +109,19 @@ class MarketAlertsManager:
         self._cleanup_task: asyncio.Task[None] | None = None
         self._cleanup_lock = asyncio.Lock()
 
+        # Общий снимок рынка и результаты оценки предметов по типам уведомлений:
+        # alert_type -> {title: (отпечаток предмета, результат оценки или None)}
+        self.snapshot_store = MarketSnapshotStore(dmarket_api)
+        self._evaluated: dict[
+            str, dict[str, tuple[ItemFingerprint, dict[str, Any] | None]]
+        ] = {alert_type: {} for alert_type in SNAPSHOT_ALERT_TYPES}
+
+        # Куча таймеров проверок (время запуска, тип уведомлений). Запись
+        # действительна, только если совпадает с self._scheduled_at.
+        self._schedule: list[tuple[float, str]] = []
+        self._scheduled_at: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+
         # Флаг для управления фоновой задачей
         self.running = False
         self.background_task = None
@@ -124,16 +158,118 @@ class MarketAlertsManager:
 
         logger.info("Мониторинг рынка остановлен")
 
+    def _schedule_check(self, alert_type: str, due: float | None = None) -> None:
+        """Ставит (или переставляет) таймер проверки указанного типа.
+
+        Args:
+            alert_type: Тип уведомлений
+            due: Время запуска; по умолчанию - последняя проверка плюс интервал
+
+        """
+        if due is None:
+            due = self.last_check_time[alert_type] + self.check_intervals[alert_type]
+        self._scheduled_at[alert_type] = due
+        heapq.heappush(self._schedule, (due, alert_type))
+        self._wakeup.set()
+
+    def _reset_schedule(self) -> None:
+        """Пересобирает кучу таймеров для типов, у которых есть подписчики."""
+        self._schedule.clear()
+        self._scheduled_at.clear()
+        for alert_type, subscribers in self.subscribers.items():
+            if subscribers:
+                self._schedule_check(alert_type)
+
+    def _pop_due_checks(self, now: float) -> list[str]:
+        """Извлекает из кучи типы уведомлений, время проверки которых наступило."""
+        due_checks = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due, alert_type = heapq.heappop(self._schedule)
+            # Устаревшая запись после перестановки таймера
+            if self._scheduled_at.get(alert_type) != due:
+                continue
+            del self._scheduled_at[alert_type]
+            # Без подписчиков таймер не перезапускается до новой подписки
+            if self.subscribers[alert_type]:
+                due_checks.append(alert_type)
+        return due_checks
+
+    def _next_wakeup(self) -> float:
+        """Время ближайшего таймера проверки или очистки истории."""
+        next_cleanup = self.last_cleanup_time + self.sent_alerts_cleanup_interval_seconds
+        while self._schedule:
+            due, alert_type = self._schedule[0]
+            if self._scheduled_at.get(alert_type) == due:
+                break
+            heapq.heappop(self._schedule)
+        if not self._schedule:
+            return next_cleanup
+        return min(self._schedule[0][0], next_cleanup)
+
+    async def _wait_for_wakeup(self, timeout: float | None) -> None:
+        """Ждет наступления таймера или изменения подписок/интервалов."""
+        if timeout is not None and timeout <= 0:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _run_checks(self, alert_types: list[str]) -> None:
+        """Выполняет наступившие проверки параллельно на общем снимке рынка.
+
+        Args:
+            alert_types: Типы уведомлений для проверки
+
+        """
+        snapshot = None
+        if any(alert_type in SNAPSHOT_ALERT_TYPES for alert_type in alert_types):
+            snapshot = await self.snapshot_store.get()
+
+        checks = {
+            "price_changes": self._check_price_changes,
+            "trending": self._check_trending_items,
+            "volatility": self._check_volatility,
+        }
+        tasks = []
+        started = []
+        for alert_type in alert_types:
+            if alert_type == "arbitrage":
+                tasks.append(self._check_arbitrage())
+            elif snapshot is not None:
+                tasks.append(checks[alert_type](snapshot))
+            else:
+                logger.warning(
+                    f"Снимок рынка недоступен, проверка '{alert_type}' отложена "
+                    f"на {SNAPSHOT_RETRY_DELAY:.0f} с",
+                )
+                self._schedule_check(alert_type, time.time() + SNAPSHOT_RETRY_DELAY)
+                continue
+            started.append(alert_type)
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        finished_at = time.time()
+        for alert_type, result in zip(started, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка проверки уведомлений '{alert_type}': {result}")
+            self.last_check_time[alert_type] = finished_at
+            if self.subscribers[alert_type]:
+                self._schedule_check(alert_type)
+
     async def _monitor_market(self) -> None:
         """Фоновая задача для мониторинга рынка."""
         logger.info("Фоновый мониторинг рынка запущен")
 
         try:
+            self._reset_schedule()
+
             while self.running:
+                # Изменения подписок и интервалов после этой точки разбудят цикл
+                self._wakeup.clear()
+
                 # Проверяем наличие подписчиков
                 if not any(subscribers for subscribers in self.subscribers.values()):
-                    logger.debug("Нет активных подписчиков, пропускаем проверку")
-                    await asyncio.sleep(60)  # Спим минуту и проверяем снова
+                    logger.debug("Нет активных подписчиков, ждем подписки")
+                    await self._wait_for_wakeup(None)
                     continue
 
                 current_time = time.time()
@@ -152,44 +288,13 @@ class MarketAlertsManager:
                         )
                     self.last_cleanup_time = current_time
 
-                # Проверяем изменения цен при необходимости
-                if (
-                    self.subscribers["price_changes"]
-                    and current_time - self.last_check_time["price_changes"]
-                    >= self.check_intervals["price_changes"]
-                ):
-                    await self._check_price_changes()
-                    self.last_check_time["price_changes"] = current_time
-
-                # Проверяем трендовые предметы при необходимости
-                if (
-                    self.subscribers["trending"]
-                    and current_time - self.last_check_time["trending"]
-                    >= self.check_intervals["trending"]
-                ):
-                    await self._check_trending_items()
-                    self.last_check_time["trending"] = current_time
-
-                # Проверяем волатильность при необходимости
-                if (
-                    self.subscribers["volatility"]
-                    and current_time - self.last_check_time["volatility"]
-                    >= self.check_intervals["volatility"]
-                ):
-                    await self._check_volatility()
-                    self.last_check_time["volatility"] = current_time
-
-                # Проверяем арбитражные возможности при необходимости
-                if (
-                    self.subscribers["arbitrage"]
-                    and current_time - self.last_check_time["arbitrage"]
-                    >= self.check_intervals["arbitrage"]
-                ):
-                    await self._check_arbitrage()
-                    self.last_check_time["arbitrage"] = current_time
+                due_checks = self._pop_due_checks(current_time)
+                if due_checks:
+                    await self._run_checks(due_checks)
+                    continue
 
-                # Ждем перед следующей проверкой
-                await asyncio.sleep(30)  # Проверяем подписки каждые 30 секунд
+                # Спим до ближайшего таймера
+                await self._wait_for_wakeup(self._next_wakeup() - current_time)
 
         except asyncio.CancelledError:
             logger.info("Задача мониторинга рынка отменена")
@@ -205,19 +310,129 @@ class MarketAlertsManager:
                 await asyncio.sleep(60)
                 self.background_task = asyncio.create_task(self._monitor_market())
 
-    async def _check_price_changes(self) -> None:
-        """Проверяет изменения цен и отправляет уведомления."""
+    def _evaluate_snapshot(
+        self,
+        alert_type: str,
+        snapshot: MarketSnapshot,
+    ) -> list[dict[str, Any]]:
+        """Инкрементально оценивает предметы снимка для типа уведомлений.
+
+        Заново оцениваются только предметы, изменившиеся с прошлой проверки
+        этого типа; для остальных используется сохраненный результат.
+
+        Args:
+            alert_type: Тип уведомлений (price_changes, trending, volatility)
+            snapshot: Снимок рынка
+
+        Returns:
+            Результаты оценки всех предметов снимка (без фильтра по порогу)
+
+        """
+        evaluated = self._evaluated[alert_type]
+        fingerprints = {title: entry[0] for title, entry in evaluated.items()}
+        changed, removed = snapshot.changed_since(fingerprints)
+
+        for title in removed:
+            del evaluated[title]
+
+        if changed:
+            items = [snapshot.items[title] for title in changed]
+            if alert_type == "price_changes":
+                results = self._evaluate_price_changes(items, snapshot.game)
+            elif alert_type == "trending":
+                results = self._evaluate_trending(items, snapshot.game)
+            else:
+                results = self._evaluate_volatility(items, snapshot.game)
+            for title in changed:
+                evaluated[title] = (snapshot.fingerprints[title], results.get(title))
+
+        logger.debug(
+            f"Оценка '{alert_type}': изменилось {len(changed)} из {len(snapshot.items)} предметов",
+        )
+        return [result for _, result in evaluated.values() if result is not None]
+
+    @staticmethod
+    def _evaluate_price_changes(
+        items: list[dict[str, Any]],
+        game: str,
+    ) -> dict[str, dict[str, Any] | None]:
+        """Оценивает изменения цен предметов."""
+        historical_prices = simulate_historical_prices(items)
+        return {
+            item["title"]: evaluate_price_change(
+                item,
+                historical_prices.get(item["title"], 0),
+                game=game,
+            )
+            for item in items
+        }
+
+    @staticmethod
+    def _evaluate_trending(
+        items: list[dict[str, Any]],
+        game: str,
+    ) -> dict[str, dict[str, Any] | None]:
+        """Оценивает популярность предметов (цена от $5, минимум 10 продаж)."""
+        results = {}
+        for item in items:
+            trending_item = evaluate_trending_item(item, game=game, min_sales=10)
+            if trending_item is not None and trending_item["price"] < 5.0:
+                trending_item = None
+            results[item["title"]] = trending_item
+        return results
+
+    @staticmethod
+    def _evaluate_volatility(
+        items: list[dict[str, Any]],
+        game: str,
+    ) -> dict[str, dict[str, Any] | None]:
+        """Оценивает волатильность предметов (цена от $10 до $500)."""
+        historical_24h = simulate_historical_prices(items)
+        historical_7d = simulate_historical_prices(items)
+        results = {}
+        for item in items:
+            title = item["title"]
+            volatility_item = evaluate_item_volatility(
+                item,
+                historical_24h.get(title, 0),
+                historical_7d.get(title, 0),
+                game=game,
+            )
+            if volatility_item is not None and not (
+                10.0 <= volatility_item["current_price"] <= 500.0
+            ):
+                volatility_item = None
+            results[title] = volatility_item
+        return results
+
+    async def _check_price_changes(self, snapshot: MarketSnapshot | None = None) -> None:
+        """Проверяет изменения цен и отправляет уведомления.
+
+        Args:
+            snapshot: Общий снимок рынка или None для отдельного запроса к API
+
+        """
         logger.info("Проверка изменений цен")
 
         try:
-            # Анализируем изменения цен для CS2
-            price_changes = await analyze_price_changes(
-                game="csgo",
-                period="24h",
-                min_change_percent=self.alert_thresholds["price_change_percent"],
-                dmarket_api=self.dmarket_api,
-                limit=10,
-            )
+            if snapshot is None:
+                # Анализируем изменения цен для CS2
+                price_changes = await analyze_price_changes(
+                    game="csgo",
+                    period="24h",
+                    min_change_percent=self.alert_thresholds["price_change_percent"],
+                    dmarket_api=self.dmarket_api,
+                    limit=ALERT_CANDIDATES_LIMIT,
+                )
+            else:
+                threshold = self.alert_thresholds["price_change_percent"]
+                price_changes = [
+                    item
+                    for item in self._evaluate_snapshot("price_changes", snapshot)
+                    if abs(item["change_percent"]) >= threshold
+                ]
+                price_changes.sort(key=lambda x: abs(x["change_percent"]), reverse=True)
+                price_changes = price_changes[:ALERT_CANDIDATES_LIMIT]
 
             if not price_changes:
                 logger.info("Значительных изменений цен не обнаружено")
@@ -288,19 +503,31 @@ class MarketAlertsManager:
 
             logger.exception(traceback.format_exc())
 
-    async def _check_trending_items(self) -> None:
-        """Проверяет трендовые предметы и отправляет уведомления."""
+    async def _check_trending_items(self, snapshot: MarketSnapshot | None = None) -> None:
+        """Проверяет трендовые предметы и отправляет уведомления.
+
+        Args:
+            snapshot: Общий снимок рынка или None для отдельного запроса к API
+
+        """
         logger.info("Проверка трендовых предметов")
 
         try:
-            # Анализируем трендовые предметы для CS2
-            trending_items = await find_trending_items(
-                game="csgo",
-                min_price=5.0,  # Минимальная цена $5
-                dmarket_api=self.dmarket_api,
-                limit=10,
-                min_sales=10,  # Минимум 10 продаж
-            )
+            if snapshot is None:
+                # Анализируем трендовые предметы для CS2
+                trending_items = await find_trending_items(
+                    game="csgo",
+                    min_price=5.0,  # Минимальная цена $5
+                    dmarket_api=self.dmarket_api,
+                    limit=ALERT_CANDIDATES_LIMIT,
+                    min_sales=10,  # Минимум 10 продаж
+                )
+            else:
+                trending_items = sorted(
+                    self._evaluate_snapshot("trending", snapshot),
+                    key=lambda x: x["popularity_score"],
+                    reverse=True,
+                )[:ALERT_CANDIDATES_LIMIT]
 
             if not trending_items:
                 logger.info("Значимых трендовых предметов не обнаружено")
@@ -378,19 +605,31 @@ class MarketAlertsManager:
 
             logger.exception(traceback.format_exc())
 
-    async def _check_volatility(self) -> None:
-        """Проверяет волатильность предметов и отправляет уведомления."""
+    async def _check_volatility(self, snapshot: MarketSnapshot | None = None) -> None:
+        """Проверяет волатильность предметов и отправляет уведомления.
+
+        Args:
+            snapshot: Общий снимок рынка или None для отдельного запроса к API
+
+        """
         logger.info("Проверка волатильности предметов")
 
         try:
-            # Анализируем волатильные предметы для CS2
-            volatile_items = await analyze_market_volatility(
-                game="csgo",
-                min_price=10.0,  # Минимальная цена $10
-                max_price=500.0,  # Максимальная цена $500
-                dmarket_api=self.dmarket_api,
-                limit=10,
-            )
+            if snapshot is None:
+                # Анализируем волатильные предметы для CS2
+                volatile_items = await analyze_market_volatility(
+                    game="csgo",
+                    min_price=10.0,  # Минимальная цена $10
+                    max_price=500.0,  # Максимальная цена $500
+                    dmarket_api=self.dmarket_api,
+                    limit=ALERT_CANDIDATES_LIMIT,
+                )
+            else:
+                volatile_items = sorted(
+                    self._evaluate_snapshot("volatility", snapshot),
+                    key=lambda x: x["volatility_score"],
+                    reverse=True,
+                )[:ALERT_CANDIDATES_LIMIT]
 
             if not volatile_items:
                 logger.info("Значимых волатильных предметов не обнаружено")
@@ -456,11 +695,9 @@ class MarketAlertsManager:
         try:
             # Используем ArbitrageScanner для поиска возможностей
             from src.dmarket.arbitrage_scanner import ArbitrageScanner
-            from src.dmarket.dmarket_api import DMarketAPI
 
-            # Создаем API клиент и сканер
-            api_client = DMarketAPI()
-            scanner = ArbitrageScanner(api_client=api_client)
+            # Сканер работает через общий API клиент менеджера
+            scanner = ArbitrageScanner(api_client=self.dmarket_api)
 
             # Ищем арбитражные возможности
             arbitrage_items = await scanner.scan_level(
@@ -572,6 +809,8 @@ class MarketAlertsManager:
             return False
 
         self.subscribers[alert_type].add(user_id)
+        if alert_type not in self._scheduled_at:
+            self._schedule_check(alert_type)
         logger.info(
             f"Пользователь {user_id} подписался на уведомления типа '{alert_type}'",
         )
@@ -715,6 +954,8 @@ class MarketAlertsManager:
             return False
 
         self.check_intervals[alert_type] = new_interval
+        if alert_type in self._scheduled_at:
+            self._schedule_check(alert_type)
         logger.info(
             f"Интервал проверки для уведомлений типа '{alert_type}' обновлен до {new_interval} с",
         )
@@ -1,6 +1,9 @@
 import asyncio
-from dataclasses import dataclass
+from collections import deque
+import contextlib
+from dataclasses import dataclass, field
 from enum import IntEnum
+import heapq
 import itertools
 import logging
 import time
@@ -11,6 +14,13 @@ from telegram.error import NetworkError, RetryAfter, TimedOut
 
 logger = logging.getLogger(__name__)
 
+# Telegram message length limit (coalesced texts must fit)
+MAX_MESSAGE_LENGTH = 4096
+COALESCE_SEPARATOR = "\n\n"
+
+# Number of recent queue latencies used for percentiles
+LATENCY_WINDOW = 1000
+
 
 class Priority(IntEnum):
     HIGH = 0
@@ -26,6 +36,54 @@ class NotificationMessage:
     reply_markup: InlineKeyboardMarkup | ReplyKeyboardMarkup | None = None
     disable_web_page_preview: bool = False
     priority: int = Priority.NORMAL
+    enqueued_at: float = field(default_factory=time.monotonic)
+    coalesced: int = 1
+
+    def can_coalesce(self, other: "NotificationMessage") -> bool:
+        """Check if another message can be appended to this one."""
+        return (
+            self.reply_markup is None
+            and other.reply_markup is None
+            and self.parse_mode == other.parse_mode
+            and self.disable_web_page_preview == other.disable_web_page_preview
+            and len(self.text) + len(COALESCE_SEPARATOR) + len(other.text) <= MAX_MESSAGE_LENGTH
+        )
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket refilled with one token every `interval` seconds."""
+
+    interval: float
+    capacity: float = 1.0
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+    blocked_until: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.tokens = self.capacity
+
+    def _refill(self, now: float) -> None:
+        if self.interval <= 0:
+            self.tokens = self.capacity
+        elif now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+        self.updated = max(self.updated, now)
+
+    def ready_at(self, now: float) -> float:
+        """Time when a token is available."""
+        self._refill(now)
+        ready = now if self.tokens >= 1 else now + (1 - self.tokens) * self.interval
+        return max(ready, self.blocked_until)
+
+    def consume(self, now: float) -> None:
+        """Take a token."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, until: float) -> None:
+        """Make no tokens available until the given time (e.g. after RetryAfter)."""
+        self.blocked_until = max(self.blocked_until, until)
 
 
 class NotificationQueue:
@@ -34,6 +92,12 @@ class NotificationQueue:
     Respects Telegram's limits:
     - 30 messages per second globally
     - 1 message per second per chat
+
+    Every chat has its own lane and token bucket, so a chat in cooldown does
+    not delay other chats. `concurrency` senders always take the highest
+    priority message among chats that may send right now; a global token
+    bucket keeps the total rate within Telegram's budget. Messages still
+    queued for the same chat are coalesced into one message.
     """
 
     def __init__(
@@ -41,40 +105,87 @@ class NotificationQueue:
         bot: Bot,
         global_rate_limit: float = 1.0 / 30.0,  # 30 msgs/sec
         chat_rate_limit: float = 1.0,  # 1 msg/sec per chat
+        concurrency: int = 4,
+        coalesce: bool = True,
     ) -> None:
         self.bot = bot
-        self.queue: asyncio.PriorityQueue[tuple[int, float, int, NotificationMessage]] = (
-            asyncio.PriorityQueue()
-        )
         self.is_running = False
-        self.worker_task: asyncio.Task[None] | None = None
+        self.concurrency = concurrency
+        self.coalesce = coalesce
+        self._workers: list[asyncio.Task[None]] = []
 
         # Rate limiting
-        self.last_global_send_time = 0.0
-        self.last_chat_send_time: dict[int, float] = {}
-        self.global_rate_limit = global_rate_limit
-        self.chat_rate_limit = chat_rate_limit
+        self._global_bucket = TokenBucket(global_rate_limit)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        self._chat_rate_limit = chat_rate_limit
+
+        # Per-chat lanes: heaps of [priority, sequence, message]
+        self._lanes: dict[int, list[list]] = {}
+        self._last_entry: dict[int, list] = {}
+        self._in_flight: set[int] = set()
+        # Chats with eligible heads: (priority, sequence, chat_id, generation)
+        self._ready: list[tuple[int, int, int, int]] = []
+        # Chats waiting for their bucket: (ready_at, chat_id, generation)
+        self._waiting: list[tuple[float, int, int]] = []
+        self._generation: dict[int, int] = {}
+        self._waiters: list[asyncio.Future[None]] = []
         self._counter = itertools.count()
+        self._pending = 0
+
+        # Stats
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.sent_count = 0
+        self.failed_count = 0
+        self.coalesced_count = 0
+
+    @property
+    def global_rate_limit(self) -> float:
+        """Minimum interval between any two messages (seconds)."""
+        return self._global_bucket.interval
+
+    @global_rate_limit.setter
+    def global_rate_limit(self, value: float) -> None:
+        self._global_bucket.interval = value
+
+    @property
+    def chat_rate_limit(self) -> float:
+        """Minimum interval between two messages to one chat (seconds)."""
+        return self._chat_rate_limit
+
+    @chat_rate_limit.setter
+    def chat_rate_limit(self, value: float) -> None:
+        self._chat_rate_limit = value
+        for bucket in self._chat_buckets.values():
+            bucket.interval = value
+
+    @property
+    def pending(self) -> int:
+        """Number of queued messages."""
+        return self._pending
 
     async def start(self) -> None:
-        """Start the notification worker."""
+        """Start the notification senders."""
         if self.is_running:
             return
 
         self.is_running = True
-        self.worker_task = asyncio.create_task(self._worker())
-        logger.info("Notification queue worker started")
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(max(1, self.concurrency))
+        ]
+        logger.info(f"Notification queue started with {len(self._workers)} senders")
 
     async def stop(self) -> None:
-        """Stop the notification worker."""
+        """Stop the notification senders."""
         self.is_running = False
-        if self.worker_task:
-            self.worker_task.cancel()
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
             try:
-                await self.worker_task
+                await task
             except asyncio.CancelledError:
                 pass
-        logger.info("Notification queue worker stopped")
+        self._workers = []
+        logger.info("Notification queue stopped")
 
     async def enqueue(
         self,
@@ -85,7 +196,7 @@ class NotificationQueue:
         disable_web_page_preview: bool = False,
         priority: int = 1,
     ) -> None:
-        """Add a message to the queue."""
+        """Add a message to the chat's lane."""
         message = NotificationMessage(
             chat_id=chat_id,
             text=text,
@@ -94,49 +205,137 @@ class NotificationQueue:
             disable_web_page_preview=disable_web_page_preview,
             priority=priority,
         )
-        # PriorityQueue sorts by the first item in the tuple,
-        # so we put priority first. We add a counter to break ties
-        # and avoid comparing NotificationMessage objects.
-        count = next(self._counter)
-        await self.queue.put((priority, time.time(), count, message))
 
-    async def _worker(self) -> None:
-        """Process messages from the queue."""
-        while self.is_running:
-            try:
-                # Get message from queue
-                _, _, _, message = await self.queue.get()
+        # Append to the chat's last queued message if possible
+        last = self._last_entry.get(chat_id)
+        if self.coalesce and last is not None and last[2].can_coalesce(message):
+            queued: NotificationMessage = last[2]
+            queued.text = f"{queued.text}{COALESCE_SEPARATOR}{message.text}"
+            queued.coalesced += 1
+            self.coalesced_count += 1
+            _track_notification("coalesced")
+            if priority < last[0]:
+                last[0] = queued.priority = priority
+                heapq.heapify(self._lanes[chat_id])
+                self._schedule_chat(chat_id)
+            return
 
-                # Check rate limits
-                await self._wait_for_rate_limits(message.chat_id)
+        self._push(message, priority)
 
-                # Send message
-                await self._send_message(message)
+    def _push(self, message: NotificationMessage, priority: int) -> None:
+        """Put a message into its chat's lane."""
+        entry = [priority, next(self._counter), message]
+        heapq.heappush(self._lanes.setdefault(message.chat_id, []), entry)
+        self._last_entry[message.chat_id] = entry
+        self._pending += 1
+        self._schedule_chat(message.chat_id)
 
-                # Mark task as done
-                self.queue.task_done()
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self._chat_rate_limit)
+        return bucket
 
-            except asyncio.CancelledError:
-                break
-            except (RuntimeError, OSError, ConnectionError):
-                logger.exception("Error in notification worker")
-                await asyncio.sleep(1)
+    def _schedule_chat(self, chat_id: int) -> None:
+        """(Re)schedule a chat's lane head as ready or waiting for its bucket."""
+        lane = self._lanes.get(chat_id)
+        if not lane or chat_id in self._in_flight:
+            return
+
+        generation = self._generation.get(chat_id, 0) + 1
+        self._generation[chat_id] = generation
+        now = time.monotonic()
+        ready_at = self._chat_bucket(chat_id).ready_at(now)
+        if ready_at <= now:
+            priority, sequence, _ = lane[0]
+            heapq.heappush(self._ready, (priority, sequence, chat_id, generation))
+        else:
+            heapq.heappush(self._waiting, (ready_at, chat_id, generation))
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake up senders waiting for work."""
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    def _promote_waiting(self, now: float) -> None:
+        """Move chats whose cooldown is over to the ready heap."""
+        while self._waiting and self._waiting[0][0] <= now:
+            _, chat_id, generation = heapq.heappop(self._waiting)
+            if self._generation.get(chat_id) == generation:
+                self._schedule_chat(chat_id)
 
-    async def _wait_for_rate_limits(self, chat_id: int) -> None:
-        """Wait if necessary to respect rate limits."""
-        now = time.time()
+    def _pop_ready(self) -> tuple[int, int, int, int] | None:
+        """Pop the highest priority eligible chat, skipping stale entries."""
+        while self._ready:
+            entry = heapq.heappop(self._ready)
+            if self._generation.get(entry[2]) == entry[3]:
+                return entry
+        return None
 
-        # Global rate limit
-        time_since_global = now - self.last_global_send_time
-        if time_since_global < self.global_rate_limit:
-            await asyncio.sleep(self.global_rate_limit - time_since_global)
-            now = time.time()
+    async def _next_message(self) -> NotificationMessage:
+        """Wait for the highest priority message that may be sent now."""
+        while True:
+            now = time.monotonic()
+            self._promote_waiting(now)
 
-        # Chat rate limit
-        last_chat_time = self.last_chat_send_time.get(chat_id, 0)
-        time_since_chat = now - last_chat_time
-        if time_since_chat < self.chat_rate_limit:
-            await asyncio.sleep(self.chat_rate_limit - time_since_chat)
+            entry = self._pop_ready()
+            if entry is not None:
+                global_ready = self._global_bucket.ready_at(now)
+                if global_ready > now:
+                    heapq.heappush(self._ready, entry)
+                    await asyncio.sleep(global_ready - now)
+                    continue
+
+                chat_id = entry[2]
+                self._global_bucket.consume(now)
+                self._chat_bucket(chat_id).consume(now)
+                self._generation[chat_id] += 1
+
+                lane = self._lanes[chat_id]
+                queued = heapq.heappop(lane)
+                if not lane:
+                    del self._lanes[chat_id]
+                if self._last_entry.get(chat_id) is queued:
+                    del self._last_entry[chat_id]
+                self._in_flight.add(chat_id)
+                self._pending -= 1
+                return queued[2]
+
+            # A per-sender future cannot miss a wakeup between checking and waiting
+            timeout = self._waiting[0][0] - now if self._waiting else None
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except TimeoutError:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+
+    def _complete(self, chat_id: int) -> None:
+        """Allow the chat's next message after a send attempt."""
+        self._in_flight.discard(chat_id)
+        self._schedule_chat(chat_id)
+        if len(self._chat_buckets) > 1000:
+            self._cleanup_timestamps()
+
+    async def _worker(self) -> None:
+        """Send eligible messages until stopped."""
+        while self.is_running:
+            message = await self._next_message()
+
+            latency = time.monotonic() - message.enqueued_at
+            self._latencies.append(latency)
+            _track_latency(message.priority, latency)
+            try:
+                await self._send_message(message)
+            except (RuntimeError, OSError, ConnectionError):
+                logger.exception("Error in notification worker")
+            finally:
+                self._complete(message.chat_id)
+            _set_queue_stats(self._pending, self.get_latency_percentiles())
 
     async def _send_message(self, message: NotificationMessage) -> None:
         """Send the message using the bot instance."""
@@ -148,45 +347,98 @@ class NotificationQueue:
                 reply_markup=message.reply_markup,
                 disable_web_page_preview=message.disable_web_page_preview,
             )
-
-            # Update timestamps
-            now = time.time()
-            self.last_global_send_time = now
-            self.last_chat_send_time[message.chat_id] = now
-
-            # Cleanup old chat timestamps (optional optimization)
-            if len(self.last_chat_send_time) > 1000:
-                self._cleanup_timestamps()
+            self.sent_count += 1
+            _track_notification("sent")
 
         except RetryAfter as e:
             logger.warning(
                 f"Rate limit exceeded. Retry after {e.retry_after} seconds.",
             )
-            # Put back in queue with high priority
+            # Pause only this chat and put the message back with high priority
             retry_after = (
                 e.retry_after if isinstance(e.retry_after, float) else float(e.retry_after)
             )
-            await asyncio.sleep(retry_after)
-            count = next(self._counter)
-            await self.queue.put((0, time.time(), count, message))
+            self._chat_bucket(message.chat_id).block(time.monotonic() + retry_after)
+            _track_notification("retried")
+            self._push(message, Priority.HIGH)
 
         except (TimedOut, NetworkError) as e:
             logger.warning(f"Network error sending message: {e}. Retrying...")
-            await asyncio.sleep(1)
-            count = next(self._counter)
-            await self.queue.put((message.priority, time.time(), count, message))
+            self._chat_bucket(message.chat_id).block(time.monotonic() + 1)
+            _track_notification("retried")
+            self._push(message, message.priority)
 
         except (RuntimeError, OSError, ConnectionError):
             logger.exception(f"Failed to send message to {message.chat_id}")
             # Don't retry for other errors (e.g. user blocked bot)
+            self.failed_count += 1
+            _track_notification("failed")
 
     def _cleanup_timestamps(self) -> None:
-        """Remove old timestamps to prevent memory leak."""
-        now = time.time()
-        to_remove = []
-        for chat_id, timestamp in self.last_chat_send_time.items():
-            if now - timestamp > 60:  # Remove if older than 1 minute
-                to_remove.append(chat_id)
+        """Remove buckets of idle chats to prevent memory leak."""
+        now = time.monotonic()
+        to_remove = [
+            chat_id
+            for chat_id, bucket in self._chat_buckets.items()
+            if chat_id not in self._lanes
+            and chat_id not in self._in_flight
+            and bucket.blocked_until <= now
+            and now - bucket.updated > max(60, bucket.interval)  # Idle for over a minute
+        ]
 
         for chat_id in to_remove:
-            del self.last_chat_send_time[chat_id]
+            del self._chat_buckets[chat_id]
+            self._generation.pop(chat_id, None)
+
+    def get_latency_percentiles(self) -> dict[str, float]:
+        """Queue latency percentiles of recent messages (seconds)."""
+        if not self._latencies:
+            return {}
+        latencies = sorted(self._latencies)
+        last = len(latencies) - 1
+        return {
+            name: latencies[round(last * quantile)]
+            for name, quantile in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        }
+
+    def get_stats(self) -> dict[str, object]:
+        """Queue statistics."""
+        return {
+            "pending": self._pending,
+            "chats": len(self._lanes),
+            "in_flight": len(self._in_flight),
+            "sent": self.sent_count,
+            "failed": self.failed_count,
+            "coalesced": self.coalesced_count,
+            "latency": self.get_latency_percentiles(),
+        }
+
+
+def _track_notification(status: str) -> None:
+    """Record a notification outcome in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_notification
+
+        track_notification(status)
+    except ImportError:
+        pass
+
+
+def _track_latency(priority: int, latency: float) -> None:
+    """Record queue latency in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_notification_latency
+
+        track_notification_latency(Priority(priority).name.lower(), latency)
+    except (ImportError, ValueError):
+        pass
+
+
+def _set_queue_stats(size: int, percentiles: dict[str, float]) -> None:
+    """Export queue size and latency percentiles to Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import set_notification_queue_stats
+
+        set_notification_queue_stats(size, percentiles)
+    except ImportError:
+        pass
@@ -26,6 +26,10 @@ Usage:
     triggered = await manager.check_alerts(current_prices)
     ```
 
+Above/below price alerts are kept per item in sorted threshold arrays
+(``ThresholdIndex``), so a price tick finds the alerts it triggers in
+O(log n + k) instead of scanning every alert.
+
 Created: January 10, 2026
 """
 
@@ -35,11 +39,18 @@ from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from enum import StrEnum
-from typing import Any
+import heapq
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
 import structlog
 
+from src.utils.threshold_index import ThresholdIndex
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 
 logger = structlog.get_logger(__name__)
 
@@ -228,6 +239,16 @@ class AlertManager:
         self._user_alerts: dict[int, set[str]] = {}  # user_id -> alert_ids
         self._triggers_history: list[TriggeredAlert] = []
 
+        # Active above/below alerts by item in sorted threshold arrays.
+        # alert_id -> (threshold, direction) it was indexed with.
+        self._index: ThresholdIndex[Alert] = ThresholdIndex(inclusive=False)
+        self._indexed: dict[str, tuple[Decimal, str]] = {}
+        # Active alerts with other conditions: item_name -> {alert_id: alert}
+        self._unindexed: dict[str, dict[str, Alert]] = {}
+        # (time, alert_id) heaps: cooldown end of triggered alerts, expiry
+        self._rearm_heap: list[tuple[datetime, str]] = []
+        self._expiry_heap: list[tuple[datetime, str]] = []
+
         # Rate limiting
         self._user_triggers: dict[int, list[datetime]] = {}
 
@@ -298,10 +319,8 @@ class AlertManager:
         )
 
         # Store
-        self._alerts[alert_id] = alert
-        if user_id not in self._user_alerts:
-            self._user_alerts[user_id] = set()
-        self._user_alerts[user_id].add(alert_id)
+        self._store_alert(alert)
+        self._index_alert(alert)
 
         logger.info(
             "alert_created",
@@ -313,6 +332,64 @@ class AlertManager:
 
         return alert
 
+    def load_alerts(self, alerts: Iterable[Alert]) -> int:
+        """Bulk-load stored alerts (e.g. from the database).
+
+        Per-user limits are not applied. Threshold arrays of each item are
+        sorted once instead of on every insert.
+
+        Args:
+            alerts: Alerts to load
+
+        Returns:
+            Number of loaded alerts
+        """
+        entries = []
+        count = 0
+        for alert in alerts:
+            self._store_alert(alert)
+            count += 1
+            if alert.status != AlertStatus.ACTIVE:
+                continue
+            if alert.condition in {AlertCondition.ABOVE, AlertCondition.BELOW}:
+                self._indexed[alert.alert_id] = (alert.target_value, alert.condition.value)
+                entries.append(
+                    (alert.item_name, alert.target_value, alert.condition.value, alert)
+                )
+            else:
+                self._unindexed.setdefault(alert.item_name, {})[alert.alert_id] = alert
+
+        self._index.add_many(entries)
+        logger.info("alerts_loaded", count=count)
+        return count
+
+    def _store_alert(self, alert: Alert) -> None:
+        """Register alert in storage and the expiry heap."""
+        self._alerts[alert.alert_id] = alert
+        self._user_alerts.setdefault(alert.user_id, set()).add(alert.alert_id)
+        if alert.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (alert.expires_at, alert.alert_id))
+
+    def _index_alert(self, alert: Alert) -> None:
+        """Make an active alert visible to check_alerts."""
+        if alert.status != AlertStatus.ACTIVE or alert.alert_id in self._indexed:
+            return
+        if alert.condition in {AlertCondition.ABOVE, AlertCondition.BELOW}:
+            self._indexed[alert.alert_id] = (alert.target_value, alert.condition.value)
+            self._index.add(alert.item_name, alert.target_value, alert.condition.value, alert)
+        else:
+            self._unindexed.setdefault(alert.item_name, {})[alert.alert_id] = alert
+
+    def _unindex_alert(self, alert: Alert) -> None:
+        """Hide an alert from check_alerts."""
+        entry = self._indexed.pop(alert.alert_id, None)
+        if entry is not None:
+            self._index.remove(alert.item_name, entry[0], entry[1], alert)
+            return
+        others = self._unindexed.get(alert.item_name)
+        if others is not None and others.pop(alert.alert_id, None) is not None and not others:
+            del self._unindexed[alert.item_name]
+
     def create_price_alert(
         self,
         item_name: str,
@@ -466,6 +543,8 @@ class AlertManager:
         if not alert:
             return False
 
+        self._unindex_alert(alert)
+
         if target_value is not None:
             alert.target_value = Decimal(str(target_value))
 
@@ -475,6 +554,8 @@ class AlertManager:
         if status is not None:
             alert.status = status
 
+        self._index_alert(alert)
+
         logger.info("alert_updated", alert_id=alert_id)
         return True
 
@@ -491,6 +572,7 @@ class AlertManager:
         if not alert:
             return False
 
+        self._unindex_alert(alert)
         alert.status = AlertStatus.DELETED
 
         # Remove from user's alerts
@@ -538,39 +620,72 @@ class AlertManager:
         Returns:
             List of triggered alerts
         """
-        triggered = []
-
-        # Get alerts to check
-        if user_id:
-            alerts = self.get_user_alerts(user_id, status=AlertStatus.ACTIVE)
-        else:
-            alerts = [a for a in self._alerts.values() if a.status == AlertStatus.ACTIVE]
+        now = datetime.now(UTC)
+        self._expire_alerts(now)
+        self._rearm_alerts(now)
 
-        for alert in alerts:
-            # Skip if expired
-            if alert.is_expired():
-                alert.status = AlertStatus.EXPIRED
-                continue
+        triggered = []
 
-            # Skip if can't trigger
-            if not alert.can_trigger(self.config.min_trigger_interval_seconds):
-                continue
+        for item_name, current_price in prices.items():
+            # Only alerts whose threshold is crossed at this price
+            candidates = self._index.crossed(item_name, current_price)
+            others = self._unindexed.get(item_name)
+            if others:
+                candidates.extend(others.values())
+
+            for alert in candidates:
+                if user_id and alert.user_id != user_id:
+                    continue
+
+                # Skip if expired
+                if alert.is_expired():
+                    alert.status = AlertStatus.EXPIRED
+                    self._unindex_alert(alert)
+                    continue
+
+                # Skip if can't trigger
+                if not alert.can_trigger(self.config.min_trigger_interval_seconds):
+                    continue
+
+                # Check rate limit for user
+                if not self._check_user_rate_limit(alert.user_id):
+                    continue
+
+                # Check condition
+                if alert.check_condition(current_price):
+                    triggered_alert = self._trigger_alert(alert, current_price)
+                    triggered.append(triggered_alert)
+                    self._start_cooldown(alert)
 
-            # Check rate limit for user
-            if not self._check_user_rate_limit(alert.user_id):
-                continue
+        return triggered
 
-            # Get current price
-            current_price = prices.get(alert.item_name)
-            if current_price is None:
+    def _start_cooldown(self, alert: Alert) -> None:
+        """Take a triggered threshold alert out of the index until it can trigger again."""
+        interval = self.config.min_trigger_interval_seconds
+        if interval <= 0 or alert.alert_id not in self._indexed or alert.last_triggered is None:
+            return
+        self._unindex_alert(alert)
+        rearm_at = alert.last_triggered + timedelta(seconds=interval)
+        heapq.heappush(self._rearm_heap, (rearm_at, alert.alert_id))
+
+    def _rearm_alerts(self, now: datetime) -> None:
+        """Return alerts whose cooldown is over to the index."""
+        while self._rearm_heap and self._rearm_heap[0][0] <= now:
+            _, alert_id = heapq.heappop(self._rearm_heap)
+            alert = self._alerts.get(alert_id)
+            if alert is not None:
+                self._index_alert(alert)
+
+    def _expire_alerts(self, now: datetime) -> None:
+        """Mark active alerts past their expiry as expired."""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, alert_id = heapq.heappop(self._expiry_heap)
+            alert = self._alerts.get(alert_id)
+            if alert is None or alert.expires_at != expires_at:
                 continue
-
-            # Check condition
-            if alert.check_condition(current_price):
-                triggered_alert = self._trigger_alert(alert, current_price)
-                triggered.append(triggered_alert)
-
-        return triggered
+            if alert.status == AlertStatus.ACTIVE:
+                alert.status = AlertStatus.EXPIRED
+            self._unindex_alert(alert)
 
     def _check_user_rate_limit(self, user_id: int) -> bool:
         """Check if user is within rate limit.
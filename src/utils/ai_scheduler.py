@@ -27,9 +27,12 @@ if TYPE_CHECKING:
     from telegram import Bot
 
     from src.dmarket.dmarket_api import DMarketAPI
+    from src.utils.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+PRICE_HISTORY_MAINTENANCE_INTERVAL = 900  # 15 minutes
+
 
 class AITrainingScheduler:
     """Scheduler for AI model training and data collection.
@@ -43,6 +46,7 @@ class AITrainingScheduler:
         api_client: DMarket API client
         admin_users: List of admin user IDs to notify
         bot: Telegram bot for notifications
+        database: Database manager the collected market data is also stored in
         training_time: Time for nightly training (UTC)
         enabled: Whether scheduled training is enabled
     """
@@ -55,6 +59,7 @@ class AITrainingScheduler:
         training_time: time = time(3, 0),  # 03:00 UTC by default
         data_collection_interval: int = 300,  # 5 minutes
         enabled: bool = True,
+        database: "DatabaseManager | None" = None,
     ) -> None:
         """Initialize the AI Training Scheduler.
 
@@ -65,8 +70,11 @@ class AITrainingScheduler:
             training_time: Time of day for nightly training (UTC)
             data_collection_interval: Seconds between data collection runs
             enabled: Whether scheduling is enabled
+            database: Database manager; when set, collected market data is
+                also written to the market_data table in batches
         """
         self.api_client = api_client
+        self.database = database
         self.admin_users = admin_users or []
         self.bot = bot
         self.training_time = training_time
@@ -119,6 +127,17 @@ class AITrainingScheduler:
             self.data_collection_interval,
         )
 
+        # Roll up collected market data into 5m/1h/1d bars and prune old rows
+        if self.database is not None:
+            self.scheduler.add_job(
+                self._maintain_price_history,
+                trigger="interval",
+                seconds=PRICE_HISTORY_MAINTENANCE_INTERVAL,
+                id="price_history_maintenance",
+                name="Price History Rollup",
+                replace_existing=True,
+            )
+
         self.scheduler.start()
         self._is_running = True
 
@@ -176,6 +195,7 @@ class AITrainingScheduler:
                 self._data_logger = MarketDataLogger(
                     api=self.api_client,
                     config=config,
+                    ingestor=self.database.market_data_ingestor if self.database else None,
                 )
 
             # Log market data
@@ -193,6 +213,17 @@ class AITrainingScheduler:
         except Exception as e:
             logger.debug("Market data collection error: %s", e)
 
+    async def _maintain_price_history(self) -> None:
+        """Roll up market data into price history tiers and apply retention."""
+        if self.database is None:
+            return
+
+        try:
+            result = await self.database.price_history_store.maintain()
+            logger.debug("Price history maintenance: %s", result)
+        except Exception as e:
+            logger.warning("Price history maintenance error: %s", e)
+
     async def _notify_admins(self, message: str) -> None:
         """Send notification to admin users.
 
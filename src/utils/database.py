@@ -4,13 +4,15 @@ This module provides database connection management, model definitions,
 and common database operations.
 """
 
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 import json
 import logging
+import sqlite3
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import text
+from sqlalchemy import or_, select, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -21,14 +23,35 @@ from sqlalchemy.ext.asyncio import (
 # Import all models to ensure they're registered with Base.metadata
 from src.models import (
     MarketData,  # noqa: F401
+    PriceAlert,
     User,
 )
 from src.models.base import Base
+from src.utils.market_data_ingestor import MarketDataIngestor
 from src.utils.memory_cache import _user_cache, cached, get_all_cache_stats
+from src.utils.price_history_store import PriceHistoryStore
 
 
 logger = logging.getLogger(__name__)
 
+# Порядок колонок market_data для пакетной вставки
+_MARKET_DATA_COLUMNS = (
+    "id",
+    "item_id",
+    "game",
+    "item_name",
+    "price_usd",
+    "price_change_24h",
+    "volume_24h",
+    "market_cap",
+    "data_source",
+    "created_at",
+)
+
+# Лимит параметров одного SQLite-запроса (SQLITE_MAX_VARIABLE_NUMBER)
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+_SQLITE_ROWS_PER_INSERT = _SQLITE_MAX_VARIABLES // len(_MARKET_DATA_COLUMNS)
+
 
 class DatabaseManager:  # noqa: PLR0904
     """Database connection and operations manager."""
@@ -61,6 +84,8 @@ class DatabaseManager:  # noqa: PLR0904
         self.pool_recycle = pool_recycle
         self._async_engine: AsyncEngine | None = None
         self._async_session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._market_data_ingestor: MarketDataIngestor | None = None
+        self._price_history_store: PriceHistoryStore | None = None
 
     @property
     def async_engine(self) -> AsyncEngine:
@@ -117,6 +142,11 @@ class DatabaseManager:  # noqa: PLR0904
             )
         return self._async_session_maker
 
+    @property
+    def is_pool_ready(self) -> bool:
+        """Check whether the connection pool has been created."""
+        return self._async_engine is not None
+
     def get_async_session(self) -> AsyncSession:
         """Get asynchronous database session."""
         return self.async_session_maker()
@@ -234,6 +264,9 @@ class DatabaseManager:  # noqa: PLR0904
 
     async def close(self) -> None:
         """Close database connections."""
+        if self._market_data_ingestor is not None:
+            await self._market_data_ingestor.stop()
+            self._market_data_ingestor = None
         if self._async_engine:
             await self._async_engine.dispose()
             logger.info("Database connections closed")
@@ -430,41 +463,54 @@ class DatabaseManager:  # noqa: PLR0904
     ) -> list[dict[str, Any]]:
         """Get price history for an item.
 
+        Reads closing prices of the best-fitting price history tier (see
+        ``price_history_store``), so long ranges return bars instead of
+        every raw tick.
+
         Args:
             item_name: Name of the item
             game: Game identifier (csgo, dota2, etc.)
             start_date: Start date for history
 
         Returns:
-            list: List of price records with timestamp and price_usd
+            list: List of price records with timestamp and price_usd,
+            newest first
+        """
+        bars = await self.price_history_store.get_price_bars(game, item_name, start=start_date)
+        return [{"price_usd": bar.close, "timestamp": bar.timestamp} for bar in reversed(bars)]
+
+    async def iter_active_price_alerts(
+        self,
+        batch_size: int = 10000,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream active, not yet triggered price alerts in batches.
+
+        Rows are read through a server-side cursor, so loading 100k+ alerts
+        does not materialize the whole result set at once.
+
+        Args:
+            batch_size: Number of rows per yielded batch
+
+        Yields:
+            list: Alert rows with item_id, market_hash_name, game,
+            target_price and condition
         """
         async with self.get_async_session() as session:
-            result = await session.execute(
-                text(
-                    """
-                    SELECT price_usd, created_at as timestamp
-                    FROM market_data
-                    WHERE item_name = :item_name
-                      AND game = :game
-                      AND created_at >= :start_date
-                    ORDER BY created_at DESC
-                """
-                ),
-                {
-                    "item_name": item_name,
-                    "game": game,
-                    "start_date": start_date,
-                },
+            result = await session.stream(
+                select(
+                    PriceAlert.item_id,
+                    PriceAlert.market_hash_name,
+                    PriceAlert.game,
+                    PriceAlert.target_price,
+                    PriceAlert.condition,
+                ).where(
+                    PriceAlert.is_active.is_(True),
+                    or_(PriceAlert.triggered.is_(None), PriceAlert.triggered.is_(False)),
+                    or_(PriceAlert.expires_at.is_(None), PriceAlert.expires_at > datetime.now(UTC)),
+                )
             )
-
-            rows = result.fetchall()
-            return [
-                {
-                    "price_usd": row[0],
-                    "timestamp": row[1],
-                }
-                for row in rows
-            ]
+            async for partition in result.mappings().partitions(batch_size):
+                yield [dict(row) for row in partition]
 
     async def get_trade_statistics(
         self,
@@ -750,52 +796,131 @@ class DatabaseManager:  # noqa: PLR0904
 
     # Batch operations for performance
 
+    @property
+    def market_data_ingestor(self) -> MarketDataIngestor:
+        """Буферизованный пакетный писатель market_data (создаётся при первом обращении)."""
+        if self._market_data_ingestor is None:
+            self._market_data_ingestor = MarketDataIngestor(self)
+        return self._market_data_ingestor
+
+    @property
+    def price_history_store(self) -> PriceHistoryStore:
+        """Хранилище истории цен с агрегатами 5m/1h/1d и сроками хранения."""
+        if self._price_history_store is None:
+            self._price_history_store = PriceHistoryStore(self)
+        return self._price_history_store
+
+    async def enqueue_market_data(self, items: list[dict[str, Any]]) -> None:
+        """
+        Поставить записи market_data в очередь пакетной записи.
+
+        Записи сохраняются фоновой задачей пачками (по размеру или по времени),
+        оставшиеся в буфере записи сохраняются при close().
+
+        Args:
+            items: Список словарей с данными (как в bulk_save_market_data)
+        """
+        await self.market_data_ingestor.put_many(items)
+
     async def bulk_save_market_data(self, items: list[dict[str, Any]]) -> None:
         """
         Сохранить множество записей market_data одной транзакцией.
 
+        Способ вставки выбирается по СУБД:
+        - SQLite: многострочный INSERT ... VALUES (...), (...) пачками
+        - PostgreSQL (asyncpg): COPY через copy_records_to_table
+        - остальные: executemany
+
         Args:
             items: Список словарей с данными для сохранения
         """
         if not items:
             return
 
-        async with self.get_async_session() as session:
-            values = []
-            for item in items:
-                values.append({
-                    "id": str(uuid4()),
-                    "item_id": item.get("item_id"),
-                    "game": item.get("game"),
-                    "item_name": item.get("item_name"),
-                    "price_usd": item.get("price_usd"),
-                    "price_change_24h": item.get("price_change_24h"),
-                    "volume_24h": item.get("volume_24h"),
-                    "market_cap": item.get("market_cap"),
-                    "data_source": item.get("data_source", "dmarket"),
-                    "created_at": datetime.now(UTC),
-                })
+        created_at = datetime.now(UTC)
+        rows = [self._market_data_row(item, created_at) for item in items]
+        dialect = self.async_engine.dialect
 
-            # Batch insert
-            await session.execute(
-                text(
-                    """
-                    INSERT INTO market_data (
-                        id, item_id, game, item_name, price_usd,
-                        price_change_24h, volume_24h, market_cap,
-                        data_source, created_at
-                    ) VALUES (
-                        :id, :item_id, :game, :item_name, :price_usd,
-                        :price_change_24h, :volume_24h, :market_cap,
-                        :data_source, :created_at
-                    )
-                """
-                ),
-                values,
-            )
+        async with self.get_async_session() as session:
+            if dialect.name == "sqlite":
+                await self._insert_market_data_multirow(session, rows)
+            elif dialect.name == "postgresql" and dialect.driver == "asyncpg":
+                await self._copy_market_data(session, rows)
+            else:
+                await self._insert_market_data_executemany(session, rows)
             await session.commit()
             logger.debug(f"Bulk saved {len(items)} market data records")
 
+    @staticmethod
+    def _market_data_row(item: dict[str, Any], created_at: datetime) -> dict[str, Any]:
+        """Подготовить строку market_data для вставки."""
+        return {
+            "id": str(uuid4()),
+            "item_id": item.get("item_id"),
+            "game": item.get("game"),
+            "item_name": item.get("item_name"),
+            "price_usd": item.get("price_usd"),
+            "price_change_24h": item.get("price_change_24h"),
+            "volume_24h": item.get("volume_24h"),
+            "market_cap": item.get("market_cap"),
+            "data_source": item.get("data_source", "dmarket"),
+            "created_at": created_at,
+        }
+
+    @staticmethod
+    async def _insert_market_data_multirow(
+        session: AsyncSession, rows: list[dict[str, Any]]
+    ) -> None:
+        """Вставить строки многострочными INSERT (SQLite).
+
+        Запрос передаётся драйверу напрямую: компиляция text() с тысячами
+        именованных параметров медленнее самой вставки.
+        """
+        connection = await session.connection()
+        row_placeholder = "(" + ", ".join("?" * len(_MARKET_DATA_COLUMNS)) + ")"
+        columns = ", ".join(_MARKET_DATA_COLUMNS)
+        for start in range(0, len(rows), _SQLITE_ROWS_PER_INSERT):
+            chunk = rows[start : start + _SQLITE_ROWS_PER_INSERT]
+            values = ", ".join([row_placeholder] * len(chunk))
+            params = tuple(row[column] for row in chunk for column in _MARKET_DATA_COLUMNS)
+            await connection.exec_driver_sql(
+                f"INSERT INTO market_data ({columns}) VALUES {values}",  # noqa: S608
+                params,
+            )
+
+    @staticmethod
+    async def _copy_market_data(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """Загрузить строки через COPY (PostgreSQL + asyncpg)."""
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "market_data",
+            records=[tuple(row[column] for column in _MARKET_DATA_COLUMNS) for row in rows],
+            columns=list(_MARKET_DATA_COLUMNS),
+        )
+
+    @staticmethod
+    async def _insert_market_data_executemany(
+        session: AsyncSession, rows: list[dict[str, Any]]
+    ) -> None:
+        """Вставить строки через executemany."""
+        await session.execute(
+            text(
+                """
+                INSERT INTO market_data (
+                    id, item_id, game, item_name, price_usd,
+                    price_change_24h, volume_24h, market_cap,
+                    data_source, created_at
+                ) VALUES (
+                    :id, :item_id, :game, :item_name, :price_usd,
+                    :price_change_24h, :volume_24h, :market_cap,
+                    :data_source, :created_at
+                )
+            """
+            ),
+            rows,
+        )
+
     async def cleanup_old_market_data(self, days: int = 30) -> int:
         """
         Удалить старые записи market_data для экономии места.
@@ -46,6 +46,8 @@ from typing import Any, ClassVar
 import httpx
 import structlog
 
+from src.utils.http_pool import http_pool
+
 
 # Conditional import - hishel is optional
 try:
@@ -151,6 +153,9 @@ class CachedHTTPClient:
         """
         self.config = config or CacheConfig()
         self.timeout = timeout
+        # Requests go through the process-wide connection pool unless
+        # a transport is passed explicitly
+        httpx_kwargs.setdefault("transport", http_pool.transport)
         self.httpx_kwargs = httpx_kwargs
         self._client: httpx.AsyncClient | None = None
         self._stats = CacheStats()
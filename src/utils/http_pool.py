@@ -0,0 +1,366 @@
+"""Process-wide HTTP connection pool shared by API clients.
+
+DMarketAPI, WaxpeerAPI, the Steam price helpers and CachedHTTPClient used to
+build their own ``httpx.AsyncClient`` with their own connection pool, and
+scanners that create a fresh API object per task threw the warm connections
+and TLS sessions away together with that object.
+
+All of them now create their clients on top of ``http_pool.transport``: a
+routing transport that keeps one keep-alive connection pool per origin
+(HTTP/2 when the ``h2`` package is installed). Clients stay cheap and can be
+opened and closed as before - closing a client does not close the shared
+pools, they live until ``http_pool.aclose()`` on shutdown.
+
+Every request is traced through httpcore, so the pool also works as a
+dashboard: connection usage, TLS handshakes per minute and connection reuse
+ratio for each host.
+
+Example usage:
+    ```python
+    from src.utils.http_pool import http_pool
+
+    http_pool.configure("https://api.dmarket.com", limits=httpx.Limits(max_connections=100))
+
+    async with http_pool.create_client(timeout=10.0) as client:
+        response = await client.get("https://api.dmarket.com/exchange/v1/market/items")
+
+    print(http_pool.get_stats()["hosts"])
+    ```
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import importlib.util
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from src.utils.pool_monitor import pool_monitor
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=30,
+    keepalive_expiry=60.0,
+)
+
+# Window for the "TLS handshakes per minute" metric
+HANDSHAKE_WINDOW_SECONDS = 60.0
+
+TraceCallback = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+
+def origin_key(url: str | httpx.URL) -> str:
+    """Normalize a URL to the pool key ``scheme://host[:port]``."""
+    url = httpx.URL(url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+@dataclass
+class HostPoolStats:
+    """Request and connection counters for one origin."""
+
+    origin: str
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    handshake_times: deque[float] = field(default_factory=deque)
+
+    def record_handshake(self, now: float) -> None:
+        """Record a completed TLS handshake."""
+        self.tls_handshakes += 1
+        self.handshake_times.append(now)
+        self._trim(now)
+
+    def handshakes_per_minute(self, now: float | None = None) -> int:
+        """TLS handshakes completed during the last minute."""
+        self._trim(time.monotonic() if now is None else now)
+        return len(self.handshake_times)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served by an already open connection."""
+        if self.requests == 0:
+            return 0.0
+        return max(0.0, (self.requests - self.connections_opened) / self.requests)
+
+    def _trim(self, now: float) -> None:
+        while self.handshake_times and now - self.handshake_times[0] > HANDSHAKE_WINDOW_SECONDS:
+            self.handshake_times.popleft()
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """Transport that routes requests into the per-origin pools of HTTPConnectionPool.
+
+    ``aclose`` is a no-op: clients built on this transport may be closed
+    freely without tearing down connections used by other clients.
+    """
+
+    def __init__(self, pool: "HTTPConnectionPool") -> None:
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request through the pooled transport of its origin."""
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Keep the shared pools open; see HTTPConnectionPool.aclose."""
+
+
+class HTTPConnectionPool:
+    """Registry of pooled HTTP transports, one per origin."""
+
+    def __init__(self, limits: httpx.Limits = DEFAULT_POOL_LIMITS, http2: bool = True) -> None:
+        """Initialize the pool registry.
+
+        Args:
+            limits: Default connection limits of each origin pool
+            http2: Use HTTP/2 by default (requires the h2 package)
+
+        """
+        self.default_limits = limits
+        self.default_http2 = http2
+        self.http2_available = importlib.util.find_spec("h2") is not None
+        self.transport = SharedTransport(self)
+        self._config: dict[str, tuple[httpx.Limits, bool]] = {}
+        self._transports: dict[str, httpx.AsyncHTTPTransport] = {}
+        self._stats: dict[str, HostPoolStats] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closing: set[asyncio.Task[None]] = set()
+
+        if http2 and not self.http2_available:
+            logger.info("HTTP/2 not available (h2 package not installed), using HTTP/1.1")
+
+    def configure(
+        self,
+        url: str | httpx.URL,
+        limits: httpx.Limits | None = None,
+        http2: bool | None = None,
+    ) -> None:
+        """Set connection limits and HTTP/2 usage for an origin.
+
+        Applies to the origin pool when it is created; an already open pool
+        keeps its settings so that its warm connections are not dropped.
+
+        Args:
+            url: Any URL of the origin
+            limits: Connection limits (default limits if None)
+            http2: Use HTTP/2 (default setting if None)
+
+        """
+        key = origin_key(url)
+        config = (
+            limits or self.default_limits,
+            self.default_http2 if http2 is None else http2,
+        )
+        if key in self._transports and self._config.get(key, config) != config:
+            logger.debug("HTTP pool for %s is already open, new settings apply after reset", key)
+        self._config[key] = config
+
+    def uses_http2(self, url: str | httpx.URL) -> bool:
+        """Whether requests to the origin go over HTTP/2."""
+        _, http2 = self._config.get(origin_key(url), (self.default_limits, self.default_http2))
+        return http2 and self.http2_available
+
+    def create_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        """Create an ``httpx.AsyncClient`` that sends requests through the shared pools.
+
+        Args:
+            **kwargs: Arguments for httpx.AsyncClient (timeout, headers, ...)
+
+        Returns:
+            Client whose ``aclose`` leaves the shared connections open
+
+        """
+        kwargs.setdefault("transport", self.transport)
+        return httpx.AsyncClient(**kwargs)
+
+    def _get_transport(self, key: str) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections are bound to the event loop they were opened in
+            stale = list(self._transports.values())
+            self._transports.clear()
+            if stale:
+                self._close_stale(stale, self._loop)
+            self._loop = loop
+
+        transport = self._transports.get(key)
+        if transport is None:
+            limits, http2 = self._config.get(key, (self.default_limits, self.default_http2))
+            transport = httpx.AsyncHTTPTransport(
+                limits=limits,
+                http2=http2 and self.http2_available,
+            )
+            self._transports[key] = transport
+            logger.debug(
+                "Created HTTP pool for %s: max_connections=%s, max_keepalive=%s, http2=%s",
+                key,
+                limits.max_connections,
+                limits.max_keepalive_connections,
+                http2 and self.http2_available,
+            )
+        return transport
+
+    def _close_stale(
+        self,
+        transports: list[httpx.AsyncHTTPTransport],
+        loop: asyncio.AbstractEventLoop | None,
+    ) -> None:
+        """Close transports left over from a previous event loop.
+
+        A loop that is still running (in another thread) closes its own
+        transports; otherwise the close runs as a task of the current loop.
+        """
+        coro = self._close_transports(transports)
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(coro, loop)
+            return
+        task = asyncio.get_running_loop().create_task(coro)
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_transports(transports: list[httpx.AsyncHTTPTransport]) -> None:
+        for transport in transports:
+            try:
+                await transport.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing HTTP pool: {e}")
+
+    def _stats_for(self, key: str) -> HostPoolStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = HostPoolStats(origin=key)
+        return stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the pool of its origin, recording connection events."""
+        key = origin_key(request.url)
+        transport = self._get_transport(key)
+        stats = self._stats_for(key)
+        stats.requests += 1
+
+        parent_trace: TraceCallback | None = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.record_handshake(time.monotonic())
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        return await transport.handle_async_request(request)
+
+    def get_host_stats(self, url: str | httpx.URL) -> dict[str, Any]:
+        """Pool usage and connection metrics of one origin.
+
+        Args:
+            url: Any URL of the origin
+
+        Returns:
+            Dictionary with limits, connection usage, TLS handshakes per
+            minute and connection reuse ratio
+
+        """
+        key = origin_key(url)
+        limits, _ = self._config.get(key, (self.default_limits, self.default_http2))
+        stats = self._stats.get(key) or HostPoolStats(origin=key)
+
+        connections = in_use = idle = pending = 0
+        transport = self._transports.get(key)
+        if transport is not None:
+            try:
+                pool = transport._pool
+                pool_connections = list(pool.connections)
+                connections = len(pool_connections)
+                idle = sum(1 for connection in pool_connections if connection.is_idle())
+                in_use = connections - idle
+                pending = len(getattr(pool, "_requests", []))
+            except Exception as e:
+                logger.debug(f"Could not get detailed pool stats for {key}: {e}")
+
+        max_connections = limits.max_connections or 0
+        return {
+            "origin": key,
+            "status": "active" if transport is not None else "idle",
+            "http2_enabled": self.uses_http2(key),
+            "max_connections": limits.max_connections,
+            "max_keepalive": limits.max_keepalive_connections,
+            "keepalive_expiry": limits.keepalive_expiry,
+            "connections": connections,
+            "active_connections": in_use,
+            "idle_connections": idle,
+            "pending_requests": pending,
+            "utilization_percent": (in_use / max_connections * 100) if max_connections else 0.0,
+            "requests": stats.requests,
+            "connections_opened": stats.connections_opened,
+            "tls_handshakes": stats.tls_handshakes,
+            "tls_handshakes_per_minute": stats.handshakes_per_minute(),
+            "connection_reuse_ratio": round(stats.reuse_ratio, 4),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Dashboard of all origin pools.
+
+        Returns:
+            Dictionary with per-origin stats under "hosts" and totals under "total"
+
+        """
+        keys = sorted(set(self._config) | set(self._stats) | set(self._transports))
+        hosts = {key: self.get_host_stats(key) for key in keys}
+        requests = sum(host["requests"] for host in hosts.values())
+        opened = sum(host["connections_opened"] for host in hosts.values())
+        return {
+            "hosts": hosts,
+            "total": {
+                "pools": len(self._transports),
+                "connections": sum(host["connections"] for host in hosts.values()),
+                "active_connections": sum(host["active_connections"] for host in hosts.values()),
+                "requests": requests,
+                "connections_opened": opened,
+                "tls_handshakes_per_minute": sum(
+                    host["tls_handshakes_per_minute"] for host in hosts.values()
+                ),
+                "connection_reuse_ratio": (
+                    round(max(0.0, (requests - opened) / requests), 4) if requests else 0.0
+                ),
+            },
+        }
+
+    def reset_stats(self) -> None:
+        """Reset request and connection counters."""
+        self._stats.clear()
+
+    async def aclose(self) -> None:
+        """Close all origin pools (on application shutdown)."""
+        transports = list(self._transports.values())
+        self._transports.clear()
+        await self._close_transports(transports)
+        loop = asyncio.get_running_loop()
+        closing = [task for task in self._closing if task.get_loop() is loop]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+
+
+# Global shared pool instance
+http_pool = HTTPConnectionPool()
+pool_monitor.register_pool("http_pool", http_pool)
+
+
+__all__ = [
+    "DEFAULT_POOL_LIMITS",
+    "HTTPConnectionPool",
+    "HostPoolStats",
+    "SharedTransport",
+    "http_pool",
+    "origin_key",
+]
@@ -0,0 +1,303 @@
+"""Buffered bulk ingestion of market data into the database.
+
+Scanners and pollers produce ``market_data`` rows much faster than
+per-row commits can store them. ``MarketDataIngestor`` collects rows in
+an in-memory buffer and writes them with ``DatabaseManager.bulk_save_market_data``
+in batches, flushed by size or by time:
+
+- a flush starts as soon as ``batch_size`` rows are buffered
+- otherwise buffered rows are flushed every ``flush_interval`` seconds
+- ``put`` waits when ``max_buffer_size`` rows are pending (backpressure),
+  ``put_nowait`` drops the row instead
+
+Usage:
+    ```python
+    ingestor = database.market_data_ingestor
+    await ingestor.put_many(market_items_to_rows(items, game="csgo"))
+    ...
+    await database.close()  # flushes pending rows
+    ```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.utils.database import DatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 2.0  # seconds
+DEFAULT_MAX_BUFFER_SIZE = 50_000
+
+_TABLE = "market_data"
+
+
+def market_items_to_rows(
+    items: Iterable[dict[str, Any]],
+    game: str,
+    data_source: str = "dmarket",
+) -> list[dict[str, Any]]:
+    """Convert DMarket API market items to ``market_data`` rows.
+
+    Items without an ID, title or USD price are skipped.
+
+    Args:
+        items: Items from the market API (``objects``)
+        game: Game identifier
+        data_source: Source of the data
+
+    Returns:
+        Rows for ``MarketDataIngestor.put_many``
+    """
+    rows = []
+    for item in items:
+        price = item.get("price")
+        if isinstance(price, dict):
+            price = price.get("USD") or price.get("amount")
+        item_id = item.get("itemId") or item.get("item_id")
+        title = item.get("title")
+        if not item_id or not title or price is None:
+            continue
+        try:
+            price_usd = int(price) / 100
+        except (TypeError, ValueError):
+            continue
+        rows.append({
+            "item_id": item_id,
+            "game": game,
+            "item_name": title,
+            "price_usd": price_usd,
+            "data_source": data_source,
+        })
+    return rows
+
+
+class MarketDataIngestor:
+    """Buffered batch writer for ``market_data`` rows.
+
+    Attributes:
+        batch_size: Maximum rows per flush
+        flush_interval: Maximum seconds a row waits before being flushed
+        max_buffer_size: Pending rows above which ``put`` waits
+    """
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE,
+    ) -> None:
+        """Initialize ingestor.
+
+        Args:
+            database: Database manager used for the bulk inserts
+            batch_size: Maximum rows per flush
+            flush_interval: Seconds between time-based flushes
+            max_buffer_size: Pending rows above which ``put`` waits
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max(max_buffer_size, batch_size)
+
+        self._buffer: list[dict[str, Any]] = []
+        self._batch_ready = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
+        self._write_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+        self._stats = {
+            "rows_enqueued": 0,
+            "rows_written": 0,
+            "rows_failed": 0,
+            "rows_dropped": 0,
+            "flushes": 0,
+            "flush_seconds": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet written."""
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Start the background flush task (called automatically by ``put``)."""
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="market_data_ingestor")
+        logger.debug(
+            f"Market data ingestor started (batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Flush all pending rows and stop the background task."""
+        if self._task is not None:
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        logger.info(
+            f"Market data ingestor stopped: {self._stats['rows_written']} rows written, "
+            f"{self._stats['rows_failed']} failed, {self._stats['rows_dropped']} dropped"
+        )
+
+    async def put(self, row: dict[str, Any]) -> None:
+        """Buffer a row, waiting while the buffer is full.
+
+        Args:
+            row: ``market_data`` fields (see ``DatabaseManager.save_market_data``)
+        """
+        while len(self._buffer) >= self.max_buffer_size:
+            self._space_available.clear()
+            self.start()
+            await self._space_available.wait()
+        self._append(row)
+
+    async def put_many(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Buffer several rows, waiting while the buffer is full.
+
+        Args:
+            rows: ``market_data`` rows
+        """
+        for row in rows:
+            await self.put(row)
+
+    def put_nowait(self, row: dict[str, Any]) -> bool:
+        """Buffer a row without waiting.
+
+        Args:
+            row: ``market_data`` fields
+
+        Returns:
+            False if the buffer is full and the row was dropped
+        """
+        if len(self._buffer) >= self.max_buffer_size:
+            self._stats["rows_dropped"] += 1
+            _track_dropped()
+            return False
+        self._append(row)
+        return True
+
+    async def flush(self) -> int:
+        """Write all buffered rows now.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        async with self._write_lock:
+            while self._buffer:
+                batch = self._buffer[: self.batch_size]
+                del self._buffer[: self.batch_size]
+                if len(self._buffer) < self.batch_size:
+                    self._batch_ready.clear()
+                if len(self._buffer) < self.max_buffer_size:
+                    self._space_available.set()
+                _track_queue_size(len(self._buffer))
+                written += await self._write(batch)
+        return written
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get ingestion statistics.
+
+        Returns:
+            Counters, pending rows and write throughput (rows/second of
+            flush time)
+        """
+        stats: dict[str, Any] = dict(self._stats)
+        stats["pending"] = len(self._buffer)
+        stats["running"] = self.running
+        flush_seconds = self._stats["flush_seconds"]
+        stats["rows_per_second"] = (
+            self._stats["rows_written"] / flush_seconds if flush_seconds > 0 else 0.0
+        )
+        return stats
+
+    def _append(self, row: dict[str, Any]) -> None:
+        """Add a row to the buffer and wake the flush task on a full batch."""
+        self._buffer.append(row)
+        self._stats["rows_enqueued"] += 1
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+        self.start()
+
+    async def _run(self) -> None:
+        """Flush when a batch is full or the flush interval has passed."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            await self.flush()
+
+    async def _write(self, batch: list[dict[str, Any]]) -> int:
+        """Write a batch; failures are logged and counted, not raised."""
+        start = time.perf_counter()
+        try:
+            await self.database.bulk_save_market_data(batch)
+        except Exception:
+            self._stats["rows_failed"] += len(batch)
+            _track_flush(len(batch), time.perf_counter() - start, success=False)
+            logger.exception(f"Failed to write {len(batch)} market data rows")
+            return 0
+
+        duration = time.perf_counter() - start
+        self._stats["rows_written"] += len(batch)
+        self._stats["flushes"] += 1
+        self._stats["flush_seconds"] += duration
+        _track_flush(len(batch), duration, success=True)
+        return len(batch)
+
+
+def _track_flush(rows: int, duration: float, success: bool) -> None:
+    """Record a flush in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_db_ingest_flush
+
+        track_db_ingest_flush(_TABLE, rows, duration, success)
+    except ImportError:
+        pass
+
+
+def _track_dropped() -> None:
+    """Record a dropped row in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import track_db_ingest_dropped
+
+        track_db_ingest_dropped(_TABLE)
+    except ImportError:
+        pass
+
+
+def _track_queue_size(size: int) -> None:
+    """Record the number of pending rows in Prometheus (if available)."""
+    try:
+        from src.utils.prometheus_metrics import set_db_ingest_queue_size
+
+        set_db_ingest_queue_size(_TABLE, size)
+    except ImportError:
+        pass
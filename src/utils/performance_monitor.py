@@ -4,6 +4,7 @@ This module provides:
 - PerformanceMonitor: Tracks execution times and identifies slow operations
 - slow_request_alert: Decorator for alerting on slow requests
 - PerformanceMetrics: Aggregated performance statistics
+- EventLoopLagMonitor: Measures how late the event loop runs ready callbacks
 """
 
 import asyncio
@@ -326,6 +327,89 @@ class PerformanceMonitor:
 global_monitor = PerformanceMonitor(slow_threshold=5.0)
 
 
+class EventLoopLagMonitor:
+    """Measures event loop lag with a periodic sleeper task.
+
+    Lag is how much later than requested the sleeper wakes up. Synchronous
+    CPU work running on the loop delays every other coroutine (Telegram
+    handlers, WebSocket consumers) by the same amount.
+
+    Example:
+        >>> async with EventLoopLagMonitor() as lag:
+        ...     await heavy_scan()
+        >>> lag.get_stats()["max_ms"]
+    """
+
+    def __init__(self, interval: float = 0.01, window: int = 10000) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval: Sleep interval of the sampling task in seconds
+            window: Number of most recent lag samples kept
+        """
+        self.interval = interval
+        self._samples: deque[float] = deque(maxlen=window)
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampling task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    async def __aenter__(self) -> "EventLoopLagMonitor":
+        self.start()
+        # Let the sampler take its first timestamp
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    def reset(self) -> None:
+        """Drop collected samples."""
+        self._samples.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get lag statistics in milliseconds.
+
+        Returns:
+            Dictionary with sample count and average, p95 and max lag
+        """
+        samples = sorted(self._samples)
+        if not samples:
+            return {"samples": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return {
+            "samples": len(samples),
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 3),
+            "p95_ms": round(p95 * 1000, 3),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
+
+
 def slow_request_alert(threshold: float = 5.0) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to alert on slow requests.
 
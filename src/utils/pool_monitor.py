@@ -173,6 +173,32 @@ class PoolMonitor:
                 timestamp=datetime.now(UTC),
             )
 
+    def get_http_pool_stats(self, http_pool) -> dict[str, PoolStats]:
+        """Get statistics for each origin of the shared HTTP connection pool.
+
+        Args:
+            http_pool: HTTPConnectionPool from src.utils.http_pool
+
+        Returns:
+            Dictionary of "http:<origin>" to statistics
+        """
+        stats = {}
+        for origin, host in http_pool.get_stats()["hosts"].items():
+            max_connections = host["max_connections"] or 0
+            max_keepalive = host["max_keepalive"] or 0
+            stats[f"http:{origin}"] = PoolStats(
+                pool_name=f"http:{origin}",
+                size=host["connections"],
+                max_size=max_connections,
+                in_use=host["active_connections"],
+                available=host["idle_connections"],
+                overflow=max(0, host["connections"] - max_keepalive),
+                max_overflow=max(0, max_connections - max_keepalive),
+                utilization_percent=host["utilization_percent"],
+                timestamp=datetime.now(UTC),
+            )
+        return stats
+
     def get_all_stats(self) -> dict[str, PoolStats]:
         """Get statistics for all registered pools.
 
@@ -189,6 +215,8 @@ class PoolMonitor:
                     stats[name] = self.get_redis_stats(pool)
                 elif name == "httpx":
                     stats[name] = self.get_httpx_stats(pool)
+                elif name == "http_pool":
+                    stats.update(self.get_http_pool_stats(pool))
                 else:
                     logger.warning(f"Unknown pool type: {name}")
             except Exception as e:
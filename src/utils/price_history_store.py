@@ -0,0 +1,676 @@
+"""Time-bucketed price history with downsampling and retention tiers.
+
+Raw ``market_data`` ticks are kept for a limited time and rolled up into
+OHLCV bars (``market_data_rollups``) of increasing resolution:
+
+=========  ===========  =============
+Tier       Bucket       Kept for
+=========  ===========  =============
+raw        (ticks)      7 days
+5m         5 minutes    30 days
+1h         1 hour       365 days
+1d         1 day        forever
+=========  ===========  =============
+
+Each tier is built from the previous one (raw -> 5m -> 1h -> 1d), only for
+complete buckets after the tier's last stored bucket, so ``rollup()`` is
+cheap to call periodically. Buckets are built in windows of
+``rollup_window`` (committed one by one), so the first rollup over an
+existing ``market_data`` table never loads the whole history at once.
+``apply_retention()`` deletes rows of a tier only once they are both
+expired and rolled up into the next tier.
+
+Reads go through ``get_price_bars()``, which picks the coarsest tier that
+still has data for the requested start and is at least as fine as the
+requested resolution (or returns at most ``max_points`` bars), so a 90-day
+chart reads a few hundred daily/hourly bars instead of every raw tick.
+``get_price_bars_bulk()`` reads the same range for many items at once
+(e.g. every item of a scan) in one query per source.
+
+Usage:
+    ```python
+    store = database.price_history_store
+    await store.maintain()  # rollup + retention, e.g. every 15 minutes
+
+    bars = await store.get_price_bars("csgo", "AK-47 | Redline (FT)", start=since)
+    prices = [bar.close for bar in bars]
+    ```
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import bindparam, text
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Collection, Iterable, Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql.elements import TextClause
+
+    from src.utils.database import DatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+RAW_TIER = "raw"
+DEFAULT_RAW_RETENTION = timedelta(days=7)
+DEFAULT_MAX_POINTS = 500
+# Ticks may reach the database a little late (see MarketDataIngestor)
+DEFAULT_SETTLE_DELAY = timedelta(minutes=1)
+# Time range read and aggregated per rollup step
+DEFAULT_ROLLUP_WINDOW = timedelta(hours=6)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class RollupTier:
+    """Resolution of stored OHLCV bars.
+
+    Attributes:
+        name: Tier name stored in ``market_data_rollups.resolution``
+        step: Bucket length
+        retention: How long bars are kept (None = forever)
+    """
+
+    name: str
+    step: timedelta
+    retention: timedelta | None
+
+
+DEFAULT_TIERS: tuple[RollupTier, ...] = (
+    RollupTier("5m", timedelta(minutes=5), timedelta(days=30)),
+    RollupTier("1h", timedelta(hours=1), timedelta(days=365)),
+    RollupTier("1d", timedelta(days=1), None),
+)
+
+
+@dataclass
+class PriceBar:
+    """OHLCV bar of an item's price.
+
+    Attributes:
+        timestamp: Bucket start (tick time for raw data)
+        open: First price in the bucket
+        high: Highest price
+        low: Lowest price
+        close: Last price
+        volume: Highest reported 24h volume in the bucket
+        samples: Number of raw ticks aggregated
+    """
+
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int | None = None
+    samples: int = 1
+
+    def merge(self, other: PriceBar) -> None:
+        """Extend this bar with a later bar of the same bucket."""
+        self.high = max(self.high, other.high)
+        self.low = min(self.low, other.low)
+        self.close = other.close
+        if other.volume is not None:
+            self.volume = other.volume if self.volume is None else max(self.volume, other.volume)
+        self.samples += other.samples
+
+
+def floor_time(timestamp: datetime, step: timedelta) -> datetime:
+    """Round a timestamp down to the start of its bucket (UTC aligned)."""
+    seconds = int(step.total_seconds())
+    elapsed = int((timestamp - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    """Normalize a timestamp column value (SQLite returns strings)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value
+
+
+def _item_conditions(
+    params: dict[str, Any],
+    game: str | None,
+    item_name: str | None,
+    games: Collection[str] | None,
+    item_names: Collection[str] | None,
+) -> list[str]:
+    """SQL conditions selecting one item or a set of games and item names."""
+    if game is not None:
+        params.update(game=game, item_name=item_name)
+        return ["game = :game", "item_name = :item_name"]
+    if item_names is not None:
+        params.update(games=list(games or ()), item_names=list(item_names))
+        return ["game IN :games", "item_name IN :item_names"]
+    return []
+
+
+def _with_expanding(sql: str, params: dict[str, Any]) -> TextClause:
+    """Text clause with list parameters bound as expanding IN lists."""
+    clause = text(sql)
+    expanding = [
+        bindparam(name, expanding=True) for name, value in params.items() if isinstance(value, list)
+    ]
+    return clause.bindparams(*expanding) if expanding else clause
+
+
+def aggregate_bars(
+    rows: Iterable[tuple[str, str, datetime, PriceBar]],
+    step: timedelta,
+) -> dict[tuple[str, str, datetime], PriceBar]:
+    """Downsample time-ordered bars into buckets of ``step``.
+
+    Args:
+        rows: ``(game, item_name, timestamp, bar)`` in ascending time order
+        step: Bucket length
+
+    Returns:
+        Bars keyed by ``(game, item_name, bucket_start)``
+    """
+    buckets: dict[tuple[str, str, datetime], PriceBar] = {}
+    for game, item_name, timestamp, bar in rows:
+        key = (game, item_name, floor_time(timestamp, step))
+        current = buckets.get(key)
+        if current is None:
+            buckets[key] = PriceBar(
+                timestamp=key[2],
+                open=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                volume=bar.volume,
+                samples=bar.samples,
+            )
+        else:
+            current.merge(bar)
+    return buckets
+
+
+class PriceHistoryStore:
+    """Rollups, retention and tiered reads of market_data price history.
+
+    Attributes:
+        database: Database manager
+        tiers: Rollup tiers from finest to coarsest
+        raw_retention: How long raw market_data ticks are kept
+        settle_delay: Buckets are rolled up only after this delay past their end
+        rollup_window: Time range aggregated per rollup step
+    """
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        tiers: Sequence[RollupTier] = DEFAULT_TIERS,
+        raw_retention: timedelta = DEFAULT_RAW_RETENTION,
+        settle_delay: timedelta = DEFAULT_SETTLE_DELAY,
+        rollup_window: timedelta = DEFAULT_ROLLUP_WINDOW,
+    ) -> None:
+        """Initialize store.
+
+        Args:
+            database: Database manager
+            tiers: Rollup tiers, finest first; each step must be a multiple
+                of the previous one
+            raw_retention: How long raw ticks are kept
+            settle_delay: Delay before a finished bucket is rolled up
+            rollup_window: Time range read per rollup step; rounded up to a
+                whole number of buckets of each tier
+
+        Raises:
+            ValueError: If the tiers are not ordered multiples of each other
+        """
+        previous: RollupTier | None = None
+        for tier in tiers:
+            if previous is not None and tier.step % previous.step:
+                raise ValueError(f"Tier {tier.name} step must be a multiple of {previous.name}")
+            previous = tier
+
+        self.database = database
+        self.tiers = tuple(tiers)
+        self.raw_retention = raw_retention
+        self.settle_delay = settle_delay
+        self.rollup_window = rollup_window
+
+    async def maintain(self, now: datetime | None = None) -> dict[str, int]:
+        """Roll up new buckets and apply retention.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Bars written and rows deleted per tier
+        """
+        now = now or datetime.now(UTC)
+        written = await self.rollup(now)
+        deleted = await self.apply_retention(now)
+        return {
+            **{f"{name}_written": count for name, count in written.items()},
+            **{f"{name}_deleted": count for name, count in deleted.items()},
+        }
+
+    async def rollup(self, now: datetime | None = None) -> dict[str, int]:
+        """Build bars for all complete buckets not rolled up yet.
+
+        Each tier is built window by window from its last stored bucket (or
+        from the oldest source row on the first run), committing every
+        window, so an interrupted rollup resumes where it stopped.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Number of bars written per tier
+        """
+        now = now or datetime.now(UTC)
+        written: dict[str, int] = {}
+
+        async with self.database.get_async_session() as session:
+            source: RollupTier | None = None
+            for tier in self.tiers:
+                end = floor_time(now - self.settle_delay, tier.step)
+                last = await self._last_bucket(session, tier)
+                if last is not None:
+                    start: datetime | None = last + tier.step
+                else:
+                    first = await self._first_time(session, source)
+                    start = floor_time(first, tier.step) if first is not None else None
+
+                written[tier.name] = 0
+                window = tier.step * max(-(-self.rollup_window // tier.step), 1)
+                while start is not None and start < end:
+                    window_end = min(start + window, end)
+                    rows = (
+                        self._raw_rows(session, start, window_end)
+                        if source is None
+                        else self._tier_rows(session, source, start, window_end)
+                    )
+                    bars = aggregate_bars([row async for row in rows], tier.step)
+                    await self._insert_bars(session, tier, bars)
+                    await session.commit()
+                    written[tier.name] += len(bars)
+                    start = window_end
+                source = tier
+
+        if any(written.values()):
+            logger.info(f"Price history rollup: {written}")
+        return written
+
+    async def apply_retention(self, now: datetime | None = None) -> dict[str, int]:
+        """Delete expired rows that are already rolled up into the next tier.
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            Number of deleted rows per tier (``raw`` = market_data)
+        """
+        now = now or datetime.now(UTC)
+        deleted: dict[str, int] = {}
+
+        async with self.database.get_async_session() as session:
+            levels: list[tuple[str, timedelta | None]] = [(RAW_TIER, self.raw_retention)]
+            levels.extend((tier.name, tier.retention) for tier in self.tiers)
+
+            for index, (name, retention) in enumerate(levels):
+                if retention is None:
+                    continue
+                cutoff = now - retention
+                if index < len(self.tiers):
+                    # Keep rows the next tier has not been built from yet
+                    next_tier = self.tiers[index]
+                    last = await self._last_bucket(session, next_tier)
+                    if last is None:
+                        continue
+                    cutoff = min(cutoff, last + next_tier.step)
+
+                if name == RAW_TIER:
+                    result = await session.execute(
+                        text("DELETE FROM market_data WHERE created_at < :cutoff"),
+                        {"cutoff": cutoff},
+                    )
+                else:
+                    result = await session.execute(
+                        text(
+                            """
+                            DELETE FROM market_data_rollups
+                            WHERE resolution = :resolution AND bucket_start < :cutoff
+                        """
+                        ),
+                        {"resolution": name, "cutoff": cutoff},
+                    )
+                deleted[name] = result.rowcount or 0  # type: ignore[attr-defined]
+
+            await session.commit()
+
+        if any(deleted.values()):
+            logger.info(f"Price history retention: {deleted}")
+        return deleted
+
+    def select_tier(
+        self,
+        start: datetime,
+        end: datetime | None = None,
+        resolution: timedelta | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+        now: datetime | None = None,
+    ) -> RollupTier | None:
+        """Pick the tier to read a range from.
+
+        Only tiers that still keep data from ``start`` are considered. With
+        an explicit ``resolution`` the coarsest tier whose bucket is not
+        longer than it is used; otherwise the finest tier that returns at
+        most ``max_points`` bars over the range. Falls back to the coarsest
+        covering tier.
+
+        Args:
+            start: Range start
+            end: Range end (default: now)
+            resolution: Wanted bar length
+            max_points: Maximum bars when no resolution is given
+            now: Current time (default: now)
+
+        Returns:
+            The tier, or None for raw ticks
+        """
+        now = now or datetime.now(UTC)
+        end = end or now
+
+        candidates: list[tuple[timedelta, RollupTier | None, timedelta | None]] = [
+            (timedelta(0), None, self.raw_retention),
+            *((tier.step, tier, tier.retention) for tier in self.tiers),
+        ]
+        covering = [
+            (step, tier)
+            for step, tier, retention in candidates
+            if retention is None or start >= now - retention
+        ]
+        if not covering:
+            return self.tiers[-1] if self.tiers else None
+
+        if resolution is not None:
+            fine_enough = [tier for step, tier in covering if step <= resolution]
+            return fine_enough[-1] if fine_enough else covering[0][1]
+
+        min_step = (end - start) / max(max_points, 1)
+        coarse_enough = [tier for step, tier in covering if step >= min_step]
+        return coarse_enough[0] if coarse_enough else covering[-1][1]
+
+    async def get_price_bars(
+        self,
+        game: str,
+        item_name: str,
+        start: datetime,
+        end: datetime | None = None,
+        resolution: timedelta | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> list[PriceBar]:
+        """Read an item's price history from the best-fitting tier.
+
+        Buckets newer than the tier's last rolled-up bucket are aggregated
+        from raw ticks, so the result reaches up to ``end``.
+
+        Args:
+            game: Game identifier
+            item_name: Item name
+            start: Range start
+            end: Range end (default: now)
+            resolution: Wanted bar length
+            max_points: Maximum bars when no resolution is given
+
+        Returns:
+            Bars in ascending time order
+        """
+        now = datetime.now(UTC)
+        end = end or now
+        tier = self.select_tier(start, end, resolution, max_points, now)
+
+        async with self.database.get_async_session() as session:
+            if tier is None:
+                return [
+                    bar
+                    async for _, _, _, bar in self._raw_rows(session, start, end, game, item_name)
+                ]
+
+            bars = [
+                bar
+                async for _, _, _, bar in self._tier_rows(
+                    session, tier, floor_time(start, tier.step), end, game, item_name
+                )
+            ]
+            last = await self._last_bucket(session, tier)
+            tail_start = max(start, last + tier.step) if last is not None else start
+            if tail_start < end:
+                tail = aggregate_bars(
+                    [
+                        row
+                        async for row in self._raw_rows(session, tail_start, end, game, item_name)
+                    ],
+                    tier.step,
+                )
+                bars.extend(tail.values())
+        return bars
+
+    async def get_close_prices(
+        self,
+        game: str,
+        item_name: str,
+        start: datetime,
+        end: datetime | None = None,
+        resolution: timedelta | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> list[float]:
+        """Closing prices (oldest first), e.g. for ``PriceAnalytics.analyze_item``."""
+        bars = await self.get_price_bars(game, item_name, start, end, resolution, max_points)
+        return [bar.close for bar in bars]
+
+    async def get_price_bars_bulk(
+        self,
+        items: Iterable[tuple[str, str]],
+        start: datetime,
+        end: datetime | None = None,
+        resolution: timedelta | None = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> dict[tuple[str, str], list[PriceBar]]:
+        """Read the price history of many items from the best-fitting tier.
+
+        Same as ``get_price_bars()`` for every item, but the tier and the
+        not yet rolled-up raw tail are each read in one query for all items.
+
+        Args:
+            items: ``(game, item_name)`` pairs
+            start: Range start
+            end: Range end (default: now)
+            resolution: Wanted bar length
+            max_points: Maximum bars per item when no resolution is given
+
+        Returns:
+            Bars in ascending time order by ``(game, item_name)``; items
+            without history are left out
+        """
+        wanted = set(items)
+        if not wanted:
+            return {}
+        games = {game for game, _ in wanted}
+        item_names = {item_name for _, item_name in wanted}
+        now = datetime.now(UTC)
+        end = end or now
+        tier = self.select_tier(start, end, resolution, max_points, now)
+
+        result: dict[tuple[str, str], list[PriceBar]] = {}
+        async with self.database.get_async_session() as session:
+            if tier is None:
+                rows = self._raw_rows(session, start, end, games=games, item_names=item_names)
+            else:
+                rows = self._tier_rows(
+                    session,
+                    tier,
+                    floor_time(start, tier.step),
+                    end,
+                    games=games,
+                    item_names=item_names,
+                )
+            async for game, item_name, _, bar in rows:
+                if (game, item_name) in wanted:
+                    result.setdefault((game, item_name), []).append(bar)
+            if tier is None:
+                return result
+
+            last = await self._last_bucket(session, tier)
+            tail_start = max(start, last + tier.step) if last is not None else start
+            if tail_start < end:
+                tail = aggregate_bars(
+                    [
+                        row
+                        async for row in self._raw_rows(
+                            session, tail_start, end, games=games, item_names=item_names
+                        )
+                        if (row[0], row[1]) in wanted
+                    ],
+                    tier.step,
+                )
+                for (game, item_name, _), bar in tail.items():
+                    result.setdefault((game, item_name), []).append(bar)
+        return result
+
+    @staticmethod
+    async def _last_bucket(session: AsyncSession, tier: RollupTier) -> datetime | None:
+        """Start of the newest stored bucket of a tier."""
+        result = await session.execute(
+            text(
+                "SELECT MAX(bucket_start) FROM market_data_rollups WHERE resolution = :resolution"
+            ),
+            {"resolution": tier.name},
+        )
+        value = result.scalar()
+        return _as_datetime(value) if value is not None else None
+
+    @staticmethod
+    async def _first_time(session: AsyncSession, source: RollupTier | None) -> datetime | None:
+        """Time of the oldest raw tick (``source=None``) or bar of a tier."""
+        if source is None:
+            result = await session.execute(text("SELECT MIN(created_at) FROM market_data"))
+        else:
+            result = await session.execute(
+                text(
+                    "SELECT MIN(bucket_start) FROM market_data_rollups "
+                    "WHERE resolution = :resolution"
+                ),
+                {"resolution": source.name},
+            )
+        value = result.scalar()
+        return _as_datetime(value) if value is not None else None
+
+    @staticmethod
+    async def _raw_rows(
+        session: AsyncSession,
+        start: datetime | None,
+        end: datetime,
+        game: str | None = None,
+        item_name: str | None = None,
+        games: Collection[str] | None = None,
+        item_names: Collection[str] | None = None,
+    ) -> AsyncIterator[tuple[str, str, datetime, PriceBar]]:
+        """Stream raw ticks in ``[start, end)`` as single-sample bars."""
+        conditions = ["created_at < :end"]
+        params: dict[str, Any] = {"end": end}
+        if start is not None:
+            conditions.append("created_at >= :start")
+            params["start"] = start
+        conditions.extend(_item_conditions(params, game, item_name, games, item_names))
+
+        result = await session.stream(
+            _with_expanding(
+                "SELECT game, item_name, created_at, price_usd, volume_24h FROM market_data "  # noqa: S608
+                f"WHERE {' AND '.join(conditions)} ORDER BY created_at",
+                params,
+            ),
+            params,
+        )
+        async for game_, item_name_, created_at, price, volume in result:
+            timestamp = _as_datetime(created_at)
+            yield (
+                game_,
+                item_name_,
+                timestamp,
+                PriceBar(timestamp, price, price, price, price, volume),
+            )
+
+    @staticmethod
+    async def _tier_rows(
+        session: AsyncSession,
+        tier: RollupTier,
+        start: datetime | None,
+        end: datetime,
+        game: str | None = None,
+        item_name: str | None = None,
+        games: Collection[str] | None = None,
+        item_names: Collection[str] | None = None,
+    ) -> AsyncIterator[tuple[str, str, datetime, PriceBar]]:
+        """Stream stored bars of a tier with bucket start in ``[start, end)``."""
+        conditions = ["resolution = :resolution", "bucket_start < :end"]
+        params: dict[str, Any] = {"resolution": tier.name, "end": end}
+        if start is not None:
+            conditions.append("bucket_start >= :start")
+            params["start"] = start
+        conditions.extend(_item_conditions(params, game, item_name, games, item_names))
+
+        result = await session.stream(
+            _with_expanding(
+                "SELECT game, item_name, bucket_start, open, high, low, close, volume, samples "  # noqa: S608
+                f"FROM market_data_rollups WHERE {' AND '.join(conditions)} ORDER BY bucket_start",
+                params,
+            ),
+            params,
+        )
+        async for game_, item_name_, bucket_start, *values in result:
+            timestamp = _as_datetime(bucket_start)
+            yield game_, item_name_, timestamp, PriceBar(timestamp, *values)
+
+    @staticmethod
+    async def _insert_bars(
+        session: AsyncSession,
+        tier: RollupTier,
+        bars: dict[tuple[str, str, datetime], PriceBar],
+    ) -> None:
+        """Store new bars of a tier."""
+        if not bars:
+            return
+        await session.execute(
+            text(
+                """
+                INSERT INTO market_data_rollups (
+                    resolution, game, item_name, bucket_start,
+                    open, high, low, close, volume, samples
+                ) VALUES (
+                    :resolution, :game, :item_name, :bucket_start,
+                    :open, :high, :low, :close, :volume, :samples
+                )
+            """
+            ),
+            [
+                {
+                    "resolution": tier.name,
+                    "game": game,
+                    "item_name": item_name,
+                    "bucket_start": bucket_start,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume,
+                    "samples": bar.samples,
+                }
+                for (game, item_name, bucket_start), bar in bars.items()
+            ],
+        )
@@ -31,6 +31,41 @@ telegram_updates_total = Counter(
     ["type", "status"],
 )
 
+# Очередь уведомлений Telegram
+# Labels: status (sent/retried/failed/coalesced)
+telegram_notifications_total = Counter(
+    "telegram_notifications_total",
+    "Total number of notifications handled by the notification queue",
+    ["status"],
+)
+
+telegram_notification_queue_latency_seconds = Histogram(
+    "telegram_notification_queue_latency_seconds",
+    "Time notifications spend in the queue before sending",
+    ["priority"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+telegram_notification_queue_latency_quantile_seconds = Gauge(
+    "telegram_notification_queue_latency_quantile_seconds",
+    "Queue latency percentiles of recent notifications",
+    ["quantile"],
+)
+
+telegram_notification_queue_size = Gauge(
+    "telegram_notification_queue_size",
+    "Number of notifications waiting in the queue",
+)
+
+# Обработка callback-кнопок
+# Labels: route (callback_data, prefix or pattern that matched, or "unmatched")
+telegram_callback_duration_seconds = Histogram(
+    "telegram_callback_duration_seconds",
+    "Callback query handler duration in seconds",
+    ["route"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
 # Время обработки команд
 bot_command_duration_seconds = Histogram(
     "bot_command_duration_seconds",
@@ -84,6 +119,28 @@ api_errors_total = Counter(
     ["endpoint", "error_type"],
 )
 
+# Объединенные (single-flight) запросы
+api_requests_coalesced_total = Counter(
+    "dmarket_api_requests_coalesced_total",
+    "Total number of DMarket API requests served by an identical in-flight request",
+    ["endpoint"],
+)
+
+# Ожидание в очереди планировщика запросов по классам приоритета
+api_request_queue_wait_seconds = Histogram(
+    "dmarket_request_queue_wait_seconds",
+    "Time DMarket API requests wait in the scheduler queue before sending",
+    ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+# Устаревшие запросы, снятые из очереди по крайнему сроку
+api_requests_expired_total = Counter(
+    "dmarket_requests_expired_total",
+    "Total number of DMarket API requests dropped after their deadline",
+    ["priority"],
+)
+
 # =============================================================================
 # Database Metrics
 # =============================================================================
@@ -109,6 +166,34 @@ db_errors_total = Counter(
     ["error_type"],
 )
 
+# Буферизованная запись (bulk ingestion)
+# Labels: table, status (written/failed/dropped)
+db_ingest_rows_total = Counter(
+    "db_ingest_rows_total",
+    "Total number of rows handled by buffered database ingestion",
+    ["table", "status"],
+)
+
+db_ingest_batch_size = Histogram(
+    "db_ingest_batch_size",
+    "Number of rows written per ingestion flush",
+    ["table"],
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+db_ingest_flush_duration_seconds = Histogram(
+    "db_ingest_flush_duration_seconds",
+    "Duration of ingestion flushes in seconds",
+    ["table"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+db_ingest_queue_size = Gauge(
+    "db_ingest_queue_size",
+    "Number of rows waiting in the ingestion queue",
+    ["table"],
+)
+
 # =============================================================================
 # Arbitrage Metrics (Roadmap Task #8: Enhanced)
 # =============================================================================
@@ -253,6 +338,20 @@ cache_size_bytes = Gauge(
     ["cache_type"],
 )
 
+# Cache entries count
+cache_entries = Gauge(
+    "cache_entries",
+    "Number of entries in cache",
+    ["cache_type"],
+)
+
+# Cache evictions
+cache_evictions_total = Counter(
+    "cache_evictions_total",
+    "Total number of cache evictions",
+    ["cache_type", "reason"],  # reason: lru/ttl
+)
+
 # Cache operations duration
 cache_operation_duration_seconds = Histogram(
     "cache_operation_duration_seconds",
@@ -350,6 +449,34 @@ def track_api_request(
     api_request_duration.labels(endpoint=endpoint, method=method).observe(duration)
 
 
+def track_api_request_coalesced(endpoint: str) -> None:
+    """Track API request deduplicated by single-flight coalescing.
+
+    Args:
+        endpoint: API endpoint
+    """
+    api_requests_coalesced_total.labels(endpoint=endpoint).inc()
+
+
+def track_request_queue_wait(priority: str, wait: float) -> None:
+    """Track time a DMarket API request waited in the scheduler queue.
+
+    Args:
+        priority: Priority class (trade/targets/interactive/scan/background)
+        wait: Queue wait time in seconds
+    """
+    api_request_queue_wait_seconds.labels(priority=priority).observe(wait)
+
+
+def track_request_expired(priority: str) -> None:
+    """Track a stale DMarket API request dropped from the scheduler queue.
+
+    Args:
+        priority: Priority class
+    """
+    api_requests_expired_total.labels(priority=priority).inc()
+
+
 def track_db_query(query_type: str, duration: float) -> None:
     """Track database query.
 
@@ -360,6 +487,42 @@ def track_db_query(query_type: str, duration: float) -> None:
     db_query_duration.labels(query_type=query_type).observe(duration)
 
 
+def track_db_ingest_flush(table: str, rows: int, duration: float, success: bool = True) -> None:
+    """Track a buffered ingestion flush.
+
+    Args:
+        table: Target table
+        rows: Number of rows in the batch
+        duration: Flush duration in seconds
+        success: Whether the batch was written
+    """
+    status = "written" if success else "failed"
+    db_ingest_rows_total.labels(table=table, status=status).inc(rows)
+    if success:
+        db_ingest_batch_size.labels(table=table).observe(rows)
+        db_ingest_flush_duration_seconds.labels(table=table).observe(duration)
+
+
+def track_db_ingest_dropped(table: str, count: int = 1) -> None:
+    """Track rows dropped because the ingestion queue was full.
+
+    Args:
+        table: Target table
+        count: Number of dropped rows
+    """
+    db_ingest_rows_total.labels(table=table, status="dropped").inc(count)
+
+
+def set_db_ingest_queue_size(table: str, size: int) -> None:
+    """Set number of rows waiting in the ingestion queue.
+
+    Args:
+        table: Target table
+        size: Current queue size
+    """
+    db_ingest_queue_size.labels(table=table).set(size)
+
+
 def track_arbitrage_scan(
     game: str,
     level: str,
@@ -402,6 +565,47 @@ def track_telegram_update(update_type: str, success: bool = True) -> None:
     telegram_updates_total.labels(type=update_type, status=status).inc()
 
 
+def track_notification(status: str) -> None:
+    """Track a notification queue outcome.
+
+    Args:
+        status: sent, retried, failed or coalesced
+    """
+    telegram_notifications_total.labels(status=status).inc()
+
+
+def track_notification_latency(priority: str, latency: float) -> None:
+    """Track time a notification spent in the queue.
+
+    Args:
+        priority: Message priority (high/normal/low)
+        latency: Queue latency in seconds
+    """
+    telegram_notification_queue_latency_seconds.labels(priority=priority).observe(latency)
+
+
+def set_notification_queue_stats(size: int, percentiles: dict[str, float]) -> None:
+    """Set notification queue size and latency percentiles.
+
+    Args:
+        size: Number of queued notifications
+        percentiles: Latency percentiles in seconds, e.g. {"p50": 0.1, "p99": 1.2}
+    """
+    telegram_notification_queue_size.set(size)
+    for quantile, value in percentiles.items():
+        telegram_notification_queue_latency_quantile_seconds.labels(quantile=quantile).set(value)
+
+
+def track_callback_route(route: str, duration: float) -> None:
+    """Track a routed callback query.
+
+    Args:
+        route: Matched callback_data, prefix or pattern ("unmatched" if none)
+        duration: Handler duration in seconds
+    """
+    telegram_callback_duration_seconds.labels(route=route).observe(duration)
+
+
 def track_cache_request(cache_type: str, hit: bool) -> None:
     """Track cache request.
 
@@ -435,6 +639,37 @@ def track_cache_operation(
     ).observe(duration)
 
 
+def track_cache_eviction(cache_type: str, reason: str, count: int = 1) -> None:
+    """Track cache evictions.
+
+    Args:
+        cache_type: Type of cache (e.g. dmarket_api)
+        reason: Eviction reason (lru, ttl)
+        count: Number of evicted entries
+    """
+    cache_evictions_total.labels(cache_type=cache_type, reason=reason).inc(count)
+
+
+def set_cache_size(cache_type: str, size_bytes: int) -> None:
+    """Set cache size in bytes.
+
+    Args:
+        cache_type: Type of cache (e.g. dmarket_api)
+        size_bytes: Current payload size in bytes
+    """
+    cache_size_bytes.labels(cache_type=cache_type).set(size_bytes)
+
+
+def set_cache_entries(cache_type: str, count: int) -> None:
+    """Set number of entries in cache.
+
+    Args:
+        cache_type: Type of cache (e.g. dmarket_api)
+        count: Current number of entries
+    """
+    cache_entries.labels(cache_type=cache_type).set(count)
+
+
 def track_rate_limit_hit(endpoint: str, limit_type: str = "api") -> None:
     """Track rate limit hit.
 
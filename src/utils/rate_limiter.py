@@ -1,9 +1,14 @@
 """Модуль для управления лимитами запросов к API."""
 
 import asyncio
+from collections.abc import Mapping
+from enum import IntEnum
+import hashlib
+import heapq
+import itertools
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 
 try:
@@ -17,6 +22,7 @@ except ImportError:
 
 if TYPE_CHECKING:
     from src.utils.notifier import Notifier
+    from src.utils.redis_rate_limiter import SlidingWindowRateLimiter
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -40,6 +46,70 @@ RATE_LIMIT_WARNING_THRESHOLD = 0.9
 # Максимальное время ожидания при exponential backoff (секунды)
 MAX_BACKOFF_TIME = 60.0
 
+# Документированные лимиты DMarket API по категориям эндпоинтов (запросов в минуту)
+DMARKET_ENDPOINT_LIMITS = {
+    "market": 30,  # Market search, items, prices
+    "inventory": 20,  # User inventory
+    "targets": 10,  # Buy orders (targets)
+    "account": 15,  # Balance, account info
+    "trade": 10,  # Buy/sell operations
+    "other": 20,  # Default for other endpoints
+}
+
+
+def get_dmarket_endpoint_category(path: str) -> str:
+    """Determine DMarket endpoint category from URL path.
+
+    Args:
+        path: API endpoint path
+
+    Returns:
+        Endpoint category (market, inventory, targets, account, trade, other)
+    """
+    path_lower = path.lower()
+
+    # Check more specific patterns first to avoid false matches
+
+    # Trade endpoints (check before market since /buy is in both)
+    if any(
+        keyword in path_lower
+        for keyword in [
+            "/items/buy",
+            "/offers-buy",
+            "/inventory/sell",
+            "/create-offer",
+            "/offers/edit",
+            "/offers/delete",
+        ]
+    ):
+        return "trade"
+
+    # Targets (Buy Orders) endpoints
+    if "/target" in path_lower or "/buy-order" in path_lower:
+        return "targets"
+
+    # Market endpoints
+    if any(
+        keyword in path_lower
+        for keyword in [
+            "/market/items",
+            "/market/aggregated-prices",
+            "/market/best-offers",
+            "/market/search",
+        ]
+    ):
+        return "market"
+
+    # Inventory endpoints
+    if "/inventory" in path_lower or "/user/items" in path_lower:
+        return "inventory"
+
+    # Account endpoints
+    if "/account" in path_lower or "/balance" in path_lower:
+        return "account"
+
+    return "other"
+
 
 class RateLimiter:
     """Класс для контроля скорости запросов к API DMarket.
@@ -560,6 +630,10 @@ class RateLimiter:
 class DMarketRateLimiter:
     """Advanced per-endpoint rate limiter using aiolimiter.
 
+    Superseded by AdaptiveRateLimiter, which DMarketAPI uses: fixed limits
+    here are not updated from server headers and are not shared between
+    API client instances.
+
     Implements precise rate limiting for each DMarket API endpoint with:
     - Individual limiters per endpoint
     - Automatic throttling at 80% usage threshold
@@ -585,14 +659,7 @@ class DMarketRateLimiter:
             )
 
         # Endpoint-specific limits (requests per minute)
-        self._endpoint_limits = {
-            "market": 30,  # Market search, items, prices
-            "inventory": 20,  # User inventory
-            "targets": 10,  # Buy orders (targets)
-            "account": 15,  # Balance, account info
-            "trade": 10,  # Buy/sell operations
-            "other": 20,  # Default for other endpoints
-        }
+        self._endpoint_limits = DMARKET_ENDPOINT_LIMITS.copy()
 
         # Create AsyncLimiter for each endpoint
         self._limiters: dict[str, AsyncLimiter] = {}
@@ -624,42 +691,7 @@ class DMarketRateLimiter:
         Returns:
             Endpoint category (market, inventory, targets, etc.)
         """
-        path_lower = path.lower()
-
-        # Check more specific patterns first to avoid false matches
-
-        # Trade endpoints (check before market since /buy is in both)
-        if any(
-            keyword in path_lower
-            for keyword in ["/items/buy", "/create-offer", "/offers/edit", "/offers/delete"]
-        ):
-            return "trade"
-
-        # Targets (Buy Orders) endpoints
-        if "/target" in path_lower or "/buy-order" in path_lower:
-            return "targets"
-
-        # Market endpoints
-        if any(
-            keyword in path_lower
-            for keyword in [
-                "/market/items",
-                "/market/aggregated-prices",
-                "/market/best-offers",
-                "/market/search",
-            ]
-        ):
-            return "market"
-
-        # Inventory endpoints
-        if "/inventory" in path_lower or "/user/items" in path_lower:
-            return "inventory"
-
-        # Account endpoints
-        if "/account" in path_lower or "/balance" in path_lower:
-            return "account"
-
-        return "other"
+        return get_dmarket_endpoint_category(path)
 
     async def acquire(self, endpoint: str) -> None:
         """Acquire rate limit slot for endpoint.
@@ -759,3 +791,367 @@ class DMarketRateLimiter:
         self._429_counts = dict.fromkeys(self._endpoint_limits, 0)
         self._warning_sent = dict.fromkeys(self._endpoint_limits, False)
         logger.info("📊 Rate limiter statistics reset")
+
+
+# ============================================================================
+# Adaptive (AIMD) rate limiter shared by DMarket API clients
+# ============================================================================
+
+# Additive increase of the allowed rate per successful response (requests/minute)
+AIMD_ADDITIVE_INCREASE = 1.0
+
+# Multiplicative decrease of the allowed rate on 429
+AIMD_DECREASE_FACTOR = 0.5
+
+# Lower bound of the allowed rate (requests/minute)
+AIMD_MIN_RATE = 1.0
+
+# Values of X-RateLimit-Reset below this are "seconds until reset", above - a unix timestamp
+RESET_HEADER_TIMESTAMP_THRESHOLD = 1_000_000_000
+
+
+class RequestPriority(IntEnum):
+    """Priority lanes of AdaptiveRateLimiter (lower value is served first)."""
+
+    TRADE = 0  # Buying and selling
+    TARGETS = 1  # Buy orders (targets)
+    INTERACTIVE = 2  # Balance, inventory, user-facing requests
+    SCAN = 3  # Market scans
+    BACKGROUND = 4  # ML data collection and other background work
+
+
+# Default lane of each endpoint category
+CATEGORY_PRIORITIES = {
+    "trade": RequestPriority.TRADE,
+    "targets": RequestPriority.TARGETS,
+    "account": RequestPriority.INTERACTIVE,
+    "inventory": RequestPriority.INTERACTIVE,
+    "market": RequestPriority.SCAN,
+    "other": RequestPriority.SCAN,
+}
+
+
+class _AdaptiveBudget:
+    """Token bucket of one endpoint category with an AIMD-controlled rate."""
+
+    __slots__ = (
+        "_changed",
+        "blocked_until",
+        "ceiling",
+        "documented_limit",
+        "errors_429",
+        "rate",
+        "requests",
+        "server_remaining",
+        "tokens",
+        "updated_at",
+        "waiters",
+    )
+
+    def __init__(self, documented_limit: float, now: float) -> None:
+        self.documented_limit = float(documented_limit)
+        self.ceiling = float(documented_limit)  # Highest rate allowed by the server
+        self.rate = float(documented_limit)  # Current allowed rate (requests/minute)
+        self.tokens = float(documented_limit)
+        self.updated_at = now
+        self.blocked_until = 0.0
+        self.server_remaining: int | None = None
+        self.requests = 0
+        self.errors_429 = 0
+        # Heap of (priority, sequence) of waiting acquire() calls
+        self.waiters: list[tuple[int, int]] = []
+        self._changed: asyncio.Future[None] | None = None
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.rate, self.tokens + elapsed * self.rate / 60.0)
+            self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a request of this category may be sent."""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) * 60.0 / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        self.rate = max(AIMD_MIN_RATE, min(self.ceiling, rate))
+        self.tokens = min(self.tokens, self.rate)
+
+    def changed(self) -> "asyncio.Future[None]":
+        """Future resolved on the next change of the budget state."""
+        loop = asyncio.get_running_loop()
+        future = self._changed
+        if future is None or future.done() or future.get_loop() is not loop:
+            future = self._changed = loop.create_future()
+        return future
+
+    def notify(self) -> None:
+        """Wake up waiters to re-check the budget."""
+        future = self._changed
+        self._changed = None
+        if future is not None and not future.done() and not future.get_loop().is_closed():
+            future.set_result(None)
+
+
+class AdaptiveRateLimiter:
+    """Adaptive per-endpoint rate limiter for DMarket API.
+
+    Unifies RateLimiter (learns quotas from X-RateLimit-* headers) and
+    DMarketRateLimiter (per-endpoint limits):
+    - Starts from the documented limits (DMARKET_ENDPOINT_LIMITS)
+    - AIMD: each successful response raises the allowed rate additively up
+      to the server ceiling, each 429 halves it
+    - X-RateLimit-Limit raises or lowers the ceiling, X-RateLimit-Remaining
+      and X-RateLimit-Reset bound the current budget
+    - One instance per API key is shared by all DMarketAPI clients and
+      asyncio tasks of the process (get_dmarket_rate_limiter); with a
+      SlidingWindowRateLimiter the budget is also shared between replicas
+    - Priority lanes: waiting trade requests are served before scans
+
+    Exposes the DMarketRateLimiter interface (acquire, record_429_error,
+    get_stats, reset_stats) so it can be used in its place.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int] | None = None,
+        redis_limiter: "SlidingWindowRateLimiter | None" = None,
+        redis_prefix: str = "dmarket:",
+        header_window: float = 60.0,
+    ) -> None:
+        """Initialize adaptive rate limiter.
+
+        Args:
+            limits: Starting limits per endpoint category (requests per minute)
+            redis_limiter: Sliding window limiter to share the budget between replicas
+            redis_prefix: Prefix of Redis keys of this limiter
+            header_window: Window of X-RateLimit-Limit in seconds
+        """
+        self._endpoint_limits = dict(limits or DMARKET_ENDPOINT_LIMITS)
+        self._endpoint_limits.setdefault("other", DMARKET_ENDPOINT_LIMITS["other"])
+        self.redis_limiter = redis_limiter
+        self.redis_prefix = redis_prefix
+        self.header_window = header_window
+        self._sequence = itertools.count()
+        now = time.monotonic()
+        self._budgets = {
+            category: _AdaptiveBudget(limit, now)
+            for category, limit in self._endpoint_limits.items()
+        }
+
+    def get_endpoint_category(self, path: str) -> str:
+        """Determine endpoint category from URL path."""
+        return get_dmarket_endpoint_category(path)
+
+    def _category(self, endpoint: str) -> str:
+        category = endpoint if endpoint in self._budgets else self.get_endpoint_category(endpoint)
+        return category if category in self._budgets else "other"
+
+    async def acquire(self, endpoint: str, priority: int | None = None) -> None:
+        """Acquire rate limit slot for endpoint.
+
+        Waits until the category budget allows a request. Waiting requests are
+        served by priority lane, then in arrival order.
+
+        Args:
+            endpoint: Endpoint category or path
+            priority: RequestPriority lane (default lane of the category if None)
+        """
+        category = self._category(endpoint)
+        budget = self._budgets[category]
+        if priority is None:
+            priority = CATEGORY_PRIORITIES.get(category, RequestPriority.SCAN)
+
+        ticket = (int(priority), next(self._sequence))
+        heapq.heappush(budget.waiters, ticket)
+        try:
+            while True:
+                now = time.monotonic()
+                delay = budget.wait_time(now)
+                is_head = budget.waiters[0] == ticket
+
+                if is_head and delay <= 0:
+                    retry_after = await self._acquire_shared(category, budget)
+                    if retry_after <= 0:
+                        heapq.heappop(budget.waiters)
+                        budget.tokens -= 1.0
+                        budget.requests += 1
+                        budget.notify()
+                        return
+                    # Other replicas used up the shared budget
+                    budget.blocked_until = max(budget.blocked_until, time.monotonic() + retry_after)
+                    continue
+
+                # Only the head of the queue waits for tokens; others wait for their turn
+                changed = budget.changed()
+                await asyncio.wait({changed}, timeout=delay if is_head else None)
+        except BaseException:
+            if ticket in budget.waiters:
+                budget.waiters.remove(ticket)
+                heapq.heapify(budget.waiters)
+                budget.notify()
+            raise
+
+    async def _acquire_shared(self, category: str, budget: _AdaptiveBudget) -> float:
+        """Take a slot in the budget shared through Redis.
+
+        Returns:
+            0 if the slot is taken, otherwise seconds to wait
+        """
+        if self.redis_limiter is None:
+            return 0.0
+        allowed, _, retry_after = await self.redis_limiter.check_and_increment(
+            f"{self.redis_prefix}{category}",
+            limit=max(1, int(budget.rate)),
+            window=60,
+        )
+        return 0.0 if allowed else max(retry_after, 0.05)
+
+    def record_success(self, endpoint: str) -> None:
+        """Additively increase the allowed rate after a successful response.
+
+        Args:
+            endpoint: Endpoint category or path
+        """
+        budget = self._budgets[self._category(endpoint)]
+        if budget.rate < budget.ceiling:
+            budget.set_rate(budget.rate + AIMD_ADDITIVE_INCREASE)
+
+    def record_429_error(self, endpoint: str, retry_after: float | None = None) -> None:
+        """Record a 429 (Too Many Requests) error and back off.
+
+        The allowed rate is halved and the category is blocked for
+        retry_after seconds (or until a new token would be available).
+
+        Args:
+            endpoint: Endpoint that returned 429
+            retry_after: Retry-After from the response in seconds
+        """
+        category = self._category(endpoint)
+        budget = self._budgets[category]
+        budget.errors_429 += 1
+        budget.set_rate(budget.rate * AIMD_DECREASE_FACTOR)
+        budget.tokens = 0.0
+        pause = retry_after if retry_after and retry_after > 0 else 60.0 / budget.rate
+        budget.blocked_until = max(budget.blocked_until, time.monotonic() + pause)
+        budget.notify()
+
+        logger.warning(
+            "❌ Rate limit exceeded (429) for %s endpoint (total 429s: %d), "
+            "rate lowered to %.1f req/min, pause %.1fs",
+            category,
+            budget.errors_429,
+            budget.rate,
+            pause,
+        )
+
+    def update_from_headers(self, headers: Mapping[str, Any], endpoint: str = "other") -> None:
+        """Learn the server quota from X-RateLimit-* response headers.
+
+        Args:
+            headers: HTTP response headers
+            endpoint: Endpoint category or path of the request
+        """
+        if not isinstance(headers, Mapping):
+            return
+        values = {str(key).lower(): value for key, value in headers.items()}
+        if "x-ratelimit-limit" not in values and "x-ratelimit-remaining" not in values:
+            return
+
+        budget = self._budgets[self._category(endpoint)]
+        try:
+            if "x-ratelimit-limit" in values:
+                limit = float(values["x-ratelimit-limit"]) * 60.0 / self.header_window
+                if limit > 0:
+                    budget.ceiling = max(limit, AIMD_MIN_RATE)
+                    if budget.rate > budget.ceiling:
+                        budget.set_rate(budget.ceiling)
+
+            if "x-ratelimit-remaining" in values:
+                remaining = int(float(values["x-ratelimit-remaining"]))
+                budget.server_remaining = remaining
+                budget.refill(time.monotonic())
+                budget.tokens = min(budget.tokens, float(remaining))
+
+                if remaining <= 0 and "x-ratelimit-reset" in values:
+                    reset = float(values["x-ratelimit-reset"])
+                    if reset > RESET_HEADER_TIMESTAMP_THRESHOLD:
+                        reset -= time.time()
+                    if reset > 0:
+                        budget.blocked_until = max(
+                            budget.blocked_until, time.monotonic() + min(reset, MAX_BACKOFF_TIME)
+                        )
+        except (TypeError, ValueError):
+            return
+
+        budget.notify()
+
+    def get_rate(self, endpoint: str) -> float:
+        """Current allowed rate of the endpoint category (requests per minute)."""
+        return self._budgets[self._category(endpoint)].rate
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Get rate limiter statistics.
+
+        Returns:
+            Dictionary with current limits, usage and error stats per endpoint
+        """
+        stats = {}
+        for category, budget in self._budgets.items():
+            stats[category] = {
+                "limit_per_minute": round(budget.rate, 1),
+                "documented_limit": self._endpoint_limits[category],
+                "ceiling_per_minute": round(budget.ceiling, 1),
+                "server_remaining": budget.server_remaining,
+                "waiting": len(budget.waiters),
+                "total_requests": budget.requests,
+                "total_429_errors": budget.errors_429,
+            }
+        return stats
+
+    def reset_stats(self) -> None:
+        """Reset usage statistics (useful for testing)."""
+        for budget in self._budgets.values():
+            budget.requests = 0
+            budget.errors_429 = 0
+        logger.info("📊 Rate limiter statistics reset")
+
+
+# Shared limiters per DMarket API key
+_shared_limiters: dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_dmarket_rate_limiter(
+    api_key: str = "",
+    redis_limiter: "SlidingWindowRateLimiter | None" = None,
+) -> AdaptiveRateLimiter:
+    """Get the process-wide adaptive rate limiter of a DMarket API key.
+
+    DMarket quotas belong to the API key, so all clients using the same key
+    share one budget.
+
+    Args:
+        api_key: DMarket public API key
+        redis_limiter: Sliding window limiter to share the budget between replicas
+
+    Returns:
+        AdaptiveRateLimiter instance
+    """
+    limiter = _shared_limiters.get(api_key)
+    if limiter is None:
+        # Redis keys must not contain the API key itself
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        limiter = AdaptiveRateLimiter(redis_prefix=f"dmarket:{key_hash}:")
+        _shared_limiters[api_key] = limiter
+    if redis_limiter is not None:
+        limiter.redis_limiter = redis_limiter
+    return limiter
+
+
+def reset_shared_rate_limiters() -> None:
+    """Drop shared limiters (learned limits and budgets), e.g. between tests."""
+    _shared_limiters.clear()
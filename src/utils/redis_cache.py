@@ -129,6 +129,11 @@ class RedisCache:
             logger.info("Falling back to in-memory cache")
             return False
 
+    @property
+    def is_connected(self) -> bool:
+        """Check whether Redis is connected (not serving from the fallback)."""
+        return self._connected
+
     async def disconnect(self) -> None:
         """Disconnect from Redis server."""
         if self._redis:
@@ -0,0 +1,219 @@
+"""Индекс пороговых оповещений о цене.
+
+Оповещения каждого предмета хранятся в двух отсортированных по порогу
+массивах: "above" (срабатывают при цене не ниже порога) и "below"
+(при цене не выше порога). Для тика цены сработавшие оповещения - это
+префикс массива "above" и суффикс массива "below", поэтому их поиск
+занимает O(log n + k) вместо перебора всех оповещений предмета.
+
+Вставка и удаление одного оповещения - бинарный поиск и сдвиг массива;
+при массовой загрузке массивы каждого предмета сортируются один раз.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Hashable, Iterable
+from typing import Any, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+ABOVE = "above"
+BELOW = "below"
+
+
+class _Thresholds(Generic[T]):
+    """Отсортированные пороги и оповещения одной стороны предмета."""
+
+    __slots__ = ("thresholds", "values")
+
+    def __init__(self) -> None:
+        self.thresholds: list[Any] = []
+        self.values: list[T] = []
+
+    def insert(self, threshold: Any, value: T) -> None:
+        index = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(index, threshold)
+        self.values.insert(index, value)
+
+    def remove(self, threshold: Any, value: T) -> bool:
+        index = bisect_left(self.thresholds, threshold)
+        end = bisect_right(self.thresholds, threshold, lo=index)
+        for position in range(index, end):
+            if self.values[position] is value:
+                del self.thresholds[position]
+                del self.values[position]
+                return True
+        return False
+
+    def extend_sorted(self, entries: list[tuple[Any, T]]) -> None:
+        entries.extend(zip(self.thresholds, self.values, strict=True))
+        entries.sort(key=lambda entry: entry[0])
+        self.thresholds = [threshold for threshold, _ in entries]
+        self.values = [value for _, value in entries]
+
+
+class ThresholdIndex(Generic[T]):
+    """Пороговые оповещения по предметам в отсортированных массивах."""
+
+    def __init__(self, inclusive: bool = True) -> None:
+        """Инициализация индекса.
+
+        Args:
+            inclusive: Срабатывает ли оповещение при цене, равной порогу
+
+        """
+        self.inclusive = inclusive
+        self._above: dict[Hashable, _Thresholds[T]] = {}
+        self._below: dict[Hashable, _Thresholds[T]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Количество оповещений в индексе."""
+        return self._size
+
+    def _side(self, direction: str) -> dict[Hashable, _Thresholds[T]]:
+        if direction == ABOVE:
+            return self._above
+        if direction == BELOW:
+            return self._below
+        raise ValueError(f"Unknown threshold direction: {direction!r}")
+
+    def add(self, key: Hashable, threshold: Any, direction: str, value: T) -> None:
+        """Добавить оповещение.
+
+        Args:
+            key: Ключ предмета
+            threshold: Пороговая цена
+            direction: "above" или "below"
+            value: Оповещение
+
+        Raises:
+            ValueError: Если direction неизвестен
+
+        """
+        side = self._side(direction)
+        thresholds = side.get(key)
+        if thresholds is None:
+            thresholds = side[key] = _Thresholds()
+        thresholds.insert(threshold, value)
+        self._size += 1
+
+    def add_many(self, entries: Iterable[tuple[Hashable, Any, str, T]]) -> int:
+        """Массово добавить оповещения (key, threshold, direction, value).
+
+        Массивы каждого затронутого предмета сортируются один раз.
+
+        Returns:
+            Количество добавленных оповещений
+
+        Raises:
+            ValueError: Если direction неизвестен
+
+        """
+        grouped: dict[tuple[str, Hashable], list[tuple[Any, T]]] = {}
+        for key, threshold, direction, value in entries:
+            if direction not in {ABOVE, BELOW}:
+                raise ValueError(f"Unknown threshold direction: {direction!r}")
+            grouped.setdefault((direction, key), []).append((threshold, value))
+
+        added = 0
+        for (direction, key), side_entries in grouped.items():
+            side = self._side(direction)
+            thresholds = side.get(key)
+            if thresholds is None:
+                thresholds = side[key] = _Thresholds()
+            added += len(side_entries)
+            thresholds.extend_sorted(side_entries)
+        self._size += added
+        return added
+
+    def remove(self, key: Hashable, threshold: Any, direction: str, value: T) -> bool:
+        """Удалить оповещение (сравнение по идентичности объекта).
+
+        Returns:
+            True, если оповещение было в индексе
+
+        """
+        side = self._side(direction)
+        thresholds = side.get(key)
+        if thresholds is None or not thresholds.remove(threshold, value):
+            return False
+        if not thresholds.values:
+            del side[key]
+        self._size -= 1
+        return True
+
+    def _bounds(self, key: Hashable, price: Any) -> tuple[int, int]:
+        """Граница префикса "above" и начало суффикса "below" для цены."""
+        above = self._above.get(key)
+        below = self._below.get(key)
+        if self.inclusive:
+            above_end = bisect_right(above.thresholds, price) if above else 0
+            below_start = bisect_left(below.thresholds, price) if below else 0
+        else:
+            above_end = bisect_left(above.thresholds, price) if above else 0
+            below_start = bisect_right(below.thresholds, price) if below else 0
+        return above_end, below_start
+
+    def crossed(self, key: Hashable, price: Any) -> list[T]:
+        """Оповещения предмета, условие которых выполняется при цене.
+
+        Args:
+            key: Ключ предмета
+            price: Текущая цена
+
+        Returns:
+            Сработавшие оповещения: сначала "above" по возрастанию порога,
+            затем "below" по возрастанию порога
+
+        """
+        above_end, below_start = self._bounds(key, price)
+        result: list[T] = []
+        if above_end:
+            result.extend(self._above[key].values[:above_end])
+        below = self._below.get(key)
+        if below is not None and below_start < len(below.values):
+            result.extend(below.values[below_start:])
+        return result
+
+    def pop_crossed(self, key: Hashable, price: Any) -> list[T]:
+        """Извлечь из индекса оповещения предмета, сработавшие при цене."""
+        above_end, below_start = self._bounds(key, price)
+        result: list[T] = []
+        above = self._above.get(key)
+        if above_end:
+            result.extend(above.values[:above_end])
+            del above.values[:above_end]
+            del above.thresholds[:above_end]
+            if not above.values:
+                del self._above[key]
+        below = self._below.get(key)
+        if below is not None and below_start < len(below.values):
+            result.extend(below.values[below_start:])
+            del below.values[below_start:]
+            del below.thresholds[below_start:]
+            if not below.values:
+                del self._below[key]
+        self._size -= len(result)
+        return result
+
+    def discard_key(self, key: Hashable) -> int:
+        """Удалить все оповещения предмета.
+
+        Returns:
+            Количество удаленных оповещений
+
+        """
+        removed = 0
+        for side in (self._above, self._below):
+            thresholds = side.pop(key, None)
+            if thresholds is not None:
+                removed += len(thresholds.values)
+        self._size -= removed
+        return removed
+
+    def clear(self) -> None:
+        """Удалить все оповещения."""
+        self._above.clear()
+        self._below.clear()
+        self._size = 0
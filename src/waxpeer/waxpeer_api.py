@@ -31,6 +31,8 @@ from typing import Any
 import httpx
 import structlog
 
+from src.utils.http_pool import http_pool
+
 
 logger = structlog.get_logger(__name__)
 
@@ -186,15 +188,19 @@ class WaxpeerAPI:  # noqa: PLR0904
         self._rate_limit_lock = asyncio.Lock()
 
     async def __aenter__(self) -> "WaxpeerAPI":
-        """Создание HTTP клиента при входе в контекст."""
-        self._client = httpx.AsyncClient(
+        """Создание HTTP клиента при входе в контекст.
+
+        Клиент работает поверх общего пула соединений (src.utils.http_pool),
+        поэтому соединения с Waxpeer переживают выход из контекста.
+        """
+        self._client = http_pool.create_client(
             timeout=self.timeout,
             headers={"Accept": "application/json"},
         )
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Закрытие HTTP клиента при выходе из контекста."""
+        """Закрытие HTTP клиента при выходе из контекста (общий пул остается открытым)."""
         if self._client:
             await self._client.aclose()
             self._client = None
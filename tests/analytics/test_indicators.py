@@ -0,0 +1,185 @@
+"""Tests for incremental and vectorized technical indicators."""
+
+from decimal import Decimal
+import random
+
+import numpy as np
+import pytest
+
+from src.analytics.indicators import (
+    EMA,
+    SMA,
+    Bollinger,
+    IndicatorEngine,
+    IndicatorState,
+    compute_indicators_batch,
+    to_price_matrix,
+)
+from src.analytics.price_analytics import PriceAnalytics
+
+
+def _random_walk(length: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    prices = [100.0]
+    for _ in range(length - 1):
+        prices.append(max(1.0, prices[-1] + rng.gauss(0, 2)))
+    return prices[:length]
+
+
+class TestStreamingIndicators:
+    """Tests for single-series streaming indicators."""
+
+    def test_sma_uses_latest_window(self):
+        """SMA slides over the most recent prices."""
+        sma = SMA(3)
+        values = [sma.update(price) for price in [10, 12, 14, 16, 18]]
+        assert values == [None, None, 12.0, 14.0, 16.0]
+
+    def test_ema_seeded_with_sma(self):
+        """EMA starts at the SMA of the first period prices."""
+        ema = EMA(3)
+        values = [ema.update(price) for price in [10, 12, 14, 16]]
+        assert values[:3] == [None, None, 12.0]
+        assert values[3] == pytest.approx(16 * 0.5 + 12 * 0.5)
+
+    def test_bollinger_matches_window_std(self):
+        """Sliding standard deviation matches a direct computation."""
+        prices = _random_walk(200, seed=1)
+        bollinger = Bollinger(20, 2.0)
+        for price in prices:
+            bollinger.update(price)
+
+        window = np.array(prices[-20:])
+        assert bollinger.middle == pytest.approx(window.mean())
+        assert bollinger.std == pytest.approx(window.std())
+
+    @pytest.mark.parametrize("length", (10, 15, 20, 35, 50, 300))
+    def test_state_matches_price_analytics(self, length):
+        """One pass over the history gives the same values as PriceAnalytics."""
+        analytics = PriceAnalytics()
+        prices = _random_walk(length, seed=length)
+
+        state = IndicatorState.from_prices(prices)
+
+        assert state.ema[12].value == (
+            None if length < 12 else pytest.approx(analytics.calculate_ema(prices, 12), rel=1e-12)
+        )
+        rsi = analytics.calculate_rsi(prices)
+        assert (rsi.value if rsi else None) == (
+            round(state.rsi.value, 2) if state.rsi.value is not None else None
+        )
+        macd = analytics.calculate_macd(prices)
+        if macd is not None:
+            assert macd.macd_line == round(state.macd.macd_line, 4)
+            assert macd.signal_line == round(state.macd.signal_line, 4)
+
+
+class TestIndicatorEngine:
+    """Tests for per-item state."""
+
+    def test_tracks_items_separately(self):
+        """Each item has its own state."""
+        engine = IndicatorEngine()
+        for price in range(30):
+            engine.add_price("a", float(price))
+        engine.add_price("b", 5.0)
+
+        assert engine.get("a").snapshot()["sma_20"] == pytest.approx(19.5)
+        assert engine.get("b").count == 1
+        assert engine.get("missing") is None
+
+    def test_evicts_least_recently_updated(self):
+        """Oldest items are dropped when max_items is exceeded."""
+        engine = IndicatorEngine(max_items=2)
+        engine.add_price("a", 1.0)
+        engine.add_price("b", 1.0)
+        engine.add_price("a", 2.0)
+        engine.add_price("c", 1.0)
+
+        assert len(engine) == 2
+        assert "a" in engine
+        assert "b" not in engine
+
+
+class TestBatchIndicators:
+    """Tests for NumPy batch computation."""
+
+    def test_batch_matches_streaming(self):
+        """Batch results equal streaming state for histories of any length."""
+        histories = [_random_walk(length, seed=length) for length in [1, 5, 20, 34, 35, 60, 250]]
+
+        batch = compute_indicators_batch(histories)
+
+        for index, prices in enumerate(histories):
+            expected = IndicatorState.from_prices(prices).snapshot()
+            for name, value in batch.for_item(index).items():
+                if name == "macd_histogram":
+                    continue
+                if expected[name] is None:
+                    assert value is None, name
+                else:
+                    assert value == pytest.approx(expected[name], rel=1e-9), name
+
+    def test_full_history_shape(self):
+        """Every indicator is computed for every point in time."""
+        matrix = to_price_matrix([[1.0, 2.0, 3.0], [4.0]])
+        assert np.isnan(matrix[1, :2]).all()
+
+        batch = compute_indicators_batch(matrix)
+
+        assert all(values.shape == (2, 3) for values in batch.series.values())
+
+    def test_gaps_rejected(self):
+        """NaN inside a history is an error."""
+        with pytest.raises(ValueError, match="gaps"):
+            compute_indicators_batch(np.array([[1.0, np.nan, 2.0]]))
+
+
+class TestPriceAnalyticsIntegration:
+    """Tests for the incremental API of PriceAnalytics."""
+
+    def test_add_price_and_get_indicators(self):
+        """Prices pushed via add_price update the item's indicators."""
+        analytics = PriceAnalytics()
+        prices = _random_walk(40, seed=7)
+        for price in prices:
+            analytics.add_price("item_1", Decimal(str(price)))
+
+        indicators = analytics.get_indicators("item_1")
+
+        assert analytics.is_ready()
+        assert indicators["count"] == 40
+        assert indicators["rsi"] == pytest.approx(
+            IndicatorState.from_prices(prices).rsi.value, rel=1e-9
+        )
+        assert analytics.get_indicators("unknown") is None
+
+    def test_is_ready_follows_readiness_checks(self):
+        """is_ready fails while any dependency check fails or raises."""
+        state = {"database": True, "bot_polling": False}
+
+        def redis() -> bool:
+            raise ConnectionError("redis down")
+
+        analytics = PriceAnalytics(
+            readiness_checks={
+                "database": lambda: state["database"],
+                "bot_polling": lambda: state["bot_polling"],
+            }
+        )
+        assert not analytics.is_ready()
+
+        state["bot_polling"] = True
+        assert analytics.is_ready()
+
+        assert not PriceAnalytics(readiness_checks={"redis": redis}).is_ready()
+
+    def test_analyze_item_moving_averages_use_recent_prices(self):
+        """sma_20 in analyze_item averages the latest 20 prices."""
+        analytics = PriceAnalytics()
+        prices = [float(i) for i in range(60)]
+
+        analysis = analytics.analyze_item("Item", prices, Decimal(59))
+
+        assert analysis.sma_20 == pytest.approx(49.5)
+        assert analysis.sma_50 == pytest.approx(34.5)
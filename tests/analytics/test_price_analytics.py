@@ -1,6 +1,8 @@
 """Tests for Price Analytics Module."""
 
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -164,8 +166,8 @@ class TestMovingAverages:
         """Test SMA calculation."""
         prices = [10, 12, 14, 16, 18]
         sma = analytics.calculate_sma(prices, period=3)
-        # Average of [10, 12, 14] = 12
-        assert sma == pytest.approx(12.0, rel=0.01)
+        # Average of the most recent [14, 16, 18] = 16
+        assert sma == pytest.approx(16.0, rel=0.01)
 
     def test_ema_calculation(self, analytics):
         """Test EMA calculation."""
@@ -316,6 +318,26 @@ class TestCompleteAnalysis:
         assert "current_price" in data
         assert "overall_signal" in data
 
+    async def test_analyze_stored_item(self):
+        """Test analysis over closing prices of the price history store."""
+        store = AsyncMock()
+        store.get_close_prices.return_value = [10 + i * 0.1 for i in range(50)]
+        analytics = PriceAnalytics(price_history_store=store)
+
+        analysis = await analytics.analyze_stored_item("csgo", "Test Item", Decimal("15.0"), days=7)
+
+        (game, item_name), kwargs = store.get_close_prices.await_args
+        assert (game, item_name) == ("csgo", "Test Item")
+        assert kwargs["start"] < datetime.now(UTC) - timedelta(days=7) + timedelta(minutes=1)
+        assert analysis.item_name == "Test Item"
+        assert analysis.rsi is not None
+        assert analysis.macd is not None
+
+    async def test_analyze_stored_item_without_store(self, analytics):
+        """Test stored analysis needs a price history store."""
+        with pytest.raises(RuntimeError):
+            await analytics.analyze_stored_item("csgo", "Test Item", Decimal("15.0"))
+
 
 class TestFactoryFunction:
     """Tests for factory function."""
@@ -600,12 +600,12 @@ class TestDMarketAPICaching:
         mock_balance_response: dict[str, Any],
     ) -> None:
         """Test that responses are cached properly."""
-        from src.dmarket.dmarket_api import DMarketAPI, api_cache
+        from src.dmarket.dmarket_api import DMarketAPI
 
         api = DMarketAPI(mock_public_key, mock_secret_key)
 
         # Clear cache first
-        api_cache.clear()
+        await api.clear_cache()
 
         with patch.object(api, "_request", new_callable=AsyncMock) as mock_request:
             mock_request.return_value = mock_balance_response
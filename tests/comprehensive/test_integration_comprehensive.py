@@ -300,12 +300,12 @@ class TestCacheIntegration:
     @pytest.mark.asyncio
     async def test_api_caches_responses(self) -> None:
         """Test API caches responses correctly."""
-        from src.dmarket.dmarket_api import DMarketAPI, api_cache
+        from src.dmarket.dmarket_api import DMarketAPI
 
         api = DMarketAPI("public", "secret")
 
         # Clear cache
-        api_cache.clear()
+        await api.clear_cache()
 
         mock_response = {"usd": {"amount": "1000"}}
 
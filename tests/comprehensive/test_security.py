@@ -401,12 +401,13 @@ class TestDataProtection:
 
     def test_balance_data_not_cached_insecurely(self) -> None:
         """Test balance data caching is secure."""
-        from src.dmarket.dmarket_api import api_cache
+        from src.dmarket.dmarket_api import DMarketAPI
 
         # Cache should not contain plaintext sensitive data
         # After normal operations
         # This is a basic sanity check
-        assert isinstance(api_cache, dict)
+        api = DMarketAPI("public", "secret")
+        assert len(api._cache) == 0
 
 
 # =============================================================================
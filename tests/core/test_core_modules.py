@@ -127,6 +127,26 @@ class TestApplicationLifecycle:
 
         mock_scanner.stop.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_http_pool(self, mock_app):
+        """Test shutdown closes the shared HTTP connection pool."""
+        from src.core.app_lifecycle import ApplicationLifecycle
+        from src.utils.http_pool import http_pool
+
+        mock_app.dmarket_api = None
+        mock_app.database = None
+        mock_app.bot = None
+
+        lifecycle = ApplicationLifecycle(mock_app)
+
+        with (
+            patch("src.telegram_bot.health_check.health_check_server", None),
+            patch.object(http_pool, "aclose", new_callable=AsyncMock) as mock_aclose,
+        ):
+            await lifecycle.shutdown(timeout=5.0)
+
+        mock_aclose.assert_awaited_once()
+
 
 class TestTradeRecovery:
     """Tests for TradeRecovery class."""
@@ -19,6 +19,16 @@ def reset_circuit_breakers_fixture():
         reset_func()
     except ImportError:
         pass  # Circuit breaker module not available
+    try:
+        from src.utils.rate_limiter import reset_shared_rate_limiters
+
+        # Shared per-key rate limit budgets must not leak between tests either
+        reset_shared_rate_limiters()
+        from src.dmarket.request_scheduler import reset_request_schedulers
+
+        reset_request_schedulers()
+    except ImportError:
+        pass
     yield
     # Reset again after test completes
     if reset_func:
@@ -0,0 +1,46 @@
+"""Unit tests for src/dmarket/targets/overbid_controller.py module.
+
+Tests for executing an overbid against the request deadline.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.dmarket.models.target_enhancements import TargetOperationStatus
+from src.dmarket.request_scheduler import OVERBID_REQUEST_DEADLINE
+from src.dmarket.targets.overbid_controller import OverbidController
+
+
+class TestExecuteOverbid:
+    """Tests for OverbidController._execute_overbid."""
+
+    @pytest.mark.asyncio()
+    async def test_overbid_sends_delete_with_deadline(self):
+        """Test the old order is deleted under the overbid deadline."""
+        api = AsyncMock()
+        api.delete_targets = AsyncMock(return_value={})
+        api.create_targets = AsyncMock(
+            return_value={"Result": [{"Status": "Created", "TargetID": "new"}]}
+        )
+        controller = OverbidController(api)
+
+        result = await controller._execute_overbid("old", "csgo", "AK-47 | Redline", 10.0, 10.5)
+
+        assert result.success is True
+        assert api.delete_targets.await_args.kwargs["deadline"] == OVERBID_REQUEST_DEADLINE
+
+    @pytest.mark.asyncio()
+    async def test_expired_delete_keeps_old_order(self):
+        """Test no new order is created when the delete request expired."""
+        api = AsyncMock()
+        api.delete_targets = AsyncMock(
+            return_value={"error": True, "code": "REQUEST_EXPIRED", "message": "expired"}
+        )
+        controller = OverbidController(api)
+
+        result = await controller._execute_overbid("old", "csgo", "AK-47 | Redline", 10.0, 10.5)
+
+        assert result.success is False
+        assert result.status == TargetOperationStatus.FAILED
+        api.create_targets.assert_not_awaited()
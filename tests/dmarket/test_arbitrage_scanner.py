@@ -10,7 +10,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.dmarket.arbitrage_scanner import ARBITRAGE_LEVELS, GAME_IDS, ArbitrageScanner
+from src.dmarket.arbitrage_scanner import (
+    ANALYZE_CONCURRENCY,
+    ARBITRAGE_LEVELS,
+    GAME_IDS,
+    ArbitrageScanner,
+)
 from src.dmarket.dmarket_api import DMarketAPI
 
 
@@ -547,6 +552,164 @@ async def test_scan_level_filters_by_price_range(scanner):
     assert all(0.5 <= item["buy_price"] <= 3.0 for item in result)
 
 
+def _market_items(count: int) -> dict:
+    return {
+        "objects": [
+            {"itemId": f"item{i}", "title": f"Item {i}", "price": {"USD": "200"}}
+            for i in range(count)
+        ]
+    }
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_enriches_all_items_in_chunks(scanner):
+    """aggregated-prices запрашивается пачками по 100 для всех предметов."""
+    scanner.api_client.get_market_items = AsyncMock(return_value=_market_items(250))
+
+    async def aggregated(game, titles, limit):
+        return {
+            "aggregatedPrices": [
+                {"title": title, "offerCount": 10, "orderCount": 5} for title in titles
+            ]
+        }
+
+    scanner.api_client.get_aggregated_prices_bulk = AsyncMock(side_effect=aggregated)
+    seen = []
+
+    async def analyze(item, config, game, level):
+        seen.append(item)
+
+    scanner._analyze_item = analyze
+
+    await scanner.scan_level("boost", "csgo", max_results=100, use_cache=False)
+
+    chunk_sizes = [
+        len(call.kwargs["titles"])
+        for call in scanner.api_client.get_aggregated_prices_bulk.await_args_list
+    ]
+    assert sorted(chunk_sizes) == [50, 100, 100]
+    assert len(seen) == 250
+    assert all(item["_liquidity"]["is_liquid"] for item in seen)
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_failed_chunk_keeps_other_liquidity(scanner):
+    """Ошибка одной пачки не лишает данных остальные предметы."""
+    scanner.api_client.get_market_items = AsyncMock(return_value=_market_items(150))
+
+    async def aggregated(game, titles, limit):
+        if "Item 0" in titles:
+            raise RuntimeError("API error")
+        return {"aggregatedPrices": [{"title": title, "offerCount": "7"} for title in titles]}
+
+    scanner.api_client.get_aggregated_prices_bulk = AsyncMock(side_effect=aggregated)
+    seen = []
+
+    async def analyze(item, config, game, level):
+        seen.append(item)
+
+    scanner._analyze_item = analyze
+
+    await scanner.scan_level("boost", "csgo", max_results=100, use_cache=False)
+
+    assert [("_liquidity" in item) for item in seen] == [False] * 100 + [True] * 50
+    assert seen[100]["_liquidity"]["offer_count"] == 7
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_requests_liquidity_only_for_candidates(scanner):
+    """aggregated-prices запрашивается только для предметов, проходящих по прибыли."""
+    items = _market_items(150)
+    for item in items["objects"][1:]:
+        item["suggestedPrice"] = {"USD": "190"}  # Убыток
+    scanner.api_client.get_market_items = AsyncMock(return_value=items)
+    scanner.api_client.get_aggregated_prices_bulk = AsyncMock(return_value={"aggregatedPrices": []})
+
+    await scanner.scan_level("boost", "csgo", max_results=100, use_cache=False)
+
+    scanner.api_client.get_aggregated_prices_bulk.assert_awaited_once()
+    assert scanner.api_client.get_aggregated_prices_bulk.await_args.kwargs["titles"] == ["Item 0"]
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_skips_malformed_liquidity_rows(scanner):
+    """Строка aggregated-prices без названия не прерывает сканирование."""
+    scanner.api_client.get_market_items = AsyncMock(return_value=_market_items(2))
+    scanner.api_client.get_aggregated_prices_bulk = AsyncMock(
+        return_value={
+            "aggregatedPrices": [
+                {"offerCount": 10, "orderCount": 5},
+                {"title": "Item 1", "offerCount": 10, "orderCount": 5},
+            ]
+        }
+    )
+    seen = []
+
+    async def analyze(item, config, game, level):
+        seen.append(item)
+
+    scanner._analyze_item = analyze
+
+    await scanner.scan_level("boost", "csgo", max_results=100, use_cache=False)
+
+    assert [("_liquidity" in item) for item in seen] == [False, True]
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_analyzes_with_bounded_concurrency(scanner):
+    """Предметы анализируются параллельно, порядок результатов сохраняется."""
+    scanner.api_client.get_market_items = AsyncMock(return_value=_market_items(30))
+    active = 0
+    peak = 0
+    analyzed = 0
+
+    async def analyze(item, config, game, level):
+        nonlocal active, peak, analyzed
+        active += 1
+        analyzed += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"title": item["title"]}
+
+    scanner._analyze_item = analyze
+
+    result = await scanner.scan_level(
+        "boost", "csgo", max_results=5, use_cache=False, use_aggregated_api=False
+    )
+
+    assert [r["title"] for r in result] == [f"Item {i}" for i in range(5)]
+    assert 1 < peak <= ANALYZE_CONCURRENCY
+    # Stops once max_results is reached, the remaining items are cancelled
+    assert analyzed < 30
+
+
+@pytest.mark.asyncio()
+async def test_scan_level_slow_item_does_not_stall_others(scanner):
+    """Медленный предмет занимает один слот, остальные продолжают анализироваться."""
+    scanner.api_client.get_market_items = AsyncMock(return_value=_market_items(30))
+    release = asyncio.Event()
+    started = []
+
+    async def analyze(item, config, game, level):
+        started.append(item["title"])
+        if item["title"] == "Item 0":
+            await release.wait()
+        elif len(started) == 30:
+            release.set()
+        return {"title": item["title"]}
+
+    scanner._analyze_item = analyze
+
+    result = await scanner.scan_level(
+        "boost", "csgo", max_results=30, use_cache=False, use_aggregated_api=False
+    )
+
+    # Every item started while "Item 0" was still holding its slot
+    assert len(started) == 30
+    assert [r["title"] for r in result] == [f"Item {i}" for i in range(30)]
+
+
 # ============================================================================
 # Тесты scan_all_levels
 # ============================================================================
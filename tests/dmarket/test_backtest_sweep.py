@@ -0,0 +1,211 @@
+"""Tests for the parallel parameter-sweep runner."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.dmarket import backtest_sweep
+from src.dmarket.backtest_sweep import (
+    ParameterSweepRunner,
+    SweepJob,
+    SweepResult,
+    build_sweep_jobs,
+    format_ranking_table,
+    rank_results,
+)
+from src.dmarket.backtester import (
+    Backtester,
+    BacktestResults,
+    SimpleArbitrageStrategy,
+)
+
+
+GRID = {
+    "buy_threshold_percent": [1.0, 3.0],
+    "max_loss_percent": [2.0, 5.0],
+}
+
+
+def _make_backtester(num_items: int = 4, num_days: int = 4) -> Backtester:
+    """Create backtester with reproducible random walks."""
+    rng = np.random.default_rng(7)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    backtester = Backtester(initial_balance=100.0)
+    for i in range(num_items):
+        price = 5.0 + i * 2
+        prices = []
+        for hour in range(num_days * 24):
+            price = max(0.01, price * (1 + rng.normal(0, 0.04)))
+            prices.append({"timestamp": start + timedelta(hours=hour), "price": round(price, 2)})
+        backtester.load_data_from_list(f"item_{i}", f"Item {i}", "csgo", prices)
+    return backtester
+
+
+def _result(job_id: int, roi: float, drawdown: float = 0.0) -> SweepResult:
+    """Create a sweep result with the given metrics."""
+    now = datetime.now(UTC)
+    return SweepResult(
+        job=SweepJob(job_id=job_id, strategy=SimpleArbitrageStrategy()),
+        results=BacktestResults(
+            strategy_name="SimpleArbitrage(profit=10.0%)",
+            start_date=now,
+            end_date=now,
+            initial_balance=100.0,
+            final_balance=100.0 + roi,
+            total_roi=roi,
+            max_drawdown=drawdown,
+        ),
+    )
+
+
+class TestBuildSweepJobs:
+    """Tests for build_sweep_jobs."""
+
+    def test_builds_every_combination(self):
+        """One job per parameter combination, numbered in product order."""
+        jobs = build_sweep_jobs(SimpleArbitrageStrategy, GRID)
+
+        assert [job.job_id for job in jobs] == [0, 1, 2, 3]
+        assert jobs[1].params == {"buy_threshold_percent": 1.0, "max_loss_percent": 5.0}
+        assert jobs[1].strategy.max_loss_percent == 5.0
+        assert all(job.item_ids is None for job in jobs)
+
+    def test_item_subsets(self):
+        """Every combination is repeated per item subset."""
+        jobs = build_sweep_jobs(SimpleArbitrageStrategy, GRID, item_subsets=[None, ["a", "b"]])
+
+        assert len(jobs) == 8
+        assert jobs[4].item_ids == ("a", "b")
+
+
+class TestRanking:
+    """Tests for rank_results and format_ranking_table."""
+
+    def test_rank_by_roi(self):
+        """Higher ROI ranks first."""
+        ranked = rank_results([_result(0, 1.0), _result(1, 5.0), _result(2, -2.0)])
+
+        assert [r.job.job_id for r in ranked] == [1, 0, 2]
+        assert [r.rank for r in ranked] == [1, 2, 3]
+
+    def test_rank_by_drawdown(self):
+        """Lower drawdown ranks first."""
+        ranked = rank_results(
+            [_result(0, 1.0, drawdown=10.0), _result(1, 1.0, drawdown=3.0)],
+            rank_by="max_drawdown",
+        )
+
+        assert [r.job.job_id for r in ranked] == [1, 0]
+
+    def test_unknown_metric(self):
+        """Non-metric fields are rejected."""
+        with pytest.raises(ValueError, match="Unknown ranking metric"):
+            rank_results([_result(0, 1.0)], rank_by="trades")
+
+    def test_format_table(self):
+        """Table lists ranked rows up to the limit."""
+        ranked = rank_results([_result(0, 1.0), _result(1, 5.0), _result(2, -2.0)])
+
+        table = format_ranking_table(ranked, limit=2)
+
+        lines = table.splitlines()
+        assert len(lines) == 4
+        assert lines[2].startswith("| 1 |")
+        assert "5.0%" in lines[2]
+
+
+class TestWorker:
+    """Tests for the worker functions, run in-process."""
+
+    @pytest.mark.asyncio()
+    async def test_run_chunk_uses_memory_mapped_matrix(self, tmp_path, monkeypatch):
+        """Worker loads prices with mmap and matches Backtester results."""
+        backtester = _make_backtester()
+        runner = ParameterSweepRunner.from_backtester(backtester)
+        prices_path = str(tmp_path / "prices.npy")
+        np.save(prices_path, runner.matrix.prices)
+        monkeypatch.setattr(backtest_sweep, "_worker_state", None)
+
+        backtest_sweep._init_worker(
+            prices_path,
+            runner.matrix.item_ids,
+            runner.matrix.item_names,
+            runner.matrix.timestamps,
+            runner.initial_balance,
+            runner.fee_percent,
+        )
+        jobs = build_sweep_jobs(SimpleArbitrageStrategy, GRID, item_subsets=[["item_1"]])
+        results = backtest_sweep._run_chunk(jobs, max_positions=5, include_details=False)
+
+        assert isinstance(backtest_sweep._worker_state.matrix.prices, np.memmap)
+        assert [job_id for job_id, _ in results] == [0, 1, 2, 3]
+        assert all(not r.trades and not r.equity_curve for _, r in results)
+
+        single = Backtester(initial_balance=100.0)
+        single.data = {"item_1": backtester.data["item_1"]}
+        for job, (_, result) in zip(jobs, results, strict=True):
+            expected = await single.run(job.strategy)
+            assert result.total_trades == expected.total_trades
+            assert result.final_balance == pytest.approx(expected.final_balance, abs=1e-9)
+
+    def test_run_chunk_without_init(self, monkeypatch):
+        """Worker refuses to run before the initializer."""
+        monkeypatch.setattr(backtest_sweep, "_worker_state", None)
+
+        with pytest.raises(RuntimeError, match="not initialized"):
+            backtest_sweep._run_chunk(build_sweep_jobs(SimpleArbitrageStrategy, GRID), 5, False)
+
+
+class TestParameterSweepRunner:
+    """Tests for ParameterSweepRunner."""
+
+    def test_chunk_jobs_groups_by_subset(self):
+        """Chunks never mix item subsets and are split across workers."""
+        runner = ParameterSweepRunner(_make_backtester(num_items=2).data, max_workers=2)
+        jobs = build_sweep_jobs(SimpleArbitrageStrategy, GRID, item_subsets=[None, ["item_0"]])
+
+        chunks = runner._chunk_jobs(jobs)
+
+        assert len(chunks) == 4
+        for chunk in chunks:
+            assert len({job.item_ids for job in chunk}) == 1
+
+    @pytest.mark.asyncio()
+    async def test_run_empty(self):
+        """No jobs gives no results."""
+        runner = ParameterSweepRunner(_make_backtester(num_items=1).data)
+
+        assert await runner.run([]) == []
+
+    @pytest.mark.asyncio()
+    async def test_run_without_data(self):
+        """Running without data raises ValueError."""
+        runner = ParameterSweepRunner({})
+
+        with pytest.raises(ValueError, match="No historical data loaded"):
+            await runner.run(build_sweep_jobs(SimpleArbitrageStrategy, GRID))
+
+    @pytest.mark.asyncio()
+    async def test_run_across_processes(self):
+        """Sweep across worker processes matches sequential Backtester runs."""
+        backtester = _make_backtester()
+        runner = ParameterSweepRunner.from_backtester(backtester, max_workers=2)
+        jobs = build_sweep_jobs(SimpleArbitrageStrategy, GRID, item_subsets=[None, ["item_0"]])
+
+        ranked = await runner.run(jobs, include_details=True)
+
+        assert sorted(r.job.job_id for r in ranked) == list(range(len(jobs)))
+        rois = [r.results.total_roi for r in ranked]
+        assert rois == sorted(rois, reverse=True)
+
+        subset = Backtester(initial_balance=100.0)
+        subset.data = {"item_0": backtester.data["item_0"]}
+        for result in ranked:
+            source = backtester if result.job.item_ids is None else subset
+            expected = await source.run(result.job.strategy)
+            assert result.results.total_trades == expected.total_trades
+            assert result.results.final_balance == pytest.approx(expected.final_balance, abs=1e-9)
+            assert len(result.results.equity_curve) == len(expected.equity_curve)
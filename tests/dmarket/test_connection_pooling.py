@@ -146,6 +146,36 @@ async def test_get_connection_pool_stats_when_active(api_client):
     assert isinstance(stats["http2_enabled"], bool)
 
 
+@pytest.mark.asyncio()
+async def test_connection_pool_stats_include_shared_pool(api_client):
+    """Test stats expose shared pool usage, TLS handshakes and reuse ratio."""
+    await api_client._get_client()
+
+    stats = api_client.get_connection_pool_stats()
+
+    assert stats["tls_handshakes_per_minute"] >= 0
+    assert 0.0 <= stats["connection_reuse_ratio"] <= 1.0
+    assert "https://api.dmarket.com" in stats["shared_pool"]["hosts"]
+
+
+@pytest.mark.asyncio()
+async def test_closed_clients_share_pool_transport():
+    """Test separate API instances send requests through one shared pool."""
+    from src.utils.http_pool import http_pool
+
+    first = DMarketAPI(public_key="test", secret_key=b"test")
+    second = DMarketAPI(public_key="test", secret_key=b"test")
+
+    client1 = await first._get_client()
+    await first._close_client()
+    client2 = await second._get_client()
+
+    assert client1 is not client2
+    assert client1._transport is client2._transport is http_pool.transport
+
+    await second._close_client()
+
+
 @pytest.mark.asyncio()
 async def test_connection_pool_stats_structure(api_client):
     """Test connection pool stats have expected structure."""
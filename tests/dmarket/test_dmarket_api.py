@@ -16,6 +16,7 @@
 Цель: увеличить покрытие с 9.19% до 50%+
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -1243,6 +1244,221 @@ class TestRequestMethod:
             assert result == {"updated": True}
 
 
+class TestRequestCoalescing:
+    """Тесты объединения одинаковых одновременных GET-запросов (single-flight)."""
+
+    @staticmethod
+    def _slow_client(payload, delay=0.05):
+        """HTTP клиент, отвечающий с задержкой."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = payload
+        mock_response.status_code = 200
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return mock_response
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=slow_get)
+        return mock_client
+
+    @pytest.mark.asyncio()
+    async def test_identical_get_requests_share_one_call(self, dmarket_api):
+        """Тест что одинаковые GET-запросы выполняют один HTTP-вызов."""
+        # Arrange
+        mock_client = self._slow_client({"objects": []})
+
+        # Act
+        with patch.object(
+            dmarket_api, "_get_client", new_callable=AsyncMock, return_value=mock_client
+        ):
+            results = await asyncio.gather(
+                *[
+                    dmarket_api._request("GET", "/test/items", params={"gameId": "a8db"})
+                    for _ in range(5)
+                ]
+            )
+
+        # Assert
+        assert all(r == {"objects": []} for r in results)
+        assert mock_client.get.call_count == 1
+        stats = dmarket_api.get_coalescing_stats()
+        assert stats["coalesced_requests"] == 4
+        assert stats["inflight_requests"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_different_params_not_coalesced(self, dmarket_api):
+        """Тест что запросы с разными параметрами выполняются отдельно."""
+        # Arrange
+        mock_client = self._slow_client({"objects": []})
+
+        # Act
+        with patch.object(
+            dmarket_api, "_get_client", new_callable=AsyncMock, return_value=mock_client
+        ):
+            await asyncio.gather(
+                dmarket_api._request("GET", "/test/items", params={"gameId": "a8db"}),
+                dmarket_api._request("GET", "/test/items", params={"gameId": "9a92"}),
+            )
+
+        # Assert
+        assert mock_client.get.call_count == 2
+        assert dmarket_api.get_coalescing_stats()["coalesced_requests"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_post_requests_not_coalesced(self, dmarket_api):
+        """Тест что POST-запросы никогда не объединяются."""
+        # Arrange
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"created": True}
+        mock_response.status_code = 200
+
+        # Act
+        with patch.object(
+            dmarket_api, "_get_client", new_callable=AsyncMock
+        ) as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_get_client.return_value = mock_client
+
+            await asyncio.gather(
+                dmarket_api._request("POST", "/test/create", data={"name": "x"}),
+                dmarket_api._request("POST", "/test/create", data={"name": "x"}),
+            )
+
+        # Assert
+        assert mock_client.post.call_count == 2
+
+    @pytest.mark.asyncio()
+    async def test_cancelled_waiter_does_not_cancel_shared_request(self, dmarket_api):
+        """Тест что отмена одного ожидающего не отменяет общий запрос."""
+        # Arrange
+        mock_client = self._slow_client({"ok": True}, delay=0.1)
+
+        with patch.object(
+            dmarket_api, "_get_client", new_callable=AsyncMock, return_value=mock_client
+        ):
+            first = asyncio.create_task(dmarket_api._request("GET", "/test/items"))
+            second = asyncio.create_task(dmarket_api._request("GET", "/test/items"))
+            await asyncio.sleep(0.01)
+
+            # Act
+            first.cancel()
+            result = await second
+
+        # Assert
+        assert result == {"ok": True}
+        assert mock_client.get.call_count == 1
+
+
+class TestIterMarketItems:
+    """Тесты потоковой выдачи предметов маркета (iter_market_items)."""
+
+    @staticmethod
+    def _pages(count, page_size=3):
+        """Ответы API: count страниц с курсорами."""
+        responses = []
+        for page in range(count):
+            responses.append({
+                "objects": [{"itemId": f"{page}_{i}"} for i in range(page_size)],
+                "cursor": f"cursor_{page + 1}" if page < count - 1 else None,
+            })
+        return responses
+
+    @pytest.mark.asyncio()
+    async def test_yields_pages_in_order(self, dmarket_api):
+        """Тест выдачи страниц по мере получения."""
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(3)
+        ) as mock_request:
+            pages = [page async for page in dmarket_api.iter_market_items(max_items=None)]
+
+        assert [len(p) for p in pages] == [3, 3, 3]
+        assert pages[1][0]["itemId"] == "1_0"
+        assert mock_request.call_count == 3
+        assert mock_request.call_args_list[2].kwargs["params"]["cursor"] == "cursor_2"
+
+    @pytest.mark.asyncio()
+    async def test_respects_max_items(self, dmarket_api):
+        """Тест ограничения количества предметов."""
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(5)
+        ) as mock_request:
+            pages = [page async for page in dmarket_api.iter_market_items(max_items=4)]
+
+        assert sum(len(p) for p in pages) == 4
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio()
+    async def test_prefetch_is_bounded(self, dmarket_api):
+        """Тест что загрузка не уходит дальше буфера предзагрузки."""
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(10)
+        ) as mock_request:
+            stream = dmarket_api.iter_market_items(max_items=None, prefetch=1)
+            await anext(stream)
+            await asyncio.sleep(0.01)
+
+            # 1 выданная + 1 в буфере + 1 ожидающая места в очереди
+            assert mock_request.call_count <= 3
+
+            await stream.aclose()
+
+    @pytest.mark.asyncio()
+    async def test_checkpoint_allows_resume(self, dmarket_api):
+        """Тест сохранения и возобновления курсора через CursorPaginator."""
+        from src.dmarket.cursor_paginator import CursorPaginator
+
+        paginator = CursorPaginator()
+
+        # Прерываем скан на второй странице: первая обработана, вторая - нет
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(3)
+        ):
+            stream = dmarket_api.iter_market_items(max_items=None, checkpoint=paginator)
+            await anext(stream)
+            await anext(stream)
+            await stream.aclose()
+
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(3)[1:]
+        ) as mock_request:
+            pages = [
+                page
+                async for page in dmarket_api.iter_market_items(
+                    max_items=None, checkpoint=paginator, resume=True
+                )
+            ]
+
+        assert mock_request.call_args_list[0].kwargs["params"]["cursor"] == "cursor_1"
+        assert len(pages) == 2
+
+        # Завершённый проход очищает checkpoint
+        assert paginator.get_saved_cursor("csgo", {"orderBy": "price"}) is None
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(3)
+        ) as mock_request:
+            pages = [
+                page
+                async for page in dmarket_api.iter_market_items(
+                    max_items=None, checkpoint=paginator, resume=True
+                )
+            ]
+
+        assert "cursor" not in mock_request.call_args_list[0].kwargs["params"]
+        assert len(pages) == 3
+
+    @pytest.mark.asyncio()
+    async def test_get_all_market_items_uses_stream(self, dmarket_api):
+        """Тест что get_all_market_items собирает страницы из потока."""
+        with patch.object(
+            dmarket_api, "_request", new_callable=AsyncMock, side_effect=self._pages(2)
+        ):
+            items = await dmarket_api.get_all_market_items(max_items=100)
+
+        assert len(items) == 6
+
+
 class TestHighLevelAPIMethods:
     """Тесты для high-level API методов (финальный push к 50% coverage)."""
 
@@ -16,7 +16,7 @@ import time
 
 import pytest
 
-from src.dmarket.dmarket_api import DMarketAPI, api_cache
+from src.dmarket.dmarket_api import CACHE_TTL, DMarketAPI
 
 
 @pytest.fixture()
@@ -48,14 +48,6 @@ def dmarket_api_no_cache(api_keys):
     )
 
 
-@pytest.fixture(autouse=True)
-def clear_api_cache():
-    """Автоматически очищает api_cache перед каждым тестом."""
-    api_cache.clear()
-    yield
-    api_cache.clear()
-
-
 # ============================================================================
 # Тесты кэширования (_get_cache_key, _is_cacheable, _get_from_cache, _save_to_cache)
 # ============================================================================
@@ -183,89 +175,190 @@ class TestCaching:
         test_data = {"result": "old"}
 
         # Сохраняем с отрицательным TTL (мгновенное истечение)
-        expire_time = time.time() - 10  # истекло 10 секунд назад
-        api_cache[cache_key] = (test_data, expire_time)
+        dmarket_api_with_cache._cache.set(cache_key, test_data, ttl=-10)
 
         # Должен вернуть None, так как данные устарели
         cached_data = dmarket_api_with_cache._get_from_cache(cache_key)
 
         assert cached_data is None
-        # Note: Key removal happens via pop(), check implementation
+        assert len(dmarket_api_with_cache._cache) == 0
 
-    def test_save_to_cache_with_different_ttl(self, api_keys):
+    def test_save_to_cache_with_different_ttl(self, dmarket_api_with_cache):
         """Тест сохранения с разными TTL."""
-        # Create completely fresh instance to avoid any state pollution
-        from src.dmarket.dmarket_api import api_cache as fresh_cache
-        fresh_cache.clear()  # Ensure clean state
-        
-        api = DMarketAPI(
-            public_key=api_keys["public_key"],
-            secret_key=api_keys["secret_key"],
-            enable_cache=True,
-        )
-        
-        # Force enable cache in case something disabled it
-        assert api.enable_cache is True, f"Cache should be enabled but is {api.enable_cache}"
-        
+        cache = dmarket_api_with_cache._cache
+
         for ttl_type in ["short", "medium", "long"]:
             cache_key = f"test_ttl_{ttl_type}_key"
             test_data = {"type": ttl_type}
 
-            api._save_to_cache(cache_key, test_data, ttl_type)
+            dmarket_api_with_cache._save_to_cache(cache_key, test_data, ttl_type)
 
             # Проверяем что данные сохранены
-            assert cache_key in fresh_cache, f"Cache key {cache_key} not found in {fresh_cache}"
-            data, expire_time = fresh_cache[cache_key]
-            assert data == test_data
-            assert expire_time > time.time()
+            assert cache_key in cache
+            entry = cache._entries[cache_key]
+            assert entry.data == test_data
+            assert entry.expires_at > time.time()
+            assert entry.ttl == CACHE_TTL[ttl_type]
 
     def test_save_to_cache_disabled(self, dmarket_api_no_cache):
         """Тест что кэш не сохраняется если отключен."""
         cache_key = "test_key"
         test_data = {"result": "test"}
 
-        # Очищаем кэш перед тестом
-        api_cache.clear()
-
         dmarket_api_no_cache._save_to_cache(cache_key, test_data, "short")
 
         # Кэш должен быть пуст
-        assert cache_key not in api_cache
+        assert cache_key not in dmarket_api_no_cache._cache
 
     def test_get_from_cache_disabled(self, dmarket_api_no_cache):
         """Тест что данные не извлекаются если кэш отключен."""
         cache_key = "test_key"
-        api_cache[cache_key] = ({"data": "test"}, time.time() + 1000)
+        dmarket_api_no_cache._cache.set(cache_key, {"data": "test"}, ttl=1000)
 
         cached_data = dmarket_api_no_cache._get_from_cache(cache_key)
 
         assert cached_data is None
 
-    def test_cache_cleanup_on_overflow(self, api_keys):
-        """Тест автоматической очистки при переполнении кэша."""
-        from src.dmarket.dmarket_api import api_cache as fresh_cache
-        
-        # Create fresh instance
+    def test_cache_is_per_instance(self, api_keys, dmarket_api_with_cache):
+        """Тест что каждый клиент имеет собственный кэш."""
+        other_api = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            enable_cache=True,
+        )
+
+        dmarket_api_with_cache._save_to_cache("shared_key", {"data": 1}, "short")
+
+        assert other_api._get_from_cache("shared_key") is None
+
+    def test_cache_evicts_lru_on_entry_overflow(self, api_keys):
+        """Тест LRU-вытеснения при превышении лимита записей."""
         api = DMarketAPI(
             public_key=api_keys["public_key"],
             secret_key=api_keys["secret_key"],
             enable_cache=True,
+            cache_max_entries=3,
         )
-        
-        # Заполняем кэш до предела (>500)
-        fresh_cache.clear()
-        for i in range(510):
-            cache_key = f"key_{i}"
-            fresh_cache[cache_key] = ({"index": i}, time.time() + 1000)
 
-        initial_count = len(fresh_cache)
+        for i in range(3):
+            api._save_to_cache(f"key_{i}", {"index": i}, "short")
+
+        # key_0 становится самым свежим после чтения
+        assert api._get_from_cache("key_0") is not None
 
-        # Добавляем еще один элемент - должна сработать очистка
         api._save_to_cache("overflow_key", {"data": "test"}, "short")
 
-        # Проверяем что кэш уменьшился (удалено 100 записей)
-        # New size = 510 - 100 + 1 = 411
-        assert len(fresh_cache) <= initial_count - 99  # At least 100 entries removed
+        assert len(api._cache) == 3
+        assert "key_0" in api._cache
+        assert "key_1" not in api._cache
+        assert api.get_cache_stats()["evictions"] == 1
+
+    def test_cache_evicts_on_byte_budget(self, api_keys):
+        """Тест вытеснения при превышении бюджета памяти."""
+        api = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            enable_cache=True,
+            cache_max_bytes=250,
+        )
+
+        for i in range(5):
+            api._save_to_cache(f"key_{i}", {"index": i}, "short", size_bytes=100)
+
+        assert api._cache.total_bytes <= 250
+        assert len(api._cache) == 2
+        assert "key_4" in api._cache
+
+    def test_cache_purges_expired_on_save(self, dmarket_api_with_cache):
+        """Тест что устаревшие записи удаляются при сохранении новых."""
+        cache = dmarket_api_with_cache._cache
+        for i in range(10):
+            cache.set(f"old_{i}", {"index": i}, ttl=-1)
+
+        dmarket_api_with_cache._save_to_cache("fresh", {"data": 1}, "short")
+
+        assert len(cache) == 1
+        assert cache.get_stats()["expirations"] == 10
+
+    def test_cache_stats_hits_and_misses(self, dmarket_api_with_cache):
+        """Тест счетчиков попаданий и промахов."""
+        dmarket_api_with_cache._save_to_cache("key", {"data": 1}, "short")
+
+        dmarket_api_with_cache._get_from_cache("key")
+        dmarket_api_with_cache._get_from_cache("missing")
+
+        stats = dmarket_api_with_cache.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio()
+    async def test_redis_tier_promotes_to_memory(self, api_keys):
+        """Тест что данные из Redis-уровня переносятся в память."""
+        redis_store: dict = {}
+
+        class FakeRedisCache:
+            async def get(self, key):
+                return redis_store.get(key)
+
+            async def set(self, key, value, ttl=None):
+                redis_store[key] = value
+                return True
+
+        writer = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            redis_cache=FakeRedisCache(),
+        )
+        reader = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            redis_cache=FakeRedisCache(),
+        )
+
+        await writer._cache.aset("key", {"data": 1}, ttl=30, path="/exchange/v1/market/items")
+
+        assert reader._get_from_cache("key") is None
+        assert await reader._cache.aget("key") == {"data": 1}
+        assert reader._get_from_cache("key") == {"data": 1}
+        assert reader.get_cache_stats()["l2_hits"] == 1
+
+    @pytest.mark.asyncio()
+    async def test_redis_promotion_reuses_ttl_bucket(self, api_keys):
+        """Тест что записи из Redis попадают в корзину исходного TTL."""
+        redis_store: dict = {}
+
+        class FakeRedisCache:
+            async def get(self, key):
+                return redis_store.get(key)
+
+            async def set(self, key, value, ttl=None):
+                redis_store[key] = value
+                return True
+
+        writer = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            redis_cache=FakeRedisCache(),
+        )
+        reader = DMarketAPI(
+            public_key=api_keys["public_key"],
+            secret_key=api_keys["secret_key"],
+            redis_cache=FakeRedisCache(),
+        )
+
+        for i in range(5):
+            await writer._cache.aset(f"key_{i}", {"index": i}, ttl=30)
+            await reader._cache.aget(f"key_{i}")
+
+        # Старый формат без TTL - ближайший класс TTL
+        redis_store["dmarket_api:legacy"] = {"data": {"x": 1}, "expires_at": time.time() + 100}
+        await reader._cache.aget("legacy")
+
+        assert set(reader._cache._expiry_queues) == {30, CACHE_TTL["medium"]}
+        assert len(reader._cache._expiry_queues[30]) == 5
+        entry = reader._cache._entries["key_0"]
+        assert entry.expires_at == redis_store["dmarket_api:key_0"]["expires_at"]
 
     @pytest.mark.asyncio()
     async def test_clear_cache(self, dmarket_api_with_cache):
@@ -287,23 +380,21 @@ class TestCaching:
     @pytest.mark.asyncio()
     async def test_clear_cache_for_endpoint(self, dmarket_api_with_cache):
         """Тест очистки кэша для конкретного эндпоинта."""
-        # Добавляем данные для разных эндпоинтов напрямую в глобальный кэш
-        from src.dmarket.dmarket_api import api_cache as global_cache
-
-        global_cache["GET_/market/items_123"] = ({"data": 1}, time.time() + 1000)
-        global_cache["GET_/balance_456"] = ({"data": 2}, time.time() + 1000)
-        global_cache["GET_/market/offers_789"] = ({"data": 3}, time.time() + 1000)
+        api = dmarket_api_with_cache
+        api._save_to_cache("key_123", {"data": 1}, "short", path="/market/items")
+        api._save_to_cache("key_456", {"data": 2}, "short", path="/balance")
+        api._save_to_cache("key_789", {"data": 3}, "short", path="/market/offers")
 
-        assert len(global_cache) == 3
+        assert len(api._cache) == 3
 
         # Очищаем только /market/*
-        await dmarket_api_with_cache.clear_cache_for_endpoint("/market/")
+        await api.clear_cache_for_endpoint("/market/")
 
         # Проверяем что удалены только /market/* записи
-        assert "GET_/market/items_123" not in global_cache
-        assert "GET_/balance_456" in global_cache
-        assert "GET_/market/offers_789" not in global_cache
-        assert len(global_cache) == 1
+        assert "key_123" not in api._cache
+        assert "key_456" in api._cache
+        assert "key_789" not in api._cache
+        assert len(api._cache) == 1
 
 
 # ============================================================================
@@ -16,7 +16,7 @@ Phase 4: Расширенные тесты для dmarket_api.py (Часть 2/3
 import httpx
 import pytest
 
-from src.dmarket.dmarket_api import DMarketAPI, api_cache
+from src.dmarket.dmarket_api import DMarketAPI
 
 
 @pytest.fixture()
@@ -39,14 +39,6 @@ def dmarket_api(api_keys):
     )
 
 
-@pytest.fixture(autouse=True)
-def clear_api_cache():
-    """Автоматически очищает api_cache перед каждым тестом."""
-    api_cache.clear()
-    yield
-    api_cache.clear()
-
-
 # ============================================================================
 # Тесты context manager
 # ============================================================================
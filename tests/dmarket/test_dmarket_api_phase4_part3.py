@@ -15,7 +15,7 @@ from unittest.mock import patch
 
 import pytest
 
-from src.dmarket.dmarket_api import DMarketAPI, api_cache
+from src.dmarket.dmarket_api import DMarketAPI
 
 
 @pytest.fixture()
@@ -38,14 +38,6 @@ def dmarket_api(api_keys):
     )
 
 
-@pytest.fixture(autouse=True)
-def clear_api_cache():
-    """Автоматически очищает api_cache перед каждым тестом."""
-    api_cache.clear()
-    yield
-    api_cache.clear()
-
-
 # ============================================================================
 # Тесты get_balance()
 # ============================================================================
@@ -14,7 +14,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.dmarket.dmarket_api import DMarketAPI, api_cache
+from src.dmarket.dmarket_api import DMarketAPI
 
 
 @pytest.fixture()
@@ -47,14 +47,6 @@ def dmarket_api_dry_run(api_keys):
     )
 
 
-@pytest.fixture(autouse=True)
-def clear_api_cache():
-    """Автоматически очищает api_cache перед каждым тестом."""
-    api_cache.clear()
-    yield
-    api_cache.clear()
-
-
 # ============================================================================
 # Тесты buy_item()
 # ============================================================================
@@ -100,6 +100,33 @@ class TestMarketDataLogger:
 
         assert count >= 0
 
+    @pytest.mark.asyncio
+    async def test_log_market_data_feeds_ingestor(self, mock_api, tmp_path):
+        """Test logged items are also queued for the market_data table."""
+        from src.dmarket.market_data_logger import MarketDataLogger, MarketDataLoggerConfig
+
+        mock_api.get_market_items.return_value = {
+            "objects": [
+                {"itemId": "item-1", "title": "Test Item", "price": {"USD": "1000"}},
+            ]
+        }
+        ingestor = AsyncMock()
+
+        config = MarketDataLoggerConfig(output_path=str(tmp_path / "test.csv"))
+        with patch("src.dmarket.market_data_logger.logger"):
+            data_logger = MarketDataLogger(api=mock_api, config=config, ingestor=ingestor)
+            await data_logger.log_market_data()
+
+        ingestor.put_many.assert_awaited_once_with([
+            {
+                "item_id": "item-1",
+                "game": "a8db",
+                "item_name": "Test Item",
+                "price_usd": 10.0,
+                "data_source": "dmarket",
+            }
+        ])
+
     def test_config_games(self, logger):
         """Test games configuration."""
         assert logger.config.games is not None
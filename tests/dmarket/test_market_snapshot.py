@@ -0,0 +1,258 @@
+"""Тесты для общего снимка рынка."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.dmarket.market_snapshot import (
+    SNAPSHOT_BUDGET_SHARE,
+    MarketSnapshot,
+    MarketSnapshotService,
+    MarketSnapshotStore,
+    MarketTable,
+    fetch_market_items,
+    get_market_snapshot_service,
+    start_market_snapshots,
+    stop_market_snapshots,
+)
+from src.dmarket.request_scheduler import resolve_priority
+from src.utils.rate_limiter import AdaptiveRateLimiter, RequestPriority
+
+
+def _items(prices):
+    return [
+        {"title": title, "price": {"amount": amount}, "salesVolume": 10, "offersCount": 3}
+        for title, amount in prices.items()
+    ]
+
+
+def test_changed_since_reports_new_changed_and_removed_items():
+    """Изменившиеся и новые предметы отделяются от исчезнувших."""
+    old = MarketSnapshot.from_items("csgo", _items({"a": 100, "b": 200, "c": 300}))
+    new = MarketSnapshot.from_items("csgo", _items({"a": 100, "b": 250, "d": 400}))
+
+    changed, removed = new.changed_since(old.fingerprints)
+
+    assert sorted(changed) == ["b", "d"]
+    assert removed == ["c"]
+
+
+@pytest.mark.asyncio()
+async def test_store_fetches_once_for_concurrent_consumers():
+    """Одновременные потребители получают один и тот же снимок."""
+    api = MagicMock()
+
+    async def get_market_items(**kwargs):
+        await asyncio.sleep(0.01)
+        return {"objects": _items({"a": 100})}
+
+    api.get_market_items = AsyncMock(side_effect=get_market_items)
+    store = MarketSnapshotStore(api, ttl=60)
+
+    snapshots = await asyncio.gather(*(store.get() for _ in range(5)))
+
+    assert api.get_market_items.await_count == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert list(snapshots[0].items) == ["a"]
+
+
+@pytest.mark.asyncio()
+async def test_store_refetches_after_ttl_and_survives_errors():
+    """Устаревший снимок загружается заново; ошибка API возвращает None."""
+    api = MagicMock()
+    api.get_market_items = AsyncMock(return_value={"objects": _items({"a": 100})})
+    store = MarketSnapshotStore(api, ttl=0)
+
+    await store.get()
+    await store.get()
+    assert store.fetch_count == 2
+
+    api.get_market_items.side_effect = Exception("API Error")
+    assert await store.get() is None
+
+
+def _priced(prices):
+    return [
+        {"itemId": f"{title}-{i}", "title": title, "price": {"USD": str(cents)}}
+        for i, (title, cents) in enumerate(prices)
+    ]
+
+
+def _paged_api(pages):
+    """API, отдающий страницы по курсору."""
+    api = MagicMock()
+    api.public_key = "snapshot-test"
+    calls = []
+
+    async def get_market_items(**kwargs):
+        calls.append(kwargs)
+        index = int(kwargs.get("cursor") or 0)
+        cursor = str(index + 1) if index + 1 < len(pages) else ""
+        return {"objects": pages[index], "cursor": cursor}
+
+    api.get_market_items = AsyncMock(side_effect=get_market_items)
+    return api, calls
+
+
+@pytest.mark.asyncio()
+async def test_store_pages_market_up_to_limit():
+    """Снимок листает рынок по курсору, пока не наберет limit предметов."""
+    pages = [
+        _priced([(f"item{page}-{i}", 100 * page + i) for i in range(100)]) for page in range(4)
+    ]
+    api, calls = _paged_api(pages)
+    store = MarketSnapshotStore(api, limit=250)
+
+    snapshot = await store.get()
+
+    assert len(snapshot.items) == 250
+    assert [call["limit"] for call in calls] == [100, 100, 50]
+    assert [call["cursor"] for call in calls] == ["", "1", "2"]
+
+
+@pytest.mark.asyncio()
+async def test_store_uses_shared_market_table():
+    """Если общая таблица покрывает диапазон, снимок не обращается к API."""
+    api, calls = _paged_api([_priced([(f"item{i}", 100 + i) for i in range(300)])])
+    service = get_market_snapshot_service(api, "csgo", max_items=1000)
+    await service.refresh()
+    calls.clear()
+    store = MarketSnapshotStore(api, limit=250)
+
+    try:
+        snapshot = await store.get()
+    finally:
+        await stop_market_snapshots()
+
+    assert len(snapshot.items) == 250
+    assert calls == []
+
+
+def test_table_selects_price_range_and_title():
+    """Выборка по цене, названию, смещению и убыванию цены."""
+    table = MarketTable(
+        "csgo",
+        _priced([("AK-47 | Redline", 1500), ("AWP | Asiimov", 9000), ("AK-47 | Slate", 300)]),
+    )
+
+    assert [i["title"] for i in table.select(price_to=20.0)] == [
+        "AK-47 | Slate",
+        "AK-47 | Redline",
+    ]
+    assert [i["title"] for i in table.select(title="ak-47", offset=1)] == ["AK-47 | Redline"]
+    assert [i["title"] for i in table.select(sort="price_desc", limit=1)] == ["AWP | Asiimov"]
+    assert table.select(sort="popularity") is None
+    assert table.offers("AWP | Asiimov")[0]["itemId"] == "AWP | Asiimov-1"
+
+
+def test_truncated_table_answers_only_loaded_range():
+    """Неполная таблица отвечает, только если нужные предметы загружены."""
+    table = MarketTable("csgo", _priced([("a", 100), ("b", 200), ("c", 300)]), complete=False)
+
+    assert len(table.select(limit=2)) == 2
+    assert table.select(price_to=2.5) is not None
+    assert table.select(limit=5) is None
+    assert table.select(sort="price_desc") is None
+
+
+@pytest.mark.asyncio()
+async def test_service_pages_market_and_tracks_changes():
+    """Сервис листает рынок по курсору и перестраивает таблицу только при изменениях."""
+    api, calls = _paged_api([_priced([("a", 100), ("b", 200)]), _priced([("c", 300)])])
+    service = MarketSnapshotService(api, max_items=10)
+
+    table = await service.refresh()
+    assert len(table) == 3
+    assert len(calls) == 2
+    assert service.last_changed == {"a", "b", "c"}
+
+    assert await service.refresh() is table
+    assert service.last_changed == set()
+    assert service.get_stats()["api_calls"] == 4
+
+
+@pytest.mark.asyncio()
+async def test_fetch_market_items_served_from_shared_table():
+    """Сканеры получают предметы из таблицы без обращения к API."""
+    api, calls = _paged_api([_priced([("a", 100), ("b", 200), ("c", 300)])])
+    await get_market_snapshot_service(api, "csgo").refresh()
+    api_calls = len(calls)
+    try:
+        response = await fetch_market_items(api, game="a8db", limit=2, price_from=1.5)
+        assert [item["title"] for item in response["objects"]] == ["b", "c"]
+        assert len(calls) == api_calls
+
+        # Параметры, которые таблица не обслуживает, уходят в API
+        await fetch_market_items(api, game="csgo", limit=2, tree_filters="{}")
+        assert len(calls) == api_calls + 1
+    finally:
+        await stop_market_snapshots()
+
+    await fetch_market_items(api, game="csgo", limit=2)
+    assert len(calls) == api_calls + 2
+
+
+def test_service_refresh_fits_market_budget():
+    """Период обновления и число страниц выводятся из лимита "market"."""
+    api = MagicMock()
+    api.advanced_rate_limiter = AdaptiveRateLimiter()
+    pages_per_minute = api.advanced_rate_limiter.get_rate("market") * SNAPSHOT_BUDGET_SHARE
+
+    derived = MarketSnapshotService(api, max_items=2000)
+    assert 20 * 60 / derived.refresh_interval <= pages_per_minute
+
+    fixed = MarketSnapshotService(api, max_items=2000, refresh_interval=60.0)
+    assert fixed.max_items // 100 <= pages_per_minute
+
+
+@pytest.mark.asyncio()
+async def test_service_pages_in_background_class_and_forgets_removed_items():
+    """Страницы запрашиваются классом BACKGROUND; исчезнувшие предметы не отслеживаются."""
+    pages = [_priced([("a", 100), ("b", 200)])]
+    api, _ = _paged_api(pages)
+    priorities = []
+    get_page = api.get_market_items.side_effect
+
+    async def get_market_items(**kwargs):
+        priorities.append(resolve_priority("/exchange/v1/market/items"))
+        return await get_page(**kwargs)
+
+    api.get_market_items.side_effect = get_market_items
+    service = MarketSnapshotService(api, max_items=10)
+
+    await service.refresh()
+    pages[0] = pages[0][1:]
+    await service.refresh()
+
+    assert priorities == [RequestPriority.BACKGROUND] * 2
+    assert service.delta_tracker.get_snapshot("a-0") is None
+    assert service.delta_tracker.get_snapshot("b-1") is not None
+
+
+@pytest.mark.asyncio()
+async def test_start_does_not_wait_for_first_refresh():
+    """Запуск не ждет загрузки; до нее сканеры листают API."""
+    api, calls = _paged_api([_priced([("a", 100)])])
+    loaded = asyncio.Event()
+    get_page = api.get_market_items.side_effect
+
+    async def get_market_items(**kwargs):
+        if kwargs.get("sort") == "price" and "cursor" in kwargs:
+            await loaded.wait()
+        return await get_page(**kwargs)
+
+    api.get_market_items.side_effect = get_market_items
+    try:
+        (service,) = await asyncio.wait_for(start_market_snapshots(api, ["csgo"]), timeout=1.0)
+        assert service.table is None
+
+        await fetch_market_items(api, game="csgo", limit=1)
+        assert calls[-1]["limit"] == 1
+
+        loaded.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert service.table is not None
+    finally:
+        await stop_market_snapshots()
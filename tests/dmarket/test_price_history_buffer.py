@@ -0,0 +1,123 @@
+"""Тесты для кольцевого буфера истории цен."""
+
+import numpy as np
+import pytest
+
+from src.dmarket.price_history_buffer import (
+    DEFAULT_MEMORY_BUDGET,
+    MEMORY_BUDGET_ENV,
+    PriceHistoryBuffer,
+    memory_budget_from_env,
+)
+
+
+def test_keeps_last_capacity_points():
+    """В буфере остаются только последние capacity точек."""
+    buffer = PriceHistoryBuffer(capacity=5)
+
+    for i in range(23):
+        buffer.append("item", float(i), float(i) * 2)
+
+    assert buffer["item"] == [(float(i), float(i) * 2) for i in range(18, 23)]
+
+
+def test_window_by_time_is_view():
+    """Окно по времени - представление без копирования, только для чтения."""
+    buffer = PriceHistoryBuffer(capacity=10)
+    for i in range(10):
+        buffer.append("item", 100.0 + i, float(i))
+
+    timestamps, prices = buffer.window("item", start_time=103, end_time=106.5)
+
+    assert timestamps.tolist() == [103.0, 104.0, 105.0, 106.0]
+    assert prices.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert np.shares_memory(prices, buffer.window("item")[1])
+    with pytest.raises(ValueError, match="read-only"):
+        prices[0] = 0.0
+
+
+def test_points_limit_and_missing_item():
+    """limit возвращает последние точки; нет истории - пустой список."""
+    buffer = PriceHistoryBuffer(capacity=10)
+    for i in range(6):
+        buffer.append("item", float(i), float(i))
+
+    assert buffer.points("item", limit=2) == [(4.0, 4.0), (5.0, 5.0)]
+    assert buffer.points("missing") == []
+    assert buffer.window("missing")[0].size == 0
+    assert "missing" not in buffer
+
+
+def test_memory_budget_evicts_least_recently_updated():
+    """При исчерпании лимита памяти вытесняется давно не обновлявшийся предмет."""
+    capacity = 8
+    row_bytes = (capacity + capacity // 4) * 16
+    buffer = PriceHistoryBuffer(capacity=capacity, memory_budget=3 * row_bytes)
+
+    for item_id in ("a", "b", "c"):
+        buffer.append(item_id, 1.0, 1.0)
+    buffer.append("a", 2.0, 2.0)
+    buffer.append("d", 1.0, 1.0)
+
+    assert len(buffer) == 3
+    assert "b" not in buffer
+    assert buffer["a"] == [(1.0, 1.0), (2.0, 2.0)]
+    assert buffer.memory_bytes <= buffer.memory_budget
+    assert buffer.get_stats()["evicted"] == 1
+
+
+def test_remove_reuses_slot():
+    """Освобожденный слот используется для нового предмета."""
+    buffer = PriceHistoryBuffer(capacity=4, memory_budget=2 * 5 * 16)
+    buffer.append("a", 1.0, 1.0)
+    buffer.append("b", 1.0, 1.0)
+
+    buffer.remove("a")
+    buffer.append("c", 2.0, 3.0)
+
+    assert buffer["c"] == [(2.0, 3.0)]
+    assert buffer["b"] == [(1.0, 1.0)]
+    assert buffer.evicted == 0
+
+
+def test_capacity_change_keeps_latest_points():
+    """Изменение емкости сохраняет последние точки."""
+    buffer = PriceHistoryBuffer(capacity=10)
+    for i in range(10):
+        buffer.append("item", float(i), float(i))
+
+    buffer.capacity = 3
+
+    assert buffer["item"] == [(7.0, 7.0), (8.0, 8.0), (9.0, 9.0)]
+
+
+def test_memory_is_predictable_for_many_items():
+    """20 тыс. предметов по 100 точек занимают фиксированный объем массивов."""
+    buffer = PriceHistoryBuffer(capacity=100, memory_budget=64 * 1024 * 1024)
+
+    for i in range(20_000):
+        buffer.append(f"item_{i}", 1.0, 1.0)
+
+    assert len(buffer) == 20_000
+    # 125 точек на строку (с запасом), строки выделяются блоками по 256
+    assert buffer.memory_bytes <= (20_000 + 255) * 125 * 16
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (
+        (None, DEFAULT_MEMORY_BUDGET),
+        ("4", 4 * 1024 * 1024),
+        ("0.5", 512 * 1024),
+        ("0", DEFAULT_MEMORY_BUDGET),
+        ("много", DEFAULT_MEMORY_BUDGET),
+    ),
+)
+def test_memory_budget_from_env(monkeypatch, value, expected):
+    """Лимит памяти задается через PRICE_HISTORY_MEMORY_MB."""
+    if value is None:
+        monkeypatch.delenv(MEMORY_BUDGET_ENV, raising=False)
+    else:
+        monkeypatch.setenv(MEMORY_BUDGET_ENV, value)
+
+    assert memory_budget_from_env() == expected
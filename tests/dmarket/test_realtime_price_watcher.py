@@ -216,6 +216,18 @@ def test_watcher_initialization(price_watcher, mock_api_client):
     assert price_watcher.price_update_interval == 300
 
 
+def test_history_memory_budget_from_env(monkeypatch, mock_api_client):
+    """Тест лимита памяти истории цен из окружения и из аргумента."""
+    monkeypatch.setenv("PRICE_HISTORY_MEMORY_MB", "2")
+
+    with patch("src.dmarket.realtime_price_watcher.DMarketWebSocketClient"):
+        from_env = RealtimePriceWatcher(mock_api_client)
+        explicit = RealtimePriceWatcher(mock_api_client, history_memory_budget=1024 * 1024)
+
+    assert from_env.price_history.memory_budget == 2 * 1024 * 1024
+    assert explicit.price_history.memory_budget == 1024 * 1024
+
+
 # ==================== Тесты RealtimePriceWatcher - Start/Stop ====================
 
 
@@ -762,6 +774,93 @@ async def test_check_alerts_already_triggered(price_watcher):
     alert_handler.assert_not_called()
 
 
+@pytest.mark.asyncio()
+async def test_check_alerts_only_crossed_thresholds(price_watcher):
+    """Тест проверки оповещений - срабатывают только пересеченные пороги."""
+    alerts = [
+        PriceAlert("item_123", "Test Item", price, condition)
+        for price, condition in [(8.0, "below"), (10.0, "below"), (12.0, "above"), (9.5, "above")]
+    ]
+    alert_handler = AsyncMock()
+    price_watcher.add_price_alerts(alerts)
+    price_watcher.register_alert_handler(alert_handler)
+
+    await price_watcher._check_alerts("item_123", 10.0)
+
+    assert [a.is_triggered for a in alerts] == [False, True, False, True]
+    assert alert_handler.await_count == 2
+
+
+@pytest.mark.asyncio()
+async def test_reset_triggered_alerts_rearms_alert(price_watcher):
+    """Тест сброса - сброшенное оповещение срабатывает снова."""
+    alert = PriceAlert("item_123", "Test Item", 10.0, "below")
+    alert_handler = AsyncMock()
+    price_watcher.add_price_alert(alert)
+    price_watcher.register_alert_handler(alert_handler)
+
+    await price_watcher._check_alerts("item_123", 9.0)
+    price_watcher.reset_triggered_alerts()
+    await price_watcher._check_alerts("item_123", 9.0)
+
+    assert alert_handler.await_count == 2
+
+
+@pytest.mark.asyncio()
+async def test_removed_alert_not_triggered(price_watcher):
+    """Тест удаления - удаленное оповещение не срабатывает."""
+    alert = PriceAlert("item_123", "Test Item", 10.0, "below")
+    alert_handler = AsyncMock()
+    price_watcher.add_price_alert(alert)
+    price_watcher.register_alert_handler(alert_handler)
+
+    price_watcher.remove_price_alert(alert)
+    await price_watcher._check_alerts("item_123", 9.0)
+
+    alert_handler.assert_not_called()
+
+
+@pytest.mark.asyncio()
+async def test_load_price_alerts_from_database(price_watcher):
+    """Тест массовой загрузки оповещений из базы данных."""
+
+    async def iter_active_price_alerts(batch_size):
+        yield [
+            {
+                "item_id": "item_1",
+                "market_hash_name": "Item 1",
+                "game": "csgo",
+                "target_price": 5.0,
+                "condition": "below",
+            },
+            {
+                "item_id": None,
+                "market_hash_name": "Item 2",
+                "game": None,
+                "target_price": 7.5,
+                "condition": "above",
+            },
+        ]
+        yield [
+            {
+                "item_id": None,
+                "market_hash_name": None,
+                "game": None,
+                "target_price": 1.0,
+                "condition": "below",
+            }
+        ]
+
+    database = MagicMock()
+    database.iter_active_price_alerts = iter_active_price_alerts
+
+    loaded = await price_watcher.load_price_alerts(database, batch_size=2)
+
+    assert loaded == 2
+    assert price_watcher.watched_items == {"item_1", "Item 2"}
+    assert price_watcher.price_alerts["Item 2"][0].condition == "above"
+
+
 # ==================== Тесты RealtimePriceWatcher - Handle Messages ====================
 
 
@@ -0,0 +1,380 @@
+"""Tests for the priority request scheduler in front of DMarketAPI._request."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.dmarket.dmarket_api import DMarketAPI
+from src.dmarket.request_scheduler import (
+    TRADE_REQUEST_DEADLINE,
+    RequestExpiredError,
+    RequestScheduler,
+    get_request_scheduler,
+    request_priority,
+    reset_request_schedulers,
+    resolve_priority,
+)
+from src.utils.rate_limiter import AdaptiveRateLimiter, RequestPriority
+
+
+class TestResolvePriority:
+    """Tests for resolve_priority."""
+
+    def test_category_default(self):
+        assert resolve_priority("/exchange/v1/offers-buy") == RequestPriority.TRADE
+        assert resolve_priority("/exchange/v1/market/items") == RequestPriority.SCAN
+
+    def test_context_and_explicit_priority(self):
+        with request_priority(RequestPriority.BACKGROUND):
+            assert resolve_priority("/exchange/v1/market/items") == RequestPriority.BACKGROUND
+            assert (
+                resolve_priority("/exchange/v1/market/items", RequestPriority.INTERACTIVE)
+                == RequestPriority.INTERACTIVE
+            )
+        assert resolve_priority("/exchange/v1/market/items") == RequestPriority.SCAN
+
+
+class TestRequestScheduler:
+    """Tests for RequestScheduler."""
+
+    @pytest.mark.asyncio()
+    async def test_trade_served_before_queued_scans(self):
+        """A freed slot goes to the trade request, scans keep FIFO order."""
+        scheduler = RequestScheduler(max_concurrency=1)
+        order = []
+        release = asyncio.Event()
+
+        async def request(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                if name == "first":
+                    await release.wait()
+
+        first = asyncio.create_task(request("first", RequestPriority.SCAN))
+        await asyncio.sleep(0)
+        scans = [
+            asyncio.create_task(request(f"scan{i}", RequestPriority.SCAN)) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        trade = asyncio.create_task(request("trade", RequestPriority.TRADE))
+        await asyncio.sleep(0)
+
+        assert scheduler.queued == 4
+        release.set()
+        await asyncio.gather(first, *scans, trade)
+
+        assert order == ["first", "trade", "scan0", "scan1", "scan2"]
+        stats = scheduler.get_stats()
+        assert stats["active"] == 0
+        assert stats["classes"]["trade"]["granted"] == 1
+        assert stats["classes"]["scan"]["granted"] == 4
+
+    @pytest.mark.asyncio()
+    async def test_stale_request_expires_without_slot(self):
+        """A queued request past its deadline is dropped, not sent."""
+        scheduler = RequestScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot(RequestPriority.TRADE):
+                await release.wait()
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+
+        with pytest.raises(RequestExpiredError) as exc_info:
+            async with scheduler.slot(RequestPriority.SCAN, timeout=0.05):
+                pytest.fail("stale request must not get a slot")
+
+        assert exc_info.value.priority == RequestPriority.SCAN
+        assert exc_info.value.waited >= 0.04
+        release.set()
+        await task
+
+        scan = scheduler.get_stats()["classes"]["scan"]
+        assert scan["expired"] == 1
+        assert scan["queued"] == 0
+        assert scheduler.queued == 0
+
+    @pytest.mark.asyncio()
+    async def test_wait_for_counts_into_deadline(self):
+        """Waiting for the rate limiter is bounded by the same deadline."""
+        scheduler = RequestScheduler()
+
+        with pytest.raises(RequestExpiredError):
+            async with scheduler.slot(timeout=0.05, wait_for=lambda ticket: asyncio.sleep(1)):
+                pass
+
+        assert scheduler.get_stats()["classes"]["scan"]["expired"] == 1
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio()
+    async def test_wait_for_starts_after_slot_is_granted(self):
+        """The rate limiter token is taken only once the request holds a slot."""
+        scheduler = RequestScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        limiter_calls = []
+
+        async def holder():
+            async with scheduler.slot(RequestPriority.TRADE):
+                await release.wait()
+
+        async def limiter(ticket):
+            limiter_calls.append(scheduler.active)
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(_use_slot(scheduler, wait_for=limiter))
+        await asyncio.sleep(0)
+
+        assert limiter_calls == []
+        release.set()
+        await asyncio.gather(task, waiting)
+        assert limiter_calls == [1]
+
+    @pytest.mark.asyncio()
+    async def test_promoted_ticket_jumps_the_queue(self):
+        """A queued request promoted to trade is served before earlier scans."""
+        scheduler = RequestScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        order = []
+
+        async def holder():
+            async with scheduler.slot(RequestPriority.SCAN):
+                await release.wait()
+
+        async def request(name, ticket):
+            async with scheduler.slot(ticket=ticket):
+                order.append(name)
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        scan = asyncio.create_task(request("scan", scheduler.new_ticket(RequestPriority.SCAN)))
+        late = scheduler.new_ticket(RequestPriority.BACKGROUND)
+        promoted = asyncio.create_task(request("promoted", late))
+        await asyncio.sleep(0)
+
+        scheduler.promote(late, RequestPriority.TRADE)
+        scheduler.promote(late, RequestPriority.SCAN)  # Lowering is ignored
+        assert late.priority == RequestPriority.TRADE
+        assert scheduler.get_stats()["classes"]["trade"]["queued"] == 1
+        assert scheduler.get_stats()["classes"]["background"]["queued"] == 0
+
+        release.set()
+        await asyncio.gather(task, scan, promoted)
+
+        assert order == ["promoted", "scan"]
+        assert scheduler.queued == 0
+        assert scheduler.get_stats()["classes"]["trade"]["granted"] == 1
+
+    @pytest.mark.asyncio()
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = RequestScheduler(max_concurrency=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot():
+                await release.wait()
+
+        async def waiter():
+            async with scheduler.slot(RequestPriority.TARGETS):
+                pass
+
+        task = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        release.set()
+        await task
+        stats = scheduler.get_stats()
+        assert stats["classes"]["targets"]["cancelled"] == 1
+        assert stats["queued"] == 0
+        assert stats["active"] == 0
+        async with scheduler.slot():
+            assert scheduler.active == 1
+
+    @pytest.mark.asyncio()
+    async def test_wait_time_percentiles(self):
+        scheduler = RequestScheduler()
+        for _ in range(5):
+            async with scheduler.slot(RequestPriority.INTERACTIVE):
+                pass
+
+        interactive = scheduler.get_stats()["classes"]["interactive"]
+        assert interactive["granted"] == 5
+        assert 0.0 <= interactive["p50_wait"] <= interactive["p95_wait"] <= interactive["max_wait"]
+
+        scheduler.reset_stats()
+        assert scheduler.get_stats()["classes"]["interactive"]["granted"] == 0
+
+    def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            RequestScheduler(max_concurrency=0)
+
+    def test_shared_scheduler_per_api_key(self):
+        reset_request_schedulers()
+
+        first = get_request_scheduler("key-a")
+        assert get_request_scheduler("key-a") is first
+        assert get_request_scheduler("key-b") is not first
+
+
+async def _use_slot(scheduler, **kwargs):
+    async with scheduler.slot(**kwargs):
+        pass
+
+
+def _response(status_code: int = 200, **kwargs) -> httpx.Response:
+    return httpx.Response(
+        status_code, request=httpx.Request("GET", "https://api.dmarket.com"), **kwargs
+    )
+
+
+class TestDMarketAPIScheduling:
+    """Tests for the scheduler in DMarketAPI._request."""
+
+    @pytest.mark.asyncio()
+    async def test_expired_request_returns_error(self):
+        """A request that cannot be sent before its deadline is not sent."""
+        api = DMarketAPI("public", "a" * 64, request_scheduler=RequestScheduler(max_concurrency=1))
+        send = AsyncMock(return_value=_response(json={"ok": True}))
+
+        with patch.object(api, "_execute_single_http_request", send):
+            async with api.request_scheduler.slot(RequestPriority.TRADE):
+                result = await api._request(
+                    "POST", "/exchange/v1/offers-buy", data={"offers": []}, deadline=0.01
+                )
+
+        assert result["code"] == "REQUEST_EXPIRED"
+        send.assert_not_awaited()
+        assert api.get_scheduler_stats()["classes"]["trade"]["expired"] == 1
+
+    @pytest.mark.asyncio()
+    async def test_request_priority_from_context(self):
+        api = DMarketAPI("public", "a" * 64, enable_cache=False)
+        send = AsyncMock(return_value=_response(json={"objects": []}))
+
+        with (
+            patch.object(api, "_execute_single_http_request", send),
+            request_priority(RequestPriority.BACKGROUND),
+        ):
+            await api._request("GET", "/exchange/v1/market/items", params={"gameId": "a8db"})
+
+        classes = api.get_scheduler_stats()["classes"]
+        assert classes["background"]["granted"] == 1
+        assert classes["scan"]["granted"] == 0
+        send.assert_awaited_once()
+        await api._close_client()
+
+    @pytest.mark.asyncio()
+    async def test_coalesced_get_takes_highest_priority(self):
+        """A trade-path waiter joining a background GET lifts the shared request."""
+        api = DMarketAPI(
+            "public",
+            "a" * 64,
+            enable_cache=False,
+            request_scheduler=RequestScheduler(max_concurrency=1),
+        )
+        send = AsyncMock(return_value=_response(json={"objects": []}))
+        params = {"gameId": "a8db"}
+
+        with patch.object(api, "_execute_single_http_request", send):
+            async with api.request_scheduler.slot(RequestPriority.TRADE):
+                with request_priority(RequestPriority.BACKGROUND):
+                    background = asyncio.create_task(
+                        api._request("GET", "/exchange/v1/market/items", params=params)
+                    )
+                await asyncio.sleep(0)
+                trade = asyncio.create_task(
+                    api._request(
+                        "GET",
+                        "/exchange/v1/market/items",
+                        params=params,
+                        priority=RequestPriority.TRADE,
+                    )
+                )
+                await asyncio.sleep(0)
+            await asyncio.gather(background, trade)
+
+        classes = api.get_scheduler_stats()["classes"]
+        assert classes["trade"]["granted"] == 2
+        assert classes["background"]["granted"] == 0
+        send.assert_awaited_once()
+        await api._close_client()
+
+    @pytest.mark.asyncio()
+    async def test_retrying_scan_does_not_block_trade(self):
+        """A scan backing off after 429 frees its slot for a trade request."""
+        api = DMarketAPI(
+            "public",
+            "a" * 64,
+            enable_cache=False,
+            request_scheduler=RequestScheduler(max_concurrency=1),
+            rate_limiter=AdaptiveRateLimiter(limits={"market": 600, "trade": 600}),
+        )
+        sent: list[str] = []
+        rate_limited = asyncio.Event()
+
+        async def send(method: str, **kwargs) -> httpx.Response:
+            sent.append(method)
+            if sent == ["GET"]:
+                rate_limited.set()
+                return _response(429)
+            return _response(json={"ok": True})
+
+        with (
+            patch.object(api, "_execute_single_http_request", side_effect=send),
+            patch.object(api, "_calculate_retry_delay", return_value=0.2),
+        ):
+            scan = asyncio.create_task(
+                api._request("GET", "/exchange/v1/market/items", params={"gameId": "a8db"})
+            )
+            await rate_limited.wait()
+
+            trade = await api._request(
+                "POST", "/exchange/v1/offers-buy", data={"offers": []}, deadline=0.1
+            )
+
+            assert trade == {"ok": True}
+            assert sent == ["GET", "POST"]
+            assert await scan == {"ok": True}
+
+        assert sent == ["GET", "POST", "GET"]
+        classes = api.get_scheduler_stats()["classes"]
+        assert classes["trade"]["expired"] == 0
+        assert classes["scan"]["granted"] == 2
+        await api._close_client()
+
+    @pytest.mark.asyncio()
+    async def test_retry_keeps_request_deadline(self):
+        """A retry that cannot be sent before the original deadline is dropped."""
+        api = DMarketAPI("public", "a" * 64, enable_cache=False)
+        send = AsyncMock(return_value=_response(429))
+
+        with (
+            patch.object(api, "_execute_single_http_request", send),
+            patch.object(api, "_calculate_retry_delay", return_value=0.1),
+        ):
+            result = await api._request(
+                "POST", "/exchange/v1/offers-buy", data={"offers": []}, deadline=0.05
+            )
+
+        assert result["code"] == "REQUEST_EXPIRED"
+        send.assert_awaited_once()
+        await api._close_client()
+
+    @pytest.mark.asyncio()
+    async def test_buy_offers_carries_trade_deadline(self):
+        api = DMarketAPI("public", "a" * 64)
+
+        with patch.object(api, "_request", AsyncMock(return_value={})) as request:
+            await api.buy_offers([{"offerId": "1"}])
+
+        assert request.await_args.kwargs["deadline"] == TRADE_REQUEST_DEADLINE
+        await api._close_client()
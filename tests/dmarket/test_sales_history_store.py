@@ -0,0 +1,132 @@
+"""Tests for the SQLite sales history store."""
+
+import json
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.dmarket import sales_history
+from src.dmarket.sales_history_store import SalesHistoryStore
+
+
+def _sales(item_name: str, timestamps: list[int], price: float = 1.0) -> list[dict]:
+    return [
+        {"price": price + i, "timestamp": ts, "market_hash_name": item_name}
+        for i, ts in enumerate(sorted(timestamps, reverse=True))
+    ]
+
+
+@pytest.fixture()
+def store(tmp_path):
+    """Create store in a temporary directory."""
+    store = SalesHistoryStore(tmp_path / "sales.db")
+    yield store
+    store.close()
+
+
+class TestSalesHistoryStore:
+    """Tests for SalesHistoryStore."""
+
+    def test_load_returns_newest_first(self, store):
+        """Stored sales are returned newest first."""
+        store.append("AK-47", "csgo", "24h", _sales("AK-47", [100, 300, 200]))
+
+        loaded = store.load("AK-47", "csgo", "24h")
+
+        assert [sale["timestamp"] for sale in loaded] == [300, 200, 100]
+        assert loaded[0] == {"price": 1.0, "timestamp": 300, "market_hash_name": "AK-47"}
+
+    def test_append_only_adds_new_sales(self, store):
+        """Only newer sales are appended and the window slides."""
+        store.append("AK-47", "csgo", "24h", _sales("AK-47", [100, 200, 300]))
+
+        added = store.append("AK-47", "csgo", "24h", _sales("AK-47", [200, 300, 400, 500]))
+
+        assert added == 2
+        loaded = store.load("AK-47", "csgo", "24h")
+        assert [sale["timestamp"] for sale in loaded] == [500, 400, 300, 200]
+
+    def test_series_are_separate(self, store):
+        """Game and period are part of the key."""
+        store.append("AK-47", "csgo", "24h", _sales("AK-47", [1]))
+        store.append("AK-47", "csgo", "7d", _sales("AK-47", [1, 2]))
+
+        assert len(store.load("AK-47", "csgo", "24h")) == 1
+        assert len(store.load("AK-47", "csgo", "7d")) == 2
+        assert store.load("AK-47", "dota2", "24h") == []
+
+    def test_expired_series_not_loaded(self, store):
+        """Series older than max_age are treated as missing."""
+        store.append("AK-47", "csgo", "24h", _sales("AK-47", [1]), updated_at=time.time() - 120)
+
+        assert store.load("AK-47", "csgo", "24h", max_age=60) == []
+        assert len(store.load("AK-47", "csgo", "24h", max_age=600)) == 1
+
+    def test_load_many(self, store):
+        """Many items are read in one call, missing items are omitted."""
+        names = [f"Item {i}" for i in range(1000)]
+        for name in names[::2]:
+            store.append(name, "csgo", "24h", _sales(name, [1, 2]))
+
+        loaded = store.load_many(names, "csgo", "24h")
+
+        assert set(loaded) == set(names[::2])
+        assert all(len(sales) == 2 for sales in loaded.values())
+
+    def test_migrates_json_cache(self, tmp_path):
+        """Legacy JSON cache files are imported and removed."""
+        cache_dir = tmp_path / "sales_history"
+        cache_dir.mkdir()
+        fresh = cache_dir / "csgo_AK_47___Redline_24h.json"
+        fresh.write_text(json.dumps(_sales("AK-47 | Redline", [10, 20])), encoding="utf-8")
+        stale = cache_dir / "dota2_Arcana_7d.json"
+        stale.write_text(json.dumps(_sales("Arcana", [5])), encoding="utf-8")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+        (cache_dir / "csgo_Empty_24h.json").write_text("[]", encoding="utf-8")
+
+        store = SalesHistoryStore(tmp_path / "sales.db", legacy_cache_dir=cache_dir)
+        try:
+            assert list(cache_dir.glob("*.json")) == []
+            loaded = store.load("AK-47 | Redline", "csgo", "24h", max_age=60)
+            assert [sale["timestamp"] for sale in loaded] == [20, 10]
+            assert store.load("Arcana", "dota2", "7d", max_age=60) == []
+            assert len(store.load("Arcana", "dota2", "7d", max_age=7200)) == 1
+        finally:
+            store.close()
+
+
+class TestSalesHistoryCache:
+    """Tests for the sales_history module cache functions."""
+
+    @pytest.fixture(autouse=True)
+    def _isolated_store(self, store):
+        with patch.object(sales_history, "_sales_store", store):
+            yield
+
+    def test_save_and_load(self):
+        """_save_to_cache / _load_from_cache go through the store."""
+        sales_history._save_to_cache("AK-47", "csgo", "1h", _sales("AK-47", [1, 2]))
+
+        assert len(sales_history._load_from_cache("AK-47", "csgo", "1h")) == 2
+
+    @pytest.mark.asyncio()
+    async def test_get_items_sales_history_fetches_only_misses(self):
+        """Cached items are read in bulk, the rest are fetched."""
+        sales_history._save_to_cache("Cached", "csgo", "24h", _sales("Cached", [1]))
+        api = AsyncMock()
+        api.get_item_price_history.return_value = [{"date": 7, "price": 250}]
+
+        with patch.object(sales_history.rate_limiter, "wait_if_needed", AsyncMock()):
+            result = await sales_history.get_items_sales_history(
+                ["Cached", "Fresh"], game="csgo", dmarket_api=api
+            )
+
+        api.get_item_price_history.assert_awaited_once_with(
+            title="Fresh", game="csgo", period="24h"
+        )
+        assert result["Cached"][0]["timestamp"] == 1
+        assert result["Fresh"] == [{"price": 2.5, "timestamp": 7, "market_hash_name": "Fresh"}]
+        assert sales_history._load_from_cache("Fresh", "csgo", "24h") == result["Fresh"]
@@ -0,0 +1,205 @@
+"""Tests for the vectorized backtesting engine.
+
+Results are compared against the event-driven Backtester on the same data.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.dmarket.backtester import (
+    Backtester,
+    BacktestResults,
+    MeanReversionStrategy,
+    MomentumStrategy,
+    SimpleArbitrageStrategy,
+    TradingStrategy,
+)
+from src.dmarket.vectorized_backtester import PriceMatrix, VectorizedBacktester
+
+
+def _make_backtester(num_items: int = 6, num_days: int = 6, seed: int = 42) -> Backtester:
+    """Create backtester with reproducible random walks and missing points."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    backtester = Backtester(initial_balance=150.0)
+
+    for i in range(num_items):
+        price = 5.0 + i * 3
+        prices = []
+        for hour in range(num_days * 24):
+            price = max(0.01, price * (1 + rng.normal(0, 0.04)))
+            # Every item skips some hours so rows have gaps
+            if rng.random() < 0.15:
+                continue
+            prices.append({"timestamp": start + timedelta(hours=hour), "price": round(price, 2)})
+        backtester.load_data_from_list(f"item_{i}", f"Item {i}", "csgo", prices)
+
+    return backtester
+
+
+def _assert_same_results(expected: BacktestResults, actual: BacktestResults) -> None:
+    """Check that vectorized results match the event-driven engine."""
+    assert actual.strategy_name == expected.strategy_name
+    assert actual.total_trades == expected.total_trades
+    assert actual.winning_trades == expected.winning_trades
+    assert actual.losing_trades == expected.losing_trades
+    assert [(t.trade_id, t.item_id, t.timestamp, t.price) for t in actual.trades] == [
+        (t.trade_id, t.item_id, t.timestamp, t.price) for t in expected.trades
+    ]
+    assert [(t.close_price, t.close_timestamp) for t in actual.trades] == [
+        (t.close_price, t.close_timestamp) for t in expected.trades
+    ]
+    assert actual.final_balance == pytest.approx(expected.final_balance, abs=1e-9)
+    assert actual.total_roi == pytest.approx(expected.total_roi, abs=1e-9)
+    assert actual.max_drawdown == pytest.approx(expected.max_drawdown, abs=1e-9)
+    assert actual.sharpe_ratio == pytest.approx(expected.sharpe_ratio, abs=1e-6)
+    assert [t for t, _ in actual.equity_curve] == [t for t, _ in expected.equity_curve]
+    assert [e for _, e in actual.equity_curve] == pytest.approx(
+        [e for _, e in expected.equity_curve], abs=1e-9
+    )
+
+
+class TestPriceMatrix:
+    """Tests for PriceMatrix."""
+
+    def test_from_datasets_aligns_timestamps(self):
+        """Rows are items, columns are the union of timestamps."""
+        backtester = Backtester()
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        backtester.load_data_from_list("a", "A", "csgo", [{"timestamp": start, "price": 1.0}])
+        backtester.load_data_from_list(
+            "b",
+            "B",
+            "csgo",
+            [
+                {"timestamp": start + timedelta(hours=1), "price": 2.0},
+                {"timestamp": start, "price": 3.0},
+            ],
+        )
+
+        matrix = PriceMatrix.from_datasets(backtester.data)
+
+        assert matrix.item_ids == ["a", "b"]
+        assert matrix.item_names == ["A", "B"]
+        assert matrix.timestamps == [start, start + timedelta(hours=1)]
+        assert matrix.shape == (2, 2)
+        assert matrix.prices[0, 0] == 1.0
+        assert np.isnan(matrix.prices[0, 1])
+        assert matrix.prices[1].tolist() == [3.0, 2.0]
+
+
+class TestVectorizedBacktester:
+    """Tests for VectorizedBacktester."""
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "strategy",
+        (
+            SimpleArbitrageStrategy(buy_threshold_percent=2.0),
+            SimpleArbitrageStrategy(
+                min_profit_percent=4.0, max_loss_percent=2.0, lookback_periods=5
+            ),
+            MomentumStrategy(momentum_threshold=2.0),
+            MeanReversionStrategy(lookback_periods=10, std_threshold=1.0),
+        ),
+        ids=["simple", "simple-tight", "momentum", "mean-reversion"],
+    )
+    async def test_run_matches_backtester(self, strategy: TradingStrategy):
+        """Single-strategy run matches Backtester.run."""
+        backtester = _make_backtester()
+        engine = VectorizedBacktester.from_backtester(backtester)
+
+        expected = await backtester.run(strategy)
+        actual = engine.run(strategy)
+
+        assert expected.total_trades > 0
+        _assert_same_results(expected, actual)
+
+    @pytest.mark.asyncio()
+    async def test_run_batch_matches_backtester(self):
+        """Mixed batch gives the same result per strategy as separate runs."""
+        backtester = _make_backtester()
+        engine = VectorizedBacktester.from_backtester(backtester)
+        strategies = [
+            SimpleArbitrageStrategy(buy_threshold_percent=1.0, max_loss_percent=3.0),
+            MomentumStrategy(momentum_periods=3, momentum_threshold=1.0),
+            MeanReversionStrategy(lookback_periods=15, std_threshold=1.5),
+            SimpleArbitrageStrategy(buy_threshold_percent=4.0, lookback_periods=20),
+        ]
+
+        results = engine.run_batch(strategies, max_positions=3)
+
+        assert len(results) == len(strategies)
+        for strategy, actual in zip(strategies, results, strict=True):
+            expected = await backtester.run(strategy, max_positions=3)
+            _assert_same_results(expected, actual)
+
+    @pytest.mark.asyncio()
+    async def test_run_grid(self):
+        """Parameter grid runs every combination in product order."""
+        backtester = _make_backtester(num_items=4, num_days=4)
+        engine = VectorizedBacktester.from_backtester(backtester)
+        grid = {
+            "buy_threshold_percent": [1.0, 3.0],
+            "min_profit_percent": [5.0, 10.0],
+            "max_loss_percent": [2.0, 5.0],
+        }
+
+        results = engine.run_grid(SimpleArbitrageStrategy, grid)
+
+        assert len(results) == 8
+        expected = await backtester.run(
+            SimpleArbitrageStrategy(
+                buy_threshold_percent=3.0, min_profit_percent=5.0, max_loss_percent=2.0
+            )
+        )
+        _assert_same_results(expected, results[4])
+
+    def test_results_are_independent_per_strategy(self):
+        """Balances and trades are not shared between strategies of a batch."""
+        engine = VectorizedBacktester.from_backtester(_make_backtester())
+        strategy = SimpleArbitrageStrategy(buy_threshold_percent=1.0)
+
+        first, second = engine.run_batch([strategy, strategy])
+
+        assert first.trades is not second.trades
+        assert first.final_balance == second.final_balance
+        assert [t.trade_id for t in first.trades] == [t.trade_id for t in second.trades]
+
+    def test_no_positions_allowed(self):
+        """max_positions=0 never opens trades."""
+        engine = VectorizedBacktester.from_backtester(_make_backtester())
+
+        results = engine.run(SimpleArbitrageStrategy(buy_threshold_percent=0.5), max_positions=0)
+
+        assert results.trades == []
+        assert results.final_balance == engine.initial_balance
+
+    def test_run_without_data(self):
+        """Running without data raises ValueError."""
+        engine = VectorizedBacktester()
+
+        with pytest.raises(ValueError, match="No historical data loaded"):
+            engine.run(SimpleArbitrageStrategy())
+
+    def test_custom_strategy_not_supported(self):
+        """Strategies without a vectorized signal are rejected."""
+
+        class CustomStrategy(SimpleArbitrageStrategy):
+            pass
+
+        engine = VectorizedBacktester.from_backtester(_make_backtester(num_items=1))
+
+        with pytest.raises(TypeError, match="CustomStrategy"):
+            engine.run(CustomStrategy())
+
+    def test_invalid_window(self):
+        """Non-positive lookback raises ValueError."""
+        engine = VectorizedBacktester.from_backtester(_make_backtester(num_items=1))
+
+        with pytest.raises(ValueError, match="window"):
+            engine.run(MomentumStrategy(momentum_periods=0))
@@ -31,6 +31,17 @@ def reset_circuit_breakers_for_integration() -> Generator[None, None, None]:
     except ImportError:
         pass
 
+    try:
+        from src.utils.rate_limiter import reset_shared_rate_limiters
+
+        # Shared per-key rate limit budgets and request queues
+        reset_shared_rate_limiters()
+        from src.dmarket.request_scheduler import reset_request_schedulers
+
+        reset_request_schedulers()
+    except ImportError:
+        pass
+
     yield
 
     try:
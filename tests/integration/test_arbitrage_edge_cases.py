@@ -54,16 +54,7 @@ class TestArbitrageScannerEdgeCases:
             json=response,
             status_code=200,
         )
-
-        # Мок для aggregated-prices (вызывается автоматически)
-        httpx_mock.add_response(
-            url=re.compile(
-                r"https://api\.dmarket\.com/marketplace-api/v1/aggregated-prices.*"
-            ),
-            method="POST",
-            json={"aggregatedPrices": []},
-            status_code=200,
-        )
+        # aggregated-prices не запрашивается: ни один предмет не проходит по прибыли
 
         scanner = ArbitrageScanner(mock_dmarket_api)
         opportunities = await scanner.scan_level(level="standard", game="csgo")
@@ -112,6 +103,16 @@ class TestArbitrageScannerEdgeCases:
             status_code=200,
         )
 
+        # Мок для targets-by-title (проверка конкуренции buy orders)
+        httpx_mock.add_response(
+            url=re.compile(
+                r"https://api\.dmarket\.com/marketplace-api/v1/targets-by-title/.*"
+            ),
+            method="GET",
+            json={"orders": []},
+            status_code=200,
+        )
+
         scanner = ArbitrageScanner(mock_dmarket_api)
         opportunities = await scanner.scan_level(level="standard", game="csgo")
 
@@ -156,6 +157,16 @@ class TestArbitrageScannerEdgeCases:
             status_code=200,
         )
 
+        # Мок для targets-by-title (проверка конкуренции buy orders)
+        httpx_mock.add_response(
+            url=re.compile(
+                r"https://api\.dmarket\.com/marketplace-api/v1/targets-by-title/.*"
+            ),
+            method="GET",
+            json={"orders": []},
+            status_code=200,
+        )
+
         scanner = ArbitrageScanner(mock_dmarket_api)
         opportunities = await scanner.scan_level(level="standard", game="csgo")
 
@@ -691,6 +691,35 @@ class TestBotIntegrator:
         assert integrator._initialized is True
         assert results["enhanced_polling"] is False  # No API
     
+    @pytest.mark.asyncio
+    async def test_price_updates_wait_for_dependencies(self):
+        """Test price updates reach analytics only once dependencies are ready."""
+        database = MagicMock(is_pool_ready=True)
+        redis_cache = MagicMock(is_connected=True)
+        updater = MagicMock(running=False)
+
+        integrator = BotIntegrator(
+            database=database,
+            redis_cache=redis_cache,
+            bot_updater=updater,
+            config=IntegratorConfig(enable_price_analytics=True),
+        )
+        await integrator.initialize()
+        analytics = integrator.price_analytics
+        event = Event(type=EventTypes.PRICE_UPDATE, data={"item_id": "item_1", "price": 10.0})
+
+        assert analytics.is_ready() is False
+        await integrator.events.publish(event)
+        assert analytics.get_indicators("item_1") is None
+
+        updater.running = True
+        assert analytics.is_ready() is True
+        await integrator.events.publish(event)
+        assert analytics.get_indicators("item_1")["count"] == 1
+
+        redis_cache.is_connected = False
+        assert analytics.is_ready() is False
+
     @pytest.mark.asyncio
     async def test_services_registered(self):
         """Test services are registered correctly."""
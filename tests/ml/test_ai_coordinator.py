@@ -1,6 +1,8 @@
 """Tests for AICoordinator - unified ML module coordinator."""
 
+import asyncio
 from datetime import UTC, datetime
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -336,6 +338,152 @@ class TestAnalyzeItem:
 
         assert analysis.llm_analysis is None
 
+    @pytest.mark.asyncio
+    async def test_analyze_item_scores_on_worker_pool(self, coordinator, sample_item):
+        """Test that model scoring runs on the scoring executor."""
+        await coordinator.analyze_item(sample_item)
+
+        scoring = coordinator.get_statistics()["scoring_executor"]
+        assert scoring["max_workers"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_analyze_item_reads_stored_price_history(self, sample_item):
+        """Test items without priceHistory are scored on stored daily bars."""
+        from src.utils.price_history_store import PriceBar
+
+        day = datetime(2026, 3, 1, tzinfo=UTC)
+        bars = [
+            PriceBar(day.replace(day=i + 1), 490.0, 510.0, 480.0, 490.0 + i, volume=10)
+            for i in range(20)
+        ]
+        store = MagicMock()
+        store.get_price_bars_bulk = AsyncMock(
+            return_value={("csgo", "M4A4 | Howl (Field-Tested)"): bars}
+        )
+        coordinator = AICoordinator(price_history_store=store)
+        coordinator._ensure_models()
+        predictor = coordinator._price_predictor
+        predictor.predict_batch = MagicMock(wraps=predictor.predict_batch)
+        del sample_item["priceHistory"]
+
+        await coordinator.analyze_item(sample_item)
+
+        (wanted,), _ = store.get_price_bars_bulk.await_args
+        assert wanted == {("csgo", "M4A4 | Howl (Field-Tested)")}
+        (requests,), _ = predictor.predict_batch.call_args
+        assert requests[0]["price_history"] == [(bar.timestamp, bar.close) for bar in bars]
+
+
+class TestScanAndDecide:
+    """Tests for scan_and_decide method."""
+
+    @pytest.fixture
+    def items(self):
+        """Discounted items with stable price history."""
+        return [
+            {
+                "title": f"Item {i}",
+                "itemId": f"item{i}",
+                "gameId": "csgo",
+                "price": {"USD": 1000 + i * 10},
+                "suggestedPrice": {"USD": 1500},
+                "priceHistory": [10.0, 10.2, 9.9, 10.1] * 5,
+            }
+            for i in range(30)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_scan_matches_single_decisions(self, items):
+        """Test that batch scoring gives the same decisions as make_decision."""
+        coordinator = AICoordinator(user_balance=1000.0)
+
+        decisions = await coordinator.scan_and_decide(items, max_decisions=len(items))
+        single = [await coordinator.make_decision(item) for item in items]
+
+        expected = {
+            d.item_name: d.action
+            for d in single
+            if d.action not in {TradeAction.HOLD, TradeAction.SKIP}
+        }
+        assert {d.item_name: d.action for d in decisions} == expected
+        scoring = coordinator.get_statistics()["scoring_executor"]
+        assert scoring["items_scored"] >= len(items)
+
+    @pytest.mark.asyncio
+    async def test_scan_skips_failed_items(self, items):
+        """Test that an item that cannot be scored does not fail the scan."""
+        coordinator = AICoordinator(user_balance=1000.0)
+        items[3]["price"] = {"USD": "not a price"}
+
+        results = coordinator._score_items(items[:5])
+        decisions = await coordinator.scan_and_decide(items, max_decisions=5)
+
+        assert isinstance(results[3], ValueError)
+        assert all(isinstance(r, ItemAnalysis) for i, r in enumerate(results) if i != 3)
+        assert len(decisions) <= 5
+        assert all(d.item_name != "Item 3" for d in decisions)
+
+    @pytest.mark.asyncio
+    async def test_scan_initializes_models_before_workers(self, items):
+        """Test that the workers share models built on the event loop."""
+        coordinator = AICoordinator(user_balance=1000.0)
+        seen = []
+
+        def score_items(chunk):
+            seen.append((coordinator._price_predictor, coordinator._trade_classifier))
+            return [None] * len(chunk)
+
+        with patch.object(coordinator, "_score_items", side_effect=score_items):
+            await coordinator.scan_and_decide(items)
+
+        predictor = coordinator._price_predictor
+        classifier = coordinator._trade_classifier
+        assert predictor is not None
+        assert classifier is not None
+        assert seen
+        assert all(s == (predictor, classifier) for s in seen)
+
+    @pytest.mark.asyncio
+    async def test_scan_loads_stored_history_in_one_call(self, items):
+        """Test that a scan reads stored history of all items with one store call."""
+        for item in items[10:]:
+            del item["priceHistory"]
+        store = MagicMock()
+        store.get_price_bars_bulk = AsyncMock(return_value={})
+        coordinator = AICoordinator(user_balance=1000.0, price_history_store=store)
+
+        await coordinator.scan_and_decide(items)
+
+        store.get_price_bars_bulk.assert_awaited_once()
+        (wanted,), _ = store.get_price_bars_bulk.await_args
+        assert wanted == {("csgo", f"Item {i}") for i in range(10, 30)}
+
+    @pytest.mark.asyncio
+    async def test_scan_deadline_covers_stored_history(self, items):
+        """Test that a slow history read is cut off by the scan deadline."""
+        for item in items:
+            del item["priceHistory"]
+
+        async def slow_read(*args, **kwargs):
+            await asyncio.sleep(10)
+            return {}
+
+        store = MagicMock()
+        store.get_price_bars_bulk = slow_read
+        coordinator = AICoordinator(user_balance=1000.0, price_history_store=store)
+        scored = []
+
+        def score_items(chunk):
+            scored.extend(chunk)
+            return [None] * len(chunk)
+
+        started = time.monotonic()
+        with patch.object(coordinator, "_score_items", side_effect=score_items):
+            await coordinator.scan_and_decide(items, deadline=0.2)
+
+        assert time.monotonic() - started < 2.0
+        assert scored == []
+
 
 class TestStatistics:
     """Tests for statistics tracking."""
@@ -612,3 +612,165 @@ class TestMLDataSchedulerMetrics:
         assert "state" in status
         assert "config" in status
         assert "stats" in status
+
+
+class TestMLDataSchedulerCollection:
+    """Тесты возобновляемого сбора данных."""
+
+    @pytest.mark.asyncio()
+    async def test_interrupted_collection_resumes(self, tmp_path):
+        """Тест продолжения прерванного сбора с checkpoint'а."""
+        import json
+
+        from src.ml.data_scheduler import MLDataScheduler, SchedulerConfig
+        from src.ml.real_price_collector import RealPriceCollector
+
+        failed = []
+
+        async def get_market_items(game, limit, cursor=""):
+            start = int(cursor or 0)
+            if start == 200 and not failed:
+                failed.append(start)
+                raise ConnectionError("connection reset")
+            end = min(start + limit, 250)
+            return {
+                "objects": [
+                    {"title": f"Item {i}", "price": {"USD": str(100 + i)}} for i in range(start, end)
+                ],
+                "cursor": str(end) if end < 250 else "",
+            }
+
+        dmarket_api = MagicMock()
+        dmarket_api.get_market_items = AsyncMock(side_effect=get_market_items)
+        scheduler = MLDataScheduler(
+            predictor=MagicMock(),
+            config=SchedulerConfig(items_per_collection=1000, collection_dir=str(tmp_path)),
+            collector=RealPriceCollector(dmarket_api=dmarket_api),
+        )
+
+        with pytest.raises(RuntimeError, match="csgo"):
+            await scheduler._collect_data_only(["csgo"])
+        assert (tmp_path / "checkpoint.json").exists()
+
+        result = await scheduler._collect_data_only(["csgo"])
+
+        assert result["total_samples"] == 50
+        assert result["sources"]["dmarket"] == 50
+        assert not (tmp_path / "checkpoint.json").exists()
+        with open(result["output_file"], encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert len({row["item_name"] for row in rows}) == len(rows) == 250
+
+
+class TestMLDataSchedulerIncrementalTraining:
+    """Тесты дообучения на сохранённых версиях датасета."""
+
+    @staticmethod
+    def _dataset(version_id, rows):
+        import numpy as np
+
+        from src.ml.training_data_manager import DatasetMetadata, TrainingDataset
+
+        labels = np.arange(rows, dtype=np.float32)
+        return TrainingDataset(
+            features=np.ones((rows, 3), dtype=np.float32),
+            labels=labels,
+            item_names=[f"item_{i}" for i in range(rows)],
+            metadata=DatasetMetadata(
+                version_id=version_id,
+                created_at=datetime.now(),
+                game="csgo",
+                sources=["dmarket"],
+                total_samples=rows,
+                price_range=(0.0, float(rows)),
+                features_count=3,
+                checksum="",
+            ),
+            feature_names=["a", "b", "c"],
+        )
+
+    @pytest.mark.asyncio()
+    async def test_training_streams_stored_versions(self, tmp_path):
+        """Тест что модель дообучается пакетами memory-mapped версий."""
+        import numpy as np
+
+        from src.ml.data_scheduler import MLDataScheduler, SchedulerConfig
+        from src.ml.training_data_manager import TrainingDataManager
+
+        manager = TrainingDataManager(data_dir=tmp_path, enable_cache=False)
+        manager.save_version(self._dataset("csgo_base", 30))
+        manager.append_version(self._dataset("csgo_inc", 20), "csgo_base")
+
+        predictor = MagicMock(spec=["partial_fit"])
+        scheduler = MLDataScheduler(
+            predictor=predictor, config=SchedulerConfig(min_samples_for_training=40)
+        )
+
+        with patch("src.ml.training_data_manager.TrainingDataManager", return_value=manager):
+            result = await scheduler._run_training()
+
+        assert result.success is True
+        assert result.items_processed == 50
+        batches = [call.args for call in predictor.partial_fit.call_args_list]
+        assert [len(y) for _, y in batches] == [30, 20]
+        assert all(isinstance(X, np.memmap) for X, _ in batches)
+
+    @pytest.mark.asyncio()
+    async def test_training_requires_partial_fit(self):
+        """Тест что модель без partial_fit не считается обученной."""
+        from src.ml.data_scheduler import MLDataScheduler
+
+        scheduler = MLDataScheduler(predictor=MagicMock(spec=["train"]))
+
+        result = await scheduler._run_training()
+
+        assert result.success is False
+        assert "partial_fit" in result.error_message
+
+
+class TestSchedulerFactories:
+    """Тесты создания планировщика с коллектором."""
+
+    def test_create_scheduler_passes_collector(self):
+        """Тест что create_scheduler передаёт коллектор планировщику."""
+        from src.ml.data_scheduler import create_scheduler
+        from src.ml.real_price_collector import RealPriceCollector
+
+        collector = RealPriceCollector(dmarket_api=MagicMock())
+
+        scheduler = create_scheduler(MagicMock(), collection_interval_hours=4.0, collector=collector)
+
+        assert scheduler.collector is collector
+        assert scheduler.config.collection_interval_hours == 4.0
+
+    @pytest.mark.asyncio()
+    async def test_quick_start_scheduler_passes_collector(self):
+        """Тест что quick_start_scheduler запускает планировщик с коллектором."""
+        from src.ml.data_scheduler import MLDataScheduler, quick_start_scheduler
+        from src.ml.real_price_collector import RealPriceCollector
+
+        collector = RealPriceCollector(waxpeer_api=MagicMock())
+
+        with patch.object(MLDataScheduler, "start", new_callable=AsyncMock) as start:
+            scheduler = await quick_start_scheduler(MagicMock(), collector)
+
+        assert scheduler.collector is collector
+        start.assert_awaited_once()
+
+    @pytest.mark.asyncio()
+    async def test_collection_without_clients_fails(self, tmp_path):
+        """Тест что сбор без API клиентов завершается ошибкой."""
+        from src.ml.data_scheduler import MLDataScheduler, SchedulerConfig
+
+        predictor = MagicMock()
+        predictor.train_from_real_data = AsyncMock()
+        scheduler = MLDataScheduler(
+            predictor=predictor,
+            config=SchedulerConfig(collection_dir=str(tmp_path), retry_on_failure=False),
+        )
+
+        result = await scheduler._run_collection(["csgo"])
+
+        assert result.success is False
+        assert "API" in result.error_message
+        assert scheduler.stats.successful_collections == 0
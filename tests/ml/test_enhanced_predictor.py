@@ -271,6 +271,44 @@ class TestEnhancedFeatureExtractor:
 
         assert features.relative_strength == 1.0  # current_price / market_index
 
+    def test_extract_batch_matches_single_items(self, extractor):
+        """Тест: пакетное извлечение совпадает с извлечением по одному."""
+        now = datetime.now(UTC)
+        items = [
+            {
+                "item_name": "AK-47 | Redline (Field-Tested)",
+                "current_price": 10.0 + i,
+                "game": GameType.CS2 if i % 2 else GameType.DOTA2,
+                "price_history": [(now - timedelta(hours=h), 9.0 + (h * i) % 3) for h in range(i * 5)],
+                "sales_history": [
+                    {"timestamp": (now - timedelta(hours=3 * h + i)).isoformat()} for h in range(i)
+                ],
+                "market_offers": [{"price": {"USD": 1000 + 100 * i}}] * i,
+                "item_data": {"float_value": 0.2, "gems": [{}] * i},
+            }
+            for i in range(6)
+        ]
+
+        def extract(batch):
+            return extractor.extract_batch(
+                item_names=[item["item_name"] for item in batch],
+                current_prices=[item["current_price"] for item in batch],
+                games=[item["game"] for item in batch],
+                price_histories=[item["price_history"] for item in batch],
+                sales_histories=[item["sales_history"] for item in batch],
+                market_offers=[item["market_offers"] for item in batch],
+                item_data=[item["item_data"] for item in batch],
+                now=now,
+            )
+
+        batch = extract(items)
+        single = [extract([item])[0] for item in items]
+
+        assert [f.to_array().tolist() for f in batch] == [f.to_array().tolist() for f in single]
+        assert batch[3].time_since_last_sale == pytest.approx(3 * 3600)
+        assert batch[3].avg_time_between_sales == pytest.approx(3 * 3600)
+        assert batch[1].game_type == GameType.CS2
+
 
 # ============ MLPipeline Tests ============
 
@@ -575,6 +613,49 @@ class TestEnhancedPricePredictor:
         assert len(predictor._training_data_y) == 1
         assert predictor._new_samples_count == 1
 
+    def test_predict_batch_matches_predict(self, predictor):
+        """Тест что пакетный прогноз совпадает с поштучным."""
+        for i in range(30):
+            price = 5.0 + i
+            features = EnhancedFeatures(current_price=price, rsi=40.0 + i, volatility=0.01 * i)
+            predictor.add_training_example(features, price * 1.05)
+        predictor.train(force=True)
+
+        items = [
+            {"item_name": "AK-47 | Redline (FT)", "current_price": 12.5},
+            {"item_name": "Arcana", "current_price": 30.0, "game": GameType.DOTA2},
+            {"item_name": "AWP | Asiimov (FT)", "current_price": 45.0, "item_data": {"float": 0.2}},
+        ]
+        batch = predictor.predict_batch(items, use_cache=False)
+
+        assert len(batch) == 3
+        assert batch.predictions[1]["game"] == GameType.DOTA2.value
+        for i, item in enumerate(items):
+            single = predictor.predict(**item, use_cache=False)
+            assert batch.predicted_price_24h[i] == pytest.approx(single["predicted_price_24h"])
+            assert batch.predictions[i]["price_range_7d"] == single["price_range_7d"]
+
+    def test_predict_batch_caches_per_item(self, predictor):
+        """Тест что пакетный прогноз кэшируется по предмету."""
+        batch = predictor.predict_batch(
+            [
+                {"item_name": "Item A", "current_price": 10.0},
+                {"item_name": "Item B", "current_price": 20.0},
+            ]
+        )
+        assert batch.cache_hits == 0
+
+        again = predictor.predict_batch(
+            [
+                {"item_name": "Item B", "current_price": 20.0},
+                {"item_name": "Item C", "current_price": 5.0},
+            ]
+        )
+
+        assert again.cache_hits == 1
+        assert again.predictions[0] is batch.predictions[1]
+        assert predictor.predict(item_name="Item C", current_price=5.0) is again.predictions[1]
+
 
 # ============ Integration Tests ============
 
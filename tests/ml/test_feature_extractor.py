@@ -10,7 +10,9 @@ import pytest
 
 from src.ml.feature_extractor import (
     MarketFeatureExtractor,
+    MarketHistoryBatch,
     PriceFeatures,
+    PriceWindow,
     TrendDirection,
 )
 
@@ -372,3 +374,105 @@ class TestMarketFeatureExtractor:
         # Weekend should match day_of_week >= 5
         expected = features.day_of_week >= 5
         assert features.is_weekend == expected
+
+
+def _histories(now, count=40, seed=3):
+    """Random price, sales and offer histories of different lengths."""
+    rng = np.random.default_rng(seed)
+    current_prices, price_histories, sales_histories, market_offers = [], [], [], []
+    for i in range(count):
+        hours = np.sort(rng.uniform(0, 240, size=i % 25))[::-1]
+        price_histories.append(
+            [(now - timedelta(hours=h), float(rng.uniform(5, 15))) for h in hours] or None
+        )
+        sales_histories.append(
+            [
+                {"timestamp": (now - timedelta(hours=float(h))).isoformat()}
+                for h in rng.uniform(0, 300, size=i % 7)
+            ]
+            + [{"date": "not a date"}] * (i % 2)
+        )
+        market_offers.append([
+            {"price": {"USD": int(p)}} for p in rng.uniform(500, 1500, size=i % 5)
+        ])
+        current_prices.append(float(rng.uniform(5, 15)))
+    return current_prices, price_histories, sales_histories, market_offers
+
+
+class TestMarketHistoryBatch:
+    """Tests for the columnar feature extraction."""
+
+    def test_batch_matches_single_items(self):
+        """Test that a batch gives the same features as items one by one."""
+        extractor = MarketFeatureExtractor()
+        now = datetime.now(UTC)
+        histories = _histories(now)
+
+        batch = extractor.extract_batch(*histories, now=now)
+        single = [
+            extractor.extract_batch(*([h] for h in item), now=now)[0]
+            for item in zip(*histories, strict=True)
+        ]
+
+        assert [f.to_array().tolist() for f in batch] == [f.to_array().tolist() for f in single]
+        assert [f.data_quality_score for f in batch] == [f.data_quality_score for f in single]
+
+    def test_matrix_matches_to_array(self):
+        """Test that extract_matrix rows equal PriceFeatures.to_array()."""
+        extractor = MarketFeatureExtractor()
+        now = datetime.now(UTC)
+        histories = _histories(now)
+
+        matrix = extractor.extract_matrix(MarketHistoryBatch.from_histories(*histories), now=now)
+        features = extractor.extract_batch(*histories, now=now)
+
+        assert matrix.shape == (40, len(PriceFeatures.feature_names()))
+        np.testing.assert_array_equal(matrix, np.vstack([f.to_array() for f in features]))
+
+    def test_window_indicators_match_scalar(self):
+        """Test windowed RSI and momentum against the per-list calculation."""
+        extractor = MarketFeatureExtractor()
+        rng = np.random.default_rng(5)
+        price_lists = [list(rng.uniform(5, 15, size=n)) for n in (0, 1, 2, 13, 14, 15, 30)]
+
+        prices = np.concatenate(price_lists)
+        segments = np.repeat(np.arange(len(price_lists)), [len(p) for p in price_lists])
+        window = PriceWindow.select(
+            prices, segments, np.ones(len(prices), dtype=bool), len(price_lists)
+        )
+
+        rsi = window.rsi(extractor.RSI_PERIOD)
+        momentum = window.momentum()
+        for i, values in enumerate(price_lists):
+            expected_rsi = extractor._calculate_rsi(values) if len(values) >= 14 else 50.0
+            assert rsi[i] == pytest.approx(expected_rsi)
+            assert momentum[i] == pytest.approx(extractor._calculate_momentum(values))
+
+    def test_sales_and_offers_columns(self):
+        """Test sales counts, market depth and competition of a batch."""
+        now = datetime.now(UTC)
+        batch = MarketHistoryBatch.from_histories(
+            current_prices=[10.0, 20.0],
+            sales_histories=[
+                [
+                    {"timestamp": now - timedelta(hours=2)},
+                    {"timestamp": (now - timedelta(days=3)).timestamp()},
+                    {"date": (now - timedelta(days=10)).isoformat()},
+                    {"date": "invalid"},
+                ],
+                None,
+            ],
+            market_offers=[
+                [{"price": {"USD": 1000}}, {"price": 2000}],
+                [{"price": {"USD": 2050}}],
+            ],
+        )
+
+        columns = batch.history_columns(now)
+
+        assert columns["sales_count_24h"].tolist() == [1, 0]
+        assert columns["sales_count_7d"].tolist() == [2, 0]
+        assert columns["market_depth"].tolist() == [2.0, 1.0]
+        assert columns["competition_level"].tolist() == [0.5, 1.0]
+        assert columns["data_quality_score"].tolist() == pytest.approx([0.5, 0.35])
+        assert columns["time_since_last_sale"][0] == pytest.approx(7200, abs=1)
@@ -3,6 +3,7 @@
 from datetime import UTC, datetime, timedelta
 
 import numpy as np
+import pytest
 
 
 class TestPriceFeatures:
@@ -265,6 +266,52 @@ class TestAdaptivePricePredictor:
         # Должны получить тот же объект из кэша
         assert pred1.prediction_timestamp == pred2.prediction_timestamp
 
+    def test_predict_batch_matches_predict(self):
+        """Тест что пакетный прогноз совпадает с поштучным."""
+        from src.ml.feature_extractor import PriceFeatures
+        from src.ml.price_predictor import AdaptivePricePredictor, PredictionBatch
+
+        predictor = AdaptivePricePredictor(user_balance=100.0)
+        for i in range(30):
+            price = 5.0 + i
+            predictor.add_training_example(PriceFeatures(current_price=price, rsi=40.0 + i), price * 1.05)
+        predictor.train(force=True)
+
+        items = [
+            {"title": f"Item {i}", "price": {"USD": str(500 + i * 250)}} for i in range(5)
+        ]
+        batch = predictor.predict_batch(items, use_cache=False)
+
+        assert isinstance(batch, PredictionBatch)
+        assert len(batch) == 5
+        assert batch.item_names == [f"Item {i}" for i in range(5)]
+        for i, item in enumerate(items):
+            single = predictor.predict(
+                item_name=item["title"],
+                current_price=(500 + i * 250) / 100,
+                use_cache=False,
+            )
+            assert batch.predicted_price_24h[i] == pytest.approx(single.predicted_price_24h)
+            assert batch.predictions[i].price_range_7d == pytest.approx(single.price_range_7d)
+
+        assert batch.expected_profit_percent("7d").shape == (5,)
+
+    def test_predict_batch_caches_per_item(self):
+        """Тест что пакетный прогноз кэшируется по предмету."""
+        from src.ml.price_predictor import AdaptivePricePredictor
+
+        predictor = AdaptivePricePredictor(user_balance=100.0)
+        cached = predictor.predict(item_name="Item A", current_price=10.0)
+
+        batch = predictor.predict_batch(
+            [{"title": "Item A", "price": {"USD": "1000"}}, {"title": "Item B", "price": 2000}]
+        )
+
+        assert batch.cache_hits == 1
+        assert batch.predictions[0] is cached
+        assert predictor.predict(item_name="Item B", current_price=20.0) is batch.predictions[1]
+        assert predictor.batch_predict([]) == []
+
 
 class TestTradeClassifier:
     """Тесты для AdaptiveTradeClassifier."""
@@ -8,12 +8,16 @@ Tests cover:
 - GameType enum
 - MultiSourceResult dataclass
 - RealPriceCollector class
+- Bulk collection with cursors, sinks and checkpoints
 - Module-level collect_prices function
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
+import json
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -21,9 +25,11 @@ import pytest
 from src.ml.price_normalizer import NormalizedPrice, PriceSource
 from src.ml.real_price_collector import (
     CollectedPrice,
+    CollectionCheckpoint,
     CollectionResult,
     CollectionStatus,
     GameType,
+    JsonlPriceSink,
     MultiSourceResult,
     RealPriceCollector,
     collect_prices,
@@ -608,3 +614,189 @@ class TestCollectPricesConvenienceFunction:
 
         assert isinstance(result, MultiSourceResult)
         # Should still return a result, but with failed statuses
+
+
+# =============================================================================
+# TestBulkCollection
+# =============================================================================
+
+
+def _dmarket_market(total: int, fail_once_at: int | None = None) -> AsyncMock:
+    """Create a DMarket mock serving `total` items page by page via cursors."""
+    failed: list[int] = []
+
+    async def get_market_items(game: str, limit: int, cursor: str = "") -> dict:
+        start = int(cursor or 0)
+        if start == fail_once_at and not failed:
+            failed.append(start)
+            raise ConnectionError("connection reset")
+        end = min(start + limit, total)
+        return {
+            "objects": [
+                {"title": f"Item {i:04d}", "itemId": f"id{i}", "price": {"USD": str(100 + i)}}
+                for i in range(start, end)
+            ],
+            "cursor": str(end) if end < total else "",
+        }
+
+    mock = AsyncMock()
+    mock.get_market_items = AsyncMock(side_effect=get_market_items)
+    return mock
+
+
+def _waxpeer_market(total: int) -> AsyncMock:
+    """Create a Waxpeer mock whose bulk endpoint returns `total` items."""
+    mock = AsyncMock()
+    mock.get_bulk_prices = AsyncMock(
+        return_value={f"Item {i:04d}": {"price": 1000 + i, "count": 1} for i in range(total)}
+    )
+    return mock
+
+
+class TestBulkCollection:
+    """Tests for paged, concurrent and resumable bulk collection."""
+
+    @pytest.mark.asyncio()
+    async def test_dmarket_pages_through_cursors(self) -> None:
+        """Test that limits above one page follow the market cursor."""
+        api = _dmarket_market(250)
+        collector = RealPriceCollector(dmarket_api=api)
+
+        limited = await collector.collect_bulk_prices(GameType.CSGO, limit=150)
+        full = await collector.collect_bulk_prices(GameType.CSGO, limit=None)
+
+        assert limited.total_items == 150
+        assert full.total_items == 250
+        assert len({p.item_name for p in full.all_prices}) == 250
+        cursors = [call.kwargs["cursor"] for call in api.get_market_items.call_args_list]
+        assert cursors == ["", "100", "", "100", "200"]
+
+    @pytest.mark.asyncio()
+    async def test_sources_collected_concurrently(self) -> None:
+        """Test that DMarket waits for Waxpeer without blocking it."""
+        dmarket = _dmarket_market(50)
+        waxpeer = _waxpeer_market(30)
+        waxpeer_called = asyncio.Event()
+        get_market_items = dmarket.get_market_items.side_effect
+        bulk_prices = waxpeer.get_bulk_prices.return_value
+
+        async def wait_for_waxpeer(**kwargs):
+            await waxpeer_called.wait()
+            return await get_market_items(**kwargs)
+
+        async def get_bulk_prices(**kwargs):
+            waxpeer_called.set()
+            return bulk_prices
+
+        dmarket.get_market_items.side_effect = wait_for_waxpeer
+        waxpeer.get_bulk_prices = AsyncMock(side_effect=get_bulk_prices)
+        collector = RealPriceCollector(dmarket_api=dmarket, waxpeer_api=waxpeer, timeout=1.0)
+
+        result = await collector.collect_bulk_prices(GameType.CSGO, limit=None)
+
+        assert [r.status for r in result.results] == [CollectionStatus.SUCCESS] * 2
+        assert len(result.get_prices_by_source(PriceSource.DMARKET)) == 50
+        assert len(result.get_prices_by_source(PriceSource.WAXPEER)) == 30
+
+    @pytest.mark.asyncio()
+    async def test_sink_receives_pages(self) -> None:
+        """Test that streamed prices are not kept in all_prices."""
+        pages: list[list[CollectedPrice]] = []
+
+        async def sink(prices: list[CollectedPrice]) -> None:
+            pages.append(prices)
+
+        collector = RealPriceCollector(dmarket_api=_dmarket_market(250))
+        result = await collector.collect_bulk_prices(GameType.CSGO, limit=None, sink=sink)
+
+        assert [len(page) for page in pages] == [100, 100, 50]
+        assert result.all_prices == []
+        assert result.streamed_items == 250
+        assert result.total_items == 250
+
+    @pytest.mark.asyncio()
+    async def test_checkpoint_writes_on_worker_thread(self, tmp_path: Path) -> None:
+        """Test that concurrent sources save the checkpoint off the event loop."""
+        checkpoint = CollectionCheckpoint(path=tmp_path / "checkpoint.json")
+
+        with patch(
+            "src.ml.real_price_collector.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            await asyncio.gather(
+                checkpoint.advance("dmarket:a8db", "100", 100),
+                checkpoint.advance("waxpeer:a8db", "Item 0050", 50),
+            )
+            await checkpoint.complete("dmarket:a8db", 150)
+
+        assert to_thread.call_count == 3
+        stored = CollectionCheckpoint.load(checkpoint.path)
+        assert stored.cursors == {"waxpeer:a8db": "Item 0050"}
+        assert stored.collected == {"dmarket:a8db": 150, "waxpeer:a8db": 50}
+        assert stored.completed == ["dmarket:a8db"]
+
+    @pytest.mark.asyncio()
+    async def test_checkpoint_resumes_after_failure(self, tmp_path: Path) -> None:
+        """Test that an interrupted collection resumes from the saved cursor."""
+        path = tmp_path / "checkpoint.json"
+        api = _dmarket_market(250, fail_once_at=200)
+        collector = RealPriceCollector(dmarket_api=api)
+        sink = JsonlPriceSink(tmp_path / "prices.jsonl")
+
+        first = await collector.collect_bulk_prices(
+            GameType.CSGO, limit=None, sink=sink, checkpoint=CollectionCheckpoint.load(path)
+        )
+        checkpoint = CollectionCheckpoint.load(path)
+        second = await collector.collect_bulk_prices(
+            GameType.CSGO, limit=None, sink=sink, checkpoint=checkpoint
+        )
+
+        assert first.results[0].status == CollectionStatus.PARTIAL
+        assert first.streamed_items == 200
+        assert second.results[0].status == CollectionStatus.SUCCESS
+        assert second.streamed_items == 50
+        assert checkpoint.is_complete(CollectionCheckpoint.key(PriceSource.DMARKET, GameType.CSGO))
+
+        rows = [json.loads(line) for line in sink.path.read_text().splitlines()]
+        assert len({row["item_name"] for row in rows}) == len(rows) == 250
+        assert rows[0]["source"] == "dmarket"
+        assert rows[0]["price_usd"] == 1.0
+
+    @pytest.mark.asyncio()
+    async def test_completed_source_is_skipped(self, tmp_path: Path) -> None:
+        """Test that a finished source is not collected again until cleared."""
+        path = tmp_path / "checkpoint.json"
+        api = _dmarket_market(50)
+        collector = RealPriceCollector(dmarket_api=api)
+
+        await collector.collect_bulk_prices(
+            GameType.CSGO, sink=AsyncMock(), checkpoint=CollectionCheckpoint.load(path)
+        )
+        checkpoint = CollectionCheckpoint.load(path)
+        again = await collector.collect_bulk_prices(
+            GameType.CSGO, sink=AsyncMock(), checkpoint=checkpoint
+        )
+        checkpoint.clear()
+
+        assert api.get_market_items.call_count == 1
+        assert again.total_items == 0
+        assert not path.exists()
+
+    @pytest.mark.asyncio()
+    async def test_waxpeer_pages_by_item_name(self, tmp_path: Path) -> None:
+        """Test that Waxpeer bulk prices resume after the last stored name."""
+        checkpoint = CollectionCheckpoint(path=tmp_path / "checkpoint.json")
+        collector = RealPriceCollector(waxpeer_api=_waxpeer_market(250))
+
+        first = await collector.collect_bulk_prices(GameType.CSGO, limit=120, checkpoint=checkpoint)
+        # Simulate an interruption after the first page
+        key = CollectionCheckpoint.key(PriceSource.WAXPEER, GameType.CSGO)
+        checkpoint.completed.remove(key)
+        await checkpoint.advance(key, first.all_prices[99].item_name, 100)
+        resumed = await collector.collect_bulk_prices(
+            GameType.CSGO, limit=None, checkpoint=CollectionCheckpoint.load(checkpoint.path)
+        )
+
+        assert first.total_items == 120
+        assert first.all_prices[0].normalized_price.price_usd == 1.0
+        assert resumed.total_items == 150
+        assert resumed.all_prices[0].item_name == "Item 0100"
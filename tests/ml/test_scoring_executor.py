@@ -0,0 +1,98 @@
+"""Tests for ScoringExecutor - worker pool for CPU-bound ML scoring."""
+
+import threading
+import time
+
+import pytest
+
+from src.ml.scoring_executor import ScoringExecutor
+
+
+def _double(chunk: list[int]) -> list[int]:
+    return [item * 2 for item in chunk]
+
+
+class TestScoringExecutor:
+    """Tests for ScoringExecutor."""
+
+    @pytest.fixture()
+    def executor(self):
+        """Create an executor and shut it down after the test."""
+        executor = ScoringExecutor(max_workers=2, initial_chunk_size=3)
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio()
+    async def test_run_uses_worker_thread(self, executor):
+        """Test that run executes the call outside the event loop thread."""
+        name = await executor.run(lambda: threading.current_thread().name)
+
+        assert name.startswith("ml_scoring")
+
+    @pytest.mark.asyncio()
+    async def test_map_batches_keeps_order(self, executor):
+        """Test that chunked results come back in item order."""
+        results = await executor.map_batches(_double, list(range(50)))
+
+        assert results == [item * 2 for item in range(50)]
+        stats = executor.get_stats()
+        assert stats["items_scored"] == 50
+        assert stats["items_dropped"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_chunk_size_follows_budget(self):
+        """Test that chunks are sized to take about chunk_budget."""
+        executor = ScoringExecutor(max_workers=1, chunk_budget=0.02, initial_chunk_size=2)
+
+        def slow(chunk):
+            time.sleep(0.002 * len(chunk))
+            return chunk
+
+        try:
+            assert executor.chunk_size() == 2
+            await executor.map_batches(slow, list(range(30)))
+            assert 5 <= executor.chunk_size() <= 15
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio()
+    async def test_deadline_drops_remaining_items(self):
+        """Test that no new chunks start after the deadline."""
+        executor = ScoringExecutor(max_workers=1, chunk_budget=0.01, initial_chunk_size=1)
+
+        def slow(chunk):
+            time.sleep(0.01 * len(chunk))
+            return chunk
+
+        try:
+            results = await executor.map_batches(slow, list(range(200)), deadline=0.05)
+        finally:
+            executor.shutdown()
+
+        scored = [r for r in results if r is not None]
+        assert 0 < len(scored) < 200
+        assert results[: len(scored)] == scored
+        assert executor.get_stats()["items_dropped"] == 200 - len(scored)
+
+    @pytest.mark.asyncio()
+    async def test_failed_chunk_returns_exception(self):
+        """Test that a failing chunk marks its items with the exception."""
+        executor = ScoringExecutor(initial_chunk_size=3, max_chunk_size=3)
+
+        def fail_on_seven(chunk):
+            if 7 in chunk:
+                raise ValueError("bad item")
+            return chunk
+
+        try:
+            results = await executor.map_batches(fail_on_seven, list(range(9)))
+        finally:
+            executor.shutdown()
+
+        assert results[:6] == list(range(6))
+        assert all(isinstance(r, ValueError) for r in results[6:9])
+
+    def test_rejects_zero_workers(self):
+        """Test that at least one worker is required."""
+        with pytest.raises(ValueError, match="max_workers"):
+            ScoringExecutor(max_workers=0)
@@ -617,3 +617,137 @@ class TestTrainingDataManagerEdgeCases:
         # Filter by tags
         tagged_versions = manager.list_versions(tags=["important"])
         assert len(tagged_versions) >= 1
+
+
+# ============================================================================
+# Test memory-mapped and incremental storage
+# ============================================================================
+
+
+class TestTrainingDataManagerStorage:
+    """Tests for memory-mapped loading, incremental versions and streaming."""
+
+    @pytest.fixture()
+    def temp_dir(self) -> Path:
+        """Create temporary directory for tests."""
+        temp = tempfile.mkdtemp()
+        yield Path(temp)
+        shutil.rmtree(temp, ignore_errors=True)
+
+    @pytest.fixture()
+    def manager(self, temp_dir: Path) -> TrainingDataManager:
+        """Create TrainingDataManager instance."""
+        return TrainingDataManager(data_dir=temp_dir)
+
+    @staticmethod
+    def _dataset(manager: TrainingDataManager, version_id: str, rows: int) -> TrainingDataset:
+        rng = np.random.default_rng(rows)
+        features = rng.random((rows, 3), dtype=np.float32)
+        labels = rng.random(rows, dtype=np.float32)
+        metadata = DatasetMetadata(
+            version_id=version_id,
+            created_at=datetime.now(UTC),
+            game="csgo",
+            sources=["dmarket"],
+            total_samples=rows,
+            price_range=(float(labels.min()), float(labels.max())),
+            features_count=3,
+            checksum=manager._compute_checksum(features, labels),
+        )
+        return TrainingDataset(
+            features=features,
+            labels=labels,
+            item_names=[f"{version_id}_{i}" for i in range(rows)],
+            metadata=metadata,
+            feature_names=["f1", "f2", "f3"],
+        )
+
+    def test_load_version_is_memory_mapped(self, manager: TrainingDataManager) -> None:
+        """Test that arrays are memory-mapped unless mmap=False."""
+        dataset = self._dataset(manager, "mmap_v1", 50)
+        manager.save_version(dataset)
+
+        loaded = manager.load_version("mmap_v1")
+        in_memory = manager.load_version("mmap_v1", mmap=False)
+
+        assert isinstance(loaded.features, np.memmap)
+        assert not isinstance(in_memory.features, np.memmap)
+        np.testing.assert_array_equal(loaded.features, dataset.features)
+        np.testing.assert_array_equal(in_memory.labels, dataset.labels)
+
+    def test_append_version_stores_only_new_rows(
+        self, manager: TrainingDataManager, temp_dir: Path
+    ) -> None:
+        """Test that an incremental version loads with its parent chain."""
+        base = self._dataset(manager, "base_v1", 40)
+        first = self._dataset(manager, "inc_v1", 10)
+        second = self._dataset(manager, "inc_v2", 5)
+        manager.save_version(base)
+        manager.append_version(first, parent_version="base_v1")
+        manager.append_version(second, parent_version="inc_v1")
+
+        stored = np.load(temp_dir / "versions" / "inc_v2" / "features.npy")
+        loaded = manager.load_version("inc_v2")
+
+        assert stored.shape == (5, 3)
+        assert len(loaded.chunks) == 3
+        assert loaded.shape == (55, 3)
+        assert loaded.metadata.total_samples == 55
+        assert loaded.metadata.parent_version == "inc_v1"
+        assert loaded.item_names[39:41] == ["base_v1_39", "inc_v1_0"]
+        np.testing.assert_array_equal(
+            loaded.features,
+            np.concatenate([base.features, first.features, second.features]),
+        )
+
+    def test_append_version_rejects_other_features(self, manager: TrainingDataManager) -> None:
+        """Test that appended rows must have the parent's feature set."""
+        manager.save_version(self._dataset(manager, "base_v1", 10))
+        other = self._dataset(manager, "inc_v1", 5)
+        other.feature_names = ["x", "y", "z"]
+
+        with pytest.raises(ValueError, match="Incompatible"):
+            manager.append_version(other, parent_version="base_v1")
+
+    def test_parent_version_kept_while_appended_to(self, manager: TrainingDataManager) -> None:
+        """Test that a parent cannot be deleted before its incremental versions."""
+        manager.save_version(self._dataset(manager, "base_v1", 10))
+        manager.append_version(self._dataset(manager, "inc_v1", 5), parent_version="base_v1")
+
+        assert manager.delete_version("base_v1") is False
+        assert manager.delete_version("inc_v1") is True
+        assert manager.delete_version("base_v1") is True
+
+    def test_merge_is_zero_copy(self, manager: TrainingDataManager) -> None:
+        """Test that merged datasets reference the chunks of their versions."""
+        first = self._dataset(manager, "merge_v1", 20)
+        second = self._dataset(manager, "merge_v2", 30)
+        manager.save_version(first)
+        manager.save_version(second)
+
+        merged = manager.merge_datasets(["merge_v1", "merge_v2"])
+
+        assert [len(chunk) for chunk in merged.chunks] == [20, 30]
+        assert all(isinstance(chunk.features, np.memmap) for chunk in merged.chunks)
+        expected_features = np.concatenate([first.features, second.features])
+        expected_labels = np.concatenate([first.labels, second.labels])
+        assert merged.metadata.checksum == manager._compute_checksum(
+            expected_features, expected_labels
+        )
+
+        version_id = manager.save_version(merged)
+        reloaded = manager.load_version(version_id)
+        np.testing.assert_array_equal(reloaded.features, expected_features)
+
+    def test_iter_batches_streams_all_rows(self, manager: TrainingDataManager) -> None:
+        """Test streaming rows across chunks in bounded batches."""
+        manager.save_version(self._dataset(manager, "base_v1", 25))
+        manager.append_version(self._dataset(manager, "inc_v1", 10), parent_version="base_v1")
+        dataset = manager.load_version("inc_v1")
+
+        batches = list(dataset.iter_batches(batch_size=10))
+
+        assert [len(labels) for _, labels in batches] == [10, 10, 5, 10]
+        np.testing.assert_array_equal(
+            np.concatenate([features for features, _ in batches]), dataset.features
+        )
@@ -0,0 +1,167 @@
+"""Benchmarks for the DMarket backtester time-stepping.
+
+Compares the indexed timeline in Backtester.run with the previous approach
+that rescanned every item's price list at each timestamp, and a vectorized
+parameter sweep with running each parameter set separately. The tests check
+that results match and count the work done (passes over the price lists)
+instead of timing it.
+"""
+
+from collections import UserList
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.dmarket import vectorized_backtester
+from src.dmarket.backtester import (
+    Backtester,
+    PricePoint,
+    SimpleArbitrageStrategy,
+    TradingStrategy,
+)
+from src.dmarket.vectorized_backtester import VectorizedBacktester
+
+
+pytestmark = pytest.mark.slow
+
+
+class _CountingList(UserList):
+    """Price list that counts how often it is iterated."""
+
+    iterations = 0
+
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+def _count_passes(backtester: Backtester) -> list[_CountingList]:
+    """Replace the price lists of all items with counting lists."""
+    price_lists = []
+    for dataset in backtester.data.values():
+        dataset.prices = _CountingList(dataset.prices)
+        price_lists.append(dataset.prices)
+    return price_lists
+
+
+def _make_backtester(num_items: int, num_days: int) -> Backtester:
+    """Create backtester with synthetic data from generate_sample_data."""
+    backtester = Backtester(initial_balance=10_000.0)
+    for i in range(num_items):
+        backtester.generate_sample_data(
+            item_id=f"item_{i}",
+            item_name=f"Item {i}",
+            base_price=5.0 + i,
+            volatility=0.05,
+            num_days=num_days,
+            points_per_day=24,
+        )
+    return backtester
+
+
+async def _run_with_rescan(
+    backtester: Backtester,
+    strategy: TradingStrategy,
+    max_positions: int = 5,
+) -> list[tuple[datetime, float]]:
+    """Reference implementation: O(T x N x P) rescan per timestamp."""
+    backtester.current_balance = backtester.initial_balance
+    backtester.trades = []
+    backtester.open_positions = []
+    backtester._trade_counter = 0
+    backtester._open_positions_value = 0.0
+
+    items = list(backtester.data.keys())
+    timestamps = sorted({p.timestamp for item in items for p in backtester.data[item].prices})
+    history: dict[str, list[PricePoint]] = {item: [] for item in items}
+    equity_curve = []
+
+    for timestamp in timestamps:
+        for item in items:
+            for price in [p for p in backtester.data[item].prices if p.timestamp == timestamp]:
+                history[item].append(price)
+                backtester._check_and_close_positions(strategy, price)
+                backtester._evaluate_and_execute_buy(strategy, price, history[item], max_positions)
+        equity = backtester.current_balance + sum(
+            pos.price * pos.quantity for pos in backtester.open_positions
+        )
+        equity_curve.append((timestamp, equity))
+
+    return equity_curve
+
+
+class TestBacktesterTimeStepping:
+    """Indexed time-stepping vs. rescanning price lists."""
+
+    @pytest.mark.asyncio()
+    async def test_indexed_run_matches_rescan(self):
+        """Indexed run produces the same equity curve and trades."""
+        backtester = _make_backtester(num_items=5, num_days=5)
+        strategy = SimpleArbitrageStrategy(buy_threshold_percent=2.0)
+
+        expected_curve = await _run_with_rescan(backtester, strategy)
+        expected_trades = [(t.item_id, t.timestamp, t.price) for t in backtester.trades]
+
+        results = await backtester.run(strategy)
+
+        assert [t for t, _ in results.equity_curve] == [t for t, _ in expected_curve]
+        for (_, actual), (_, expected) in zip(results.equity_curve, expected_curve, strict=True):
+            assert actual == pytest.approx(expected)
+        assert [(t.item_id, t.timestamp, t.price) for t in results.trades] == expected_trades
+
+    @pytest.mark.asyncio()
+    async def test_indexed_run_reads_prices_once(self):
+        """Indexed run passes over each price list once, not once per step."""
+        backtester = _make_backtester(num_items=25, num_days=7)
+        strategy = SimpleArbitrageStrategy()
+        price_lists = _count_passes(backtester)
+
+        await _run_with_rescan(backtester, strategy)
+        rescan_passes = [prices.iterations for prices in price_lists]
+
+        for prices in price_lists:
+            prices.iterations = 0
+        await backtester.run(strategy)
+        indexed_passes = [prices.iterations for prices in price_lists]
+
+        assert min(rescan_passes) > 7 * 24
+        assert max(indexed_passes) == 1
+
+
+class TestVectorizedParameterSweep:
+    """Vectorized batch vs. one Backtester.run per parameter set."""
+
+    @pytest.mark.asyncio()
+    async def test_grid_sweep_scores_signals_once(self):
+        """A 48-strategy grid computes entry scores once per signal and item."""
+        backtester = _make_backtester(num_items=20, num_days=7)
+        grid = {
+            "buy_threshold_percent": [2.0, 4.0, 6.0],
+            "min_profit_percent": [5.0, 10.0, 15.0, 20.0],
+            "max_loss_percent": [2.0, 4.0, 6.0, 8.0],
+        }
+        strategies = [
+            SimpleArbitrageStrategy(
+                buy_threshold_percent=threshold,
+                min_profit_percent=profit,
+                max_loss_percent=loss,
+            )
+            for threshold in grid["buy_threshold_percent"]
+            for profit in grid["min_profit_percent"]
+            for loss in grid["max_loss_percent"]
+        ]
+        expected = [await backtester.run(strategy) for strategy in strategies]
+
+        engine = VectorizedBacktester.from_backtester(backtester)
+        with patch.object(
+            vectorized_backtester, "_signal_scores", wraps=vectorized_backtester._signal_scores
+        ) as scores:
+            results = engine.run_grid(SimpleArbitrageStrategy, grid)
+
+        for exp, actual in zip(expected, results, strict=True):
+            assert actual.total_trades == exp.total_trades
+            assert actual.final_balance == pytest.approx(exp.final_balance)
+        # All 48 strategies share one signal: scored once per item, not per strategy
+        assert len(engine._scores) == 1
+        assert scores.call_count == len(backtester.data)
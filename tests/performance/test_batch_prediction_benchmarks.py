@@ -0,0 +1,148 @@
+"""Benchmarks for batch price prediction.
+
+A scan of a few thousand market items scored by AdaptivePricePredictor and
+EnhancedPricePredictor. Compares ``predict_batch``, which calls every model
+once on the feature matrix of the whole scan, with the previous path: one
+``predict`` per item, every model called separately for each horizon on a
+single-row matrix. The model calls of both paths are counted.
+"""
+
+from contextlib import ExitStack
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ml.enhanced_predictor import EnhancedFeatures, EnhancedPricePredictor
+from src.ml.feature_extractor import PriceFeatures
+from src.ml.price_predictor import AdaptivePricePredictor
+
+
+pytestmark = pytest.mark.slow
+
+ITEMS = 2000
+# Items scored one by one with the previous path
+SAMPLE = 100
+HORIZONS = (1, 24, 168)
+
+
+def _prices(rng: random.Random) -> list[float]:
+    return [round(rng.uniform(0.5, 500.0), 2) for _ in range(ITEMS)]
+
+
+def _count_model_calls(stack: ExitStack, *models) -> list[MagicMock]:
+    """Wrap ``predict`` of every model to record the calls and the rows passed."""
+    return [
+        stack.enter_context(patch.object(model, "predict", wraps=model.predict))
+        for model in models
+        if model is not None
+    ]
+
+
+def _rows(calls: list[MagicMock]) -> list[int]:
+    return [len(call.args[0]) for mock in calls for call in mock.call_args_list]
+
+
+class TestBatchPrediction:
+    """Matrix batch path vs. per-item, per-horizon model calls."""
+
+    def test_adaptive_batch_calls_each_model_once(self):
+        """AdaptivePricePredictor scores the scan with one call per model."""
+        rng = random.Random(42)
+        predictor = AdaptivePricePredictor(user_balance=1000.0)
+        for _ in range(200):
+            price = rng.uniform(0.5, 500.0)
+            predictor.add_training_example(
+                PriceFeatures(current_price=price, rsi=rng.uniform(20, 80)),
+                price * rng.uniform(0.9, 1.1),
+            )
+        predictor.train(force=True)
+
+        prices = _prices(rng)
+        items = [
+            {"title": f"Item {i}", "price": {"USD": str(int(price * 100))}}
+            for i, price in enumerate(prices)
+        ]
+        models = (predictor._gradient_boost, predictor._ridge)
+
+        with ExitStack() as stack:
+            calls = _count_model_calls(stack, *models)
+            for i, price in enumerate(prices[:SAMPLE]):
+                features = predictor.feature_extractor.extract_features(f"Item {i}", price)
+                for horizon in HORIZONS:
+                    predictor._ml_predict(features, horizon_hours=horizon)
+        assert _rows(calls) == [1] * SAMPLE * len(HORIZONS) * len(models)
+
+        with ExitStack() as stack:
+            calls = _count_model_calls(stack, *models)
+            batch = predictor.predict_batch(items)
+        assert len(batch) == ITEMS
+        assert _rows(calls) == [ITEMS] * len(models)
+
+        with ExitStack() as stack:
+            calls = _count_model_calls(stack, *models)
+            cached = predictor.predict_batch(items)
+        assert cached.cache_hits == ITEMS
+        assert _rows(calls) == []
+
+    def test_enhanced_batch_calls_each_model_once(self):
+        """EnhancedPricePredictor runs the ensemble once on the whole matrix."""
+        rng = random.Random(7)
+        predictor = EnhancedPricePredictor(user_balance=1000.0)
+        for _ in range(200):
+            price = rng.uniform(0.5, 500.0)
+            predictor.add_training_example(
+                EnhancedFeatures(
+                    current_price=price,
+                    rsi=rng.uniform(20, 80),
+                    volatility=rng.uniform(0.0, 0.3),
+                ),
+                price * rng.uniform(0.9, 1.1),
+            )
+        predictor.train(force=True)
+
+        prices = _prices(rng)
+        items = [
+            {"item_name": f"Item {i}", "current_price": price} for i, price in enumerate(prices)
+        ]
+        models = [
+            model
+            for model in (
+                predictor._random_forest,
+                predictor._xgboost,
+                predictor._gradient_boost,
+                predictor._ridge,
+            )
+            if model is not None
+        ]
+
+        with ExitStack() as stack:
+            calls = _count_model_calls(stack, *models)
+            single = []
+            for i, price in enumerate(prices[:SAMPLE]):
+                features = predictor.feature_extractor.extract_features(f"Item {i}", price)
+                single.append(round(predictor._ensemble_predict(features, horizon_hours=24)[0], 2))
+                for horizon in (1, 168):
+                    predictor._ensemble_predict(features, horizon_hours=horizon)
+        assert _rows(calls) == [1] * SAMPLE * len(HORIZONS) * len(models)
+
+        with ExitStack() as stack:
+            calls = _count_model_calls(stack, *models)
+            # predict_batch takes the ensemble path only when the models count as trained
+            stack.enter_context(patch.object(predictor, "_has_trained_models", return_value=True))
+            batch = predictor.predict_batch(items)
+        assert len(batch) == ITEMS
+        assert batch.predicted_price_24h.shape == (ITEMS,)
+        assert _rows(calls) == [ITEMS] * len(models)
+        assert batch.predicted_price_24h[:SAMPLE].tolist() == pytest.approx(single, abs=0.011)
+
+    @pytest.mark.parametrize("horizon", ["1h", "24h", "7d"])
+    def test_batch_columns_match_rows(self, horizon):
+        """Columns of the batch hold the same values as the row predictions."""
+        predictor = AdaptivePricePredictor()
+        items = [{"title": f"Item {i}", "price": 100 + i} for i in range(50)]
+
+        batch = predictor.predict_batch(items)
+
+        expected = [p.expected_profit_percent(horizon) for p in batch.predictions]
+        assert batch.expected_profit_percent(horizon).tolist() == pytest.approx(expected)
@@ -0,0 +1,111 @@
+"""Benchmarks for bulk price collection.
+
+A nightly collection of a few thousand items from DMarket (cursor pages)
+and Waxpeer (one bulk response). Checks that the sources are collected
+concurrently, counting the requests in flight, and that streaming pages to
+a JSON Lines sink does not hold the prices in
+``MultiSourceResult.all_prices``.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.ml.real_price_collector import GameType, JsonlPriceSink, RealPriceCollector
+
+
+pytestmark = pytest.mark.slow
+
+ITEMS = 3000
+PAGE_SIZE = RealPriceCollector.MAX_BATCH_SIZE
+
+
+class _Requests:
+    """Requests in flight across both sources."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.dmarket_page_served = asyncio.Event()
+
+    def __enter__(self) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.in_flight -= 1
+
+
+class _DMarket:
+    def __init__(self, requests: _Requests) -> None:
+        self.requests = requests
+        self.pages = 0
+
+    async def get_market_items(self, game: str, limit: int, cursor: str = "") -> dict:
+        with self.requests:
+            await asyncio.sleep(0)
+            self.pages += 1
+            self.requests.dmarket_page_served.set()
+            start = int(cursor or 0)
+            end = min(start + limit, ITEMS)
+            return {
+                "objects": [
+                    {"title": f"Item {i}", "itemId": f"id{i}", "price": {"USD": str(100 + i)}}
+                    for i in range(start, end)
+                ],
+                "cursor": str(end) if end < ITEMS else "",
+            }
+
+
+class _Waxpeer:
+    def __init__(self, requests: _Requests) -> None:
+        self.requests = requests
+
+    async def get_bulk_prices(self, game: str) -> dict:
+        with self.requests:
+            # The bulk response is slow: it arrives after DMarket served a page
+            await self.requests.dmarket_page_served.wait()
+            return {f"Item {i}": {"price": 1000 + i, "count": 1} for i in range(ITEMS)}
+
+
+def _collector() -> tuple[RealPriceCollector, _Requests, _DMarket]:
+    requests = _Requests()
+    dmarket = _DMarket(requests)
+    return (
+        RealPriceCollector(dmarket_api=dmarket, waxpeer_api=_Waxpeer(requests)),
+        requests,
+        dmarket,
+    )
+
+
+class TestBulkCollection:
+    """Concurrent, streamed collection vs. sequential, in-memory collection."""
+
+    async def test_sources_are_collected_concurrently(self):
+        """DMarket pages are fetched while the Waxpeer bulk request is pending."""
+        collector, requests, _ = _collector()
+        dmarket = await collector._collect_dmarket_bulk(GameType.CSGO, None)
+        waxpeer = await collector._collect_waxpeer_bulk(GameType.CSGO, None)
+        assert len(dmarket.prices) + len(waxpeer.prices) == 2 * ITEMS
+        assert requests.peak == 1
+
+        collector, requests, dmarket_api = _collector()
+        result = await collector.collect_bulk_prices(GameType.CSGO, limit=None)
+
+        assert result.total_items == len(result.all_prices) == 2 * ITEMS
+        assert requests.peak == 2
+        assert dmarket_api.pages == -(-ITEMS // PAGE_SIZE)
+
+    async def test_streamed_prices_are_not_held(self, tmp_path: Path):
+        """Pages streamed to the sink are written out, not kept in the result."""
+        collector, _, _ = _collector()
+        sink = JsonlPriceSink(tmp_path / "prices.jsonl")
+
+        streamed = await collector.collect_bulk_prices(GameType.CSGO, limit=None, sink=sink)
+
+        assert streamed.total_items == streamed.streamed_items == 2 * ITEMS
+        assert streamed.all_prices == []
+        assert sink.rows_written == 2 * ITEMS
+        with open(sink.path, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == 2 * ITEMS
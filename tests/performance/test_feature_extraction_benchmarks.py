@@ -0,0 +1,140 @@
+"""Benchmarks for columnar feature extraction.
+
+A scan of a few thousand items with price, sales and offer histories.
+Compares ``extract_batch``/``extract_matrix``, which compute every feature
+with windowed reductions over the whole scan, with extracting the items one
+by one as ``batch_extract`` used to. The columnar passes and the segment
+reductions run over the histories are counted: per scan for the batch path,
+per item for the previous one.
+"""
+
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+import random
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.ml import feature_extractor
+from src.ml.enhanced_predictor import EnhancedFeatureExtractor
+from src.ml.feature_extractor import MarketFeatureExtractor, MarketHistoryBatch
+
+
+pytestmark = pytest.mark.slow
+
+ITEMS = 2000
+# Items extracted one by one with the previous path
+SAMPLE = 200
+
+
+def _histories(rng: random.Random, now: datetime) -> tuple[list, list, list, list]:
+    current_prices, price_histories, sales_histories, market_offers = [], [], [], []
+    for _ in range(ITEMS):
+        price = rng.uniform(1.0, 300.0)
+        current_prices.append(price)
+        price_histories.append([
+            (now - timedelta(hours=hours), price * rng.uniform(0.9, 1.1))
+            for hours in range(168, 0, -2)
+        ])
+        sales_histories.append([
+            {"timestamp": (now - timedelta(hours=rng.uniform(0, 240))).isoformat()}
+            for _ in range(20)
+        ])
+        market_offers.append([
+            {"price": {"USD": int(price * rng.uniform(0.9, 1.2) * 100)}} for _ in range(15)
+        ])
+    return current_prices, price_histories, sales_histories, market_offers
+
+
+@contextmanager
+def _count_passes():
+    """Count columnar passes and segment reductions over the histories."""
+    with (
+        patch.object(
+            MarketHistoryBatch,
+            "history_columns",
+            autospec=True,
+            side_effect=MarketHistoryBatch.history_columns,
+        ) as passes,
+        patch.object(
+            feature_extractor, "_segment_reduce", wraps=feature_extractor._segment_reduce
+        ) as reductions,
+    ):
+        yield passes, reductions
+
+
+class TestFeatureExtraction:
+    """Columnar batch extraction vs. one item at a time."""
+
+    def test_market_batch_reduces_once_per_scan(self):
+        """MarketFeatureExtractor extracts the scan in one columnar pass."""
+        now = datetime.now(UTC)
+        histories = _histories(random.Random(42), now)
+        extractor = MarketFeatureExtractor()
+
+        with _count_passes() as (passes, reductions):
+            single = [
+                extractor.extract_batch(*([value] for value in item), now=now)[0]
+                for item in list(zip(*histories, strict=True))[:SAMPLE]
+            ]
+        per_item = reductions.call_count // SAMPLE
+        assert passes.call_count == SAMPLE
+        assert per_item > 0
+
+        with _count_passes() as (passes, reductions):
+            features = extractor.extract_batch(*histories, now=now)
+            matrix = extractor.extract_matrix(
+                MarketHistoryBatch.from_histories(*histories), now=now
+            )
+
+        # Each path makes one pass over the whole scan, not one per item
+        assert passes.call_count == 2
+        assert reductions.call_count == 2 * per_item
+        np.testing.assert_array_equal(matrix, np.vstack([f.to_array() for f in features]))
+        np.testing.assert_allclose(
+            matrix[:SAMPLE], np.vstack([f.to_array() for f in single]), rtol=1e-9
+        )
+
+    def test_enhanced_batch_reduces_once_per_scan(self):
+        """EnhancedFeatureExtractor computes history features in one pass."""
+        now = datetime.now(UTC)
+        current_prices, price_histories, sales_histories, market_offers = _histories(
+            random.Random(7), now
+        )
+        names = [f"Item {i}" for i in range(ITEMS)]
+        extractor = EnhancedFeatureExtractor()
+
+        with _count_passes() as (passes, reductions):
+            single = [
+                extractor.extract_batch(
+                    item_names=[names[i]],
+                    current_prices=[current_prices[i]],
+                    price_histories=[price_histories[i]],
+                    sales_histories=[sales_histories[i]],
+                    market_offers=[market_offers[i]],
+                    now=now,
+                )[0]
+                for i in range(SAMPLE)
+            ]
+        per_item = reductions.call_count // SAMPLE
+        assert passes.call_count == SAMPLE
+
+        with _count_passes() as (passes, reductions):
+            features = extractor.extract_batch(
+                item_names=names,
+                current_prices=current_prices,
+                price_histories=price_histories,
+                sales_histories=sales_histories,
+                market_offers=market_offers,
+                now=now,
+            )
+
+        assert len(features) == ITEMS
+        assert passes.call_count == 1
+        assert reductions.call_count == per_item
+        np.testing.assert_allclose(
+            np.vstack([f.to_array() for f in features[:SAMPLE]]),
+            np.vstack([f.to_array() for f in single]),
+            rtol=1e-9,
+        )
@@ -0,0 +1,65 @@
+"""Benchmarks for bulk market_data inserts.
+
+Compares the multi-row INSERT used by DatabaseManager.bulk_save_market_data
+on SQLite with the previous executemany of a single-row INSERT, by counting
+the statements sent to the driver.
+"""
+
+import math
+
+import pytest
+from sqlalchemy import event, text
+
+from src.utils import database
+from src.utils.database import DatabaseManager
+
+
+pytestmark = pytest.mark.slow
+
+ROWS = 5000
+
+
+@pytest.fixture()
+async def file_db(tmp_path):
+    """File-backed SQLite database (as used in production)."""
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'ingest.db'}")
+    await db.init_database()
+    yield db
+    await db.close()
+
+
+def _rows() -> list[dict]:
+    return [
+        {
+            "item_id": f"item_{i}",
+            "game": "csgo",
+            "item_name": f"Item {i}",
+            "price_usd": 1.0 + i / 100,
+        }
+        for i in range(ROWS)
+    ]
+
+
+class TestMarketDataBulkInsert:
+    """Multi-row INSERT vs. executemany."""
+
+    @pytest.mark.asyncio()
+    async def test_multirow_insert_batches_rows(self, file_db):
+        """Multi-row INSERT stores the rows in a few statements."""
+        inserts: list[tuple[bool, int]] = []
+
+        def track(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("INSERT INTO market_data"):
+                rows = len(parameters) if executemany else statement.count("), (") + 1
+                inserts.append((executemany, rows))
+
+        event.listen(file_db.async_engine.sync_engine, "before_cursor_execute", track)
+
+        await file_db.bulk_save_market_data(_rows())
+
+        async with file_db.get_async_session() as session:
+            count = await session.execute(text("SELECT COUNT(*) FROM market_data"))
+            assert count.scalar_one() == ROWS
+        assert len(inserts) == math.ceil(ROWS / database._SQLITE_ROWS_PER_INSERT)
+        assert not any(executemany for executemany, _ in inserts)
+        assert sum(rows for _, rows in inserts) == ROWS
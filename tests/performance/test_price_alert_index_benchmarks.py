@@ -0,0 +1,131 @@
+"""Benchmarks for threshold-indexed price alerts.
+
+100k above/below alerts on a few popular items, checked on a stream of price
+ticks. Compares the sorted threshold index used by
+RealtimePriceWatcher._check_alerts and AlertManager.check_alerts with the
+previous linear scan over every alert of the item, by counting how many
+alert conditions each approach evaluates.
+"""
+
+from decimal import Decimal
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.dmarket.realtime_price_watcher import PriceAlert, RealtimePriceWatcher
+from src.telegram_bot.notifications.custom_alerts import (
+    Alert,
+    AlertCondition,
+    AlertConfig,
+    AlertManager,
+    AlertType,
+)
+
+
+pytestmark = pytest.mark.slow
+
+ALERTS = 100_000
+ITEMS = 20
+TICKS = 500
+
+
+def _ticks(rng: random.Random) -> list[tuple[str, float]]:
+    """Random-walk prices around 50 for every item."""
+    prices = dict.fromkeys(range(ITEMS), 50.0)
+    ticks = []
+    for _ in range(TICKS):
+        item = rng.randrange(ITEMS)
+        prices[item] = min(99.0, max(1.0, prices[item] * rng.uniform(0.97, 1.03)))
+        ticks.append((f"item_{item}", round(prices[item], 2)))
+    return ticks
+
+
+def _threshold(rng: random.Random, below: bool) -> float:
+    """Alert threshold that is not crossed at the starting price of 50."""
+    return round(rng.uniform(1.0, 49.0) if below else rng.uniform(51.0, 100.0), 2)
+
+
+def _watcher_alerts(rng: random.Random) -> list[PriceAlert]:
+    return [
+        PriceAlert(
+            f"item_{i % ITEMS}",
+            f"Item {i % ITEMS}",
+            _threshold(rng, below=bool(i % 2)),
+            "below" if i % 2 else "above",
+        )
+        for i in range(ALERTS)
+    ]
+
+
+class TestPriceAlertIndex:
+    """Sorted threshold index vs. linear scan of all alerts."""
+
+    @pytest.mark.asyncio()
+    async def test_watcher_index_checks_crossed_alerts_only(self):
+        """RealtimePriceWatcher evaluates only the alerts it triggers."""
+        rng = random.Random(42)
+        ticks = _ticks(rng)
+        with patch("src.dmarket.realtime_price_watcher.DMarketWebSocketClient"):
+            watcher = RealtimePriceWatcher(MagicMock())
+        watcher.add_price_alerts(_watcher_alerts(rng))
+
+        linear_checks = 0
+        linear_triggered = set()
+        for item_id, price in ticks:
+            for alert in watcher.price_alerts[item_id]:
+                if not alert.is_triggered:
+                    linear_checks += 1
+                    if alert.check_condition(price):
+                        alert.is_triggered = True
+                        linear_triggered.add(id(alert))
+        watcher.reset_triggered_alerts()
+
+        triggered = []
+
+        async def on_alert(alert: PriceAlert, price: float) -> None:
+            triggered.append(alert)
+
+        watcher.register_alert_handler(on_alert)
+        with patch.object(
+            PriceAlert, "check_condition", autospec=True, side_effect=PriceAlert.check_condition
+        ) as check:
+            for item_id, price in ticks:
+                await watcher._check_alerts(item_id, price)
+
+        assert {id(alert) for alert in triggered} == linear_triggered
+        assert check.call_count == len(triggered)
+        assert linear_checks > 100 * check.call_count
+
+    @pytest.mark.asyncio()
+    async def test_alert_manager_index_checks_crossed_alerts_only(self):
+        """AlertManager.check_alerts only touches alerts of crossed thresholds."""
+        rng = random.Random(7)
+        ticks = _ticks(rng)
+        manager = AlertManager(
+            config=AlertConfig(max_triggers_per_hour=ALERTS, min_trigger_interval_seconds=3600)
+        )
+        alerts = [
+            Alert(
+                alert_id=f"alert_{i}",
+                user_id=i % 5000,
+                alert_type=AlertType.PRICE_THRESHOLD,
+                item_name=f"item_{i % ITEMS}",
+                condition=AlertCondition.BELOW if i % 2 else AlertCondition.ABOVE,
+                target_value=Decimal(str(_threshold(rng, below=bool(i % 2)))),
+            )
+            for i in range(ALERTS)
+        ]
+        manager.load_alerts(alerts)
+
+        triggered = 0
+        with patch.object(
+            Alert, "check_condition", autospec=True, side_effect=Alert.check_condition
+        ) as check:
+            for item, price in ticks:
+                triggered += len(await manager.check_alerts({item: Decimal(str(price))}))
+
+        # The previous approach evaluated every active alert on every check
+        assert triggered > 0
+        assert check.call_count == triggered
+        assert check.call_count * 100 < ALERTS * TICKS / ITEMS
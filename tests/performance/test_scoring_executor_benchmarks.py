@@ -0,0 +1,112 @@
+"""Benchmarks for event loop responsiveness during AI scans.
+
+AICoordinator.scan_and_decide over a large scan. Compares scoring on the
+scoring executor with the previous path: make_decision for batches of 20
+items gathered on the event loop, where all model work ran synchronously
+inside the coroutines. Checks where the model work runs and that other
+coroutines keep running while the scan is scored.
+"""
+
+import asyncio
+import random
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.ml.ai_coordinator import AICoordinator, TradeAction, TradeDecision
+from src.ml.enhanced_predictor import EnhancedFeatures
+
+
+pytestmark = pytest.mark.slow
+
+ITEMS = 200
+BATCH = 20  # gather batch of the previous scan_and_decide
+
+
+def _items(rng: random.Random) -> list[dict]:
+    items = []
+    for i in range(ITEMS):
+        price = rng.uniform(1.0, 300.0)
+        items.append({
+            "title": f"Item {i}",
+            "itemId": f"item{i}",
+            "gameId": "csgo",
+            "price": {"USD": int(price * 100)},
+            "suggestedPrice": {"USD": int(price * rng.uniform(1.0, 1.4) * 100)},
+            "priceHistory": [round(price * rng.uniform(0.9, 1.1), 2) for _ in range(30)],
+        })
+    return items
+
+
+def _coordinator(rng: random.Random) -> AICoordinator:
+    coordinator = AICoordinator(user_balance=1000.0)
+    predictor = coordinator._get_price_predictor()
+    for _ in range(200):
+        price = rng.uniform(1.0, 300.0)
+        predictor.add_training_example(
+            EnhancedFeatures(current_price=price, rsi=rng.uniform(20, 80)),
+            price * rng.uniform(0.9, 1.1),
+        )
+    predictor.train(force=True)
+    return coordinator
+
+
+async def _scan_on_loop(coordinator: AICoordinator, items: list[dict]) -> list[TradeDecision]:
+    """Previous scan: per-item scoring inside coroutines on the event loop."""
+
+    async def make_decision(item: dict) -> TradeDecision:
+        return coordinator._decide(coordinator._score_item(item))
+
+    decisions = []
+    for i in range(0, len(items), BATCH):
+        decisions += await asyncio.gather(*(make_decision(item) for item in items[i : i + BATCH]))
+    return decisions
+
+
+class TestScanEventLoop:
+    """Scan scoring on the executor vs. scoring on the loop."""
+
+    async def test_executor_keeps_loop_responsive(self):
+        """Model work runs off the loop, which keeps serving other coroutines."""
+        rng = random.Random(42)
+        items = _items(rng)
+        coordinator = _coordinator(rng)
+
+        on_loop = await _scan_on_loop(coordinator, items)
+        expected = sorted(
+            (d.item_name, d.action)
+            for d in on_loop
+            if d.action not in {TradeAction.HOLD, TradeAction.SKIP}
+        )
+        coordinator._get_price_predictor()._prediction_cache.clear()
+
+        loop_thread = threading.get_ident()
+        heartbeats = 0
+        chunks: list[tuple[int, int]] = []  # (scoring thread, heartbeats at chunk start)
+        score_items = coordinator._score_items
+
+        def record_chunk(chunk: list[dict]) -> list:
+            chunks.append((threading.get_ident(), heartbeats))
+            return score_items(chunk)
+
+        async def heartbeat() -> None:
+            nonlocal heartbeats
+            while True:
+                heartbeats += 1
+                await asyncio.sleep(0.001)
+
+        beating = asyncio.create_task(heartbeat())
+        try:
+            with patch.object(coordinator, "_score_items", side_effect=record_chunk):
+                decisions = await coordinator.scan_and_decide(items, max_decisions=ITEMS)
+        finally:
+            beating.cancel()
+
+        stats = coordinator.get_statistics()["scoring_executor"]
+        assert sorted((d.item_name, d.action) for d in decisions) == expected
+        assert stats["items_scored"] == ITEMS
+        assert stats["chunks"] == len(chunks) > 1
+        assert all(thread != loop_thread for thread, _ in chunks)
+        # The loop ran other coroutines between the chunks of the scan
+        assert chunks[-1][1] > chunks[0][1]
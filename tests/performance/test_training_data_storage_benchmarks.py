@@ -0,0 +1,78 @@
+"""Benchmarks for memory-mapped training dataset storage.
+
+A nightly dataset of a few hundred thousand rows with an incremental
+version on top. Checks that loading, merging and streaming the versions
+keep the rows memory-mapped: no row array is read into RAM or concatenated,
+and the incremental version stores only its own rows.
+"""
+
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.ml.training_data_manager import DatasetMetadata, TrainingDataManager, TrainingDataset
+
+
+pytestmark = pytest.mark.slow
+
+ROWS = 400_000
+NEW_ROWS = 40_000
+FEATURES = 24
+
+
+def _dataset(manager: TrainingDataManager, version_id: str, rows: int) -> TrainingDataset:
+    rng = np.random.default_rng(rows)
+    features = rng.random((rows, FEATURES), dtype=np.float32)
+    labels = rng.random(rows, dtype=np.float32)
+    return TrainingDataset(
+        features=features,
+        labels=labels,
+        item_names=[f"item_{i}" for i in range(rows)],
+        metadata=DatasetMetadata(
+            version_id=version_id,
+            created_at=datetime.now(UTC),
+            game="csgo",
+            sources=["dmarket"],
+            total_samples=rows,
+            price_range=(float(labels.min()), float(labels.max())),
+            features_count=FEATURES,
+            checksum=manager._compute_checksum(features, labels),
+        ),
+        feature_names=[f"f{i}" for i in range(FEATURES)],
+    )
+
+
+class TestTrainingDataStorage:
+    """Memory-mapped chunks vs. arrays read into RAM."""
+
+    def test_mmap_load_and_merge(self, tmp_path: Path):
+        """Loading and merging versions does not read the rows into RAM."""
+        manager = TrainingDataManager(data_dir=tmp_path, enable_cache=False)
+        manager.save_version(_dataset(manager, "nightly_base", ROWS))
+        manager.append_version(_dataset(manager, "nightly_inc", NEW_ROWS), "nightly_base")
+
+        stored = np.load(tmp_path / "versions" / "nightly_inc" / "features.npy", mmap_mode="r")
+        assert stored.shape == (NEW_ROWS, FEATURES)
+
+        in_ram = manager.load_version("nightly_inc", mmap=False)
+        with patch.object(np, "concatenate", wraps=np.concatenate) as concatenate:
+            loaded = manager.load_version("nightly_inc", verify_checksum=False)
+            merged = manager.merge_datasets(["nightly_base", "nightly_inc"])
+            batches = list(loaded.iter_batches(50_000))
+
+        assert concatenate.call_count == 0
+        assert [len(chunk) for chunk in loaded.chunks] == [ROWS, NEW_ROWS]
+        assert len(merged.chunks) == 3
+        chunks = [*loaded.chunks, *merged.chunks]
+        assert all(isinstance(chunk.features, np.memmap) for chunk in chunks)
+        assert all(isinstance(chunk.labels, np.memmap) for chunk in chunks)
+        assert all(isinstance(features, np.memmap) for features, _ in batches)
+        assert max(len(labels) for _, labels in batches) == 50_000
+        assert sum(len(labels) for _, labels in batches) == ROWS + NEW_ROWS
+        np.testing.assert_allclose(
+            sum(float(labels.sum(dtype=np.float64)) for _, labels in batches),
+            float(in_ram.labels.sum(dtype=np.float64)),
+        )
@@ -334,6 +334,140 @@ class TestRunBacktest:
             assert "failed" in last_call[0][0].lower()
 
 
+# ============================================================================
+# Parameter sweep Tests
+# ============================================================================
+class TestParameterSweep:
+    """Tests for the background parameter sweep."""
+
+    @pytest.fixture()
+    def sweep_query(self, mock_callback_query):
+        """Callback query with a chat."""
+        mock_callback_query.message = MagicMock()
+        mock_callback_query.message.chat_id = 42
+        return mock_callback_query
+
+    @pytest.fixture()
+    def sweep_context(self, mock_context):
+        """Context with a bot."""
+        mock_context.bot = MagicMock()
+        mock_context.bot.send_message = AsyncMock()
+        return mock_context
+
+    @pytest.mark.asyncio()
+    async def test_command_shows_sweep_button(
+        self, backtest_handler, mock_update, mock_context
+    ):
+        """Command keyboard offers a parameter sweep."""
+        await backtest_handler.handle_backtest_command(mock_update, mock_context)
+
+        markup = mock_update.message.reply_text.call_args[1]["reply_markup"]
+        callbacks = [button.callback_data for row in markup.inline_keyboard for button in row]
+        assert "backtest:sweep:30" in callbacks
+
+    @pytest.mark.asyncio()
+    async def test_callback_starts_sweep_in_background(
+        self, backtest_handler, sweep_query, sweep_context
+    ):
+        """Sweep callback replies immediately and runs the sweep as a task."""
+        update = MagicMock()
+        update.callback_query = sweep_query
+        sweep_query.data = "backtest:sweep:14"
+
+        with patch.object(backtest_handler, "_run_sweep", AsyncMock()) as run_sweep:
+            await backtest_handler.handle_callback(update, sweep_context)
+            await backtest_handler._sweep_tasks[42]
+
+        run_sweep.assert_awaited_once_with(sweep_context.bot, 42, 14)
+        assert "started" in sweep_query.edit_message_text.call_args[0][0]
+
+    @pytest.mark.asyncio()
+    async def test_sweep_already_running(
+        self, backtest_handler, sweep_query, sweep_context
+    ):
+        """Only one sweep runs per chat."""
+        running = MagicMock()
+        running.done.return_value = False
+        backtest_handler._sweep_tasks[42] = running
+
+        await backtest_handler._start_sweep(sweep_query, sweep_context, 30)
+
+        assert "already running" in sweep_query.edit_message_text.call_args[0][0]
+        assert backtest_handler._sweep_tasks[42] is running
+
+    @pytest.mark.asyncio()
+    async def test_sweep_no_api(self, sweep_query, sweep_context):
+        """Sweep needs an API client."""
+        handler = BacktestHandler(api=None)
+
+        await handler._start_sweep(sweep_query, sweep_context, 30)
+
+        assert "not configured" in sweep_query.edit_message_text.call_args[0][0]
+        assert handler._sweep_tasks == {}
+
+    @pytest.mark.asyncio()
+    async def test_run_sweep_sends_ranked_table(self, backtest_handler):
+        """Completed sweep sends the ranked table to the chat."""
+        from src.analytics.historical_data import PriceHistory, PricePoint
+
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        history = PriceHistory(
+            game="csgo",
+            title="AK-47 | Redline (Field-Tested)",
+            points=[
+                PricePoint(
+                    game="csgo",
+                    title="AK-47 | Redline (Field-Tested)",
+                    price=Decimal("10.00"),
+                    timestamp=start,
+                )
+            ],
+        )
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+
+        with (
+            patch(
+                "src.telegram_bot.handlers.backtest_handler.HistoricalDataCollector"
+            ) as mock_collector,
+            patch(
+                "src.telegram_bot.handlers.backtest_handler.ParameterSweepRunner"
+            ) as mock_runner,
+        ):
+            mock_collector.return_value.collect_batch = AsyncMock(
+                return_value={history.title: history}
+            )
+            mock_runner.from_backtester.return_value.run = AsyncMock(return_value=[])
+
+            await backtest_handler._run_sweep(bot, 42, 30)
+
+        backtester = mock_runner.from_backtester.call_args[0][0]
+        assert list(backtester.data) == [history.title]
+        assert backtester.initial_balance == 100.0
+        jobs = mock_runner.from_backtester.return_value.run.call_args[0][0]
+        assert len(jobs) == 36
+        text = bot.send_message.call_args[1]["text"]
+        assert "Parameter Sweep Results" in text
+        assert 42 not in backtest_handler._sweep_tasks
+
+    @pytest.mark.asyncio()
+    async def test_run_sweep_error(self, backtest_handler):
+        """Sweep errors are reported to the chat."""
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+
+        with patch(
+            "src.telegram_bot.handlers.backtest_handler.HistoricalDataCollector"
+        ) as mock_collector:
+            mock_collector.return_value.collect_batch = AsyncMock(
+                side_effect=Exception("Test error")
+            )
+
+            await backtest_handler._run_sweep(bot, 42, 30)
+
+        assert "Sweep failed" in bot.send_message.call_args[1]["text"]
+
+
 # ============================================================================
 # _display_result Tests
 # ============================================================================
@@ -0,0 +1,135 @@
+"""Тесты для CallbackRouter (trie-диспетчеризация callback-запросов)."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.telegram_bot.handlers.callback_registry import create_callback_router
+from src.telegram_bot.handlers.callback_router import (
+    UNMATCHED_ROUTE,
+    CallbackRouter,
+    RouteConflictError,
+)
+
+
+def _update(callback_data: str) -> MagicMock:
+    update = MagicMock()
+    update.callback_query.data = callback_data
+    update.callback_query.answer = AsyncMock()
+    return update
+
+
+class TestResolve:
+    """Тесты выбора обработчика."""
+
+    def test_longest_prefix_wins_regardless_of_order(self):
+        """Самый длинный префикс выбирается независимо от порядка регистрации."""
+        short, long = AsyncMock(), AsyncMock()
+        router = CallbackRouter()
+        router.register_prefix("game_", short)
+        router.register_prefix("game_selected:", long)
+
+        assert router.resolve("game_selected:csgo") == ("game_selected:", long)
+        assert router.resolve("game_dota2") == ("game_", short)
+        assert router.resolve("gam") is None
+
+    def test_exact_before_prefix_before_pattern(self):
+        """Точное совпадение важнее префикса, префикс - пользовательского matcher."""
+        exact, prefix, pattern = AsyncMock(), AsyncMock(), AsyncMock()
+
+        def is_numeric(data: str) -> bool:
+            return data.isdigit()
+
+        router = CallbackRouter()
+        router.register_pattern(is_numeric, pattern)
+        router.register_prefix("lang_", prefix)
+        router.register_exact("lang_", exact)
+
+        assert router.resolve("lang_") == ("lang_", exact)
+        assert router.resolve("lang_ru") == ("lang_", prefix)
+        assert router.resolve("42") == ("pattern:is_numeric", pattern)
+
+    def test_registry_routes(self):
+        """Роутер приложения собирается без конфликтов."""
+        router = create_callback_router()
+
+        route, _ = router.resolve("game_selected:csgo")
+
+        assert route == "game_selected:"
+
+
+class TestConflicts:
+    """Тесты обнаружения конфликтующих регистраций."""
+
+    def test_conflicting_exact_handler_rejected(self):
+        """Второй обработчик для той же callback_data - ошибка."""
+        router = CallbackRouter()
+        router.register_exact("help", AsyncMock())
+
+        with pytest.raises(RouteConflictError, match="help"):
+            router.register_exact("help", AsyncMock())
+
+    def test_conflicting_prefix_handler_rejected(self):
+        """Второй обработчик для того же префикса - ошибка."""
+        router = CallbackRouter()
+        router.register_prefix("risk_", AsyncMock())
+
+        with pytest.raises(RouteConflictError, match="risk_"):
+            router.register_prefix("risk_", AsyncMock())
+
+    def test_same_handler_can_be_registered_twice(self):
+        """Повторная регистрация того же обработчика допустима."""
+        handler = AsyncMock()
+        router = CallbackRouter()
+        router.register_exact("back", handler)
+        router.register_exact("back", handler)
+        router.register_prefix("arb_set_", handler)
+        router.register_prefix("arb_set_", handler)
+
+        assert len(router._prefix_handlers) == 1
+
+    def test_empty_prefix_rejected(self):
+        """Пустой префикс перехватил бы все callback-запросы."""
+        with pytest.raises(ValueError, match="empty"):
+            CallbackRouter().register_prefix("", AsyncMock())
+
+
+class TestRoute:
+    """Тесты вызова обработчиков и статистики маршрутов."""
+
+    @pytest.mark.asyncio()
+    async def test_route_calls_handler_and_records_stats(self):
+        """Обработчик вызывается, попадание учитывается по маршруту."""
+        handler = AsyncMock()
+        router = CallbackRouter()
+        router.register_prefix("filter:", handler)
+        update, context = _update("filter:price"), MagicMock()
+
+        assert await router.route(update, context) is True
+        assert await router.route(_update("filter:rarity"), context) is True
+
+        handler.assert_any_await(update, context)
+        assert handler.await_count == 2
+        update.callback_query.answer.assert_awaited_once()
+        stats = router.get_route_stats()["filter:"]
+        assert stats.hits == 2
+        assert stats.max_seconds >= stats.avg_seconds >= 0
+
+    @pytest.mark.asyncio()
+    async def test_unmatched_callback(self):
+        """Без обработчика route возвращает False и учитывает промах."""
+        router = CallbackRouter()
+
+        assert await router.route(_update("unknown"), MagicMock()) is False
+        assert router.get_route_stats()[UNMATCHED_ROUTE].hits == 1
+
+    @pytest.mark.asyncio()
+    async def test_failing_handler_still_recorded(self):
+        """Время обработчика учитывается и при исключении."""
+        router = CallbackRouter()
+        router.register_exact("boom", AsyncMock(side_effect=RuntimeError("boom")))
+
+        with pytest.raises(RuntimeError):
+            await router.route(_update("boom"), MagicMock())
+
+        assert router.get_route_stats()["boom"].hits == 1
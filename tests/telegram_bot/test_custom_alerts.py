@@ -471,3 +471,98 @@ class TestGlobalFunctions:
         init_alert_manager(user_id=789)
         manager = get_alert_manager()
         assert manager is not None
+
+
+class TestAlertIndex:
+    """Tests for threshold-indexed alert checking."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create test manager."""
+        return AlertManager(user_id=123)
+
+    @pytest.mark.asyncio
+    async def test_only_crossed_thresholds_trigger(self, manager):
+        """Test that only alerts whose threshold is crossed are triggered."""
+        below_low = manager.create_price_alert("Item", 80.0, condition="below")
+        below_high = manager.create_price_alert("Item", 120.0, condition="below")
+        above = manager.create_price_alert("Item", 95.0, condition="above")
+        manager.create_price_alert("Other", 200.0, condition="below")
+
+        triggered = await manager.check_alerts({"Item": Decimal("100.0")})
+
+        assert {t.alert.alert_id for t in triggered} == {below_high.alert_id, above.alert_id}
+        assert below_low.trigger_count == 0
+
+    @pytest.mark.asyncio
+    async def test_alert_rearms_after_cooldown(self, manager):
+        """Test that a triggered alert can trigger again after the interval."""
+        alert = manager.create_price_alert("Item", 100.0, condition="below")
+        prices = {"Item": Decimal("90.0")}
+
+        assert len(await manager.check_alerts(prices)) == 1
+        assert await manager.check_alerts(prices) == []
+
+        alert.last_triggered = datetime.now(UTC) - timedelta(minutes=5)
+        manager._rearm_heap = [(alert.last_triggered, alert.alert_id)]
+
+        assert len(await manager.check_alerts(prices)) == 1
+
+    @pytest.mark.asyncio
+    async def test_update_pause_and_delete_are_respected(self, manager):
+        """Test that index follows target, status and deletion changes."""
+        moved = manager.create_price_alert("Item", 100.0, condition="below")
+        paused = manager.create_price_alert("Item", 100.0, condition="below")
+        deleted = manager.create_price_alert("Item", 100.0, condition="below")
+
+        manager.update_alert(moved.alert_id, target_value=50.0)
+        manager.pause_alert(paused.alert_id)
+        manager.delete_alert(deleted.alert_id)
+
+        assert await manager.check_alerts({"Item": Decimal("90.0")}) == []
+
+        manager.resume_alert(paused.alert_id)
+        triggered = await manager.check_alerts({"Item": Decimal("40.0")})
+        assert {t.alert.alert_id for t in triggered} == {moved.alert_id, paused.alert_id}
+
+    @pytest.mark.asyncio
+    async def test_expired_alert_is_marked_expired(self, manager):
+        """Test that expired alerts are marked without being triggered."""
+        alert = manager.create_price_alert("Item", 100.0, condition="below")
+        alert.expires_at = datetime.now(UTC) - timedelta(seconds=1)
+        manager._expiry_heap = [(alert.expires_at, alert.alert_id)]
+
+        assert await manager.check_alerts({"Other": Decimal("1.0")}) == []
+        assert alert.status == AlertStatus.EXPIRED
+
+    @pytest.mark.asyncio
+    async def test_load_alerts_bulk(self, manager):
+        """Test bulk loading stored alerts, including non-threshold ones."""
+        alerts = [
+            Alert(
+                alert_id=f"alert_{i}",
+                user_id=i % 3,
+                alert_type=AlertType.PRICE_THRESHOLD,
+                item_name="Item",
+                condition=AlertCondition.BELOW,
+                target_value=Decimal(i),
+            )
+            for i in range(100)
+        ]
+        alerts.append(
+            Alert(
+                alert_id="alert_change",
+                user_id=1,
+                alert_type=AlertType.PRICE_CHANGE,
+                item_name="Item",
+                condition=AlertCondition.CHANGE_PERCENT,
+                target_value=Decimal(10),
+                reference_price=Decimal(100),
+            )
+        )
+        manager.config.max_triggers_per_hour = 1000
+
+        assert manager.load_alerts(alerts) == 101
+
+        triggered = await manager.check_alerts({"Item": Decimal("89.5")})
+        assert len(triggered) == 11  # thresholds 90..99 and the 10% change
@@ -806,3 +806,92 @@ class TestMarketAlertsManagerEdgeCases:
 
         # Should be called at most 3 times (limit per user)
         assert mock_bot.send_message.call_count <= 3
+
+
+class TestMarketAlertsManagerScheduler:
+    """Tests for heap-based check timers and the shared market snapshot."""
+
+    @staticmethod
+    def _market_items(prices):
+        return [
+            {
+                "title": title,
+                "price": {"amount": amount},
+                "salesVolume": 50,
+                "offersCount": 5,
+            }
+            for title, amount in prices.items()
+        ]
+
+    def test_subscribe_schedules_check_timer(self, manager):
+        """Test that the first subscription puts a timer on the heap."""
+        manager.subscribe(123, "trending")
+        manager.subscribe(456, "trending")
+
+        assert manager._scheduled_at == {"trending": manager.check_intervals["trending"]}
+        assert len(manager._schedule) == 1
+
+    def test_update_check_interval_reschedules_timer(self, manager):
+        """Test that changing the interval moves the timer and skips the stale entry."""
+        manager.subscribe(123, "price_changes")
+        manager.last_check_time["price_changes"] = 1000.0
+        manager.update_check_interval("price_changes", 300)
+
+        assert manager._pop_due_checks(1000.0 + 299) == []
+        assert manager._pop_due_checks(1000.0 + 300) == ["price_changes"]
+        assert manager._pop_due_checks(1000.0 + 3600) == []
+
+    def test_due_check_without_subscribers_is_dropped(self, manager):
+        """Test that a timer is not run after everybody unsubscribed."""
+        manager.subscribe(123, "volatility")
+        manager.unsubscribe(123, "volatility")
+
+        assert manager._pop_due_checks(time.time()) == []
+        assert "volatility" not in manager._scheduled_at
+
+    @pytest.mark.asyncio()
+    async def test_due_checks_share_one_snapshot(self, manager, mock_dmarket_api):
+        """Test that checks due together use a single market fetch."""
+        mock_dmarket_api.get_market_items = AsyncMock(
+            return_value={"objects": self._market_items({"A": 2000, "B": 3000})}
+        )
+        for alert_type in ("price_changes", "trending", "volatility"):
+            manager.subscribe(123, alert_type)
+
+        with (
+            patch.object(manager, "_check_price_changes", new_callable=AsyncMock) as price,
+            patch.object(manager, "_check_trending_items", new_callable=AsyncMock) as trend,
+            patch.object(manager, "_check_volatility", new_callable=AsyncMock) as vol,
+        ):
+            await manager._run_checks(manager._pop_due_checks(time.time()))
+
+        assert mock_dmarket_api.get_market_items.await_count == 1
+        snapshot = manager.snapshot_store.snapshot
+        for check in (price, trend, vol):
+            check.assert_awaited_once_with(snapshot)
+        assert set(manager._scheduled_at) == {"price_changes", "trending", "volatility"}
+        assert all(manager.last_check_time[t] > 0 for t in manager._scheduled_at)
+
+    @pytest.mark.asyncio()
+    async def test_snapshot_evaluation_is_incremental(self, manager):
+        """Test that only items changed since the last check are re-evaluated."""
+        from src.dmarket.market_snapshot import MarketSnapshot
+
+        first = MarketSnapshot.from_items("csgo", self._market_items({"A": 2000, "B": 3000}))
+        second = MarketSnapshot.from_items("csgo", self._market_items({"A": 2000, "C": 400}))
+
+        with patch(
+            "src.telegram_bot.market_alerts.evaluate_trending_item",
+            side_effect=lambda item, **kwargs: {
+                "price": item["price"]["amount"] / 100,
+                "popularity_score": 60.0,
+                "title": item["title"],
+            },
+        ) as evaluate:
+            manager._evaluate_snapshot("trending", first)
+            results = manager._evaluate_snapshot("trending", second)
+
+        evaluated = [call.args[0]["title"] for call in evaluate.call_args_list]
+        assert evaluated == ["A", "B", "C"]
+        # "B" disappeared and "C" is below the $5 trending price floor
+        assert [result["title"] for result in results] == ["A"]
@@ -1,11 +1,20 @@
 import asyncio
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from telegram.error import RetryAfter
 
 from src.telegram_bot.notification_queue import NotificationQueue, Priority
 
 
+async def wait_until(condition, timeout=5.0):
+    """Poll until condition() is true (the first send may import metrics)."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
 @pytest.fixture()
 def mock_bot():
     return AsyncMock()
@@ -41,7 +50,8 @@ async def test_enqueue_and_process(notification_queue, mock_bot):
 
 @pytest.mark.asyncio()
 async def test_priority_ordering(notification_queue, mock_bot):
-    # We will manually process items to check order
+    # A single sender makes the send order observable
+    notification_queue.concurrency = 1
 
     # Enqueue low priority first
     await notification_queue.enqueue(chat_id=1, text="Low", priority=Priority.LOW)
@@ -50,24 +60,13 @@ async def test_priority_ordering(notification_queue, mock_bot):
     # Enqueue normal priority third
     await notification_queue.enqueue(chat_id=3, text="Normal", priority=Priority.NORMAL)
 
-    # Get items from the internal queue directly to check order
-    # The queue is a PriorityQueue, so get() should return lowest priority
-    # number first (High=0)
-
-    # Note: asyncio.PriorityQueue returns items in order of priority value
-    # (lowest first). The queue stores (priority, timestamp, counter, message)
-
-    p1, _, _, msg1 = await notification_queue.queue.get()
-    assert p1 == Priority.HIGH
-    assert msg1.text == "High"
-
-    p2, _, _, msg2 = await notification_queue.queue.get()
-    assert p2 == Priority.NORMAL
-    assert msg2.text == "Normal"
+    await notification_queue.start()
+    await wait_until(lambda: mock_bot.send_message.call_count == 3)
+    await notification_queue.stop()
 
-    p3, _, _, msg3 = await notification_queue.queue.get()
-    assert p3 == Priority.LOW
-    assert msg3.text == "Low"
+    # Highest priority (lowest value) is sent first
+    sent = [call.kwargs["text"] for call in mock_bot.send_message.call_args_list]
+    assert sent == ["High", "Normal", "Low"]
 
 
 @pytest.mark.asyncio()
@@ -75,6 +74,8 @@ async def test_rate_limiting(notification_queue, mock_bot):
     # Set faster rate limits for testing so we don't have to wait long
     notification_queue.global_rate_limit = 0.01
     notification_queue.chat_rate_limit = 0.01
+    # Every message must be sent separately
+    notification_queue.coalesce = False
 
     # Start the queue processing
     await notification_queue.start()
@@ -82,8 +83,120 @@ async def test_rate_limiting(notification_queue, mock_bot):
     for i in range(5):
         await notification_queue.enqueue(chat_id=123, text=f"Msg {i}")
 
-    await asyncio.sleep(0.5)
+    await wait_until(lambda: mock_bot.send_message.call_count == 5)
 
     await notification_queue.stop()
 
     assert mock_bot.send_message.call_count == 5
+
+
+@pytest.mark.asyncio()
+async def test_chat_cooldown_does_not_block_other_chats(notification_queue, mock_bot):
+    notification_queue.global_rate_limit = 0.0
+    notification_queue.chat_rate_limit = 10.0
+    notification_queue.coalesce = False
+
+    await notification_queue.enqueue(chat_id=1, text="First", priority=Priority.HIGH)
+    await notification_queue.enqueue(chat_id=1, text="Second", priority=Priority.HIGH)
+    await notification_queue.enqueue(chat_id=2, text="Other chat", priority=Priority.LOW)
+
+    await notification_queue.start()
+    await wait_until(lambda: mock_bot.send_message.call_count == 2)
+    await asyncio.sleep(0.05)
+    await notification_queue.stop()
+
+    # Chat 1 waits for its cooldown, chat 2 is delivered anyway
+    sent = [call.kwargs["text"] for call in mock_bot.send_message.call_args_list]
+    assert sent == ["First", "Other chat"]
+    assert notification_queue.pending == 1
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_senders(mock_bot):
+    async def slow_send(**kwargs):
+        await asyncio.sleep(0.1)
+
+    mock_bot.send_message.side_effect = slow_send
+    queue = NotificationQueue(mock_bot, global_rate_limit=0.0, concurrency=4)
+
+    # Warm up the metrics import so it is not measured
+    await queue.enqueue(chat_id=99, text="Warm up")
+    await queue.start()
+    await wait_until(lambda: queue.sent_count == 1)
+
+    started = asyncio.get_running_loop().time()
+    for chat_id in range(4):
+        await queue.enqueue(chat_id=chat_id, text="Hi")
+    await wait_until(lambda: queue.sent_count == 5)
+    elapsed = asyncio.get_running_loop().time() - started
+    await queue.stop()
+
+    assert elapsed < 0.3
+
+
+@pytest.mark.asyncio()
+async def test_queued_messages_to_same_chat_are_coalesced(notification_queue, mock_bot):
+    await notification_queue.enqueue(chat_id=1, text="A", priority=Priority.LOW)
+    await notification_queue.enqueue(chat_id=1, text="B", priority=Priority.HIGH)
+    await notification_queue.enqueue(chat_id=1, text="With keyboard", reply_markup=MagicMock())
+
+    assert notification_queue.pending == 2
+
+    await notification_queue.start()
+    await wait_until(lambda: mock_bot.send_message.call_count == 1)
+    await notification_queue.stop()
+
+    # The coalesced message takes the highest priority of its parts
+    first = mock_bot.send_message.call_args_list[0].kwargs
+    assert first["text"] == "A\n\nB"
+    assert notification_queue.get_stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio()
+async def test_retry_after_pauses_only_that_chat(notification_queue, mock_bot):
+    notification_queue.global_rate_limit = 0.0
+    calls = []
+
+    async def send(**kwargs):
+        calls.append(kwargs["text"])
+        if kwargs["chat_id"] == 1 and calls.count(kwargs["text"]) == 1:
+            raise RetryAfter(0.2)
+
+    mock_bot.send_message.side_effect = send
+    await notification_queue.enqueue(chat_id=1, text="Limited")
+    await notification_queue.enqueue(chat_id=2, text="Free")
+
+    await notification_queue.start()
+    await wait_until(lambda: len(calls) == 2)
+    await asyncio.sleep(0.05)
+    assert calls == ["Limited", "Free"]
+
+    await wait_until(lambda: len(calls) == 3)
+    await notification_queue.stop()
+    assert calls == ["Limited", "Free", "Limited"]
+
+
+def test_cleanup_removes_idle_chat_buckets(notification_queue):
+    for chat_id in range(3):
+        bucket = notification_queue._chat_bucket(chat_id)
+    bucket.updated -= 120
+    notification_queue._chat_buckets[0].updated -= 120
+
+    notification_queue._cleanup_timestamps()
+
+    assert set(notification_queue._chat_buckets) == {1}
+
+
+@pytest.mark.asyncio()
+async def test_latency_percentiles(notification_queue, mock_bot):
+    notification_queue.global_rate_limit = 0.0
+    for chat_id in range(10):
+        await notification_queue.enqueue(chat_id=chat_id, text="Hi")
+
+    await notification_queue.start()
+    await wait_until(lambda: notification_queue.sent_count == 10)
+    await notification_queue.stop()
+
+    latency = notification_queue.get_stats()["latency"]
+    assert set(latency) == {"p50", "p95", "p99"}
+    assert 0 <= latency["p50"] <= latency["p95"] <= latency["p99"]
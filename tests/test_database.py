@@ -4,8 +4,8 @@ This module contains tests for database models, operations,
 and connection management.
 """
 
-from datetime import datetime
-from uuid import UUID
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
 
 import pytest
 import pytest_asyncio
@@ -118,6 +118,43 @@ class TestDatabaseManager:
         # Should complete without error
         # In a real test, we would query the database to verify the data
 
+    @pytest.mark.asyncio()
+    async def test_iter_active_price_alerts(self, db_manager: DatabaseManager):
+        """Test streaming active price alerts in batches."""
+        user_id = uuid4()
+        now = datetime.now(UTC)
+        async with db_manager.get_async_session() as session:
+            session.add_all(
+                [
+                    PriceAlert(
+                        user_id=user_id,
+                        item_id=f"item_{i}",
+                        market_hash_name=f"Item {i}",
+                        game="csgo",
+                        target_price=float(i),
+                    )
+                    for i in range(5)
+                ]
+                + [
+                    PriceAlert(user_id=user_id, item_id="inactive", target_price=1.0, is_active=False),
+                    PriceAlert(user_id=user_id, item_id="triggered", target_price=1.0, triggered=True),
+                    PriceAlert(
+                        user_id=user_id,
+                        item_id="expired",
+                        target_price=1.0,
+                        expires_at=now - timedelta(days=1),
+                    ),
+                ]
+            )
+            await session.commit()
+
+        batches = [batch async for batch in db_manager.iter_active_price_alerts(batch_size=2)]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        rows = [row for batch in batches for row in batch]
+        assert sorted(row["item_id"] for row in rows) == [f"item_{i}" for i in range(5)]
+        assert rows[0]["condition"] == "below"
+
     @pytest.mark.asyncio()
     async def test_database_connection_management(self, db_manager: DatabaseManager):
         """Test database connection management."""
@@ -19,7 +19,6 @@ from src.dmarket.dmarket_api import (
     CACHE_TTL,
     GAME_MAP,
     DMarketAPI,
-    api_cache,
 )
 
 
@@ -292,9 +291,10 @@ class TestDMarketAPICaching:
         """Test cache can be disabled."""
         assert api_client_live.enable_cache is False
 
-    def test_api_cache_global(self) -> None:
-        """Test api_cache is a global dictionary."""
-        assert isinstance(api_cache, dict)
+    def test_api_cache_per_instance(self, api_client: DMarketAPI) -> None:
+        """Test each client owns its own response cache."""
+        other = DMarketAPI(public_key="other", secret_key="b" * 64)
+        assert api_client._cache is not other._cache
 
 
 # ===========================================================================
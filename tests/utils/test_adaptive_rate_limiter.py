@@ -0,0 +1,203 @@
+"""Tests for AdaptiveRateLimiter (AIMD, header-driven, priority lanes)."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.utils.rate_limiter import (
+    AIMD_ADDITIVE_INCREASE,
+    DMARKET_ENDPOINT_LIMITS,
+    AdaptiveRateLimiter,
+    RequestPriority,
+    get_dmarket_rate_limiter,
+    reset_shared_rate_limiters,
+)
+
+
+@pytest.fixture()
+def limiter():
+    """Create AdaptiveRateLimiter with documented limits."""
+    return AdaptiveRateLimiter()
+
+
+def test_starts_from_documented_limits(limiter):
+    """Test every category starts at its documented limit."""
+    stats = limiter.get_stats()
+
+    for category, limit in DMARKET_ENDPOINT_LIMITS.items():
+        assert stats[category]["limit_per_minute"] == limit
+        assert stats[category]["ceiling_per_minute"] == limit
+
+
+def test_record_429_halves_rate_and_blocks(limiter):
+    """Test multiplicative decrease and pause after 429."""
+    limiter.record_429_error("/exchange/v1/market/items", retry_after=5)
+
+    budget = limiter._budgets["market"]
+    assert limiter.get_rate("market") == DMARKET_ENDPOINT_LIMITS["market"] / 2
+    assert budget.wait_time(time.monotonic()) > 4
+    assert limiter.get_stats()["market"]["total_429_errors"] == 1
+
+
+def test_success_increases_rate_up_to_ceiling(limiter):
+    """Test additive increase does not exceed the ceiling."""
+    limiter.record_429_error("market", retry_after=0.01)
+    halved = limiter.get_rate("market")
+
+    limiter.record_success("market")
+    assert limiter.get_rate("market") == halved + AIMD_ADDITIVE_INCREASE
+
+    for _ in range(100):
+        limiter.record_success("market")
+    assert limiter.get_rate("market") == DMARKET_ENDPOINT_LIMITS["market"]
+
+
+def test_headers_raise_ceiling(limiter):
+    """Test X-RateLimit-Limit lets the rate grow beyond the documented limit."""
+    limiter.update_from_headers(
+        {"X-RateLimit-Limit": "120", "X-RateLimit-Remaining": "100"},
+        "/exchange/v1/market/items",
+    )
+    for _ in range(200):
+        limiter.record_success("market")
+
+    stats = limiter.get_stats()["market"]
+    assert stats["ceiling_per_minute"] == 120
+    assert stats["limit_per_minute"] == 120
+    assert stats["server_remaining"] == 100
+
+
+def test_headers_lower_ceiling_and_block_until_reset(limiter):
+    """Test exhausted server quota blocks the category until reset."""
+    limiter.update_from_headers(
+        {"x-ratelimit-limit": "10", "x-ratelimit-remaining": "0", "x-ratelimit-reset": "3"},
+        "/account/v1/balance",
+    )
+
+    assert limiter.get_rate("account") == 10
+    assert limiter._budgets["account"].wait_time(time.monotonic()) > 2
+
+
+def test_headers_without_rate_limit_info_ignored(limiter):
+    """Test headers without X-RateLimit-* and non-mapping headers are ignored."""
+    limiter.update_from_headers({"Content-Type": "application/json"}, "market")
+    limiter.update_from_headers(None, "market")
+
+    assert limiter.get_stats()["market"]["server_remaining"] is None
+
+
+@pytest.mark.asyncio()
+async def test_trade_lane_served_before_scan():
+    """Test waiting trade requests pre-empt waiting scans."""
+    limiter = AdaptiveRateLimiter(limits={"market": 600, "other": 600})
+    limiter._budgets["market"].tokens = 0.0
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire("/exchange/v1/market/items", priority=priority)
+        order.append(name)
+
+    scans = [
+        asyncio.create_task(request(f"scan{i}", RequestPriority.SCAN)) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    trade = asyncio.create_task(request("trade", RequestPriority.TRADE))
+    await asyncio.gather(*scans, trade)
+
+    assert order[0] == "trade"
+    assert order[1:] == ["scan0", "scan1", "scan2"]
+
+
+@pytest.mark.asyncio()
+async def test_cancelled_waiter_leaves_queue():
+    """Test a cancelled acquire does not block the queue."""
+    limiter = AdaptiveRateLimiter(limits={"other": 600})
+    limiter._budgets["other"].tokens = 0.0
+
+    waiter = asyncio.create_task(limiter.acquire("other"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter._budgets["other"].waiters == []
+    await asyncio.wait_for(limiter.acquire("other"), timeout=1.0)
+
+
+@pytest.mark.asyncio()
+async def test_budget_shared_through_redis():
+    """Test the Redis sliding window is consulted before sending."""
+    redis_limiter = AsyncMock()
+    redis_limiter.check_and_increment = AsyncMock(side_effect=[(False, 0, 0.05), (True, 9, 0.0)])
+    limiter = AdaptiveRateLimiter(redis_limiter=redis_limiter, redis_prefix="test:")
+
+    await asyncio.wait_for(limiter.acquire("/exchange/v1/market/items"), timeout=1.0)
+
+    assert redis_limiter.check_and_increment.await_count == 2
+    key = redis_limiter.check_and_increment.await_args.args[0]
+    assert key == "test:market"
+    assert limiter.get_stats()["market"]["total_requests"] == 1
+
+
+class _SharedWindow:
+    """In-memory stand-in for one Redis sliding window backend."""
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+
+    async def check_and_increment(self, identifier, limit, window):
+        count = self.counts.get(identifier, 0)
+        if count >= limit:
+            return False, 0, 0.05
+        self.counts[identifier] = count + 1
+        return True, limit - count - 1, 0.0
+
+
+@pytest.mark.asyncio()
+async def test_replicas_share_one_budget_through_backend():
+    """Test two limiters on one backend together stay within one budget."""
+    backend = _SharedWindow()
+    first = AdaptiveRateLimiter(redis_limiter=backend, redis_prefix="dmarket:abc:")
+    second = AdaptiveRateLimiter(redis_limiter=backend, redis_prefix="dmarket:abc:")
+    limit = DMARKET_ENDPOINT_LIMITS["trade"]
+
+    for _ in range(6):
+        await asyncio.wait_for(first.acquire("trade"), timeout=1.0)
+    for _ in range(limit - 6):
+        await asyncio.wait_for(second.acquire("trade"), timeout=1.0)
+
+    # Each replica still has local tokens, but the shared window is full
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(second.acquire("trade"), timeout=0.2)
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(first.acquire("trade"), timeout=0.2)
+    assert backend.counts == {"dmarket:abc:trade": limit}
+
+
+def test_dmarket_api_shares_budget_through_configured_redis(monkeypatch):
+    """Test DMarketAPI passes a Redis limiter when REDIS_URL is configured."""
+    from src.dmarket.dmarket_api import DMarketAPI
+    from src.utils.redis_rate_limiter import SlidingWindowRateLimiter
+
+    reset_shared_rate_limiters()
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+
+    api = DMarketAPI("redis-key", "secret")
+
+    assert isinstance(api.advanced_rate_limiter.redis_limiter, SlidingWindowRateLimiter)
+    reset_shared_rate_limiters()
+
+
+def test_shared_limiter_per_api_key():
+    """Test clients with the same API key share one limiter."""
+    reset_shared_rate_limiters()
+
+    first = get_dmarket_rate_limiter("key-a")
+    assert get_dmarket_rate_limiter("key-a") is first
+    assert get_dmarket_rate_limiter("key-b") is not first
+    assert "key-a" not in first.redis_prefix
+
+    reset_shared_rate_limiters()
+    assert get_dmarket_rate_limiter("key-a") is not first
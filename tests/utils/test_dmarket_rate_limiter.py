@@ -76,6 +76,8 @@ def test_rate_limiter_has_correct_limits(rate_limiter):
         ("/account/v1/balance", "account"),
         ("/api/v1/account/balance", "account"),
         ("/exchange/v1/market/items/buy", "trade"),
+        ("/exchange/v1/offers-buy", "trade"),
+        ("/exchange/v1/user/inventory/sell", "trade"),
         ("/exchange/v1/user/offers/edit", "trade"),
         ("/some/unknown/endpoint", "other"),
     ],
@@ -0,0 +1,151 @@
+"""Tests for the process-wide HTTP connection pool."""
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import httpx
+import pytest
+
+from src.utils.http_pool import HostPoolStats, HTTPConnectionPool, SharedTransport, origin_key
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server_url():
+    """Local keep-alive HTTP server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestOriginKey:
+    """Tests for origin_key."""
+
+    def test_strips_path_and_query(self):
+        assert origin_key("https://api.dmarket.com/exchange/v1/items?limit=1") == (
+            "https://api.dmarket.com"
+        )
+
+    def test_keeps_explicit_port(self):
+        assert origin_key("http://127.0.0.1:8080/path") == "http://127.0.0.1:8080"
+
+
+class TestHostPoolStats:
+    """Tests for per-origin counters."""
+
+    def test_reuse_ratio(self):
+        stats = HostPoolStats(origin="https://x", requests=10, connections_opened=2)
+        assert stats.reuse_ratio == pytest.approx(0.8)
+        assert HostPoolStats(origin="https://x").reuse_ratio == 0.0
+
+    def test_handshakes_per_minute_window(self):
+        stats = HostPoolStats(origin="https://x")
+        stats.record_handshake(100.0)
+        stats.record_handshake(130.0)
+        stats.record_handshake(150.0)
+
+        assert stats.tls_handshakes == 3
+        assert stats.handshakes_per_minute(now=155.0) == 3
+        assert stats.handshakes_per_minute(now=200.0) == 1
+
+
+class TestHTTPConnectionPool:
+    """Tests for HTTPConnectionPool."""
+
+    def test_create_client_uses_shared_transport(self):
+        pool = HTTPConnectionPool()
+        client = pool.create_client(timeout=5.0)
+
+        assert isinstance(client._transport, SharedTransport)
+        assert client.timeout.connect == 5.0
+
+    def test_configure_sets_host_limits(self):
+        pool = HTTPConnectionPool()
+        pool.configure("https://api.waxpeer.com/v1/user", limits=httpx.Limits(max_connections=7))
+
+        stats = pool.get_host_stats("https://api.waxpeer.com")
+
+        assert stats["status"] == "idle"
+        assert stats["max_connections"] == 7
+        assert stats["requests"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_connections_reused_across_clients(self, server_url):
+        """Closing a client does not drop the warm connection of its host."""
+        pool = HTTPConnectionPool(http2=False)
+        try:
+            for _ in range(3):
+                async with pool.create_client(timeout=5.0) as client:
+                    response = await client.get(f"{server_url}/items")
+                    assert response.json() == {"ok": True}
+                    await client.get(f"{server_url}/balance")
+
+            stats = pool.get_host_stats(server_url)
+            assert stats["requests"] == 6
+            assert stats["connections_opened"] == 1
+            assert stats["connection_reuse_ratio"] == pytest.approx(5 / 6, abs=1e-4)
+            assert stats["connections"] == 1
+            assert stats["idle_connections"] == 1
+            assert stats["tls_handshakes_per_minute"] == 0
+
+            dashboard = pool.get_stats()
+            assert list(dashboard["hosts"]) == [server_url]
+            assert dashboard["total"]["requests"] == 6
+            assert dashboard["total"]["pools"] == 1
+        finally:
+            await pool.aclose()
+
+        assert pool.get_stats()["total"]["pools"] == 0
+
+    @pytest.mark.asyncio()
+    async def test_parent_trace_still_called(self, server_url):
+        pool = HTTPConnectionPool(http2=False)
+        events = []
+
+        async def trace(event_name, info):
+            events.append(event_name)
+
+        try:
+            async with pool.create_client() as client:
+                await client.get(server_url, extensions={"trace": trace})
+        finally:
+            await pool.aclose()
+
+        assert "connection.connect_tcp.complete" in events
+
+    def test_pools_of_previous_event_loop_are_closed(self, server_url):
+        pool = HTTPConnectionPool(http2=False)
+
+        async def get():
+            async with pool.create_client(timeout=5.0) as client:
+                await client.get(server_url)
+
+        asyncio.run(get())
+        stale = pool._transports[server_url]
+        assert len(stale._pool.connections) == 1
+
+        async def get_and_close():
+            await get()
+            await pool.aclose()
+
+        asyncio.run(get_and_close())
+
+        assert stale._pool.connections == []
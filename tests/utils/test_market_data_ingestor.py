@@ -0,0 +1,203 @@
+"""
+Tests for buffered market data ingestion.
+
+Тестирует:
+- DatabaseManager.bulk_save_market_data (многострочный INSERT для SQLite)
+- MarketDataIngestor (сброс по размеру, по времени, при остановке)
+- market_items_to_rows
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import text
+
+from src.utils import database as database_module
+from src.utils.database import DatabaseManager
+from src.utils.market_data_ingestor import MarketDataIngestor, market_items_to_rows
+
+
+def _rows(count: int, game: str = "csgo") -> list[dict]:
+    return [
+        {
+            "item_id": f"item_{i}",
+            "game": game,
+            "item_name": f"Item {i}",
+            "price_usd": 1.0 + i / 100,
+        }
+        for i in range(count)
+    ]
+
+
+async def _count_rows(db: DatabaseManager) -> int:
+    async with db.get_async_session() as session:
+        result = await session.execute(text("SELECT COUNT(*) FROM market_data"))
+        return result.scalar_one()
+
+
+@pytest.fixture()
+async def db_manager():
+    """Create in-memory database manager for testing."""
+    db = DatabaseManager("sqlite:///:memory:", echo=False)
+    await db.init_database()
+    yield db
+    await db.close()
+
+
+class TestBulkSaveMarketData:
+    """Тесты пакетной вставки market_data."""
+
+    async def test_multirow_insert_spans_several_statements(self, db_manager, monkeypatch):
+        """Строки разбиваются на несколько INSERT и все сохраняются."""
+        monkeypatch.setattr(database_module, "_SQLITE_ROWS_PER_INSERT", 7)
+
+        await db_manager.bulk_save_market_data(_rows(50))
+
+        assert await _count_rows(db_manager) == 50
+        history = await db_manager.get_price_history(
+            "Item 3", "csgo", start_date=datetime.now(UTC) - timedelta(days=1)
+        )
+        assert len(history) == 1
+        assert history[0]["price_usd"] == pytest.approx(1.03)
+
+    async def test_empty_items(self, db_manager):
+        """Пустой список ничего не записывает."""
+        await db_manager.bulk_save_market_data([])
+        assert await _count_rows(db_manager) == 0
+
+    async def test_enqueue_flushed_on_close(self):
+        """Записи из очереди сохраняются при закрытии."""
+        db = DatabaseManager("sqlite:///:memory:", echo=False)
+        await db.init_database()
+        await db.enqueue_market_data(_rows(10))
+        assert db.market_data_ingestor.pending == 10
+
+        saved = AsyncMock(wraps=db.bulk_save_market_data)
+        db.bulk_save_market_data = saved
+        await db.close()
+
+        saved.assert_awaited_once()
+        assert len(saved.await_args.args[0]) == 10
+
+
+class TestMarketDataIngestor:
+    """Тесты MarketDataIngestor."""
+
+    async def test_flushes_full_batches(self, db_manager):
+        """Полная пачка запускает запись без ожидания интервала."""
+        ingestor = MarketDataIngestor(db_manager, batch_size=20, flush_interval=60)
+
+        await ingestor.put_many(_rows(45))
+        for _ in range(100):
+            if ingestor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await _count_rows(db_manager) == 45
+        stats = ingestor.get_stats()
+        assert stats["rows_enqueued"] == 45
+        assert stats["rows_written"] == 45
+        assert stats["flushes"] == 3
+        assert stats["rows_per_second"] > 0
+        assert stats["running"]
+
+        await ingestor.stop()
+        assert not ingestor.running
+
+    async def test_flushes_on_interval(self, db_manager):
+        """Неполная пачка записывается по таймеру."""
+        ingestor = MarketDataIngestor(db_manager, batch_size=100, flush_interval=0.05)
+
+        await ingestor.put_many(_rows(3))
+        await asyncio.sleep(0.2)
+
+        assert await _count_rows(db_manager) == 3
+        await ingestor.stop()
+
+    async def test_put_nowait_drops_when_full(self):
+        """put_nowait отбрасывает записи при переполнении буфера."""
+        database = AsyncMock()
+        ingestor = MarketDataIngestor(database, batch_size=2, flush_interval=60, max_buffer_size=3)
+
+        accepted = [ingestor.put_nowait(row) for row in _rows(5)]
+
+        assert accepted == [True, True, True, False, False]
+        assert ingestor.get_stats()["rows_dropped"] == 2
+        await ingestor.stop()
+        assert database.bulk_save_market_data.await_count == 2
+
+    async def test_put_waits_for_space(self):
+        """put ждёт освобождения места в буфере."""
+        release = asyncio.Event()
+        written = []
+
+        async def slow_save(batch):
+            await release.wait()
+            written.extend(batch)
+
+        database = AsyncMock()
+        database.bulk_save_market_data.side_effect = slow_save
+        ingestor = MarketDataIngestor(database, batch_size=2, flush_interval=60, max_buffer_size=2)
+
+        producer = asyncio.create_task(ingestor.put_many(_rows(6)))
+        await asyncio.sleep(0.05)
+        assert not producer.done()
+
+        release.set()
+        await asyncio.wait_for(producer, timeout=1)
+        await ingestor.stop()
+        assert [row["item_id"] for row in written] == [f"item_{i}" for i in range(6)]
+
+    async def test_failed_batch_is_counted(self):
+        """Ошибка записи не останавливает ingestor."""
+        database = AsyncMock()
+        database.bulk_save_market_data.side_effect = [RuntimeError("db down"), None]
+        ingestor = MarketDataIngestor(database, batch_size=2, flush_interval=60)
+
+        ingestor.put_nowait(_rows(1)[0])
+        ingestor.put_nowait(_rows(1)[0])
+        ingestor.put_nowait(_rows(1)[0])
+        await ingestor.stop()
+
+        stats = ingestor.get_stats()
+        assert stats["rows_failed"] == 2
+        assert stats["rows_written"] == 1
+
+    def test_invalid_batch_size(self):
+        """batch_size должен быть положительным."""
+        with pytest.raises(ValueError, match="batch_size"):
+            MarketDataIngestor(AsyncMock(), batch_size=0)
+
+
+class TestMarketItemsToRows:
+    """Тесты преобразования ответа API."""
+
+    def test_converts_api_items(self):
+        """Цена в центах переводится в доллары, неполные записи пропускаются."""
+        items = [
+            {"itemId": "a1", "title": "AK-47 | Redline", "price": {"USD": "1250"}},
+            {"itemId": "a2", "title": "AWP | Asiimov", "price": {"amount": 9999}},
+            {"itemId": "a3", "title": "No price"},
+            {"title": "No id", "price": {"USD": "100"}},
+        ]
+
+        rows = market_items_to_rows(items, game="csgo")
+
+        assert rows == [
+            {
+                "item_id": "a1",
+                "game": "csgo",
+                "item_name": "AK-47 | Redline",
+                "price_usd": 12.5,
+                "data_source": "dmarket",
+            },
+            {
+                "item_id": "a2",
+                "game": "csgo",
+                "item_name": "AWP | Asiimov",
+                "price_usd": 99.99,
+                "data_source": "dmarket",
+            },
+        ]
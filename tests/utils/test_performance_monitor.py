@@ -6,6 +6,7 @@ import time
 import pytest
 
 from src.utils.performance_monitor import (
+    EventLoopLagMonitor,
     PerformanceMetrics,
     PerformanceMonitor,
     RequestMetric,
@@ -294,3 +295,28 @@ class TestGetPerformanceSummary:
         assert "metrics_by_function" in summary
         assert "total_slow_requests" in summary
         assert "slowest_requests" in summary
+
+
+class TestEventLoopLagMonitor:
+    """Tests for EventLoopLagMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_shows_up_as_lag(self):
+        """Test that synchronous work on the loop is measured as lag."""
+        async with EventLoopLagMonitor(interval=0.005) as lag:
+            await asyncio.sleep(0.02)
+            # A synchronous callback blocks the event loop
+            asyncio.get_running_loop().call_soon(time.sleep, 0.1)
+            await asyncio.sleep(0.04)
+
+        stats = lag.get_stats()
+        assert not lag.running
+        assert stats["samples"] >= 2
+        assert stats["max_ms"] >= 80
+        assert stats["p95_ms"] <= stats["max_ms"]
+
+    def test_empty_stats(self):
+        """Test stats before any sample."""
+        lag = EventLoopLagMonitor()
+
+        assert lag.get_stats() == {"samples": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
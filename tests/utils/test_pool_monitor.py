@@ -69,6 +69,26 @@ class TestPoolMonitor:
         assert "database" in stats
         assert isinstance(stats["database"], PoolStats)
 
+    def test_get_all_stats_with_http_pool(self, monitor):
+        """Test shared HTTP pool is reported per origin."""
+        import httpx
+
+        from src.utils.http_pool import HTTPConnectionPool
+
+        http_pool = HTTPConnectionPool()
+        http_pool.configure(
+            "https://api.dmarket.com",
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=30),
+        )
+
+        monitor.register_pool("http_pool", http_pool)
+        stats = monitor.get_all_stats()
+
+        assert list(stats) == ["http:https://api.dmarket.com"]
+        assert stats["http:https://api.dmarket.com"].max_size == 100
+        assert stats["http:https://api.dmarket.com"].max_overflow == 70
+        assert stats["http:https://api.dmarket.com"].in_use == 0
+
     def test_check_health_empty(self, monitor):
         """Test health check with no pools."""
         health = monitor.check_health()
@@ -0,0 +1,261 @@
+"""
+Tests for the tiered price history store.
+
+Тестирует:
+- агрегацию market_data в OHLCV-бары 5m/1h/1d
+- инкрементальный rollup и сроки хранения
+- выбор уровня детализации при чтении
+"""
+
+from datetime import UTC, datetime, timedelta
+from itertools import pairwise
+
+import pytest
+from sqlalchemy import text
+
+from src.utils.database import DatabaseManager
+from src.utils.price_history_store import (
+    PriceBar,
+    PriceHistoryStore,
+    RollupTier,
+    aggregate_bars,
+    floor_time,
+)
+
+
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture()
+async def db_manager():
+    """Create in-memory database manager for testing."""
+    db = DatabaseManager("sqlite:///:memory:", echo=False)
+    await db.init_database()
+    yield db
+    await db.close()
+
+
+async def _insert_ticks(db: DatabaseManager, ticks: list[tuple[datetime, float]]) -> None:
+    """Insert raw market_data ticks for one item with explicit timestamps."""
+    created = datetime.now(UTC)
+    rows = []
+    for i, (timestamp, price) in enumerate(ticks):
+        row = db._market_data_row(
+            {"item_id": "ak", "game": "csgo", "item_name": "AK-47", "price_usd": price},
+            created,
+        )
+        row.update(id=f"tick-{i}-{timestamp.isoformat()}", created_at=timestamp, volume_24h=i)
+        rows.append(row)
+    async with db.get_async_session() as session:
+        await db._insert_market_data_executemany(session, rows)
+        await session.commit()
+
+
+async def _count(db: DatabaseManager, sql: str) -> int:
+    async with db.get_async_session() as session:
+        return (await session.execute(text(sql))).scalar_one()
+
+
+def _day_start(days_ago: int) -> datetime:
+    return floor_time(datetime.now(UTC), timedelta(days=1)) - timedelta(days=days_ago)
+
+
+class TestAggregation:
+    """Тесты агрегации баров."""
+
+    def test_floor_time(self):
+        """Бакеты выравниваются по UTC."""
+        moment = datetime(2026, 3, 5, 14, 37, 21, tzinfo=UTC)
+        assert floor_time(moment, timedelta(minutes=5)) == datetime(2026, 3, 5, 14, 35, tzinfo=UTC)
+        assert floor_time(moment, HOUR) == datetime(2026, 3, 5, 14, tzinfo=UTC)
+        assert floor_time(moment, timedelta(days=1)) == datetime(2026, 3, 5, tzinfo=UTC)
+
+    def test_aggregate_bars_ohlcv(self):
+        """Open/close берутся по времени, high/low по экстремумам."""
+        start = datetime(2026, 3, 5, 14, tzinfo=UTC)
+        prices = [10.0, 12.0, 9.0, 11.0]
+        rows = [
+            (
+                "csgo",
+                "AK-47",
+                start + timedelta(minutes=i),
+                PriceBar(start, price, price, price, price, volume=i),
+            )
+            for i, price in enumerate(prices)
+        ]
+
+        bars = aggregate_bars(rows, timedelta(minutes=5))
+
+        assert bars == {
+            ("csgo", "AK-47", start): PriceBar(start, 10.0, 12.0, 9.0, 11.0, volume=3, samples=4)
+        }
+
+    def test_tiers_must_be_multiples(self, db_manager):
+        """Шаг уровня должен быть кратен шагу предыдущего."""
+        with pytest.raises(ValueError, match="multiple"):
+            PriceHistoryStore(
+                db_manager,
+                tiers=(
+                    RollupTier("5m", timedelta(minutes=5), None),
+                    RollupTier("7m", timedelta(minutes=7), None),
+                ),
+            )
+
+
+class TestRollupAndRetention:
+    """Тесты rollup и удаления старых данных."""
+
+    async def test_rollup_builds_all_tiers(self, db_manager):
+        """Тики двух суток сворачиваются в 5m, 1h и 1d бары."""
+        start = _day_start(3)
+        ticks = [(start + timedelta(minutes=10 * i), 10.0 + i % 6) for i in range(2 * 144)]
+        await _insert_ticks(db_manager, ticks)
+        store = db_manager.price_history_store
+
+        written = await store.rollup()
+
+        assert written == {"5m": 288, "1h": 48, "1d": 2}
+        day_bars = await store.get_price_bars(
+            "csgo", "AK-47", start, start + timedelta(days=2), resolution=timedelta(days=1)
+        )
+        assert day_bars == [
+            PriceBar(start, 10.0, 15.0, 10.0, 15.0, volume=143, samples=144),
+            PriceBar(start + timedelta(days=1), 10.0, 15.0, 10.0, 15.0, volume=287, samples=144),
+        ]
+
+        # Incremental: nothing new to roll up
+        assert await store.rollup() == {"5m": 0, "1h": 0, "1d": 0}
+
+    async def test_first_rollup_reads_history_in_windows(self, db_manager):
+        """Первый rollup читает существующую историю окнами, а не целиком."""
+        start = _day_start(3)
+        ticks = [(start + timedelta(minutes=10 * i), 10.0 + i % 6) for i in range(2 * 144)]
+        await _insert_ticks(db_manager, ticks)
+        store = PriceHistoryStore(db_manager, rollup_window=6 * HOUR)
+        windows = []
+        raw_rows = store._raw_rows
+
+        def recording_raw_rows(session, window_start, window_end):
+            windows.append((window_start, window_end))
+            return raw_rows(session, window_start, window_end)
+
+        store._raw_rows = recording_raw_rows
+
+        written = await store.rollup()
+
+        assert written == {"5m": 288, "1h": 48, "1d": 2}
+        assert windows[0][0] == start
+        assert all(window_end - window_start <= 6 * HOUR for window_start, window_end in windows)
+        assert all(prev[1] == cur[0] for prev, cur in pairwise(windows))
+        day_bars = await store.get_price_bars(
+            "csgo", "AK-47", start, start + timedelta(days=2), resolution=timedelta(days=1)
+        )
+        assert [(bar.close, bar.samples) for bar in day_bars] == [(15.0, 144), (15.0, 144)]
+
+    async def test_retention_keeps_rows_not_rolled_up(self, db_manager):
+        """Сырые тики удаляются только после агрегации."""
+        old = _day_start(10)
+        await _insert_ticks(db_manager, [(old + HOUR * i, 5.0) for i in range(24)])
+        store = db_manager.price_history_store
+
+        assert await store.apply_retention() == {}
+        assert await _count(db_manager, "SELECT COUNT(*) FROM market_data") == 24
+
+        await store.maintain()
+
+        assert await _count(db_manager, "SELECT COUNT(*) FROM market_data") == 0
+        assert (
+            await _count(
+                db_manager,
+                "SELECT COUNT(*) FROM market_data_rollups WHERE resolution = '1d'",
+            )
+            == 1
+        )
+
+
+class TestTieredReads:
+    """Тесты выбора уровня при чтении."""
+
+    def test_select_tier(self, db_manager):
+        """Выбирается самый грубый уровень, удовлетворяющий запросу."""
+        store = db_manager.price_history_store
+        now = datetime.now(UTC)
+
+        # At most max_points (500) bars
+        assert store.select_tier(now - HOUR, now=now).name == "5m"
+        assert store.select_tier(now - timedelta(days=1), now=now).name == "5m"
+        assert store.select_tier(now - timedelta(days=20), now=now).name == "1h"
+        assert store.select_tier(now - timedelta(days=90), now=now).name == "1d"
+        assert store.select_tier(now - timedelta(days=400), now=now).name == "1d"
+        # Raw ticks only while they are kept
+        assert store.select_tier(now - HOUR, resolution=timedelta(seconds=1), now=now) is None
+        # Resolution finer than any tier that still has the data
+        assert (
+            store.select_tier(now - timedelta(days=60), resolution=timedelta(minutes=1), now=now)
+        ).name == "1h"
+        assert (
+            store.select_tier(now - timedelta(days=3), resolution=timedelta(hours=6), now=now)
+        ).name == "1h"
+
+    async def test_recent_buckets_read_from_raw(self, db_manager):
+        """Ещё не агрегированные бакеты достраиваются из сырых тиков."""
+        start = floor_time(datetime.now(UTC), HOUR) - 3 * HOUR
+        ticks = [(start + timedelta(minutes=15 * i), float(i)) for i in range(12)]
+        await _insert_ticks(db_manager, ticks)
+        store = db_manager.price_history_store
+        await store.rollup()
+        await _insert_ticks(db_manager, [(start + 3 * HOUR, 100.0)])
+
+        bars = await store.get_price_bars("csgo", "AK-47", start, resolution=HOUR)
+
+        assert [bar.timestamp for bar in bars] == [start + HOUR * i for i in range(4)]
+        assert [(bar.open, bar.close, bar.samples) for bar in bars] == [
+            (0.0, 3.0, 4),
+            (4.0, 7.0, 4),
+            (8.0, 11.0, 4),
+            (100.0, 100.0, 1),
+        ]
+        assert await store.get_close_prices("csgo", "AK-47", start, resolution=HOUR) == [
+            3.0,
+            7.0,
+            11.0,
+            100.0,
+        ]
+
+    async def test_bulk_read_matches_single_reads(self, db_manager):
+        """get_price_bars_bulk читает историю многих предметов за один вызов."""
+        start = floor_time(datetime.now(UTC), HOUR) - 3 * HOUR
+        ticks = [(start + timedelta(minutes=15 * i), float(i)) for i in range(12)]
+        await _insert_ticks(db_manager, ticks)
+        async with db_manager.get_async_session() as session:
+            await session.execute(
+                text("UPDATE market_data SET item_name = 'M4A4' WHERE price_usd >= 6")
+            )
+            await session.commit()
+        store = db_manager.price_history_store
+        await store.rollup()
+        await _insert_ticks(db_manager, [(start + 3 * HOUR, 100.0)])
+
+        bulk = await store.get_price_bars_bulk(
+            [("csgo", "AK-47"), ("csgo", "M4A4"), ("csgo", "AWP")], start, resolution=HOUR
+        )
+
+        assert set(bulk) == {("csgo", "AK-47"), ("csgo", "M4A4")}
+        for game, item_name in bulk:
+            assert bulk[game, item_name] == await store.get_price_bars(
+                game, item_name, start, resolution=HOUR
+            )
+        assert [bar.close for bar in bulk["csgo", "AK-47"]] == [3.0, 5.0, 100.0]
+
+    async def test_database_price_history_reads_bars(self, db_manager):
+        """DatabaseManager.get_price_history читает бары, новые первыми."""
+        start = _day_start(20)
+        ticks = [(start + timedelta(minutes=30 * i), float(i)) for i in range(48 * 14)]
+        await _insert_ticks(db_manager, ticks)
+        await db_manager.price_history_store.rollup()
+
+        history = await db_manager.get_price_history("AK-47", "csgo", start)
+
+        assert len(history) == 14 * 24
+        assert history[0]["timestamp"] > history[-1]["timestamp"]
+        assert history[-1] == {"price_usd": 1.0, "timestamp": start}
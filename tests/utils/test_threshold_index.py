@@ -0,0 +1,77 @@
+"""Тесты для индекса пороговых оповещений."""
+
+import pytest
+
+from src.utils.threshold_index import ThresholdIndex
+
+
+def _naive_crossed(alerts, price, inclusive):
+    result = []
+    for threshold, direction, value in alerts:
+        if direction == "above":
+            hit = price >= threshold if inclusive else price > threshold
+        else:
+            hit = price <= threshold if inclusive else price < threshold
+        if hit:
+            result.append(value)
+    return result
+
+
+@pytest.mark.parametrize("inclusive", [True, False])
+def test_crossed_matches_linear_scan(inclusive):
+    """Результат совпадает с перебором всех оповещений, включая равенство порогу."""
+    index = ThresholdIndex(inclusive=inclusive)
+    alerts = [
+        (float(threshold), direction, f"{direction}_{threshold}_{n}")
+        for n in range(2)
+        for threshold in range(0, 20, 2)
+        for direction in ("above", "below")
+    ]
+    for threshold, direction, value in alerts:
+        index.add("item", threshold, direction, value)
+
+    for price in (-1.0, 0.0, 5.0, 6.0, 18.0, 25.0):
+        assert sorted(index.crossed("item", price)) == sorted(
+            _naive_crossed(alerts, price, inclusive)
+        )
+    assert index.crossed("other", 5.0) == []
+
+
+def test_pop_crossed_removes_only_triggered():
+    """pop_crossed извлекает сработавшие оповещения, остальные остаются."""
+    index = ThresholdIndex()
+    index.add_many(
+        [
+            ("item", 10.0, "below", "b10"),
+            ("item", 5.0, "below", "b5"),
+            ("item", 12.0, "above", "a12"),
+            ("item", 20.0, "above", "a20"),
+        ]
+    )
+
+    assert index.pop_crossed("item", 8.0) == ["b10"]
+    assert len(index) == 3
+    assert index.pop_crossed("item", 8.0) == []
+    assert index.pop_crossed("item", 25.0) == ["a12", "a20"]
+    assert index.crossed("item", 1.0) == ["b5"]
+
+
+def test_remove_uses_identity_among_equal_thresholds():
+    """Удаление находит нужное оповещение среди одинаковых порогов."""
+    index = ThresholdIndex()
+    first, second = object(), object()
+    index.add("item", 10.0, "below", first)
+    index.add("item", 10.0, "below", second)
+
+    assert index.remove("item", 10.0, "below", second) is True
+    assert index.remove("item", 10.0, "below", second) is False
+    assert index.crossed("item", 9.0) == [first]
+
+
+def test_unknown_direction_raises():
+    """Неизвестное направление порога - ошибка."""
+    index = ThresholdIndex()
+    with pytest.raises(ValueError, match="direction"):
+        index.add("item", 1.0, "equals", "x")
+    with pytest.raises(ValueError, match="direction"):
+        index.add_many([("item", 1.0, "equals", "x")])